@@ -4,6 +4,7 @@ from app.database import init_db, mongo, db # MySQL 초기화
 from app.models import init_models 
 from app.routes import register_routes 
 from app.utils.error_handler import register_error_handlers  
+from app.utils.resources import resources
 from flask_swagger_ui import get_swaggerui_blueprint
 from flask_cors import CORS  
 from flask_mail import Mail
@@ -40,6 +41,12 @@ def create_app():
     # 에러 핸들러 등록
     register_error_handlers(app)
 
+    # 무거운 리소스 미리 로드 (상태는 /ready에서 확인)
+    if ActiveConfig.RESOURCE_WARMUP == "eager":
+        resources.warm_up(background=False)
+    elif ActiveConfig.RESOURCE_WARMUP == "background":
+        resources.warm_up()
+
     # Flask-Mail 초기화
     mail.init_app(app)
 
@@ -1,13 +1,13 @@
 from flask_pymongo import PyMongo
 from datetime import datetime
 from pytz import timezone
-import tensorflow as tf
 import cv2
 import numpy as np
-from tensorflow.keras.preprocessing.image import img_to_array
 import os
 import uuid
 from config.settings import ActiveConfig
+from app.models.emotion_backends import create_backend
+from app.utils.metrics import metrics
 
 mongo = PyMongo()
 
@@ -17,25 +17,32 @@ KST = timezone("Asia/Seoul")
 def save_emotion(mongo, user_id, chatroom_id, emotion, confidence):
     """
     감정 데이터를 MongoDB에 저장하는 함수
-    :param mongo: Flask-PyMongo 객체
+    앱 공용 mongo(app.database.mongo)면 쓰기 버퍼로 배치 저장, 다른 객체면 해당 DB에 바로 insert_one
+    :param mongo: Flask-PyMongo 객체 (emotions 컬렉션에 저장)
     :param user_id: 사용자 ID
     :param chatroom_id: 채팅방 ID
     :param emotion: 감정 ('panic', 'happy', 'sadness', 'angry')
     :param confidence: 감정의 신뢰도 (0~1)
     """
     emotion_id = str(uuid.uuid4())
+    document = {
+        "user_id": user_id,
+        "chatroom_id": chatroom_id,
+        "emotion_id": emotion_id,
+        "emotion": emotion,
+        "confidence": confidence,
+        "timestamp": datetime.now(KST),
+    }
 
     try:
-        mongo.db.emotions.insert_one(
-            {
-                "user_id": user_id,
-                "chatroom_id": chatroom_id,
-                "emotion_id": emotion_id,
-                "emotion": emotion,
-                "confidence": confidence,
-                "timestamp": datetime.now(KST),
-            }
-        )
+        from app.database import mongo as app_mongo
+        from app.services.emotion_writer import write_emotion_document
+
+        if mongo is app_mongo:
+            # 요청 스레드에서 insert_one 대신 공용 쓰기 버퍼로 배치 저장
+            write_emotion_document(document)
+        else:
+            mongo.db.emotions.insert_one(document)
         print("감정 데이터 저장 성공!")
     except Exception as e:
         print(f"감정 데이터 저장 실패: {str(e)}")
@@ -44,15 +51,17 @@ def save_emotion(mongo, user_id, chatroom_id, emotion, confidence):
 def load_emotion_model():
     """
     감정 분석 모델을 로드하는 함수
+    설정된 추론 백엔드(keras / tflite / onnx)로 MODEL_PATH의 모델을 로드
+    :return: predict(batch) -> 확률 배열 인터페이스를 가진 백엔드 객체
     """
     try:
         model_path = ActiveConfig.MODEL_PATH
+        backend_name = ActiveConfig.EMOTION_MODEL_BACKEND
 
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
-
-        model = tf.keras.models.load_model(model_path)
-        print(f"모델 로드 성공! ({model_path})")
+        model = create_backend(
+            backend_name, model_path, ActiveConfig.EMOTION_INFERENCE_THREADS
+        )
+        print(f"모델 로드 성공! ({backend_name}: {model_path})")
         return model
 
     except Exception as e:
@@ -60,24 +69,86 @@ def load_emotion_model():
         raise
 
 
-def predict_emotion(image, model):
-    """이미지를 받아 감정 예측을 수행하는 함수"""
-    if image is None:
-        raise ValueError("이미지를 불러올 수 없습니다.")
+# 감정 클래스 정의 (학습 시 클래스 폴더 순서와 동일)
+EMOTION_CLASSES = ["happy", "sadness", "angry", "panic"]
+
+# 모델 입력 크기
+INPUT_SIZE = (224, 224)
+
+
+def preprocess_batch(images):
+    """
+    여러 이미지를 하나의 모델 입력 배치로 전처리하는 함수
+    :param images: OpenCV로 디코딩된 이미지 리스트
+    :return: (N, 224, 224, 3) float32 배열 (0~1 정규화)
+    """
+    batch = np.empty((len(images), INPUT_SIZE[1], INPUT_SIZE[0], 3), dtype=np.float32)
+
+    for i, image in enumerate(images):
+        if image is None:
+            raise ValueError("이미지를 불러올 수 없습니다.")
+        batch[i] = cv2.resize(image, INPUT_SIZE)
+
+    # 정규화 (추가 복사 없이 제자리 연산)
+    np.divide(batch, 255.0, out=batch)
+    return batch
 
-    # 이미지 전처리
-    face_resized = cv2.resize(image, (224, 224))
-    face_array = img_to_array(face_resized)
-    face_array = np.expand_dims(face_array, axis=0) / 255.0  # 정규화
 
-    # 감정 예측
-    predictions = model.predict(face_array)
-    predicted_class = np.argmax(predictions)
-    confidence = np.max(predictions)
+def fused_input_batch(images):
+    """
+    전처리 포함 모델(fused_preprocessing) 입력 배치 - uint8 그대로, float 변환/정규화 복사 없음
+    - 1장 : 디코딩된 버퍼를 (1, H, W, 3) view로 그대로 전달 (리사이즈/채널 변환/정규화는 모델 안에서)
+    - 여러 장이 같은 크기 : 그대로 쌓음
+    - 크기가 다르면 한 번의 forward pass를 위해 uint8로 224x224 리사이즈
+      (모델 안 리사이즈와 차이는 uint8 반올림 0.5/255 이하)
+    :param images: OpenCV로 디코딩된 BGR 이미지 리스트
+    :return: (N, H, W, 3) uint8 배열
+    """
+    for image in images:
+        if image is None:
+            raise ValueError("이미지를 불러올 수 없습니다.")
+
+    if len(images) == 1:
+        return images[0][np.newaxis]
+    if all(image.shape == images[0].shape for image in images):
+        return np.stack(images)
+
+    batch = np.empty((len(images), INPUT_SIZE[1], INPUT_SIZE[0], 3), dtype=np.uint8)
+    for i, image in enumerate(images):
+        cv2.resize(image, INPUT_SIZE, dst=batch[i])
+    return batch
 
-    # 감정 클래스 정의
-    class_names = ["happy", "sadness", "angry", "panic"]
-    emotion_label = class_names[predicted_class]
+
+def predict_emotion_batch(images, model):
+    """
+    여러 이미지를 한 번의 forward pass로 감정 예측하는 함수
+    :param images: OpenCV로 디코딩된 이미지 리스트
+    :param model: 감정 분석 모델 (추론 백엔드)
+    :return: [(감정 라벨, 신뢰도), ...] (입력 순서와 동일)
+    """
+    if not images:
+        return []
+
+    with metrics.timer("emotion.preprocess"):
+        if getattr(model, "fused_preprocessing", False):
+            batch = fused_input_batch(images)
+        else:
+            batch = preprocess_batch(images)
+    with metrics.timer("emotion.inference"):
+        predictions = model.predict(batch)
+    predicted_classes = np.argmax(predictions, axis=1)
+    confidences = np.max(predictions, axis=1)
 
     # confidence를 float으로 변환
-    return emotion_label, float(confidence)
+    return [
+        (EMOTION_CLASSES[int(predicted_class)], float(confidence))
+        for predicted_class, confidence in zip(predicted_classes, confidences)
+    ]
+
+
+def predict_emotion(image, model):
+    """이미지를 받아 감정 예측을 수행하는 함수"""
+    if image is None:
+        raise ValueError("이미지를 불러올 수 없습니다.")
+
+    return predict_emotion_batch([image], model)[0]
@@ -0,0 +1,177 @@
+"""
+# 감정 분류 모델 추론 백엔드
+
+동일한 인터페이스(predict(batch) -> 확률 배열)로 교체 가능한 CPU 추론 백엔드
+- keras  : .keras 모델 (기존 경로)
+- tflite : TFLite 인터프리터 (float16 / int8 양자화 모델)
+- onnx   : ONNX Runtime CPUExecutionProvider
+
+백엔드는 설정(EMOTION_MODEL_BACKEND)으로 선택하며 MODEL_PATH가 해당 백엔드의 모델 파일을 가리킴
+fused_preprocessing이 True인 백엔드는 리사이즈/정규화/채널 변환을 모델 안에서 수행하므로
+(N, H, W, 3) uint8 BGR 프레임을 그대로 입력 (models/face/export_serving_model.py로 생성한 모델)
+"""
+
+import os
+import threading
+
+import numpy as np
+
+
+def _set_tf_threads(num_threads, inter_op_threads=1):
+    """TensorFlow intra/inter-op 스레드 수 지정 (런타임 초기화 전에만 적용 가능)"""
+    import tensorflow as tf
+
+    if not num_threads:
+        return
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+    except RuntimeError as e:
+        print(f"TensorFlow 스레드 설정 건너뜀 (이미 초기화됨): {e}")
+
+
+class KerasBackend:
+    """tf.keras 모델을 그대로 사용하는 기본 백엔드"""
+
+    name = "keras"
+
+    def __init__(self, model):
+        self.model = model
+        # uint8 입력 모델 = 전처리 포함 서빙 모델
+        self.fused_preprocessing = str(model.inputs[0].dtype) == "uint8"
+
+    @classmethod
+    def load(cls, model_path, num_threads=0, inter_op_threads=1):
+        import tensorflow as tf
+
+        _set_tf_threads(num_threads, inter_op_threads)
+        return cls(tf.keras.models.load_model(model_path))
+
+    def predict(self, batch):
+        # model.predict는 호출마다 데이터 어댑터를 만들기 때문에 소량 배치에서는 직접 호출이 더 빠름
+        return np.asarray(self.model(batch, training=False))
+
+
+def _load_tflite_interpreter(model_path, num_threads):
+    """설치된 TFLite 런타임 중 가장 가벼운 것을 선택해 인터프리터 생성"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+
+            Interpreter = tf.lite.Interpreter
+
+    return Interpreter(model_path=model_path, num_threads=num_threads or None)
+
+
+class TFLiteBackend:
+    """TFLite 인터프리터 백엔드 (float32/float16/int8 모델 모두 지원)"""
+
+    name = "tflite"
+    fused_preprocessing = False
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        # 인터프리터는 스레드 안전하지 않음 : 재할당 ~ 입력 기록 ~ 실행 ~ 출력 읽기를 한 번에 보호
+        self._lock = threading.Lock()
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input["shape"][0])
+
+    @classmethod
+    def load(cls, model_path, num_threads=0, inter_op_threads=1):
+        # TFLite 인터프리터는 inter-op 스레드 설정이 없음
+        return cls(_load_tflite_interpreter(model_path, num_threads))
+
+    def _resize(self, batch_size):
+        """입력 배치 크기가 바뀌면 텐서를 재할당"""
+        if batch_size == self._batch_size:
+            return
+        shape = list(self._input["shape"])
+        shape[0] = batch_size
+        self.interpreter.resize_tensor_input(self._input["index"], shape)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = batch_size
+
+    def predict(self, batch):
+        with self._lock:
+            self._resize(len(batch))
+
+            # int8/uint8 양자화 입력이면 float 입력을 양자화
+            input_dtype = self._input["dtype"]
+            if input_dtype in (np.int8, np.uint8):
+                scale, zero_point = self._input["quantization"]
+                info = np.iinfo(input_dtype)
+                batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max)
+            self.interpreter.set_tensor(self._input["index"], batch.astype(input_dtype, copy=False))
+            self.interpreter.invoke()
+
+            # get_tensor는 복사본을 반환하므로 잠금 밖에서 역양자화해도 안전
+            output = self.interpreter.get_tensor(self._output["index"])
+            output_details = self._output
+        if output_details["dtype"] in (np.int8, np.uint8):
+            scale, zero_point = output_details["quantization"]
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+class OnnxBackend:
+    """ONNX Runtime CPU 백엔드"""
+
+    name = "onnx"
+    fused_preprocessing = False
+
+    def __init__(self, session):
+        self.session = session
+        self._input_name = session.get_inputs()[0].name
+
+    @classmethod
+    def load(cls, model_path, num_threads=0, inter_op_threads=1):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = inter_op_threads
+
+        session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        return cls(session)
+
+    def predict(self, batch):
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+BACKENDS = {
+    KerasBackend.name: KerasBackend,
+    TFLiteBackend.name: TFLiteBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def create_backend(backend_name, model_path, num_threads=0, inter_op_threads=1):
+    """
+    설정된 이름으로 추론 백엔드 생성
+    :param backend_name: 'keras', 'tflite', 'onnx'
+    :param model_path: 백엔드에 맞는 모델 파일 경로 (.keras / .tflite / .onnx)
+    :param num_threads: 추론(intra-op) 스레드 수 (0이면 라이브러리 기본값)
+    :param inter_op_threads: inter-op 스레드 수 (num_threads 지정 시에만 적용)
+    """
+    backend_cls = BACKENDS.get(backend_name)
+    if backend_cls is None:
+        raise ValueError(
+            f"지원하지 않는 추론 백엔드입니다: {backend_name} (지원: {', '.join(BACKENDS)})"
+        )
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
+
+    return backend_cls.load(model_path, num_threads, inter_op_threads)
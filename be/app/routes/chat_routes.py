@@ -18,7 +18,7 @@ from app.services.chat_service import (
     modify_response_with_emotion,
     get_chat_end_status_service,
 )
-from app.services.rag_service import preview_rag_search
+from app.services.rag_service import preview_rag_search, rag_stats
 from app.utils.auth import jwt_required_without_bearer, login_required
 import logging
 from app.services.emotion_service import get_emotion_results
@@ -178,6 +178,13 @@ def preview_rag():
     return jsonify({"retrieved_documents": search_results}), 200
 
 
+# RAG 검색 지표 조회
+@chat_bp.route("/rag-metrics", methods=["GET"])
+def rag_metrics():
+    """질의 임베딩 캐시 단계별 적중 수/적중률 조회"""
+    return jsonify(rag_stats())
+
+
 @chat_bp.route("/message/<message_id>", methods=["DELETE"])
 @jwt_required_without_bearer
 def delete_message(message_id):
@@ -262,12 +269,11 @@ def chat_with_emotion():
                 confidence = emotion_data["most_common"]["confidence"]
                 user_message = modify_message_based_on_emotion(user_message, emotion_label)
 
-        # 챗봇 응답 생성
+        # 챗봇 응답 생성 (사용자 메시지로 상담 사례를 한 번 검색해서 프롬프트에 반영)
         bot_response = generate_response(
             user_id=user_id,
             chatroom_id=chatroom_id,
             user_message=user_message,
-            retrieved_context="",
         )
 
         # 감정 반영된 응답 처리 (신뢰도가 0.7 이상인 경우)
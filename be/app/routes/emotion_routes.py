@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
+from flask_sock import Sock
+from flask_jwt_extended import decode_token
 import base64
-import cv2
-import numpy as np
-from app.models.emotion import load_emotion_model, predict_emotion
+import json
+import queue
+import time
+from app.services.emotion_pipeline import predict_frame, pipeline_stats
+from app.services.emotion_writer import emotion_writer
 from app.services.emotion_service import (
+    emotion_aggregator,
+    record_emotion,
     save_emotion_data,
     get_emotion_results,
     delete_emotion_results,
@@ -12,20 +18,80 @@ from app.services.emotion_service import (
     is_authorized,
 )
 from app.utils.auth import jwt_required_without_bearer, login_required
+from app.utils.image import decode_frame, frame_decode_min_side
+from app.utils.metrics import metrics
 import logging
 import uuid
 from bson import ObjectId
+from config.settings import ActiveConfig
 
 
 emotion_bp = Blueprint("emotion", __name__)
-model = load_emotion_model()
+sock = Sock()
+
+# 축소 디코딩 기준 (얼굴 검출 사용 시 분류기 입력인 얼굴 영역 기준)
+DECODE_MIN_SIDE = frame_decode_min_side(
+    ActiveConfig.FRAME_DECODE_MIN_SIDE,
+    ActiveConfig.FACE_DETECTION_ENABLED,
+    ActiveConfig.FRAME_DECODE_FACE_FRACTION,
+)
+
+
+def _predict_and_save(user_id, chatroom_id, image):
+    """디코딩된 프레임의 감정을 예측하고 신뢰도가 70% 이상이면 기록 (집계 윈도우 반영)"""
+    # 감정 예측 (중복 프레임 캐시 → 얼굴 추적 → 분류)
+    result = predict_frame(chatroom_id, image)
+
+    if result["face_detected"]:
+        print(f"예측된 감정: {result['emotion']}, 신뢰도: {result['confidence']}")
+
+        # 신뢰도가 70% 이상인 경우에만 기록
+        if result["confidence"] >= 0.7:
+            with metrics.timer("emotion.persist"):
+                smoothed = record_emotion(user_id, chatroom_id, result["emotion"], result["confidence"])
+            if smoothed is not None:
+                result = {**result, "smoothed": smoothed}
+
+    return result
+
+
+def _prediction_response(user_id, chatroom_id, image):
+    """디코딩된 프레임의 감정을 예측하고 저장 후 응답 생성"""
+    result = _predict_and_save(user_id, chatroom_id, image)
+
+    if not result["face_detected"]:
+        return (
+            jsonify(
+                {
+                    "emotion": None,
+                    "confidence": 0.0,
+                    "face_detected": False,
+                    "message": "얼굴이 감지되지 않았습니다.",
+                }
+            ),
+            200,
+        )
+
+    return (
+        jsonify(
+            {
+                "emotion": result["emotion"],
+                "confidence": result["confidence"],
+                "face_detected": True,
+                "cached": result["cached"],
+                "smoothed": result.get("smoothed"),
+                "message": "감정 분석이 성공적으로 수행되었습니다.",
+            }
+        ),
+        200,
+    )
 
 
 # 감정 예측 API (웹캠 프레임 처리)
 @emotion_bp.route("/predict", methods=["POST"])
 @jwt_required_without_bearer
 def predict():
-    """웹캠 스트림에서 전송된 프레임을 받아 실시간으로 감정을 예측"""
+    """웹캠 스트림에서 전송된 프레임(base64 data URL)을 받아 실시간으로 감정을 예측"""
     try:
         user_id = request.user_id
         chatroom_id = request.json.get("chatroom_id")
@@ -35,40 +101,211 @@ def predict():
             return jsonify({"message": "필수 필드가 누락되었습니다."}), 400
 
         # Base64 디코딩 및 이미지 변환
-        image_data = base64.b64decode(
-            frame_data.split(",")[1]
-        )  # "data:image/jpeg;base64," 부분을 제외하고 디코딩
-        np_array = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(np_array, cv2.IMREAD_COLOR)
+        with metrics.timer("emotion.decode"):
+            image_data = base64.b64decode(
+                frame_data.split(",")[1]
+            )  # "data:image/jpeg;base64," 부분을 제외하고 디코딩
+            image = decode_frame(image_data, DECODE_MIN_SIDE)
 
         if image is None:
             return jsonify({"message": "유효하지 않은 이미지 데이터입니다."}), 400
 
-        # 감정 예측
-        emotion_label, confidence = predict_emotion(image, model)
+        return _prediction_response(user_id, chatroom_id, image)
 
-        print(f"예측된 감정: {emotion_label}, 신뢰도: {confidence}")
+    except Exception as e:
+        logging.error(f"감정 예측 실패: {e}")
+        return jsonify({"error": "감정 예측 실패"}), 500
 
-        # 신뢰도가 70% 이상인 경우에만 저장
-        if confidence >= 0.7:
-            save_emotion_data(user_id, chatroom_id, emotion_label, confidence)
 
-        return (
-            jsonify(
-                {
-                    "emotion": emotion_label,
-                    "confidence": confidence,
-                    "message": "감정 분석이 성공적으로 수행되었습니다.",
-                }
-            ),
-            200,
-        )
+# 감정 예측 API (바이너리 프레임 업로드)
+@emotion_bp.route("/predict-frame", methods=["POST"])
+@jwt_required_without_bearer
+def predict_binary_frame():
+    """
+    원본 JPEG 바이트로 전송된 프레임의 감정을 예측
+    - multipart/form-data : 'frame' 파일 필드 + 'chatroom_id' 폼 필드
+    - application/octet-stream, image/jpeg : 요청 본문 전체가 프레임, chatroom_id는 쿼리 파라미터
+    """
+    try:
+        user_id = request.user_id
+
+        if request.mimetype == "multipart/form-data":
+            chatroom_id = request.form.get("chatroom_id")
+            frame_file = request.files.get("frame")
+            frame_bytes = frame_file.read() if frame_file else None
+        else:
+            chatroom_id = request.args.get("chatroom_id")
+            frame_bytes = request.get_data(cache=False)
+
+        if not all([user_id, chatroom_id, frame_bytes]):
+            return jsonify({"message": "필수 필드가 누락되었습니다."}), 400
+
+        # 요청 버퍼에서 바로 디코딩 (원본이 크면 축소 디코딩)
+        with metrics.timer("emotion.decode"):
+            image = decode_frame(frame_bytes, DECODE_MIN_SIDE)
+
+        if image is None:
+            return jsonify({"message": "유효하지 않은 이미지 데이터입니다."}), 400
+
+        return _prediction_response(user_id, chatroom_id, image)
 
     except Exception as e:
         logging.error(f"감정 예측 실패: {e}")
         return jsonify({"error": "감정 예측 실패"}), 500
 
 
+def _authenticate_stream(ws):
+    """
+    스트림 첫 메시지로 인증 (채팅방당 1회)
+    {"type": "auth", "token": "<JWT>", "chatroom_id": "<채팅방 ID>"}
+    :return: (user_id, chatroom_id) 또는 실패 시 (None, None)
+    """
+    try:
+        message = json.loads(ws.receive(timeout=10) or "{}")
+    except (TypeError, ValueError):
+        message = {}
+
+    token = message.get("token") or ""
+    chatroom_id = message.get("chatroom_id")
+    if token.startswith("Bearer "):
+        token = token[len("Bearer ") :]
+
+    if message.get("type") != "auth" or not token or not chatroom_id:
+        ws.send(json.dumps({"type": "error", "message": "인증 메시지가 필요합니다."}))
+        return None, None
+
+    try:
+        user_id = decode_token(token).get("sub")
+    except Exception:
+        user_id = None
+
+    if not user_id:
+        ws.send(json.dumps({"type": "error", "message": "유효하지 않은 토큰입니다."}))
+        return None, None
+
+    if not is_authorized(user_id, chatroom_id):
+        ws.send(json.dumps({"type": "error", "message": "접근 권한이 없습니다."}))
+        return None, None
+
+    return user_id, chatroom_id
+
+
+# 감정 예측 스트림 (WebSocket)
+@sock.route("/stream", bp=emotion_bp)
+def emotion_stream(ws):
+    """
+    채팅방 단위 WebSocket 감정 예측 스트림
+    1. 첫 메시지로 인증 : {"type": "auth", "token": ..., "chatroom_id": ...}
+    2. 이후 바이너리 메시지 = JPEG 프레임, 예측이 끝날 때마다 결과를 JSON으로 전송
+    3. 스무딩된 대표 감정이 바뀌면 {"type": "emotion_change", ...} 즉시 전송
+    추론이 밀리면 대기 중인 오래된 프레임은 버리고 가장 최근 프레임만 처리
+    """
+    user_id, chatroom_id = _authenticate_stream(ws)
+    if not user_id:
+        return
+
+    # 대표 감정 변경 이벤트 구독 (같은 채팅방의 HTTP 업로드로 인한 변경도 전달)
+    events = queue.SimpleQueue()
+
+    def on_emotion_change(event):
+        if event["chatroom_id"] == chatroom_id:
+            events.put(event)
+
+    if emotion_aggregator is not None:
+        emotion_aggregator.add_listener(on_emotion_change)
+
+    ws.send(json.dumps({"type": "ready", "chatroom_id": chatroom_id}))
+    metrics.incr("stream.sessions")
+    try:
+        _run_stream(ws, user_id, chatroom_id, events)
+    finally:
+        if emotion_aggregator is not None:
+            emotion_aggregator.remove_listener(on_emotion_change)
+
+
+def _send_events(ws, events):
+    """대기 중인 감정 변경 이벤트 전송"""
+    while not events.empty():
+        ws.send(json.dumps(events.get()))
+
+
+def _handle_control(ws, message):
+    """
+    텍스트(제어) 메시지 처리 : ping이면 pong 전송
+    :return: close 요청이면 True
+    """
+    try:
+        control = json.loads(message).get("type")
+    except (ValueError, AttributeError):
+        control = None
+    if control == "ping":
+        ws.send(json.dumps({"type": "pong"}))
+    return control == "close"
+
+
+def _run_stream(ws, user_id, chatroom_id, events):
+    """인증된 스트림의 프레임 수신/예측 루프"""
+    frame_seq = 0
+
+    while True:
+        _send_events(ws, events)
+        message = ws.receive(timeout=1)
+        if message is None:
+            continue
+
+        if isinstance(message, str):
+            if _handle_control(ws, message):
+                return
+            continue
+
+        # 백프레셔: 이미 도착해 있는 더 최신 프레임이 있으면 오래된 프레임은 버림
+        dropped = 0
+        closing = False
+        while True:
+            newer = ws.receive(timeout=0)
+            if newer is None:
+                break
+            if isinstance(newer, bytes):
+                message = newer
+                frame_seq += 1
+                dropped += 1
+            elif _handle_control(ws, newer):
+                # close 이후 프레임은 처리하지 않음 (마지막으로 받은 프레임까지만 예측)
+                closing = True
+                break
+        frame_seq += 1
+        if dropped:
+            metrics.incr("stream.dropped_frames", dropped)
+
+        started = time.perf_counter()
+        try:
+            with metrics.timer("emotion.decode"):
+                image = decode_frame(message, DECODE_MIN_SIDE)
+            if image is None:
+                ws.send(json.dumps({"type": "error", "message": "유효하지 않은 이미지 데이터입니다."}))
+                continue
+            result = _predict_and_save(user_id, chatroom_id, image)
+        except Exception as e:
+            logging.error(f"스트림 감정 예측 실패: {e}")
+            ws.send(json.dumps({"type": "error", "message": "감정 예측 실패"}))
+            continue
+        metrics.observe("stream.frame", time.perf_counter() - started)
+
+        ws.send(
+            json.dumps(
+                {
+                    "type": "prediction",
+                    "frame_seq": frame_seq,
+                    "dropped": dropped,
+                    **result,
+                }
+            )
+        )
+        _send_events(ws, events)
+        if closing:
+            return
+
+
 # 감정 데이터 저장
 @emotion_bp.route("/save-emotion", methods=["POST"])
 @jwt_required_without_bearer
@@ -153,3 +390,15 @@ def emotion_stats():
         return jsonify({"message": "감정 통계 조회 성공", "stats": stats})
     except Exception as e:
         return jsonify({"message": f"오류 발생: {str(e)}"}), 500
+
+
+# 감정 예측 파이프라인 지표 조회
+@emotion_bp.route("/metrics", methods=["GET"])
+def pipeline_metrics():
+    """감정 예측 단계별 소요 시간, 생략된 추론 수, 배칭/추적/캐시/집계/쓰기 버퍼 상태 조회"""
+    stats = pipeline_stats()
+    if emotion_aggregator is not None:
+        stats["aggregation"] = emotion_aggregator.stats()
+    if emotion_writer is not None:
+        stats["write_buffer"] = emotion_writer.stats()
+    return jsonify(stats)
@@ -1,4 +1,5 @@
 from flask import Blueprint, jsonify, current_app
+from app.utils.resources import resources
 
 home_bp = Blueprint("home", __name__)
 
@@ -9,3 +10,13 @@ def home():
     except Exception as e:
         current_app.logger.error(f"Error in home route: {str(e)}")
         raise  
+
+
+@home_bp.route("/ready", methods=["GET"])
+def ready():
+    """
+    준비 상태 확인 (로드 밸런서/오케스트레이터용)
+    필수 리소스(감정 모델, 벡터 DB, LLM)가 모두 로드되었으면 200, 아니면 503
+    """
+    is_ready = resources.ready()
+    return jsonify({"ready": is_ready, "resources": resources.status()}), (200 if is_ready else 503)
@@ -2,8 +2,8 @@ import pymongo
 from bson import ObjectId
 from werkzeug.exceptions import NotFound, BadRequest
 from app.database import mongo
-from app.services.rag_service import retrieve_relevant_documents
-from app.services.llm_service import generate_response
+from app.services.rag_service import format_retrieved_context, retrieve_context_documents
+from app.services.llm_service import generate_chat_reply
 from app.models.chat import save_chat
 from datetime import datetime, timezone, timedelta
 from flask import current_app
@@ -37,21 +37,14 @@ def chat_with_bot(user_id: str, chatroom_id: str, user_message: str, emotion_id=
             raise RuntimeError("MongoDB가 올바르게 초기화되지 않았습니다.")
         
         # RAG 검색 수행 (관련 상담 사례 검색)
-        retrieved_documents = retrieve_relevant_documents(user_message)
+        retrieved_documents = retrieve_context_documents(user_message)
 
-        # 검색 결과 처리
-        if retrieved_documents:
-            retrieved_context = "\n".join(
-                doc.metadata["output"].strip() if "output" in doc.metadata else str(doc)
-                for doc in retrieved_documents
-            )
-            retrieved_status = "반영됨"
-        else:
-            retrieved_context = "상담 기록이 없습니다."
-            retrieved_status = "반영 안 됨"
+        # 검색 결과 처리 (프롬프트에 넣을 상담 사례)
+        retrieved_context = format_retrieved_context(retrieved_documents)
+        retrieved_status = "반영됨" if retrieved_context else "반영 안 됨"
 
-        # LLM을 활용하여 최종 챗봇 응답 생성
-        bot_response, emotion, confidence, emotion_id = generate_response(user_id, chatroom_id, user_message, retrieved_context)
+        # 검색한 상담 사례로 LLM을 한 번 호출해 최종 챗봇 응답 생성 (추가 임베딩/검색 없음)
+        bot_response, emotion, confidence = generate_chat_reply(user_id, chatroom_id, user_message, retrieved_context)
 
         # 대화 내용 저장 (테스트 모드일 경우 DB 저장 건너뜀)
         if not test_mode:
@@ -0,0 +1,124 @@
+"""
+# RAG 검색 결과 후처리 (프롬프트에 넣을 상담 사례 선택)
+
+상담 데이터에는 같은/거의 같은 상담 답변이 많아서 top-k를 그대로 이으면 같은 조언이 프롬프트에 여러 번 들어감
+검색 결과를 넉넉히 가져온 뒤(over-fetch)
+1. 중복 제거 : 상담 답변의 문자 3-gram Jaccard 유사도가 기준 이상이면 같은 사례로 보고 상위 하나만 남김
+2. MMR : 질의 관련도(검색 순위, hybrid면 RRF 순위)와 이미 고른 답변과의 Jaccard 유사도를 함께 고려해서 서로 다른 조언이 먼저 오도록 정렬
+문서 벡터는 상담 질문(input) 임베딩이라 비슷한 질문에 다른 답변이 달린 사례도 코사인 유사도가 거의 1이 됨
+→ 중복/다양성은 프롬프트에 실제로 들어가는 답변 텍스트로 판단하고, 벡터 코사인 중복 기준은 선택 사항(기본 끔)
+3. 토큰 예산 : 상담 답변 토큰 수 합이 예산을 넘지 않을 때까지 k개 선택
+후보가 수십 개 수준이라 MinHash 근사 대신 정확한 Jaccard 유사도를 계산
+"""
+
+import functools
+import unicodedata
+
+import numpy as np
+
+from app.services.lexical_index import char_ngrams
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding(model_name):
+    """tiktoken 인코딩 (사용할 수 없으면 None → 근사 계산)"""
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(model_name)
+    except Exception:
+        return None
+
+
+def count_tokens(text, model_name="gpt-4o-mini"):
+    """
+    LLM 입력 토큰 수
+    tiktoken 인코딩을 쓸 수 없으면 UTF-8 3바이트당 1토큰으로 근사 (한글 1글자 ≈ 1토큰, 약간 크게 잡음)
+    """
+    encoding = _token_encoding(model_name)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return -(-len(text.encode("utf-8")) // 3)
+
+
+def text_shingles(text):
+    """중복 판단용 문자 3-gram 집합 (공백을 모두 지우고 이어 붙인 문자열 기준이라 띄어쓰기 차이 무시)"""
+    compact = "".join(unicodedata.normalize("NFKC", text).split())
+    return set(char_ngrams(compact, (3, 3)))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+def select_context_documents(
+    documents,
+    texts,
+    k=4,
+    vectors=None,
+    duplicate_jaccard=0.8,
+    duplicate_cosine=0.0,
+    mmr_lambda=0.7,
+    token_budget=0,
+    model_name="gpt-4o-mini",
+):
+    """
+    검색 후보에서 프롬프트에 넣을 문서 선택
+    :param documents: 검색 순위 순서의 후보 Document 리스트 (over-fetch 결과)
+    :param texts: 후보별 프롬프트에 들어갈 텍스트 (상담 답변)
+    :param vectors: 후보 벡터 (N, D) (duplicate_cosine을 쓸 때만 필요)
+    :param duplicate_jaccard: 답변 Jaccard 유사도가 이 값 이상이면 중복
+    :param duplicate_cosine: 질문 벡터 코사인 유사도가 이 값 이상이면 중복 (0이면 사용 안 함)
+    :param mmr_lambda: 관련도 가중치 (1이면 관련도만, 0이면 다양성만)
+    :param token_budget: 선택한 텍스트 토큰 수 합 상한 (0이면 제한 없음)
+    :return: (선택한 Document 리스트, 통계 {"candidates", "duplicates", "tokens"})
+    """
+    candidates = [i for i, text in enumerate(texts) if text]
+    shingles = {i: text_shingles(texts[i]) for i in candidates}
+    if vectors is not None:
+        vectors = _normalize(vectors)
+
+    # 1. 중복 제거 (검색 순위가 높은 사례를 남김)
+    kept = []
+    for i in candidates:
+        duplicate = any(
+            jaccard(shingles[i], shingles[j]) >= duplicate_jaccard
+            or (duplicate_cosine and vectors is not None and float(vectors[i] @ vectors[j]) >= duplicate_cosine)
+            for j in kept
+        )
+        if not duplicate:
+            kept.append(i)
+
+    # 2. MMR 정렬 (관련도 = 검색 순위를 0~1로 환산, 벡터/BM25/RRF 점수 척도와 무관)
+    relevance = {i: 1.0 - rank / len(kept) for rank, i in enumerate(kept)}
+
+    ordered, remaining = [], list(kept)
+    while remaining:
+        best = max(
+            remaining,
+            key=lambda i: mmr_lambda * relevance[i]
+            - (1 - mmr_lambda) * max((jaccard(shingles[i], shingles[j]) for j in ordered), default=0.0),
+        )
+        ordered.append(best)
+        remaining.remove(best)
+
+    # 3. 토큰 예산 (예산을 넘는 사례는 건너뛰고 더 짧은 다음 사례 시도, 첫 사례는 항상 포함)
+    selected, tokens = [], 0
+    for i in ordered:
+        if len(selected) >= k:
+            break
+        count = count_tokens(texts[i], model_name)
+        if token_budget and selected and tokens + count > token_budget:
+            continue
+        selected.append(i)
+        tokens += count
+
+    stats = {"candidates": len(candidates), "duplicates": len(candidates) - len(kept), "tokens": tokens}
+    return [documents[i] for i in selected], stats
@@ -1,12 +1,9 @@
-import openai
 from dotenv import load_dotenv
 import os
 import logging
 from app.database import mongo
-from openai import OpenAI, OpenAIError, AuthenticationError, RateLimitError
 
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
 def generate_summary(chatroom_id):
@@ -68,6 +65,9 @@ def generate_summary(chatroom_id):
     일기 형식으로 요약:
     """
 
+    # openai 패키지 import 비용을 앱 시작이 아닌 첫 요약 요청 시점으로 미룸
+    from openai import OpenAI, OpenAIError, AuthenticationError, RateLimitError
+
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     try:
@@ -0,0 +1,222 @@
+"""
+# RAG 질의 임베딩 캐시 (cache-aside)
+
+같은 문장(정규화 기준)을 다시 임베딩하지 않도록 2단계로 캐시
+- 1단계 : 프로세스 내 LRU (OrderedDict)
+- 2단계 : Redis (인증에 쓰는 Redis를 키 접두어로 구분해서 공유, 프로세스/재시작 간 공유)
+키는 임베딩 설정 지문(모델 이름 + 접두어/풀링/차원 등 벡터에 영향을 주는 설정) + 용도(query/document) + 정규화한 텍스트의 해시,
+벡터는 float32 바이트(차원 x 4바이트)로 저장
+정규화는 키에만 사용하고 임베딩은 원래 텍스트로 계산 (캐시 미스 결과 = 캐시 없이 계산한 결과)
+Redis 오류는 캐시 미스로 처리하고 임베딩 API로 진행 (검색 실패로 이어지지 않음),
+오류 후 일정 시간은 Redis 단계를 건너뛰어 연결 타임아웃이 질의마다 반복되지 않게 함
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.utils.metrics import metrics
+
+
+def normalize_text(text):
+    """캐시 키용 텍스트 정규화 (유니코드 NFKC, 앞뒤 공백 제거, 연속 공백을 하나로)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def embedding_model_name(embeddings):
+    """임베딩 객체의 모델 이름 (OpenAIEmbeddings.model 등, 없으면 클래스 이름)"""
+    for attr in ("model", "model_name"):
+        name = getattr(embeddings, attr, None)
+        if isinstance(name, str) and name:
+            return name
+    return type(embeddings).__name__
+
+
+# 같은 모델이라도 벡터가 달라지는 임베딩 설정 (OnnxSentenceEmbeddings / OpenAIEmbeddings 속성)
+_FINGERPRINT_ATTRS = ("query_prefix", "document_prefix", "pooling", "normalize", "max_length", "dimensions")
+
+
+def embedding_fingerprint(embeddings):
+    """
+    캐시 키용 임베딩 설정 지문 : 모델 이름@설정 해시 (설정이 바뀌면 이전 캐시 항목을 쓰지 않음)
+    """
+    config = {"class": type(embeddings).__name__, "model": embedding_model_name(embeddings)}
+    for attr in _FINGERPRINT_ATTRS:
+        value = getattr(embeddings, attr, None)
+        if value is not None:
+            config[attr] = value
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+    return f"{config['model']}@{digest}"
+
+
+class EmbeddingCache:
+    """프로세스 내 LRU + Redis 2단계 임베딩 벡터 저장소"""
+
+    def __init__(
+        self, max_entries=10000, redis_client=None, ttl_seconds=7 * 24 * 3600, key_prefix="emb", retry_seconds=30.0
+    ):
+        """
+        :param max_entries: LRU 최대 항목 수 (0이면 LRU 사용 안 함)
+        :param redis_client: redis.Redis 객체 (None이면 Redis 단계 사용 안 함)
+        :param ttl_seconds: Redis 항목 만료 시간 (0이면 만료 없음)
+        :param key_prefix: Redis 키 접두어 (인증 키와 구분)
+        :param retry_seconds: Redis 오류 후 Redis 단계를 건너뛰는 시간
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.retry_seconds = retry_seconds
+        self._redis_retry_at = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _redis_available(self):
+        return self.redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, action, error):
+        self._redis_retry_at = time.monotonic() + self.retry_seconds
+        metrics.incr("embedding_cache.redis_error")
+        logging.warning(f"임베딩 캐시 Redis {action} 실패 ({self.retry_seconds:.0f}초 동안 건너뜀): {error}")
+
+    def key(self, model_name, kind, text):
+        """캐시 키 : 접두어:모델(설정 지문):용도:정규화 텍스트 SHA-256"""
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{model_name}:{kind}:{digest}"
+
+    def get_many(self, keys):
+        """
+        LRU → Redis 순서로 조회 (Redis에서 찾은 항목은 LRU에도 저장)
+        :param keys: 캐시 키 리스트 (중복 없음)
+        :return: {키: float32 벡터} (찾은 항목만)
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+        metrics.incr("embedding_cache.lru_hit", len(found))
+
+        remaining = [key for key in keys if key not in found]
+        if remaining and self._redis_available():
+            try:
+                values = self.redis.mget(remaining)
+            except Exception as e:
+                self._redis_failed("조회", e)
+                values = [None] * len(remaining)
+
+            from_redis = {
+                key: np.frombuffer(value, dtype=np.float32)
+                for key, value in zip(remaining, values)
+                if value is not None
+            }
+            metrics.incr("embedding_cache.redis_hit", len(from_redis))
+            self._store_local(from_redis)
+            found.update(from_redis)
+
+        metrics.incr("embedding_cache.miss", len(keys) - len(found))
+        return found
+
+    def put_many(self, vectors):
+        """
+        새로 계산한 벡터를 LRU와 Redis에 저장
+        :param vectors: {키: 벡터}
+        """
+        vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in vectors.items()}
+        self._store_local(vectors)
+
+        if vectors and self._redis_available():
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, vector in vectors.items():
+                    pipe.set(key, vector.tobytes(), ex=self.ttl_seconds or None)
+                pipe.execute()
+            except Exception as e:
+                self._redis_failed("저장", e)
+
+    def _store_local(self, vectors):
+        if not self.max_entries:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear_local(self):
+        """프로세스 내 LRU 비우기 (Redis 항목은 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """단계별 적중 수와 적중률, LRU 항목 수"""
+        counters = metrics.snapshot()["counters"]
+        lru_hits = counters.get("embedding_cache.lru_hit", 0)
+        redis_hits = counters.get("embedding_cache.redis_hit", 0)
+        misses = counters.get("embedding_cache.miss", 0)
+        total = lru_hits + redis_hits + misses
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "lru_hits": lru_hits,
+            "redis_hits": redis_hits,
+            "misses": misses,
+            "hit_rate": round((lru_hits + redis_hits) / total, 4) if total else 0.0,
+            "redis_errors": counters.get("embedding_cache.redis_error", 0),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "redis_enabled": self.redis is not None,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 객체를 감싸서 캐시에 없는 텍스트만 원래 임베딩으로 계산 (cache-aside)"""
+
+    def __init__(self, embeddings, cache, model_name=None):
+        """
+        :param embeddings: 실제 임베딩 객체 (OpenAIEmbeddings 등)
+        :param cache: EmbeddingCache
+        :param model_name: 캐시 키에 넣을 모델 이름 (기본값: 임베딩 객체의 설정 지문)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name or embedding_fingerprint(embeddings)
+
+    def embed_query(self, text):
+        """질의 임베딩 (캐시 미스이면 원래 텍스트로 계산 후 저장)"""
+        key = self.cache.key(self.model_name, "query", text)
+        vector = self.cache.get_many([key]).get(key)
+        if vector is None:
+            with metrics.timer("embedding.query"):
+                vector = self.embeddings.embed_query(text)
+            self.cache.put_many({key: vector})
+        return np.asarray(vector, dtype=np.float32).tolist()
+
+    def embed_documents(self, texts):
+        """여러 문서 임베딩 (캐시 미스인 서로 다른 텍스트만 한 번의 배치로 계산)"""
+        keys = [self.cache.key(self.model_name, "document", text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = self.cache.get_many(unique_keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            with metrics.timer("embedding.documents"):
+                computed = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing, computed))
+            self.cache.put_many(computed)
+            found.update({key: np.asarray(vector, dtype=np.float32) for key, vector in computed.items()})
+
+        return [np.asarray(found[key], dtype=np.float32).tolist() for key in keys]
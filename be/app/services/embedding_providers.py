@@ -0,0 +1,220 @@
+"""
+# RAG 임베딩 제공자
+
+rag_service(질의)와 벡터 DB 생성 스크립트(문서)가 같은 설정으로 같은 임베딩 모델을 쓰도록 생성을 한 곳에서 담당
+- openai : OpenAIEmbeddings (기존, 질의마다 네트워크 왕복)
+- onnx : 로컬 모델 디렉토리의 문장 임베딩 모델(다국어/한국어 sentence-transformers 계열)을
+  ONNX Runtime CPU로 실행 (네트워크 왕복 없음, 배치 인코딩, 스레드 수 지정)
+벡터 DB 디렉토리의 embedding.json에 생성에 사용한 임베딩 정보를 기록하고, 로드 시 설정과 다르면 오류
+(질의/문서 벡터가 서로 다른 모델에서 나오면 검색 결과가 무의미해짐)
+"""
+
+import json
+import os
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_INFO_FILE = "embedding.json"
+
+
+class OnnxSentenceEmbeddings(Embeddings):
+    """
+    로컬 ONNX 문장 임베딩 모델
+    모델 디렉토리 구성 : model.onnx (또는 onnx/model.onnx) + tokenizer.json (HuggingFace tokenizers 형식)
+    토큰 임베딩 출력(N, T, H)은 attention mask 기준 평균(또는 CLS) 풀링, 문장 임베딩 출력(N, H)은 그대로 사용
+    """
+
+    def __init__(
+        self,
+        model_dir,
+        batch_size=32,
+        max_length=256,
+        num_threads=0,
+        query_prefix="",
+        document_prefix="",
+        pooling="mean",
+        normalize=True,
+    ):
+        """
+        :param model_dir: 모델 디렉토리
+        :param batch_size: 한 번에 인코딩할 문장 수
+        :param max_length: 최대 토큰 수 (초과분은 잘라냄)
+        :param num_threads: ONNX Runtime intra-op 스레드 수 (0이면 라이브러리 기본값)
+        :param query_prefix: 질의 앞에 붙일 문자열 (e5 계열은 "query: ")
+        :param document_prefix: 문서 앞에 붙일 문자열 (e5 계열은 "passage: ")
+        :param pooling: mean / cls
+        :param normalize: L2 정규화 여부 (정규화하면 L2 거리 순위 = 코사인 유사도 순위)
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = next(
+            (
+                path
+                for path in (os.path.join(model_dir, "model.onnx"), os.path.join(model_dir, "onnx", "model.onnx"))
+                if os.path.exists(path)
+            ),
+            None,
+        )
+        tokenizer_path = os.path.join(model_dir, "tokenizer.json")
+        if model_path is None or not os.path.exists(tokenizer_path):
+            raise FileNotFoundError(f"model.onnx와 tokenizer.json이 있는 모델 디렉토리가 아닙니다: {model_dir}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {item.name for item in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length)
+        self._pad_id = next(
+            (
+                self.tokenizer.token_to_id(token)
+                for token in ("[PAD]", "<pad>")
+                if self.tokenizer.token_to_id(token) is not None
+            ),
+            0,
+        )
+
+        self.model = f"onnx:{os.path.basename(os.path.normpath(model_dir))}"
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.query_prefix = query_prefix
+        self.document_prefix = document_prefix
+        self.pooling = pooling
+        self.normalize = normalize
+
+    def _encode_batch(self, texts):
+        """문장 배치 하나를 (N, H) float32 벡터로"""
+        encodings = self.tokenizer.encode_batch(texts)
+        length = max(len(encoding.ids) for encoding in encodings)
+
+        input_ids = np.full((len(texts), length), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(texts), length), dtype=np.int64)
+        for i, encoding in enumerate(encodings):
+            input_ids[i, : len(encoding.ids)] = encoding.ids
+            attention_mask[i, : len(encoding.ids)] = 1
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        output = self.session.run(None, {name: value for name, value in feeds.items() if name in self._input_names})[0]
+
+        if output.ndim == 3:
+            if self.pooling == "cls":
+                output = output[:, 0]
+            else:
+                mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+                output = (output * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            output = output / np.maximum(np.linalg.norm(output, axis=1, keepdims=True), 1e-12)
+        return output.astype(np.float32)
+
+    def encode(self, texts):
+        """
+        여러 문장을 batch_size씩 인코딩
+        길이가 비슷한 문장끼리 묶어서 패딩 연산을 줄이고 결과는 입력 순서로 되돌림
+        :return: (N, H) float32 배열
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        vectors = [None] * len(texts)
+        for start in range(0, len(texts), self.batch_size):
+            indices = order[start : start + self.batch_size]
+            for index, vector in zip(indices, self._encode_batch([texts[i] for i in indices])):
+                vectors[index] = vector
+        return np.stack(vectors)
+
+    def embed_documents(self, texts):
+        return self.encode([self.document_prefix + text for text in texts]).tolist()
+
+    def embed_query(self, text):
+        return self.encode([self.query_prefix + text])[0].tolist()
+
+
+def create_embedding_provider(
+    provider="openai",
+    model=None,
+    model_dir=None,
+    batch_size=32,
+    max_length=256,
+    num_threads=0,
+    query_prefix="",
+    document_prefix="",
+):
+    """
+    설정된 이름으로 임베딩 객체 생성
+    :param provider: 'openai' 또는 'onnx'
+    :param model: OpenAI 임베딩 모델 이름 (None이면 OpenAIEmbeddings 기본값)
+    :param model_dir: onnx 모델 디렉토리
+    """
+    if provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        return OpenAIEmbeddings(model=model) if model else OpenAIEmbeddings()
+
+    if provider == "onnx":
+        if not model_dir:
+            raise ValueError("onnx 임베딩에는 모델 디렉토리(EMBEDDING_MODEL_DIR)가 필요합니다.")
+        return OnnxSentenceEmbeddings(
+            model_dir,
+            batch_size=batch_size,
+            max_length=max_length,
+            num_threads=num_threads,
+            query_prefix=query_prefix,
+            document_prefix=document_prefix,
+        )
+
+    raise ValueError(f"지원하지 않는 임베딩 제공자입니다: {provider} (지원: openai, onnx)")
+
+
+def embedding_info(embeddings):
+    """벡터 DB와 함께 기록할 임베딩 정보 (제공자, 모델, 접두어)"""
+    if isinstance(embeddings, OnnxSentenceEmbeddings):
+        return {
+            "provider": "onnx",
+            "model": embeddings.model,
+            "query_prefix": embeddings.query_prefix,
+            "document_prefix": embeddings.document_prefix,
+        }
+    return {"provider": "openai", "model": getattr(embeddings, "model", None)}
+
+
+def write_embedding_info(index_dir, embeddings, dimension):
+    """벡터 DB 디렉토리에 embedding.json 저장"""
+    with open(os.path.join(index_dir, EMBEDDING_INFO_FILE), "w", encoding="utf-8") as f:
+        json.dump({**embedding_info(embeddings), "dimension": int(dimension)}, f, ensure_ascii=False, indent=2)
+
+
+def check_embedding_info(index_dir, embeddings):
+    """
+    벡터 DB를 만든 임베딩과 현재 질의 임베딩이 같은지 확인
+    embedding.json이 없는 기존 벡터 DB는 OpenAI 임베딩으로 만든 것으로 간주
+    :raises ValueError: 제공자/모델/접두어가 다른 경우
+    """
+    path = os.path.join(index_dir, EMBEDDING_INFO_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+    else:
+        stored = {"provider": "openai"}
+
+    current = embedding_info(embeddings)
+    mismatched = [
+        key
+        for key in ("provider", "model", "query_prefix", "document_prefix")
+        if key in stored and key in current and stored[key] != current[key]
+    ]
+    if mismatched:
+        raise ValueError(
+            f"벡터 DB 임베딩과 설정된 질의 임베딩이 다릅니다 ({', '.join(mismatched)}): "
+            f"벡터 DB {stored} / 설정 {current} - 같은 설정으로 벡터 DB를 다시 생성하세요."
+        )
+    return stored
@@ -0,0 +1,383 @@
+"""
+# 채팅방별 감정 집계 윈도우
+
+프레임마다 문서를 저장하는 대신 채팅방별로 일정 구간(윈도우)의 예측을 메모리에 모아
+구간이 끝나면 감정별 횟수/평균 신뢰도/시작·종료 시각을 담은 문서 하나로 저장
+- 스무딩 : EMA(감정별 신뢰도 지수이동평균) 또는 최근 N개 프레임 다수결로 현재 대표 감정 계산
+  대표 감정의 confidence는 최근 N개 프레임 중 그 감정 프레임의 원래 신뢰도 평균 (모델 신뢰도와 같은 척도)
+  스무딩 점수(EMA 점수 / 다수결 득표율)는 score로 따로 제공
+- 대표 감정이 바뀌면 윈도우 종료를 기다리지 않고 즉시 변경 이벤트 발생
+- 프레임이 더 이상 들어오지 않는 채팅방의 윈도우는 백그라운드 스레드가 주기적으로 마감
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+
+import pytz
+
+from app.models.emotion import EMOTION_CLASSES
+from app.utils.metrics import metrics
+
+KST = pytz.timezone("Asia/Seoul")
+
+SMOOTHING_METHODS = ("ema", "majority")
+
+
+def _isoformat(timestamp):
+    """epoch 초 → KST ISO 문자열 (기존 emotions 문서의 timestamp 형식)"""
+    return datetime.fromtimestamp(timestamp, KST).isoformat()
+
+
+class _RoomWindow:
+    """채팅방 하나의 열린 윈도우와 스무딩 상태"""
+
+    __slots__ = (
+        "user_id",
+        "started_at",
+        "updated_at",
+        "counts",
+        "confidence_sums",
+        "scores",
+        "votes",
+        "dominant",
+        "dominant_confidence",
+        "dominant_score",
+    )
+
+    def __init__(self, user_id, now, vote_window):
+        self.user_id = user_id
+        self.started_at = now
+        self.updated_at = now
+        self.counts = Counter()
+        self.confidence_sums = Counter()
+        self.scores = dict.fromkeys(EMOTION_CLASSES, 0.0)
+        self.votes = deque(maxlen=vote_window)
+        self.dominant = None
+        self.dominant_confidence = 0.0
+        self.dominant_score = 0.0
+
+    def reset(self, now):
+        """스무딩 상태는 유지하고 집계만 새 윈도우로 초기화"""
+        self.started_at = now
+        self.counts = Counter()
+        self.confidence_sums = Counter()
+
+
+class EmotionAggregator:
+    """채팅방별 감정 예측 스무딩 + 구간 집계"""
+
+    def __init__(
+        self,
+        window_seconds=30.0,
+        smoothing="ema",
+        ema_alpha=0.2,
+        switch_margin=0.1,
+        vote_window=9,
+        on_window=None,
+        idle_seconds=None,
+        sweep_interval=5.0,
+    ):
+        """
+        :param window_seconds: 윈도우 문서 하나가 담는 최대 구간 길이 (초)
+        :param smoothing: 대표 감정 스무딩 방식 ("ema" / "majority")
+        :param ema_alpha: EMA 가중치 (클수록 최신 프레임 반영이 빠름)
+        :param switch_margin: EMA에서 대표 감정을 바꾸려면 새 감정 점수가 기존 대표 감정보다 이만큼 높아야 함
+        :param vote_window: 다수결과 대표 감정 신뢰도 평균에 사용할 최근 프레임 수
+        :param on_window: 윈도우 마감 시 호출되는 저장 함수 (윈도우 문서 dict를 인자로 받음)
+        :param idle_seconds: 이 시간 동안 프레임이 없으면 채팅방 상태 제거 (기본: window_seconds)
+        :param sweep_interval: 만료 윈도우 확인 주기 (초)
+        """
+        if smoothing not in SMOOTHING_METHODS:
+            raise ValueError(f"지원하지 않는 스무딩 방식입니다: {smoothing} (가능한 값: {', '.join(SMOOTHING_METHODS)})")
+
+        self.window_seconds = window_seconds
+        self.smoothing = smoothing
+        self.ema_alpha = ema_alpha
+        self.switch_margin = switch_margin
+        self.vote_window = max(vote_window, 1)
+        self.on_window = on_window
+        self.idle_seconds = idle_seconds if idle_seconds is not None else window_seconds
+        self.sweep_interval = sweep_interval
+
+        self._rooms = OrderedDict()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop_event = threading.Event()
+
+    # 이벤트 구독
+    def add_listener(self, callback):
+        """대표 감정 변경 이벤트 구독 (callback(event))"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # 집계
+    def add(self, user_id, chatroom_id, emotion, confidence, now=None):
+        """
+        프레임 예측 하나를 채팅방 윈도우에 반영
+        :param user_id: 사용자 ID
+        :param chatroom_id: 채팅방 ID
+        :param emotion: 예측 감정
+        :param confidence: 예측 신뢰도 (0~1)
+        :param now: 기준 시각 (epoch 초, 기본값 현재 시각)
+        :return: {"emotion", "confidence", "score", "changed"} - 스무딩된 대표 감정
+            (confidence : 대표 감정 프레임의 평균 신뢰도, score : EMA 점수 또는 다수결 득표율)
+        """
+        now = time.time() if now is None else now
+        closed = []
+        event = None
+
+        with self._lock:
+            room = self._rooms.get(chatroom_id)
+            if room is not None and now - room.started_at >= self.window_seconds:
+                closed.append(self._close(chatroom_id, room))
+                room.reset(now)
+            if room is None:
+                room = _RoomWindow(user_id, now, self.vote_window)
+                self._rooms[chatroom_id] = room
+            self._rooms.move_to_end(chatroom_id)
+
+            room.updated_at = now
+            room.counts[emotion] += 1
+            room.confidence_sums[emotion] += confidence
+
+            dominant, dominant_score = self._smooth(room, emotion, confidence)
+            dominant_confidence = self._dominant_confidence(room, dominant)
+            changed = dominant != room.dominant
+            if changed:
+                event = {
+                    "type": "emotion_change",
+                    "user_id": user_id,
+                    "chatroom_id": chatroom_id,
+                    "emotion": dominant,
+                    "previous": room.dominant,
+                    "confidence": dominant_confidence,
+                    "score": dominant_score,
+                    "timestamp": _isoformat(now),
+                }
+            room.dominant = dominant
+            room.dominant_confidence = dominant_confidence
+            room.dominant_score = dominant_score
+
+        metrics.incr("aggregator.frames")
+        self._persist(closed)
+        if event is not None:
+            metrics.incr("aggregator.dominant_changes")
+            self._emit(event)
+
+        return {
+            "emotion": dominant,
+            "confidence": dominant_confidence,
+            "score": dominant_score,
+            "changed": changed,
+        }
+
+    def _smooth(self, room, emotion, confidence):
+        """스무딩된 (대표 감정, 스무딩 점수) 계산"""
+        room.votes.append((emotion, confidence))
+        if self.smoothing == "majority":
+            votes = Counter(label for label, _ in room.votes)
+            # 동률이면 직전 대표 감정 유지
+            best = max(votes.values())
+            if room.dominant in votes and votes[room.dominant] == best:
+                dominant = room.dominant
+            else:
+                dominant = max(votes, key=votes.get)
+            return dominant, votes[dominant] / len(room.votes)
+
+        alpha = self.ema_alpha
+        for label in room.scores:
+            target = confidence if label == emotion else 0.0
+            room.scores[label] = (1 - alpha) * room.scores[label] + alpha * target
+        dominant = max(room.scores, key=room.scores.get)
+        # 짧은 노이즈 구간에 대표 감정이 흔들리지 않도록 히스테리시스 적용
+        if (
+            room.dominant is not None
+            and room.scores[dominant] < room.scores[room.dominant] + self.switch_margin
+        ):
+            dominant = room.dominant
+        return dominant, room.scores[dominant]
+
+    @staticmethod
+    def _dominant_confidence(room, dominant):
+        """
+        대표 감정의 신뢰도 : 최근 프레임 중 대표 감정 프레임의 원래 신뢰도 평균
+        (히스테리시스로 유지된 대표 감정이 최근 프레임에 없으면 현재 윈도우 평균, 그것도 없으면 직전 값)
+        """
+        confidences = [c for label, c in room.votes if label == dominant]
+        if confidences:
+            return sum(confidences) / len(confidences)
+        if room.counts.get(dominant):
+            return room.confidence_sums[dominant] / room.counts[dominant]
+        return room.dominant_confidence
+
+    def _close(self, chatroom_id, room):
+        """열린 윈도우를 저장용 문서로 변환 (lock 안에서 호출, 마지막 프레임 시각이 종료 시각)"""
+        frames = sum(room.counts.values())
+        mean_confidences = {
+            label: room.confidence_sums[label] / count for label, count in room.counts.items()
+        }
+        emotion = max(room.counts, key=room.counts.get)
+        return {
+            "user_id": room.user_id,
+            "chatroom_id": chatroom_id,
+            "emotion": emotion,
+            "confidence": mean_confidences[emotion],
+            "timestamp": _isoformat(room.updated_at),
+            "window_start": _isoformat(room.started_at),
+            "window_end": _isoformat(room.updated_at),
+            "frames": frames,
+            "counts": dict(room.counts),
+            "mean_confidences": mean_confidences,
+            "mean_confidence": sum(room.confidence_sums.values()) / frames,
+        }
+
+    def _persist(self, documents):
+        for document in documents:
+            metrics.incr("aggregator.windows")
+            if self.on_window is None:
+                continue
+            try:
+                self.on_window(document)
+            except Exception as e:
+                logging.error(f"감정 윈도우 저장 실패 (chatroom_id={document['chatroom_id']}): {e}")
+
+    def _emit(self, event):
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logging.error(f"감정 변경 이벤트 처리 실패: {e}")
+
+    # 조회
+    def current(self, chatroom_id):
+        """
+        채팅방의 현재 스무딩된 대표 감정
+        :return: (emotion, confidence) 또는 집계 중인 윈도우가 없으면 None
+            (confidence는 대표 감정 프레임의 평균 신뢰도, 스무딩 점수는 current_score)
+        """
+        with self._lock:
+            room = self._rooms.get(chatroom_id)
+            if room is None or room.dominant is None:
+                return None
+            return room.dominant, room.dominant_confidence
+
+    def current_score(self, chatroom_id):
+        """채팅방 대표 감정의 스무딩 점수 (EMA 점수 또는 다수결 득표율, 없으면 None)"""
+        with self._lock:
+            room = self._rooms.get(chatroom_id)
+            if room is None or room.dominant is None:
+                return None
+            return room.dominant_score
+
+    def snapshot(self, chatroom_id):
+        """
+        아직 저장되지 않은 열린 윈도우를 문서 형태로 반환 (조회 시 저장된 문서와 합산용)
+        :return: 윈도우 문서 또는 None
+        """
+        with self._lock:
+            room = self._rooms.get(chatroom_id)
+            if room is None or not room.counts:
+                return None
+            return self._close(chatroom_id, room)
+
+    # 마감
+    def flush(self, chatroom_id=None):
+        """
+        열린 윈도우를 즉시 저장 (chatroom_id가 없으면 전체)
+        :return: 저장된 윈도우 수
+        """
+        closed = []
+        with self._lock:
+            targets = [chatroom_id] if chatroom_id is not None else list(self._rooms)
+            for room_id in targets:
+                room = self._rooms.pop(room_id, None)
+                if room is not None and room.counts:
+                    closed.append(self._close(room_id, room))
+        self._persist(closed)
+        return len(closed)
+
+    def discard(self, chatroom_id):
+        """채팅방 상태를 저장 없이 제거 (감정 데이터 삭제 시)"""
+        with self._lock:
+            self._rooms.pop(chatroom_id, None)
+
+    def sweep(self, now=None):
+        """
+        구간이 끝난 윈도우 마감, 유휴 채팅방 상태 제거
+        :return: 저장된 윈도우 수
+        """
+        now = time.time() if now is None else now
+        closed = []
+        with self._lock:
+            for room_id, room in list(self._rooms.items()):
+                idle = now - room.updated_at >= self.idle_seconds
+                expired = now - room.started_at >= self.window_seconds
+                if not (idle or expired):
+                    continue
+                if room.counts:
+                    closed.append(self._close(room_id, room))
+                if idle:
+                    del self._rooms[room_id]
+                else:
+                    room.reset(now)
+        self._persist(closed)
+        return len(closed)
+
+    def start(self):
+        """만료 윈도우 마감용 백그라운드 스레드 시작"""
+        with self._lock:
+            if self._sweeper is not None:
+                return self
+            self._sweeper = threading.Thread(
+                target=self._run, name="emotion-aggregator", daemon=True
+            )
+            self._sweeper.start()
+        return self
+
+    def after_fork(self):
+        """
+        fork된 자식 프로세스에서 호출 (gunicorn preload 등)
+        부모의 집계 상태와 스레드는 버리고 실행 중이었으면 다시 시작
+        """
+        self._rooms = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        running = self._sweeper is not None
+        self._sweeper = None
+        if running:
+            self.start()
+
+    def stop(self):
+        """백그라운드 스레드 종료 후 열린 윈도우 모두 저장"""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(self.sweep_interval + 1)
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logging.error(f"감정 윈도우 마감 실패: {e}")
+
+    def stats(self):
+        """열린 윈도우 수와 집계 설정"""
+        counters = metrics.snapshot()["counters"]
+        with self._lock:
+            open_windows = len(self._rooms)
+        return {
+            "open_windows": open_windows,
+            "frames": counters.get("aggregator.frames", 0),
+            "windows_persisted": counters.get("aggregator.windows", 0),
+            "dominant_changes": counters.get("aggregator.dominant_changes", 0),
+            "window_seconds": self.window_seconds,
+            "smoothing": self.smoothing,
+        }
@@ -0,0 +1,182 @@
+"""
+# 감정 예측 마이크로 배칭 스케줄러
+
+동시에 들어온 웹캠 프레임을 모아 한 번의 배치 forward pass로 처리
+최대 배치 크기 또는 최대 대기 시간 중 먼저 도달하는 조건으로 배치 실행
+각 요청에는 Future로 자신의 예측 결과만 돌려줌
+종료 후 들어온 요청은 워커를 다시 띄우지 않고 호출 스레드에서 바로 예측
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.models.emotion import predict_emotion_batch
+
+
+class EmotionBatchScheduler:
+    """감정 분류 모델 앞단의 프로세스 내 배칭 스케줄러"""
+
+    def __init__(self, model, max_batch_size=8, max_wait_ms=10.0):
+        """
+        :param model: 감정 분석 모델 (predict(batch)를 지원하는 추론 백엔드)
+        :param max_batch_size: 한 번에 실행할 최대 프레임 수
+        :param max_wait_ms: 첫 프레임 도착 후 배치를 채우기 위해 기다리는 최대 시간 (ms)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(max_wait_ms, 0) / 1000.0
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._running = False
+        self._stopped = False
+        self._lock = threading.Lock()  # 시작/종료와 큐 추가 보호 (종료 신호 뒤에 요청이 들어가지 않도록)
+
+        # 배치 통계
+        self._batches = 0
+        self._frames = 0
+
+    def start(self):
+        """백그라운드 배치 워커 시작"""
+        with self._lock:
+            self._stopped = False
+            self._start_locked()
+        return self
+
+    def _start_locked(self):
+        if self._running:
+            return
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="emotion-batcher", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout=None):
+        """워커 종료 (대기 중인 요청은 처리 후 종료, 이후 submit은 호출 스레드에서 바로 예측)"""
+        with self._lock:
+            self._stopped = True
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(None)
+        self._worker.join(timeout)
+
+    def after_fork(self):
+        """
+        fork된 자식 프로세스에서 호출 (gunicorn preload 등)
+        부모의 워커 스레드는 복제되지 않으므로 큐/락을 새로 만들고 실행 중이었으면 다시 시작
+        """
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        running = self._running
+        self._running = False
+        self._worker = None
+        if running:
+            self.start()
+
+    def submit(self, image):
+        """
+        프레임을 배치 큐에 넣고 Future를 반환
+        :param image: OpenCV로 디코딩된 이미지
+        :return: (감정 라벨, 신뢰도)로 완료되는 Future
+        """
+        if image is None:
+            raise ValueError("이미지를 불러올 수 없습니다.")
+
+        future = Future()
+        with self._lock:
+            if not self._stopped:
+                self._start_locked()
+                self._queue.put((image, future))
+                return future
+
+        # 종료 후 : 워커를 다시 띄우지 않고 호출 스레드에서 예측
+        self._process([(image, future)])
+        return future
+
+    def predict(self, image, timeout=None):
+        """프레임 하나를 배치 경로로 예측하고 결과를 기다림"""
+        return self.submit(image).result(timeout)
+
+    def stats(self):
+        """배치 처리 통계 반환"""
+        batches = self._batches
+        return {
+            "batches": batches,
+            "frames": self._frames,
+            "avg_batch_size": (self._frames / batches) if batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+    def _collect(self, first):
+        """첫 요청 이후 최대 배치 크기 또는 최대 대기 시간까지 요청을 모음"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                # 종료 신호는 현재 배치를 처리한 뒤 반영
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _process(self, batch):
+        """(이미지, Future) 배치를 한 번에 예측하고 각 Future 완료"""
+        images = [image for image, _ in batch]
+        futures = [future for _, future in batch]
+
+        try:
+            results = predict_emotion_batch(images, self.model)
+        except Exception as e:
+            logging.error(f"배치 감정 예측 실패: {e}")
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._frames += len(batch)
+
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def _drain(self):
+        """종료 시 큐에 남은 요청을 모두 처리 (stop이 잠금 안에서 종료 신호를 넣으므로 이후 추가 요청 없음)"""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                batch.append(item)
+        for start in range(0, len(batch), self.max_batch_size):
+            self._process(batch[start : start + self.max_batch_size])
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                if not self._running:
+                    self._drain()
+                    return
+                continue
+
+            self._process(self._collect(item))
@@ -0,0 +1,139 @@
+"""
+# 웹캠 프레임 감정 예측 파이프라인
+
+디코딩된 프레임 하나에 대해
+1. 근접 중복 프레임 확인 (채팅방별 예측 캐시)
+2. 얼굴 위치 추정/추적 (얼굴이 없으면 분류 생략)
+3. 감정 분류 (추론 워커 풀, 배칭 스케줄러 또는 직접 예측)
+순서로 처리. HTTP/스트리밍 엔드포인트가 같은 경로를 공유
+"""
+
+import os
+
+from app.models.emotion import load_emotion_model, predict_emotion
+from app.services.emotion_batcher import EmotionBatchScheduler
+from app.services.face_tracker import FaceTracker
+from app.services.frame_cache import PredictionCache, frame_signature
+from app.services.inference_pool import inference_pool
+from app.utils.metrics import metrics
+from app.utils.resources import resources
+from config.settings import ActiveConfig
+
+# 감정 모델과 배칭 스케줄러 (리소스 레지스트리로 첫 사용 또는 백그라운드 워밍 시 생성)
+model = None
+batch_scheduler = None
+
+
+def _load_classifier():
+    """
+    감정 분류기 준비
+    process 모드는 워커 풀 시작 (워커 프로세스가 모델을 가지므로 웹 프로세스에서는 로드하지 않음)
+    그 외에는 모델 로드 + 동시 요청 프레임을 모아 배치로 예측하는 스케줄러 시작
+    """
+    global model, batch_scheduler
+
+    if inference_pool is not None:
+        return inference_pool.start()
+
+    model = load_emotion_model()
+    if ActiveConfig.EMOTION_BATCHING_ENABLED:
+        batch_scheduler = EmotionBatchScheduler(
+            model,
+            max_batch_size=ActiveConfig.EMOTION_BATCH_MAX_SIZE,
+            max_wait_ms=ActiveConfig.EMOTION_BATCH_MAX_WAIT_MS,
+        ).start()
+        # 마스터에서 미리 로드한 뒤 fork된 워커는 스케줄러 스레드를 다시 시작
+        os.register_at_fork(after_in_child=batch_scheduler.after_fork)
+    return model
+
+
+classifier_resource = resources.register("emotion_model", _load_classifier)
+
+# 채팅방별 얼굴 위치 추적기 (얼굴이 없는 프레임은 분류기 호출 생략)
+face_tracker = (
+    FaceTracker(
+        detect_every=ActiveConfig.FACE_DETECT_EVERY_N_FRAMES,
+        detect_width=ActiveConfig.FACE_DETECT_WIDTH,
+        track_threshold=ActiveConfig.FACE_TRACK_THRESHOLD,
+    )
+    if ActiveConfig.FACE_DETECTION_ENABLED
+    else None
+)
+
+# 채팅방별 직전 프레임 예측 캐시 (거의 같은 프레임이면 재사용)
+prediction_cache = (
+    PredictionCache(
+        max_distance=ActiveConfig.FRAME_CACHE_MAX_DISTANCE,
+        ttl_seconds=ActiveConfig.FRAME_CACHE_TTL_SECONDS,
+        max_entries=ActiveConfig.FRAME_CACHE_MAX_ENTRIES,
+    )
+    if ActiveConfig.FRAME_CACHE_ENABLED
+    else None
+)
+
+
+def _classify(chatroom_id, image):
+    """얼굴 단계 + 분류 단계 실행"""
+    if face_tracker is not None:
+        with metrics.timer("emotion.face"):
+            face_box = face_tracker.locate(chatroom_id, image)
+        if face_box is None:
+            metrics.incr("emotion.skipped_no_face")
+            return {"emotion": None, "confidence": 0.0, "face_detected": False}
+        image = face_tracker.crop(image, face_box)
+
+    # 감정 예측 (process 모드는 워커 풀, 배칭 활성화 시 스케줄러 경유)
+    classifier = classifier_resource.get()
+    with metrics.timer("emotion.classify"):
+        if inference_pool is not None:
+            emotion_label, confidence = inference_pool.predict(image)
+        elif batch_scheduler is not None:
+            emotion_label, confidence = batch_scheduler.predict(image)
+        else:
+            emotion_label, confidence = predict_emotion(image, classifier)
+    metrics.incr("emotion.classified")
+
+    return {"emotion": emotion_label, "confidence": confidence, "face_detected": True}
+
+
+def predict_frame(chatroom_id, image):
+    """
+    디코딩된 웹캠 프레임의 감정 예측
+    :param chatroom_id: 채팅방 ID (추적/캐시 키)
+    :param image: OpenCV BGR 이미지
+    :return: {"emotion", "confidence", "face_detected", "cached"}
+    """
+    if image is None:
+        raise ValueError("이미지를 불러올 수 없습니다.")
+
+    metrics.incr("emotion.frames")
+
+    signature = None
+    if prediction_cache is not None:
+        with metrics.timer("emotion.frame_hash"):
+            signature = frame_signature(image)
+        cached = prediction_cache.lookup(chatroom_id, signature)
+        if cached is not None:
+            metrics.incr("emotion.skipped_duplicate")
+            return {**cached, "cached": True}
+
+    result = _classify(chatroom_id, image)
+
+    if prediction_cache is not None:
+        prediction_cache.store(chatroom_id, signature, result)
+
+    return {**result, "cached": False}
+
+
+def pipeline_stats():
+    """파이프라인 단계별 지표와 워커 풀/배칭/추적/캐시 상태"""
+    snapshot = metrics.snapshot()
+    if inference_pool is not None:
+        snapshot["inference_pool"] = inference_pool.stats()
+    if batch_scheduler is not None:
+        snapshot["batching"] = batch_scheduler.stats()
+    if face_tracker is not None:
+        snapshot["face_tracking"] = face_tracker.stats()
+    if prediction_cache is not None:
+        snapshot["frame_cache"] = prediction_cache.stats()
+    return snapshot
@@ -1,6 +1,15 @@
 from datetime import datetime
 import pytz  # KST 정의를 위해 추가
 from app.database import mongo
+from app.services.emotion_aggregator import EmotionAggregator
+from app.services.emotion_writer import (
+    emotion_writer,
+    pending_emotion_documents,
+    write_emotion_document,
+)
+from config.settings import ActiveConfig
+import atexit
+import os
 import uuid
 import logging
 from bson import ObjectId
@@ -9,6 +18,82 @@ from bson import ObjectId
 KST = pytz.timezone("Asia/Seoul")
 
 
+def save_emotion_window(document):
+    """
+    마감된 감정 집계 윈도우를 MongoDB에 저장
+    :param document: EmotionAggregator가 만든 윈도우 문서
+    """
+    document = {**document, "emotion_id": str(uuid.uuid4())}
+    write_emotion_document(document)
+
+
+# 채팅방별 감정 집계기 (윈도우 단위 저장 + 대표 감정 변경 이벤트)
+emotion_aggregator = (
+    EmotionAggregator(
+        window_seconds=ActiveConfig.EMOTION_WINDOW_SECONDS,
+        smoothing=ActiveConfig.EMOTION_SMOOTHING,
+        ema_alpha=ActiveConfig.EMOTION_EMA_ALPHA,
+        switch_margin=ActiveConfig.EMOTION_SWITCH_MARGIN,
+        vote_window=ActiveConfig.EMOTION_VOTE_WINDOW,
+        on_window=save_emotion_window,
+    ).start()
+    if ActiveConfig.EMOTION_AGGREGATION_ENABLED
+    else None
+)
+
+if emotion_aggregator is not None:
+    # 종료 시 열린 윈도우 저장
+    atexit.register(emotion_aggregator.stop)
+    os.register_at_fork(after_in_child=emotion_aggregator.after_fork)
+
+
+def record_emotion(user_id, chatroom_id, emotion, confidence):
+    """
+    프레임 예측 결과 기록
+    집계 활성화 시 채팅방 윈도우에 반영하고, 비활성화 시 기존처럼 프레임마다 저장
+    :param user_id: 사용자 ID
+    :param chatroom_id: 채팅방 ID
+    :param emotion: 예측 감정
+    :param confidence: 예측 신뢰도 (0~1)
+    :return: 스무딩된 대표 감정 {"emotion", "confidence", "changed"} 또는 집계 비활성화 시 None
+    """
+    if ActiveConfig.EMOTION_DEBUG_RAW_FRAMES:
+        # 디버그용 프레임별 원본 (집계 문서와 섞이지 않도록 별도 컬렉션)
+        try:
+            mongo.db.emotion_frames.insert_one(
+                {
+                    "user_id": user_id,
+                    "chatroom_id": chatroom_id,
+                    "emotion": emotion,
+                    "confidence": confidence,
+                    "timestamp": datetime.now(KST).isoformat(),
+                }
+            )
+        except Exception as e:
+            logging.error(f"프레임 감정 데이터 저장 오류: {e}")
+
+    if emotion_aggregator is None:
+        save_emotion_data(user_id, chatroom_id, emotion, confidence)
+        return None
+
+    return emotion_aggregator.add(user_id, chatroom_id, emotion, confidence)
+
+
+def _emotion_counts(emotion_data):
+    """
+    감정 문서 하나의 감정별 (횟수, 신뢰도 합)
+    윈도우 문서는 counts/mean_confidences, 프레임 문서는 1건으로 계산
+    """
+    counts = emotion_data.get("counts")
+    if not counts:
+        return {emotion_data["emotion"]: (1, emotion_data["confidence"])}
+    means = emotion_data.get("mean_confidences", {})
+    return {
+        emotion: (count, means.get(emotion, emotion_data["confidence"]) * count)
+        for emotion, count in counts.items()
+    }
+
+
 def save_emotion_data(user_id, chatroom_id, emotion, confidence):
     """
     감정 데이터를 MongoDB에 저장
@@ -26,7 +111,8 @@ def save_emotion_data(user_id, chatroom_id, emotion, confidence):
     try:
         kst_now = datetime.now(KST)
 
-        result = mongo.db.emotions.insert_one(
+        # 쓰기 버퍼 경유 (배치 저장, _id는 미리 생성)
+        inserted_id = write_emotion_document(
             {
                 "user_id": user_id,
                 "chatroom_id": chatroom_id,
@@ -41,7 +127,8 @@ def save_emotion_data(user_id, chatroom_id, emotion, confidence):
             "emotion": emotion,
             "confidence": confidence,
             "emotion_id": emotion_id,
-            "inserted_id": str(result.inserted_id),
+            # 쓰기 버퍼 한도 초과로 버려진 경우 None
+            "inserted_id": str(inserted_id) if inserted_id is not None else None,
         }
     except Exception as e:
         logging.error(f"감정 데이터 저장 오류: {e}")
@@ -69,23 +156,34 @@ def get_emotion_results(chatroom_id, user_id):
                 "emotions": [],
                 "most_common": {"emotion": "neutral", "confidence": 0.5},
             }
-        emotions_cursor = mongo.db.emotions.find({"chatroom_id": chatroom_id})
+        # 쓰기 버퍼에서 아직 저장되지 않은 문서와 열린 윈도우도 포함
+        # (버퍼를 먼저 읽고, 그 사이 저장된 문서는 _id로 중복 제거)
+        pending_docs = pending_emotion_documents(chatroom_id)
+        emotion_docs = list(mongo.db.emotions.find({"chatroom_id": chatroom_id}))
+        stored_ids = {doc["_id"] for doc in emotion_docs}
+        emotion_docs.extend(doc for doc in pending_docs if doc["_id"] not in stored_ids)
+        if emotion_aggregator is not None:
+            open_window = emotion_aggregator.snapshot(chatroom_id)
+            if open_window is not None:
+                emotion_docs.append(open_window)
+
         emotions = []
         emotion_counts = {}
         total_confidence = {}
-        for emotion_data in emotions_cursor:
-            emotion = emotion_data["emotion"]
-            confidence = emotion_data["confidence"]
-            timestamp = emotion_data["timestamp"]
-            emotions.append(
-                {"emotion": emotion, "confidence": confidence, "timestamp": timestamp}
-            )
-            if emotion in emotion_counts:
-                emotion_counts[emotion] += 1
-                total_confidence[emotion] += confidence
-            else:
-                emotion_counts[emotion] = 1
-                total_confidence[emotion] = confidence
+        for emotion_data in emotion_docs:
+            entry = {
+                "emotion": emotion_data["emotion"],
+                "confidence": emotion_data["confidence"],
+                "timestamp": emotion_data["timestamp"],
+            }
+            if "counts" in emotion_data:
+                entry["counts"] = emotion_data["counts"]
+                entry["window_start"] = emotion_data.get("window_start")
+            emotions.append(entry)
+
+            for emotion, (count, confidence_sum) in _emotion_counts(emotion_data).items():
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + count
+                total_confidence[emotion] = total_confidence.get(emotion, 0) + confidence_sum
         if emotion_counts:
             most_common_emotion = max(emotion_counts, key=emotion_counts.get)
             avg_confidence = (
@@ -116,6 +214,10 @@ def delete_emotion_results(chatroom_id):
     :param chatroom_id: 채팅방 ID
     """
     try:
+        if emotion_aggregator is not None:
+            emotion_aggregator.discard(chatroom_id)
+        if emotion_writer is not None:
+            emotion_writer.discard(chatroom_id)
         result = mongo.db.emotions.delete_many({"chatroom_id": chatroom_id})
         return result.deleted_count > 0  # 삭제된 문서 수 확인
     except Exception as e:
@@ -129,7 +231,9 @@ def get_most_common_emotion(emotion_data):
     """
     emotion_counts = {"happy": 0, "sadness": 0, "angry": 0, "panic": 0}
     for data in emotion_data:
-        emotion_counts[data["emotion"]] += 1
+        counts = data.get("counts") or {data["emotion"]: 1}
+        for emotion, count in counts.items():
+            emotion_counts[emotion] += count
     most_common = max(emotion_counts, key=emotion_counts.get)
     return {"emotion": most_common, "confidence": emotion_counts[most_common]}
 
@@ -173,7 +277,8 @@ def get_emotion_statistics(user_id, start_date, end_date):
         trend_data = []
 
         for emotion in emotions:
-            emotion_counts[emotion["emotion"]] += 1
+            for label, (count, _) in _emotion_counts(emotion).items():
+                emotion_counts[label] += count
             trend_data.append(
                 {
                     "date": emotion["timestamp"].split("T")[0],  
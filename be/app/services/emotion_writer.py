@@ -0,0 +1,568 @@
+"""
+# 감정 문서 write-behind 버퍼
+
+요청 스레드에서 insert_one을 바로 호출하지 않고 문서를 큐에 넣은 뒤
+백그라운드 스레드가 배치 크기 또는 최대 대기 시간에 도달하면 insert_many(ordered=False)로 저장
+- 저장되지 않은 문서(큐 + 저장 중 + 재시도 대기) 수가 한도에 도달하면 put이 대기(백프레셔)하고,
+  대기 시간을 넘기면 문서를 버림 (요청 스레드에서 직접 저장하지 않음)
+- 아직 저장되지 않은 문서는 채팅방별로 보관해서 같은 채팅방 조회 시 함께 반환 (read-your-writes)
+- 일시적 오류로 저장에 실패한 문서는 pending에 남겨 두고 지수 백오프 후 최대 max_retries번 다시 저장
+  (_id를 미리 만들기 때문에 이미 저장된 문서의 재시도는 중복 키 오류 → 저장된 것으로 처리)
+- 검증 오류 등 다시 시도해도 실패할 문서는 로그를 남기고 바로 포기
+- 종료 시 남은 문서를 모두 저장, 종료 후 put은 요청 스레드에서 직접 저장
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.database import mongo
+from app.utils.metrics import metrics
+from config.settings import ActiveConfig
+
+# 이미 저장된 문서를 다시 저장할 때의 오류 코드
+DUPLICATE_KEY_ERROR = 11000
+
+# 다시 시도하면 성공할 수 있는 쓰기 오류 코드 (그 외 writeErrors는 영구 실패로 처리)
+TRANSIENT_WRITE_ERRORS = frozenset(
+    {
+        6,  # HostUnreachable
+        7,  # HostNotFound
+        50,  # MaxTimeMSExpired
+        89,  # NetworkTimeout
+        91,  # ShutdownInProgress
+        112,  # WriteConflict
+        189,  # PrimarySteppedDown
+        262,  # ExceededTimeLimit
+        9001,  # SocketException
+        10107,  # NotWritablePrimary
+        11600,  # InterruptedAtShutdown
+        11602,  # InterruptedDueToReplStateChange
+        13435,  # NotPrimaryNoSecondaryOk
+        13436,  # NotPrimaryOrSecondary
+    }
+)
+
+
+class _FlushRequest:
+    """즉시 저장 요청 (처리 완료 시 event 설정)"""
+
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+class EmotionWriteBuffer:
+    """MongoDB 컬렉션 앞단의 write-behind 버퍼"""
+
+    def __init__(
+        self,
+        get_collection,
+        max_batch_size=100,
+        flush_interval_ms=1000.0,
+        max_queue_size=10000,
+        put_timeout_ms=1000.0,
+        retry_initial_ms=500.0,
+        retry_max_ms=30000.0,
+        max_retries=10,
+        sync_retries=3,
+    ):
+        """
+        :param get_collection: 저장 대상 컬렉션을 반환하는 함수 (앱 초기화 이후 연결되는 mongo.db 대응)
+        :param max_batch_size: insert_many 한 번에 저장할 최대 문서 수
+        :param flush_interval_ms: 첫 문서가 들어온 뒤 배치를 저장하기까지 최대 대기 시간 (ms)
+        :param max_queue_size: 저장되지 않은 문서 최대 수 (큐 + 저장 중 + 재시도 대기, 초과 시 put 대기)
+        :param put_timeout_ms: 한도에 도달했을 때 put이 기다리는 최대 시간 (초과 시 문서를 버림)
+        :param retry_initial_ms: 저장 실패 문서의 첫 재시도 대기 시간 (실패가 이어지면 2배씩 증가)
+        :param retry_max_ms: 재시도 대기 시간 상한
+        :param max_retries: 일시적 오류로 실패한 문서의 최대 재시도 횟수 (초과 시 포기)
+        :param sync_retries: 워커 없이 저장할 때(종료 시/종료 후) 재시도 횟수
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+
+        self.get_collection = get_collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = max(flush_interval_ms, 0) / 1000.0
+        self.put_timeout = max(put_timeout_ms, 0) / 1000.0
+        self.retry_initial = max(retry_initial_ms, 0) / 1000.0
+        self.retry_max = max(retry_max_ms, retry_initial_ms, 0) / 1000.0
+        self.max_retries = max(max_retries, 0)
+        self.sync_retries = sync_retries
+        self.max_queue_size = max(max_queue_size, 1)
+
+        # 한도는 pending 문서 수로 적용하므로 큐 자체는 크기 제한 없음
+        self._queue = queue.Queue()
+        self._pending = {}  # chatroom_id -> OrderedDict(seq -> 문서)
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        # pending 문서가 줄어들면 알림 (한도에 걸려 대기 중인 put)
+        self._capacity = threading.Condition(self._pending_lock)
+        # 저장 실패 후 재시도 대기 중인 (seq, 문서)와 seq별 재시도 횟수 (_pending_lock으로 보호)
+        self._retry = []
+        self._attempts = {}
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._seq = count()
+        self._worker = None
+        self._running = False
+        self._stopped = False
+        self._lock = threading.Lock()
+
+        # 배치 통계 (_stats_lock으로 보호)
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._documents = 0
+        self._max_batch = 0
+        self._sync_writes = 0
+        self._failed = 0
+        self._retried = 0
+        self._dropped = 0
+        self._given_up = 0
+
+    def start(self):
+        """백그라운드 저장 워커 시작"""
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+            self._stopped = False
+            self._worker = threading.Thread(
+                target=self._run, name="emotion-writer", daemon=True
+            )
+            self._worker.start()
+        return self
+
+    def stop(self, timeout=10.0):
+        """워커 종료 (큐에 남은 문서는 모두 저장 후 종료, 이후 put은 직접 저장)"""
+        with self._lock:
+            self._stopped = True
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        self._worker.join(timeout)
+        # 워커가 큐를 비운 뒤 들어온 문서도 저장
+        self._drain()
+
+    def after_fork(self):
+        """
+        fork된 자식 프로세스에서 호출 (gunicorn preload 등)
+        부모의 워커 스레드는 복제되지 않으므로 큐/락을 새로 만들고 실행 중이었으면 다시 시작
+        """
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._capacity = threading.Condition(self._pending_lock)
+        self._retry = []
+        self._attempts = {}
+        self._retry_delay = 0.0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        running = self._running
+        self._running = False
+        self._worker = None
+        if running:
+            self.start()
+
+    def put(self, document):
+        """
+        문서를 저장 큐에 추가
+        :param document: 저장할 문서 (_id가 없으면 미리 생성해서 호출자가 ID를 바로 알 수 있게 함)
+        :return: 문서의 _id (한도 초과로 버려지면 None)
+        """
+        document.setdefault("_id", ObjectId())
+        if not self._running and not self._stopped:
+            self.start()
+
+        seq = next(self._seq)
+        chatroom_id = document.get("chatroom_id")
+        with self._capacity:
+            # 저장되지 않은 문서가 한도에 도달하면 대기 (MongoDB 장애 중 메모리 증가 방지)
+            # 요청 스레드에서 직접 저장하면 장애 시 요청마다 서버 선택 시간 초과만큼 막히므로 버림
+            if not self._stopped and not self._capacity.wait_for(
+                lambda: self._pending_count < self.max_queue_size, self.put_timeout
+            ):
+                dropped = True
+            else:
+                dropped = False
+                self._pending.setdefault(chatroom_id, OrderedDict())[seq] = document
+                self._pending_count += 1
+        if dropped:
+            metrics.incr("emotion_writer.dropped")
+            self._count(dropped=1)
+            return None
+
+        if self._stopped:
+            # 종료 후에는 워커를 다시 띄우지 않고 요청 스레드에서 직접 저장
+            self._count(sync_writes=1)
+            self._write_sync([(seq, document)])
+            return document["_id"]
+
+        self._queue.put((seq, document))
+        return document["_id"]
+
+    def flush(self, timeout=None):
+        """
+        큐에 쌓인 문서를 즉시 저장하고 완료까지 대기 (재시도 대기 중인 문서도 바로 한 번 시도)
+        :return: 시간 내에 완료되면 True
+        """
+        if not self._running:
+            return True
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.event.wait(timeout)
+
+    def pending(self, chatroom_id, user_id=None):
+        """
+        아직 저장되지 않은 채팅방 문서 목록 (저장 순서)
+        :param chatroom_id: 채팅방 ID
+        :param user_id: 지정 시 해당 사용자 문서만 반환
+        """
+        with self._pending_lock:
+            documents = list(self._pending.get(chatroom_id, {}).values())
+        if user_id is not None:
+            documents = [d for d in documents if d.get("user_id") == user_id]
+        return documents
+
+    def discard(self, chatroom_id):
+        """
+        채팅방의 저장 대기 문서 취소 (채팅방 감정 데이터 삭제 시)
+        이미 insert_many 중인 문서는 저장이 끝난 뒤 워커가 다시 삭제
+        """
+        with self._capacity:
+            room = self._pending.pop(chatroom_id, None)
+            if room:
+                self._release(room)
+
+    def stats(self):
+        """배치 저장 통계"""
+        with self._stats_lock:
+            batches, documents = self._batches, self._documents
+            max_batch, sync_writes = self._max_batch, self._sync_writes
+            failed, retried = self._failed, self._retried
+            dropped, given_up = self._dropped, self._given_up
+        with self._pending_lock:
+            pending = self._pending_count
+            retrying = len(self._retry)
+        return {
+            "batches": batches,
+            "documents": documents,
+            "avg_batch_size": round(documents / batches, 2) if batches else 0.0,
+            "max_batch_size_seen": max_batch,
+            "queue_depth": self._queue.qsize(),
+            "pending": pending,
+            "retrying": retrying,
+            "sync_writes": sync_writes,
+            "failed": failed,
+            "retried": retried,
+            "dropped": dropped,
+            "given_up": given_up,
+            "max_queue_size": self.max_queue_size,
+            "max_batch_size": self.max_batch_size,
+            "flush_interval_ms": self.flush_interval * 1000.0,
+        }
+
+    def _count(self, batches=0, documents=0, sync_writes=0, failed=0, retried=0, dropped=0, given_up=0):
+        with self._stats_lock:
+            self._batches += batches
+            self._documents += documents
+            self._max_batch = max(self._max_batch, documents if batches else 0)
+            self._sync_writes += sync_writes
+            self._failed += failed
+            self._retried += retried
+            self._dropped += dropped
+            self._given_up += given_up
+
+    def _release(self, items):
+        """pending에서 빠진 문서 수만큼 한도 반환 (_capacity를 잡은 상태에서 호출)"""
+        for seq in items:
+            self._attempts.pop(seq, None)
+        self._pending_count -= len(items)
+        self._capacity.notify_all()
+
+    def _remove_pending(self, items):
+        """
+        (seq, 문서)를 pending에서 제거 (_capacity를 잡은 상태에서 호출)
+        :return: 그 사이 discard되어 이미 없던 문서의 (seq, 문서) 리스트
+        """
+        removed, missing = [], []
+        for seq, document in items:
+            chatroom_id = document.get("chatroom_id")
+            room = self._pending.get(chatroom_id)
+            if room is None or seq not in room:
+                missing.append((seq, document))
+                continue
+            del room[seq]
+            if not room:
+                del self._pending[chatroom_id]
+            removed.append(seq)
+        if removed:
+            self._release(removed)
+        return missing
+
+    def _give_up(self, items, reason):
+        """다시 저장하지 않을 문서를 pending에서 제거하고 로그 기록"""
+        with self._capacity:
+            self._remove_pending(items)
+        self._count(given_up=len(items))
+        metrics.incr("emotion_writer.given_up", len(items))
+        logging.error(f"감정 데이터 {len(items)}건 저장 포기 ({reason})")
+
+    def _collect(self, first):
+        """
+        배치 크기 또는 최대 대기 시간까지 문서를 모음
+        :return: (배치, 처리 후 완료 처리할 flush 요청 또는 None, 종료 여부)
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                return batch, None, True
+            if isinstance(item, _FlushRequest):
+                return batch, item, False
+            batch.append(item)
+
+        return batch, None, False
+
+    def _write(self, batch):
+        """
+        배치 저장 (삭제로 취소된 문서는 제외)
+        :return: 일시적 오류로 저장하지 못한 (seq, 문서) 리스트 (pending에 그대로 남아 있음)
+        """
+        with self._pending_lock:
+            live = [
+                (seq, document)
+                for seq, document in batch
+                if seq in self._pending.get(document.get("chatroom_id"), {})
+            ]
+        if not live:
+            return []
+
+        documents = [document for _, document in live]
+        failed_indexes = set()
+        permanent_indexes = set()
+        started = time.perf_counter()
+        try:
+            self.get_collection().insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # ordered=False이므로 writeErrors에 있는 문서만 실패
+            # 중복 키는 이전 시도(연결 오류 등)에서 이미 저장된 문서라 저장된 것으로 처리
+            for error in e.details.get("writeErrors", []):
+                code = error.get("code")
+                if code == DUPLICATE_KEY_ERROR:
+                    continue
+                if code in TRANSIENT_WRITE_ERRORS:
+                    failed_indexes.add(error["index"])
+                else:
+                    permanent_indexes.add(error["index"])
+            if failed_indexes or permanent_indexes:
+                logging.error(
+                    f"감정 데이터 일괄 저장 오류 (재시도 {len(failed_indexes)}건, "
+                    f"영구 실패 {len(permanent_indexes)}건 / {len(documents)}건): {e}"
+                )
+        except Exception as e:
+            # 연결 오류 등은 어떤 문서가 저장됐는지 알 수 없으므로 전부 다시 저장
+            failed_indexes = set(range(len(documents)))
+            logging.error(f"감정 데이터 일괄 저장 오류 ({len(documents)}건): {e}")
+        metrics.observe("emotion_writer.flush", time.perf_counter() - started)
+
+        written, unwritten, permanent = [], [], []
+        for i, item in enumerate(live):
+            if i in failed_indexes:
+                unwritten.append(item)
+            elif i in permanent_indexes:
+                permanent.append(item)
+            else:
+                written.append(item)
+        if failed_indexes or permanent_indexes:
+            metrics.incr("emotion_writer.errors")
+        self._count(batches=1, documents=len(written), failed=len(unwritten) + len(permanent))
+        metrics.incr("emotion_writer.documents", len(written))
+
+        # insert_many 중에 discard(채팅방 감정 데이터 삭제)된 문서는 pending에서 이미 빠져 있음
+        # 삭제 쪽 delete_many가 저장보다 먼저 실행됐을 수 있으므로 방금 저장한 문서를 다시 삭제
+        with self._capacity:
+            discarded = [document["_id"] for _, document in self._remove_pending(written)]
+            # 실패한 문서 중 그 사이 취소된 문서는 다시 저장하지 않음
+            unwritten = [
+                (seq, document)
+                for seq, document in unwritten
+                if seq in self._pending.get(document.get("chatroom_id"), {})
+            ]
+        if discarded:
+            self._delete_discarded(discarded)
+        if permanent:
+            self._give_up(permanent, "다시 시도해도 실패하는 쓰기 오류")
+        return unwritten
+
+    def _delete_discarded(self, ids):
+        """저장 중에 취소된 문서 삭제 (삭제된 채팅방 데이터가 되살아나지 않도록)"""
+        try:
+            self.get_collection().delete_many({"_id": {"$in": ids}})
+            metrics.incr("emotion_writer.discarded_after_write", len(ids))
+        except Exception as e:
+            logging.error(f"취소된 감정 데이터 삭제 오류 ({len(ids)}건): {e}")
+
+    def _retry_later(self, items):
+        """
+        저장 실패 문서를 백오프 후 워커가 다시 저장하도록 보관 (실패가 이어질수록 대기 시간 2배)
+        max_retries번 넘게 실패한 문서는 포기
+        """
+        exhausted = []
+        with self._pending_lock:
+            for seq, document in items:
+                attempts = self._attempts.get(seq, 0) + 1
+                if attempts > self.max_retries:
+                    exhausted.append((seq, document))
+                    continue
+                self._attempts[seq] = attempts
+                self._retry.append((seq, document))
+            if self._retry:
+                self._retry_delay = min(max(self._retry_delay * 2, self.retry_initial), self.retry_max)
+                self._retry_at = time.monotonic() + self._retry_delay
+        if exhausted:
+            self._give_up(exhausted, f"재시도 {self.max_retries}회 초과")
+
+    def _retry_timeout(self):
+        """다음 재시도까지 남은 시간 (재시도할 문서가 없으면 None)"""
+        with self._pending_lock:
+            if not self._retry:
+                return None
+            return max(self._retry_at - time.monotonic(), 0.0)
+
+    def _write_retries(self, force=False):
+        """재시도 시간이 된 실패 문서 저장 (다시 실패하면 더 긴 대기 후 재시도)"""
+        with self._pending_lock:
+            if not self._retry or (not force and time.monotonic() < self._retry_at):
+                return
+            items, self._retry = self._retry, []
+
+        self._count(retried=len(items))
+        unwritten = []
+        for start in range(0, len(items), self.max_batch_size):
+            unwritten.extend(self._write(items[start : start + self.max_batch_size]))
+        if unwritten:
+            self._retry_later(unwritten)
+        else:
+            with self._pending_lock:
+                if not self._retry:
+                    self._retry_delay = 0.0
+
+    def _write_sync(self, items):
+        """워커 없이 저장 (종료 시/종료 후), sync_retries번까지 재시도 후 실패 문서는 로그만 남김"""
+        delay = self.retry_initial
+        for attempt in range(self.sync_retries + 1):
+            if attempt:
+                time.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+                self._count(retried=len(items))
+            unwritten = []
+            for start in range(0, len(items), self.max_batch_size):
+                unwritten.extend(self._write(items[start : start + self.max_batch_size]))
+            items = unwritten
+            if not items:
+                return
+        self._give_up(items, f"종료 중 재시도 {self.sync_retries}회 초과")
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self._retry_timeout())
+            except queue.Empty:
+                self._write_retries()
+                continue
+            if item is None:
+                if not self._running:
+                    self._drain()
+                    return
+                continue
+            if isinstance(item, _FlushRequest):
+                self._write_retries(force=True)
+                item.event.set()
+                continue
+
+            batch, flush_request, stopping = self._collect(item)
+            unwritten = self._write(batch)
+            if unwritten:
+                self._retry_later(unwritten)
+            self._write_retries(force=flush_request is not None)
+            if flush_request is not None:
+                flush_request.event.set()
+            if stopping:
+                self._drain()
+                return
+
+    def _drain(self):
+        """종료 시 큐에 남은 문서와 재시도 대기 문서 모두 저장"""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushRequest):
+                item.event.set()
+            elif item is not None:
+                batch.append(item)
+        with self._pending_lock:
+            batch, self._retry = self._retry + batch, []
+        if batch:
+            self._write_sync(batch)
+
+
+# 감정 문서 공용 쓰기 버퍼
+emotion_writer = (
+    EmotionWriteBuffer(
+        lambda: mongo.db.emotions,
+        max_batch_size=ActiveConfig.EMOTION_WRITE_BATCH_SIZE,
+        flush_interval_ms=ActiveConfig.EMOTION_WRITE_FLUSH_INTERVAL_MS,
+        max_queue_size=ActiveConfig.EMOTION_WRITE_QUEUE_SIZE,
+        put_timeout_ms=ActiveConfig.EMOTION_WRITE_PUT_TIMEOUT_MS,
+        max_retries=ActiveConfig.EMOTION_WRITE_MAX_RETRIES,
+    ).start()
+    if ActiveConfig.EMOTION_WRITE_BUFFER_ENABLED
+    else None
+)
+
+if emotion_writer is not None:
+    # 종료 시 남은 문서 저장 (atexit은 역순 실행이므로 이 모듈을 사용하는 쪽의 종료 처리가 먼저 실행됨)
+    atexit.register(emotion_writer.stop)
+    os.register_at_fork(after_in_child=emotion_writer.after_fork)
+
+
+def write_emotion_document(document):
+    """
+    감정 문서 저장 (버퍼 활성화 시 write-behind, 비활성화 시 insert_one)
+    :return: 문서의 _id (쓰기 버퍼 한도 초과로 버려지면 None)
+    """
+    if emotion_writer is not None:
+        return emotion_writer.put(document)
+    return mongo.db.emotions.insert_one(document).inserted_id
+
+
+def pending_emotion_documents(chatroom_id, user_id=None):
+    """아직 저장되지 않은 채팅방 감정 문서 (버퍼 비활성화 시 빈 리스트)"""
+    if emotion_writer is None:
+        return []
+    return emotion_writer.pending(chatroom_id, user_id)
@@ -0,0 +1,202 @@
+"""
+# 감정 분류 전 얼굴 위치 추정 및 추적
+
+OpenCV Haar cascade(CPU 친화적)로 얼굴을 찾고 채팅방별로 얼굴 박스를 추적
+- 전체 검출은 N 프레임마다 또는 추적 실패 시에만 실행
+- 그 사이 프레임은 이전 얼굴 템플릿을 주변 영역에서 템플릿 매칭으로 추적
+- 얼굴이 없으면 None을 반환해 분류기 호출 자체를 건너뜀
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+from app.utils.metrics import metrics
+
+
+class _TrackState:
+    """채팅방별 추적 상태 (검출 해상도 좌표 기준, 등록 후에는 수정하지 않고 새 객체로 교체)"""
+
+    __slots__ = ("box", "template", "frames_since_detect", "updated_at")
+
+    def __init__(self, box, template, frames_since_detect=0):
+        self.box = box
+        self.template = template
+        self.frames_since_detect = frames_since_detect
+        self.updated_at = time.monotonic()
+
+
+class FaceTracker:
+    """채팅방별 얼굴 ROI 추적기"""
+
+    def __init__(
+        self,
+        detect_every=10,
+        detect_width=320,
+        min_face_size=40,
+        track_threshold=0.6,
+        margin=0.2,
+        max_rooms=1000,
+        ttl_seconds=300,
+    ):
+        """
+        :param detect_every: 추적 중 전체 검출을 다시 실행하는 프레임 간격
+        :param detect_width: 검출/추적에 사용할 축소 그레이스케일 이미지 너비
+        :param min_face_size: 원본 기준 최소 얼굴 크기 (px)
+        :param track_threshold: 템플릿 매칭 점수가 이 값보다 낮으면 추적 실패로 판단
+        :param margin: 분류기 입력으로 자를 때 얼굴 박스 주변에 더할 여백 비율
+        :param max_rooms: 추적 상태를 유지할 최대 채팅방 수
+        :param ttl_seconds: 이 시간 동안 프레임이 없으면 추적 상태 폐기
+        """
+        self.detect_every = max(detect_every, 1)
+        self.detect_width = detect_width
+        self.min_face_size = min_face_size
+        self.track_threshold = track_threshold
+        self.margin = margin
+        self.max_rooms = max_rooms
+        self.ttl_seconds = ttl_seconds
+
+        self._detector = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+        if self._detector.empty():
+            raise RuntimeError("얼굴 검출기(Haar cascade)를 불러올 수 없습니다.")
+
+        self._rooms = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_state(self, chatroom_id):
+        with self._lock:
+            state = self._rooms.get(chatroom_id)
+            if state is None:
+                return None
+            if time.monotonic() - state.updated_at > self.ttl_seconds:
+                del self._rooms[chatroom_id]
+                return None
+            self._rooms.move_to_end(chatroom_id)
+            return state
+
+    def _set_state(self, chatroom_id, state):
+        with self._lock:
+            if state is None:
+                self._rooms.pop(chatroom_id, None)
+                return
+            self._rooms[chatroom_id] = state
+            self._rooms.move_to_end(chatroom_id)
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+
+    def _swap_state(self, chatroom_id, expected, state):
+        """
+        채팅방 상태가 아직 expected일 때만 state로 교체 (그 사이 다른 프레임/초기화가 바꿨으면 그대로 둠)
+        :return: 교체 여부
+        """
+        with self._lock:
+            if self._rooms.get(chatroom_id) is not expected:
+                return False
+            if state is None:
+                self._rooms.pop(chatroom_id, None)
+                return True
+            self._rooms[chatroom_id] = state
+            self._rooms.move_to_end(chatroom_id)
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+            return True
+
+    def reset(self, chatroom_id):
+        """채팅방의 추적 상태 제거"""
+        self._set_state(chatroom_id, None)
+
+    def _detect(self, gray, min_size):
+        faces = self._detector.detectMultiScale(
+            gray, scaleFactor=1.2, minNeighbors=5, minSize=(min_size, min_size)
+        )
+        if len(faces) == 0:
+            return None
+        # 가장 큰 얼굴 선택
+        x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+        return int(x), int(y), int(w), int(h)
+
+    def _track(self, gray, state):
+        """이전 박스 주변 영역에서 템플릿 매칭으로 얼굴 위치 갱신"""
+        x, y, w, h = state.box
+        pad_x, pad_y = w // 2, h // 2
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        x1 = min(x + w + pad_x, gray.shape[1])
+        y1 = min(y + h + pad_y, gray.shape[0])
+
+        window = gray[y0:y1, x0:x1]
+        if window.shape[0] < h or window.shape[1] < w:
+            return None
+
+        scores = cv2.matchTemplate(window, state.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+        if score < self.track_threshold:
+            return None
+        return x0 + dx, y0 + dy, w, h
+
+    def locate(self, chatroom_id, image):
+        """
+        프레임에서 얼굴 박스를 찾음
+        :param chatroom_id: 채팅방 ID (추적 상태 키)
+        :param image: OpenCV BGR 이미지
+        :return: 원본 좌표 기준 (x, y, w, h) 또는 얼굴이 없으면 None
+        """
+        height, width = image.shape[:2]
+        scale = min(self.detect_width / width, 1.0)
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA
+            )
+
+        # 같은 채팅방 프레임이 동시에 들어와도 읽은 상태는 바뀌지 않음 (새 상태를 만들어 교체)
+        state = self._get_state(chatroom_id)
+        box = None
+        frames_since_detect = 0
+
+        if state is not None and state.frames_since_detect < self.detect_every:
+            with metrics.timer("face.track"):
+                box = self._track(gray, state)
+            if box is not None:
+                metrics.incr("face.tracked")
+                frames_since_detect = state.frames_since_detect + 1
+            else:
+                metrics.incr("face.track_lost")
+
+        if box is None:
+            with metrics.timer("face.detect"):
+                box = self._detect(gray, max(int(self.min_face_size * scale), 1))
+            metrics.incr("face.detector_runs")
+            if box is None:
+                self._swap_state(chatroom_id, state, None)
+                metrics.incr("face.no_face")
+                return None
+
+        x, y, w, h = box
+        template = gray[y : y + h, x : x + w].copy()
+        self._swap_state(chatroom_id, state, _TrackState(box, template, frames_since_detect))
+
+        return (
+            int(round(x / scale)),
+            int(round(y / scale)),
+            int(round(w / scale)),
+            int(round(h / scale)),
+        )
+
+    def crop(self, image, box):
+        """얼굴 박스에 여백을 더해 분류기 입력 영역을 잘라냄 (복사 없는 view 반환)"""
+        x, y, w, h = box
+        pad_x, pad_y = int(w * self.margin), int(h * self.margin)
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        x1 = min(x + w + pad_x, image.shape[1])
+        y1 = min(y + h + pad_y, image.shape[0])
+        return image[y0:y1, x0:x1]
+
+    def stats(self):
+        """추적 중인 채팅방 수"""
+        with self._lock:
+            return {"tracked_rooms": len(self._rooms)}
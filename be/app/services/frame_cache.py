@@ -0,0 +1,100 @@
+"""
+# 근접 중복 프레임 억제용 채팅방별 예측 캐시
+
+프레임마다 저비용 perceptual hash(dHash, 64bit)를 계산하고
+직전 프레임과 해밍 거리가 임계값 이하이면 이전 예측 결과를 재사용
+채팅방별 마지막 (hash, 예측)만 보관하며 TTL과 최대 항목 수로 크기를 제한
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from app.utils.metrics import metrics
+
+# dHash 비트 → 정수 변환용 가중치
+_BIT_WEIGHTS = (1 << np.arange(64, dtype=np.uint64)).astype(np.uint64)
+
+
+def frame_signature(image):
+    """
+    프레임의 difference hash(dHash) 계산
+    9x8 그레이스케일로 축소한 뒤 가로 방향 인접 픽셀 밝기 비교 결과를 64bit 정수로 반환
+    :param image: OpenCV BGR 이미지
+    """
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+    return int(np.sum(_BIT_WEIGHTS[bits]))
+
+
+def hamming_distance(a, b):
+    """두 64bit 해시의 해밍 거리"""
+    return bin(a ^ b).count("1")
+
+
+class PredictionCache:
+    """채팅방별 마지막 프레임 해시와 예측 결과를 보관하는 TTL 캐시"""
+
+    def __init__(self, max_distance=4, ttl_seconds=10.0, max_entries=5000):
+        """
+        :param max_distance: 이 해밍 거리 이하이면 같은 프레임으로 판단 (0~64)
+        :param ttl_seconds: 캐시된 예측을 재사용할 수 있는 최대 시간
+        :param max_entries: 최대 채팅방 수 (초과 시 가장 오래된 항목 제거)
+        """
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, chatroom_id, signature):
+        """
+        직전 프레임과 거의 같으면 캐시된 예측 반환
+        :return: 캐시된 예측 결과 또는 None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(chatroom_id)
+            if entry is not None and now - entry[2] > self.ttl_seconds:
+                del self._entries[chatroom_id]
+                entry = None
+
+        if entry is not None and hamming_distance(entry[0], signature) <= self.max_distance:
+            metrics.incr("frame_cache.hit")
+            return entry[1]
+
+        metrics.incr("frame_cache.miss")
+        return None
+
+    def store(self, chatroom_id, signature, prediction):
+        """채팅방의 마지막 프레임 해시와 예측 결과 저장"""
+        with self._lock:
+            self._entries[chatroom_id] = (signature, prediction, time.monotonic())
+            self._entries.move_to_end(chatroom_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, chatroom_id):
+        """채팅방 캐시 제거"""
+        with self._lock:
+            self._entries.pop(chatroom_id, None)
+
+    def stats(self):
+        """캐시 적중률 및 항목 수"""
+        counters = metrics.snapshot()["counters"]
+        hits = counters.get("frame_cache.hit", 0)
+        misses = counters.get("frame_cache.miss", 0)
+        total = hits + misses
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "max_distance": self.max_distance,
+        }
@@ -0,0 +1,468 @@
+"""
+# 감정 분류 추론 워커 프로세스 풀
+
+웹 프로세스 안에서 TensorFlow 모델을 직접 실행하지 않고, 모델 인스턴스를 하나씩 가진
+전용 워커 프로세스들에 추론을 맡김
+- 워커마다 공유 메모리 링 버퍼(슬롯 N개, 224x224x3 uint8)를 두고
+  웹 프로세스가 리사이즈 결과를 슬롯에 바로 기록 → 파이프로는 (요청 ID, 슬롯 번호)만 전달 (배열 pickle 없음)
+- 워커는 파이프에 쌓인 요청을 한 번에 모아 배치로 예측 (마이크로 배칭)
+- 워커별 intra-op / inter-op 스레드 수 지정 (풀 크기 x intra-op ≒ 코어 수)
+- 빈 슬롯이 없으면 제출이 대기(백프레셔), 워커가 비정상 종료되면 진행 중 요청을 실패 처리하고 재시작
+- 풀은 첫 요청 시 시작 (spawn 자식이 앱을 import해도 풀을 다시 만들지 않고, fork된 서버 워커는 각자 새로 시작)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from itertools import count
+from multiprocessing import connection, get_context, shared_memory
+
+import cv2
+import numpy as np
+
+from app.models.emotion import EMOTION_CLASSES, INPUT_SIZE
+from app.models.emotion_backends import create_backend
+from app.utils.metrics import metrics
+from config.settings import ActiveConfig
+
+# 슬롯 하나의 배열 형태 (H, W, C) - preprocess_batch와 동일한 리사이즈 결과
+FRAME_SHAPE = (INPUT_SIZE[1], INPUT_SIZE[0], 3)
+
+
+def _worker_main(conn, shm_name, slots, model_path, backend, intra_op_threads, inter_op_threads, max_batch_size):
+    """
+    추론 워커 프로세스 진입점
+    :param conn: 웹 프로세스와 연결된 파이프 (요청: (요청 ID, 슬롯), 응답: [(요청 ID, 슬롯, 클래스 인덱스, 신뢰도)])
+    :param shm_name: 프레임 링 버퍼 공유 메모리 이름
+    :param slots: 링 버퍼 슬롯 수
+    """
+    if intra_op_threads:
+        # TensorFlow/ONNX/OpenMP 런타임이 초기화되기 전에 스레드 수 고정
+        os.environ["OMP_NUM_THREADS"] = str(intra_op_threads)
+        os.environ["TF_NUM_INTRAOP_THREADS"] = str(intra_op_threads)
+        os.environ["TF_NUM_INTEROP_THREADS"] = str(inter_op_threads)
+    cv2.setNumThreads(1)
+
+    try:
+        # 워커는 웹 프로세스의 resource_tracker를 공유하므로 해제(unlink)는 생성한 쪽에서만 수행
+        shm = shared_memory.SharedMemory(name=shm_name)
+        frames = np.ndarray((slots, *FRAME_SHAPE), dtype=np.uint8, buffer=shm.buf)
+        model = create_backend(backend, model_path, intra_op_threads, inter_op_threads)
+        # 전처리 포함 모델은 uint8 슬롯을 그대로 입력 (정규화/채널 변환은 모델 안에서)
+        fused = getattr(model, "fused_preprocessing", False)
+        # 첫 호출의 그래프 생성 비용을 준비 단계에서 처리
+        model.predict(np.zeros((1, *FRAME_SHAPE), dtype=np.uint8 if fused else np.float32))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", os.getpid()))
+
+    batch_buffer = np.empty((max_batch_size, *FRAME_SHAPE), dtype=np.float32)
+    stopping = False
+    while not stopping:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        requests = [message]
+        while len(requests) < max_batch_size and conn.poll():
+            message = conn.recv()
+            if message is None:
+                stopping = True
+                break
+            requests.append(message)
+
+        if fused:
+            batch = frames[[slot for _, slot in requests]]
+        else:
+            # preprocess_batch와 동일한 정규화 (uint8 → float32 복사 후 제자리 나눗셈)
+            batch = batch_buffer[: len(requests)]
+            batch[:] = frames[[slot for _, slot in requests]]
+            np.divide(batch, 255.0, out=batch)
+
+        try:
+            predictions = model.predict(batch)
+            predicted_classes = np.argmax(predictions, axis=1)
+            confidences = np.max(predictions, axis=1)
+            results = [
+                (request_id, slot, int(predicted_class), float(confidence))
+                for (request_id, slot), predicted_class, confidence in zip(
+                    requests, predicted_classes, confidences
+                )
+            ]
+        except Exception as e:
+            results = [(request_id, slot, -1, f"{type(e).__name__}: {e}") for request_id, slot in requests]
+        conn.send(results)
+
+    del frames
+    shm.close()
+
+
+class _Worker:
+    """웹 프로세스 쪽 워커 상태 (프로세스, 파이프, 링 버퍼, 빈 슬롯, 진행 중 요청)"""
+
+    def __init__(self, index, slots):
+        self.index = index
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * int(np.prod(FRAME_SHAPE)))
+        self.frames = np.ndarray((slots, *FRAME_SHAPE), dtype=np.uint8, buffer=self.shm.buf)
+        self.process = None
+        self.conn = None
+        self.alive = False
+        self.lock = threading.Lock()  # 파이프 송신 / 진행 중 요청 보호
+        # 재시작해도 같은 큐를 유지 (슬롯은 큐 / 제출 중 / 진행 중 중 한 곳에만 있고, 끝나면 항상 큐로 돌아옴)
+        self.free_slots = queue.Queue()
+        for slot in range(slots):
+            self.free_slots.put(slot)
+        self.inflight = {}  # 슬롯 -> (요청 ID, Future)
+        self.completed = 0
+        self.batches = 0
+        self.restarts = 0
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class InferencePool:
+    """공유 메모리로 프레임을 넘기는 감정 추론 워커 프로세스 풀"""
+
+    def __init__(
+        self,
+        model_path,
+        backend="keras",
+        pool_size=2,
+        intra_op_threads=1,
+        inter_op_threads=1,
+        slots_per_worker=16,
+        max_batch_size=8,
+        start_method="spawn",
+        submit_timeout=5.0,
+        ready_timeout=120.0,
+    ):
+        """
+        :param model_path: 워커가 로드할 모델 파일 경로
+        :param backend: 추론 백엔드 이름 (keras / tflite / onnx)
+        :param pool_size: 워커 프로세스 수 (워커마다 모델 인스턴스 하나)
+        :param intra_op_threads: 워커별 연산 내부 병렬 스레드 수 (0이면 라이브러리 기본값)
+        :param inter_op_threads: 워커별 연산 간 병렬 스레드 수
+        :param slots_per_worker: 워커별 링 버퍼 슬롯 수 (동시에 처리 중일 수 있는 최대 프레임 수)
+        :param max_batch_size: 워커가 한 번에 예측하는 최대 프레임 수
+        :param start_method: multiprocessing 시작 방식 (spawn / forkserver / fork)
+        :param submit_timeout: 빈 슬롯을 기다리는 최대 시간 (초)
+        :param ready_timeout: 워커의 모델 로드를 기다리는 최대 시간 (초)
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size는 1 이상이어야 합니다.")
+        if slots_per_worker < 1 or max_batch_size < 1:
+            raise ValueError("slots_per_worker와 max_batch_size는 1 이상이어야 합니다.")
+
+        self.model_path = model_path
+        self.backend = backend
+        self.pool_size = pool_size
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.slots_per_worker = slots_per_worker
+        self.max_batch_size = min(max_batch_size, slots_per_worker)
+        self.start_method = start_method
+        self.submit_timeout = submit_timeout
+        self.ready_timeout = ready_timeout
+
+        self._context = get_context(start_method)
+        self._workers = []
+        self._listener = None
+        self._running = False
+        self._pid = None
+        self._lock = threading.Lock()
+        self._request_ids = count()
+        self._rr = count()
+
+    def start(self):
+        """워커 프로세스 시작 (모든 워커의 모델 로드 완료까지 대기)"""
+        with self._lock:
+            if self._running and self._pid == os.getpid():
+                return self
+            if self._pid is not None and self._pid != os.getpid():
+                # fork로 복제된 프로세스 : 부모의 워커/공유 메모리는 사용하지 않고 새로 만듦
+                self._workers = []
+
+            workers = [_Worker(i, self.slots_per_worker) for i in range(self.pool_size)]
+            try:
+                for worker in workers:
+                    self._spawn(worker)
+            except Exception:
+                for worker in workers:
+                    self._terminate(worker)
+                    worker.close()
+                raise
+
+            self._workers = workers
+            self._pid = os.getpid()
+            self._running = True
+            self._listener = threading.Thread(
+                target=self._listen, name="inference-pool-listener", daemon=True
+            )
+            self._listener.start()
+        print(
+            f"추론 워커 풀 시작: {self.pool_size}개 ({self.backend}, "
+            f"intra={self.intra_op_threads}, inter={self.inter_op_threads}, {self.start_method})"
+        )
+        return self
+
+    def stop(self, timeout=5.0):
+        """워커 종료 및 공유 메모리 해제"""
+        with self._lock:
+            if not self._running or self._pid != os.getpid():
+                return
+            self._running = False
+            workers = self._workers
+
+        for worker in workers:
+            with worker.lock:
+                worker.alive = False
+                try:
+                    worker.conn.send(None)
+                except (OSError, ValueError):
+                    pass
+        for worker in workers:
+            worker.process.join(timeout)
+            self._terminate(worker)
+        self._listener.join(timeout)
+        for worker in workers:
+            self._fail_inflight(worker, RuntimeError("추론 워커 풀이 종료되었습니다."))
+            worker.conn.close()
+            worker.close()
+
+    def submit(self, image):
+        """
+        프레임 추론 요청
+        :param image: OpenCV BGR 이미지 (uint8, 3채널)
+        :return: (감정 라벨, 신뢰도)를 결과로 갖는 Future
+        """
+        if image is None:
+            raise ValueError("이미지를 불러올 수 없습니다.")
+        if not self._running or self._pid != os.getpid():
+            self.start()
+
+        worker = self._pick_worker()
+        try:
+            slot = worker.free_slots.get(timeout=self.submit_timeout)
+        except queue.Empty:
+            metrics.incr("inference_pool.rejected")
+            raise RuntimeError("추론 워커가 모두 사용 중입니다.")
+
+        # 웹 프로세스에서 리사이즈해서 슬롯에 바로 기록 (추가 복사/pickle 없음)
+        cv2.resize(image, INPUT_SIZE, dst=worker.frames[slot])
+
+        future = Future()
+        request_id = next(self._request_ids)
+        with worker.lock:
+            if not worker.alive:
+                worker.free_slots.put(slot)
+                raise RuntimeError("추론 워커가 재시작 중입니다.")
+            worker.inflight[slot] = (request_id, future)
+            try:
+                worker.conn.send((request_id, slot))
+            except (OSError, ValueError):
+                worker.inflight.pop(slot, None)
+                worker.free_slots.put(slot)
+                raise RuntimeError("추론 워커에 요청을 보낼 수 없습니다.")
+        metrics.incr("inference_pool.submitted")
+        return future
+
+    def predict(self, image, timeout=30.0):
+        """
+        프레임 하나의 감정 예측 (결과가 나올 때까지 대기)
+        :return: (감정 라벨, 신뢰도)
+        """
+        return self.submit(image).result(timeout)
+
+    def stats(self):
+        """워커별 상태와 배치 통계"""
+        workers = []
+        batches = completed = 0
+        for worker in self._workers:
+            batches += worker.batches
+            completed += worker.completed
+            workers.append(
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid if worker.process is not None else None,
+                    "alive": worker.alive,
+                    "inflight": len(worker.inflight),
+                    "completed": worker.completed,
+                    "restarts": worker.restarts,
+                }
+            )
+        return {
+            "running": self._running and self._pid == os.getpid(),
+            "pool_size": self.pool_size,
+            "backend": self.backend,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "slots_per_worker": self.slots_per_worker,
+            "start_method": self.start_method,
+            "completed": completed,
+            "batches": batches,
+            "avg_batch_size": round(completed / batches, 2) if batches else 0.0,
+            "workers": workers,
+        }
+
+    def _spawn(self, worker):
+        """워커 프로세스 시작 후 모델 로드 완료 신호 대기"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                worker.shm.name,
+                worker.slots,
+                self.model_path,
+                self.backend,
+                self.intra_op_threads,
+                self.inter_op_threads,
+                self.max_batch_size,
+            ),
+            name=f"emotion-inference-{worker.index}",
+            daemon=True,
+        )
+        process.start()
+        # 자식 쪽 끝을 닫아야 워커 종료 시 EOF로 감지됨
+        child_conn.close()
+
+        if not parent_conn.poll(self.ready_timeout):
+            process.kill()
+            parent_conn.close()
+            raise RuntimeError(f"추론 워커 {worker.index} 준비 시간 초과")
+        try:
+            status, detail = parent_conn.recv()
+        except (EOFError, OSError):
+            status, detail = "error", f"exitcode={process.exitcode}"
+        if status != "ready":
+            process.join(1.0)
+            parent_conn.close()
+            raise RuntimeError(f"추론 워커 {worker.index} 시작 실패: {detail}")
+
+        worker.process = process
+        worker.conn = parent_conn
+        worker.alive = True
+
+    def _pick_worker(self):
+        """진행 중 요청이 가장 적은 워커 선택 (동률이면 순환)"""
+        offset = next(self._rr)
+        candidates = [
+            self._workers[(offset + i) % len(self._workers)] for i in range(len(self._workers))
+        ]
+        alive = [worker for worker in candidates if worker.alive]
+        if not alive:
+            raise RuntimeError("사용 가능한 추론 워커가 없습니다.")
+        return min(alive, key=lambda worker: len(worker.inflight))
+
+    def _listen(self):
+        """워커 응답을 받아 Future 완료 (워커 비정상 종료 감지 포함)"""
+        while self._running:
+            conns = {worker.conn: worker for worker in self._workers if worker.alive}
+            if not conns:
+                time.sleep(0.1)
+                continue
+            for conn in connection.wait(list(conns), timeout=0.5):
+                worker = conns[conn]
+                try:
+                    results = conn.recv()
+                except (EOFError, OSError):
+                    if self._running:
+                        self._handle_crash(worker)
+                    continue
+                self._complete(worker, results)
+
+    def _complete(self, worker, results):
+        worker.batches += 1
+        metrics.incr("inference_pool.batches")
+        for request_id, slot, class_index, confidence in results:
+            with worker.lock:
+                entry = worker.inflight.get(slot)
+                if entry is None or entry[0] != request_id:
+                    # 이미 실패 처리되어 슬롯이 반환된 요청
+                    continue
+                del worker.inflight[slot]
+            worker.free_slots.put(slot)
+            future = entry[1]
+            worker.completed += 1
+            if class_index < 0:
+                metrics.incr("inference_pool.errors")
+                future.set_exception(RuntimeError(f"추론 실패: {confidence}"))
+            else:
+                future.set_result((EMOTION_CLASSES[class_index], confidence))
+
+    def _handle_crash(self, worker):
+        """워커 비정상 종료 : 진행 중 요청 실패 처리 후 백그라운드에서 재시작"""
+        with worker.lock:
+            if not worker.alive:
+                return
+            worker.alive = False
+        worker.process.join(1.0)
+        logging.error(
+            f"추론 워커 {worker.index} 비정상 종료 (exitcode={worker.process.exitcode}), 재시작합니다."
+        )
+        metrics.incr("inference_pool.worker_crashes")
+        self._fail_inflight(worker, RuntimeError("추론 워커가 비정상 종료되었습니다."))
+        worker.conn.close()
+        threading.Thread(target=self._respawn, args=(worker,), daemon=True).start()
+
+    def _respawn(self, worker):
+        while self._running:
+            try:
+                self._spawn(worker)
+                worker.restarts += 1
+                return
+            except Exception as e:
+                logging.error(f"추론 워커 {worker.index} 재시작 실패: {e}")
+                time.sleep(1.0)
+
+    def _fail_inflight(self, worker, error):
+        """진행 중 요청 실패 처리 후 슬롯 반환 (빈 슬롯을 기다리던 제출도 바로 깨어남)"""
+        with worker.lock:
+            inflight = list(worker.inflight.items())
+            worker.inflight.clear()
+        for slot, _ in inflight:
+            worker.free_slots.put(slot)
+        for _, (_, future) in inflight:
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _terminate(worker):
+        if worker.process is not None and worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(1.0)
+
+
+# 감정 추론 워커 풀 (process 모드에서만 사용, 첫 요청 시 시작)
+inference_pool = (
+    InferencePool(
+        ActiveConfig.MODEL_PATH,
+        backend=ActiveConfig.EMOTION_MODEL_BACKEND,
+        pool_size=ActiveConfig.EMOTION_POOL_SIZE,
+        intra_op_threads=ActiveConfig.EMOTION_POOL_INTRA_OP_THREADS,
+        inter_op_threads=ActiveConfig.EMOTION_POOL_INTER_OP_THREADS,
+        slots_per_worker=ActiveConfig.EMOTION_POOL_SLOTS,
+        max_batch_size=ActiveConfig.EMOTION_BATCH_MAX_SIZE,
+        start_method=ActiveConfig.EMOTION_POOL_START_METHOD,
+    )
+    if ActiveConfig.EMOTION_INFERENCE_MODE == "process"
+    else None
+)
+
+if inference_pool is not None:
+    atexit.register(inference_pool.stop)
@@ -0,0 +1,160 @@
+"""
+# RAG 어휘(키워드) 검색
+
+형태소 분석기 없이 한국어에 쓸 수 있도록 어절 안의 문자 n-gram(기본 2~3글자)을 토큰으로 쓰는 메모리 BM25 인덱스
+- 조사/어미가 붙은 어절도 어간 부분의 n-gram이 겹쳐서 매칭됨 ("우울해요" ↔ "우울한")
+- 문서 번호는 FAISS 벡터 번호와 같게 만들어서 벡터 검색 결과와 그대로 합칠 수 있음
+하이브리드 검색은 두 결과의 순위를 Reciprocal Rank Fusion(RRF)으로 합침 (점수 척도가 달라도 순위만 사용)
+질의 임베딩이 느리거나 실패하면 임베딩 없이 어휘 검색만 쓰도록 EmbeddingLatencyGuard가 판단
+"""
+
+import threading
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+
+def char_ngrams(text, ngram_range=(2, 3)):
+    """
+    어절별 문자 n-gram 목록 (NFKC 정규화, 소문자)
+    n-gram 최소 길이보다 짧은 어절은 어절 그대로 사용
+    """
+    min_n, max_n = ngram_range
+    grams = []
+    for word in unicodedata.normalize("NFKC", text).lower().split():
+        if len(word) < min_n:
+            grams.append(word)
+            continue
+        for n in range(min_n, min(max_n, len(word)) + 1):
+            grams.extend(word[i : i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+class BM25Index:
+    """
+    문자 n-gram BM25 인덱스 (읽기 전용)
+    용어별 posting(문서 번호, BM25 가중치)을 용어 순서로 이어 붙인 배열로 보관하고
+    질의 용어의 posting 가중치를 문서별로 더해서 점수 계산
+    """
+
+    def __init__(self, texts, ngram_range=(2, 3), k1=1.2, b=0.75):
+        """
+        :param texts: 문서 텍스트 반복자 (순서 = 문서 번호)
+        :param k1: 용어 빈도 포화 계수
+        :param b: 문서 길이 정규화 계수
+        """
+        self.ngram_range = tuple(ngram_range)
+        self.k1 = k1
+        self.b = b
+
+        vocabulary = {}
+        term_ids, doc_ids, frequencies, lengths = [], [], [], []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(char_ngrams(text, self.ngram_range))
+            lengths.append(sum(counts.values()))
+            for term, frequency in counts.items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(doc_id)
+                frequencies.append(frequency)
+
+        self.vocabulary = vocabulary
+        self.num_documents = len(lengths)
+        lengths = np.asarray(lengths, dtype=np.float32)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        frequencies = np.asarray(frequencies, dtype=np.float32)
+
+        # 용어 순서로 정렬 → 용어 t의 posting = [term_offsets[t], term_offsets[t + 1])
+        order = np.argsort(term_ids, kind="stable")
+        document_frequency = np.bincount(term_ids, minlength=len(vocabulary))
+        self.term_offsets = np.concatenate([[0], np.cumsum(document_frequency)]).astype(np.int64)
+        self.doc_ids = doc_ids[order]
+
+        average_length = float(lengths.mean()) if len(lengths) else 0.0
+        idf = np.log1p((self.num_documents - document_frequency + 0.5) / (document_frequency + 0.5))
+        frequencies = frequencies[order]
+        norm = self.k1 * (1 - self.b + self.b * lengths[self.doc_ids] / max(average_length, 1e-9))
+        self.weights = (
+            idf[term_ids[order]] * frequencies * (self.k1 + 1) / (frequencies + norm)
+        ).astype(np.float32)
+
+    def search(self, query, k=4):
+        """
+        :return: (문서 번호 리스트, 점수 리스트) - 점수 높은 순, 겹치는 용어가 없는 문서는 제외
+        """
+        scores = np.zeros(self.num_documents, dtype=np.float32)
+        for term in set(char_ngrams(query, self.ngram_range)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            # 한 용어의 posting 안에서 문서 번호는 중복되지 않음
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return candidates.tolist(), scores[candidates].tolist()
+
+    def memory_bytes(self):
+        """posting 배열 크기 (어휘 딕셔너리 제외)"""
+        return int(self.term_offsets.nbytes + self.doc_ids.nbytes + self.weights.nbytes)
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=60):
+    """
+    여러 검색 결과 순위를 RRF로 합침 : 점수 = Σ 1 / (rrf_k + 순위)
+    :param rankings: 문서 번호 리스트들 (각각 좋은 순서)
+    :return: 합친 문서 번호 리스트 (점수 높은 순)
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
+
+
+class EmbeddingLatencyGuard:
+    """
+    질의 임베딩 지연 시간 지수 이동 평균(EMA)이 기준을 넘거나 임베딩이 실패하면 어휘 검색만 쓰도록 판단
+    어휘 검색만 쓰는 동안에도 probe_every번째 질의는 임베딩을 시도해서 회복 여부를 확인
+    """
+
+    def __init__(self, threshold_ms=0, probe_every=10, alpha=0.2):
+        """
+        :param threshold_ms: 기준 지연 시간 (0이면 사용 안 함)
+        :param probe_every: 어휘 검색만 쓰는 동안 임베딩을 다시 시도하는 질의 간격
+        :param alpha: EMA 가중치 (클수록 최근 값 반영이 빠름)
+        """
+        self.threshold_ms = threshold_ms
+        self.probe_every = probe_every
+        self.alpha = alpha
+        self.ema_ms = 0.0
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def use_lexical_only(self):
+        """이번 질의에서 임베딩을 건너뛸지 여부"""
+        if not self.threshold_ms:
+            return False
+        with self._lock:
+            if self.ema_ms <= self.threshold_ms:
+                return False
+            self._skipped += 1
+            if self._skipped >= self.probe_every:
+                self._skipped = 0
+                return False
+            return True
+
+    def record(self, seconds):
+        """임베딩 성공 시 지연 시간 기록"""
+        with self._lock:
+            milliseconds = seconds * 1000.0
+            self.ema_ms = milliseconds if not self.ema_ms else self.alpha * milliseconds + (1 - self.alpha) * self.ema_ms
+
+    def record_failure(self):
+        """임베딩 실패 시 다음 확인 때까지 어휘 검색만 사용"""
+        with self._lock:
+            self.ema_ms = max(self.ema_ms, self.threshold_ms * 2.0)
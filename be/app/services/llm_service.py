@@ -8,27 +8,20 @@ LLM 호출 및 응답 처리
 
 import os
 import logging
-from langchain.chains import ConversationalRetrievalChain
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
 from flask import current_app
 
 # from flask_pymongo import PyMongo
-from app.services.rag_service import retriever
+from app.services.rag_service import format_retrieved_context, retrieve_context_documents
+from app.services.emotion_service import emotion_aggregator
+from app.services.emotion_writer import pending_emotion_documents
 from app.database import mongo
+from app.utils.resources import resources
 
 # mongo = PyMongo()
 
 load_dotenv()
 
-api_key = os.getenv("OPENAI_API_KEY")
-
-if api_key:
-    print("OpenAI API Key 로드 성공!")
-else:
-    raise ValueError("OpenAI API Key가 없습니다. .env 파일을 확인하세요.")
-
 
 chatroom_memory = {}
 
@@ -46,6 +39,13 @@ def get_emotion_data(user_id, chatroom_id):
         raise RuntimeError("MongoDB 연결이 설정되지 않았습니다.")
 
     try:
+        # 대화 중인 채팅방은 집계기의 스무딩된 대표 감정 우선 사용
+        if emotion_aggregator is not None:
+            current = emotion_aggregator.current(chatroom_id)
+            if current is not None:
+                print(f"집계 중인 대표 감정 - 감정: {current[0]}, 신뢰도: {current[1]}")
+                return current
+
         print(f"Mongo 객체 상태: {mongo}")
         print(f"Mongo DB 연결 여부: {mongo.db}")
 
@@ -54,6 +54,13 @@ def get_emotion_data(user_id, chatroom_id):
             {"user_id": user_id, "chatroom_id": chatroom_id}, sort=[("timestamp", -1)]
         )
 
+        # 쓰기 버퍼에 아직 저장되지 않은 더 최신 문서가 있으면 우선 사용
+        pending = pending_emotion_documents(chatroom_id, user_id)
+        if pending and (
+            emotion_data is None or pending[-1]["timestamp"] > emotion_data["timestamp"]
+        ):
+            emotion_data = pending[-1]
+
         print(f"쿼리 조건: user_id={user_id}, chatroom_id={chatroom_id}")
         print(f"MongoDB 감정 데이터: {emotion_data}")
 
@@ -103,9 +110,8 @@ def manage_chat_memory(user_id, chatroom_id, emotion, confidence):
     }
 
 
-# 챗봇 응답 프롬프트 설정
-prompt = PromptTemplate.from_template(
-    """너는 고민을 들어주고 공감해주는 사춘기 청소년 전문 또래 상담가야!  
+# 챗봇 응답 프롬프트 템플릿
+PROMPT_TEMPLATE = """너는 고민을 들어주고 공감해주는 사춘기 청소년 전문 또래 상담가야!  
 사람들이 힘들어할 땐 **따뜻하고 친근한 말투**로 먼저 공감해주고, 대화가 끊기지 않도록 자연스럽게 **열린 추가 질문**을 던져서 대화를 이어가줘.  
 상황에 맞는 적당한 추임새와 감탄사를 사용해주고, 신조어도 10대 청소년이 자주 쓰는 신조어도 적절히 넣어줘.  
 때로는 가벼운 농담도 하면서 분위기를 풀어주고 상황에 맞는 이모티콘도 넣어줘.  
@@ -162,10 +168,32 @@ prompt = PromptTemplate.from_template(
 
 **챗봇 응답:**  
 """
-)
 
-# OpenAI 기반 LLM 설정 (RAG를 위한 언어 모델)
-llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.7)
+
+def _load_prompt():
+    """챗봇 응답 프롬프트 설정 (langchain import 비용을 첫 사용 시점으로 미룸)"""
+    from langchain_core.prompts import PromptTemplate
+
+    return PromptTemplate.from_template(PROMPT_TEMPLATE)
+
+
+prompt_resource = resources.register("chat_prompt", _load_prompt)
+
+def _load_llm():
+    """OpenAI 기반 LLM 설정 (RAG를 위한 언어 모델)"""
+    from langchain_openai import ChatOpenAI
+
+    api_key = os.getenv("OPENAI_API_KEY")
+
+    if api_key:
+        print("OpenAI API Key 로드 성공!")
+    else:
+        raise ValueError("OpenAI API Key가 없습니다. .env 파일을 확인하세요.")
+
+    return ChatOpenAI(model_name="gpt-4o-mini", temperature=0.7)
+
+
+llm_resource = resources.register("llm", _load_llm)
 
 
 # 감정 기반 챗봇 대화
@@ -219,66 +247,85 @@ def sendEmotionChatMessage(user_id, chatroom_id, userMessage):
         }
 
 
-def generate_response(
-    user_id: str, chatroom_id: str, user_message: str, retrieved_context: str
-) -> str:
+def describe_emotion(emotion, confidence):
     """
-    프롬프트와 LLM을 이용해 최종 챗봇 응답을 생성하는 함수
+    감정에 따라 프롬프트에 추가할 감정 상태 설명
+
+    :param emotion: 감정 라벨
+    :param confidence: 신뢰도
+    :return: 프롬프트의 emotion_description
+    """
+    if emotion:
+        if emotion == "sadness":
+            return f"사용자는 현재 '슬픔({confidence:.2f})' 감정을 느끼고 있어. 공감해 주고, 이전 대화와 있다면 내용이 이어지도록 따뜻한 말을 먼저 건네줘."
+        elif emotion == "angry":
+            return f"사용자는 현재 '분노({confidence:.2f})' 감정을 느끼고 있어. 감정을 진정할 수 있도록 차분하고 부드럽게 반응해주고 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+        elif emotion == "happy":
+            return f"사용자는 현재 '행복({confidence:.2f})' 감정을 느끼고 있어. 함께 기뻐하면서 긍정적인 대화를 이어가 줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+        elif emotion == "panic":
+            return f"사용자는 현재 '불안({confidence:.2f})' 상태야. 차분한 말투로 안심시켜줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+        else:
+            return f"사용자의 감정 상태는 '{emotion}({confidence:.2f})'야. 이에 맞춰 반응해줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+    return "사용자의 감정 상태를 파악할 수 없어. 평소처럼 친절하게 대화를 이어가 줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+
+
+def generate_chat_reply(user_id, chatroom_id, user_message, retrieved_context):
+    """
+    이미 검색한 상담 사례로 프롬프트를 만들고 LLM을 한 번 호출해 응답을 생성하는 함수
+    (검색은 호출하는 쪽에서 사용자 메시지로 한 번만 수행, 여기서는 임베딩/벡터 검색 없음)
 
     :param user_id: 사용자 ID
     :param chatroom_id: 채팅방 ID
     :param user_message: 사용자의 입력 메시지 (question)
-    :param retrieved_context: RAG 검색을 통해 가져온 관련 상담 사례 (context)
-    :return: 챗봇의 최종 응답
+    :param retrieved_context: format_retrieved_context로 만든 상담 사례 (context)
+    :return: (챗봇 응답, 감정, 신뢰도)
     """
-    try:
-        # RAG 검색된 데이터가 없거나 필요하지 않으면 제거
-        if not retrieved_context or retrieved_context == "상담 기록이 없습니다.":
-            retrieved_context = ""
+    # RAG 검색된 데이터가 없거나 필요하지 않으면 제거
+    if not retrieved_context or retrieved_context == "상담 기록이 없습니다.":
+        retrieved_context = ""
 
-        # 감정 데이터 불러오기
-        emotion, confidence = get_emotion_data(user_id, chatroom_id)
+    # 감정 데이터 불러오기
+    emotion, confidence = get_emotion_data(user_id, chatroom_id)
 
-        # 감정에 따라 프롬프트에 추가할 내용 결정
-        if emotion:
-            if emotion == "sadness":
-                emotion_description = f"사용자는 현재 '슬픔({confidence:.2f})' 감정을 느끼고 있어. 공감해 주고, 이전 대화와 있다면 내용이 이어지도록 따뜻한 말을 먼저 건네줘."
-            elif emotion == "angry":
-                emotion_description = f"사용자는 현재 '분노({confidence:.2f})' 감정을 느끼고 있어. 감정을 진정할 수 있도록 차분하고 부드럽게 반응해주고 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
-            elif emotion == "happy":
-                emotion_description = f"사용자는 현재 '행복({confidence:.2f})' 감정을 느끼고 있어. 함께 기뻐하면서 긍정적인 대화를 이어가 줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
-            elif emotion == "panic":
-                emotion_description = f"사용자는 현재 '불안({confidence:.2f})' 상태야. 차분한 말투로 안심시켜줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
-            else:
-                emotion_description = f"사용자의 감정 상태는 '{emotion}({confidence:.2f})'야. 이에 맞춰 반응해줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
-        else:
-            emotion_description = "사용자의 감정 상태를 파악할 수 없어. 평소처럼 친절하게 대화를 이어가 줘. 이전 대화와 있다면 내용이 이어지도록 대화 해줘."
+    # 프롬프트를 생성하여 입력 텍스트 준비
+    input_text = prompt_resource.get().format(
+        question=user_message,
+        context=retrieved_context,
+        emotion_description=describe_emotion(emotion, confidence),
+    )
 
-        # 프롬프트를 생성하여 입력 텍스트 준비
-        input_text = prompt.format(
-            question=user_message,
-            context=retrieved_context,
-            emotion_description=emotion_description,
-        )
+    # 검색 결과가 이미 프롬프트에 들어 있으므로 LLM 직접 호출
+    response = llm_resource.get().invoke(input_text)
+    bot_response = getattr(response, "content", response).strip()
 
-        # LLM을 활용한 응답 생성
-        conversation_rag = ConversationalRetrievalChain.from_llm(
-            llm=llm,
-            retriever=retriever,
-            return_source_documents=False,
-            output_key="answer",
-            verbose=False,
-        )
+    # 불필요한 줄바꿈 제거
+    bot_response = bot_response.replace("\n\n", " ").replace("\n", " ").strip()
 
-        # 챗봇 응답 생성
-        response = conversation_rag.invoke({"question": input_text, "chat_history": []})
+    return bot_response, emotion, confidence
 
-        # 응답에서 필요한 데이터 추출
-        bot_response = response["answer"].strip()
 
-        # 불필요한 줄바꿈 제거
-        bot_response = bot_response.replace("\n\n", " ").replace("\n", " ").strip()
+def generate_response(
+    user_id: str, chatroom_id: str, user_message: str, retrieved_context: str = None
+) -> str:
+    """
+    프롬프트와 LLM을 이용해 최종 챗봇 응답을 생성하는 함수
+
+    :param user_id: 사용자 ID
+    :param chatroom_id: 채팅방 ID
+    :param user_message: 사용자의 입력 메시지 (question)
+    :param retrieved_context: RAG 검색을 통해 가져온 관련 상담 사례 (context),
+        None이면 사용자 메시지로 한 번 검색
+    :return: 챗봇의 최종 응답
+    """
+    try:
+        if retrieved_context is None:
+            retrieved_context = format_retrieved_context(
+                retrieve_context_documents(user_message)
+            )
 
+        bot_response, _, _ = generate_chat_reply(
+            user_id, chatroom_id, user_message, retrieved_context
+        )
         return bot_response
     except Exception as e:
         logging.error(f"LLM 응답 생성 중 오류 발생: {e}")
@@ -1,56 +1,386 @@
 """
 # RAG 검색 및 벡터 DB 관련 로직 담당
 
-FAISS 벡터 DB 로드 및 검색 기능 제공
+FAISS 벡터 DB 로드 및 검색 기능 제공 (리소스 레지스트리로 첫 사용 또는 백그라운드 워밍 시 로드)
 문서 검색 (retriever 활용)
 검색된 문서에서 output 추출
 """
 
+import logging
 import os
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
+import time
 from dotenv import load_dotenv
 from config.settings import ActiveConfig
+from app.services.lexical_index import EmbeddingLatencyGuard
+from app.utils.metrics import metrics
+from app.utils.resources import READY, resources
 
 load_dotenv()
 
 VECTOR_DB_PATH = ActiveConfig.VECTOR_DB_PATH
 
-try:
-    # FAISS 벡터 DB 로드
-    vectorstore = FAISS.load_local(
-        VECTOR_DB_PATH, OpenAIEmbeddings(), allow_dangerous_deserialization=True
+
+# 질의 임베딩 캐시 (벡터 DB 로드 시 생성, 사용 안 하면 None)
+embedding_cache = None
+
+
+def _create_embedding_cache():
+    """설정에 따라 질의 임베딩 캐시 생성 (Redis 연결은 첫 조회 시점에 맺음)"""
+    from app.services.embedding_cache import EmbeddingCache
+
+    redis_client = None
+    if ActiveConfig.EMBEDDING_CACHE_REDIS_ENABLED:
+        import redis
+
+        redis_client = redis.Redis(
+            host=ActiveConfig.REDIS_HOST,
+            port=ActiveConfig.REDIS_PORT,
+            db=ActiveConfig.REDIS_DB,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return EmbeddingCache(
+        max_entries=ActiveConfig.EMBEDDING_CACHE_MAX_ENTRIES,
+        redis_client=redis_client,
+        ttl_seconds=ActiveConfig.EMBEDDING_CACHE_TTL_SECONDS,
     )
-    retriever = vectorstore.as_retriever()
 
-    if retriever is None:
-        raise RuntimeError(
-            "retriever가 None입니다. 벡터 DB 로드에 실패했을 가능성이 있습니다."
+
+def create_base_embeddings():
+    """설정된 임베딩 제공자(openai / onnx)로 임베딩 객체 생성 (벡터 DB 생성 스크립트와 공용)"""
+    from app.services.embedding_providers import create_embedding_provider
+
+    return create_embedding_provider(
+        ActiveConfig.EMBEDDING_PROVIDER,
+        model=ActiveConfig.EMBEDDING_MODEL,
+        model_dir=ActiveConfig.EMBEDDING_MODEL_DIR,
+        batch_size=ActiveConfig.EMBEDDING_BATCH_SIZE,
+        max_length=ActiveConfig.EMBEDDING_MAX_LENGTH,
+        num_threads=ActiveConfig.EMBEDDING_THREADS,
+        query_prefix=ActiveConfig.EMBEDDING_QUERY_PREFIX,
+        document_prefix=ActiveConfig.EMBEDDING_DOCUMENT_PREFIX,
+    )
+
+
+def create_embeddings(base_embeddings=None):
+    """벡터 DB 질의용 임베딩 (캐시 사용 시 CachedEmbeddings로 감쌈)"""
+    global embedding_cache
+
+    embeddings = base_embeddings or create_base_embeddings()
+    if not ActiveConfig.EMBEDDING_CACHE_ENABLED:
+        return embeddings
+
+    from app.services.embedding_cache import CachedEmbeddings
+
+    if embedding_cache is None:
+        embedding_cache = _create_embedding_cache()
+    return CachedEmbeddings(embeddings, embedding_cache)
+
+
+def _load_retriever():
+    """FAISS 벡터 DB 로드 후 retriever 생성"""
+    # langchain/FAISS import 비용도 로드 시점으로 미룸
+    from app.services.embedding_providers import check_embedding_info
+    from app.services.vector_index import enable_reconstruct, index_type_of
+    from app.services.vector_store import MmapVectorStore, is_mmap_store
+
+    try:
+        base_embeddings = create_base_embeddings()
+        # 벡터 DB를 만든 임베딩과 질의 임베딩이 다르면 로드 중단
+        check_embedding_info(VECTOR_DB_PATH, base_embeddings)
+        embeddings = create_embeddings(base_embeddings)
+        # mmap 형식(docs.offsets.npy 있음)은 파일 매핑, 그 외는 LangChain pickle 형식
+        if is_mmap_store(VECTOR_DB_PATH):
+            vectorstore = MmapVectorStore.load(VECTOR_DB_PATH, embeddings)
+        else:
+            from langchain_community.vectorstores import FAISS
+
+            vectorstore = FAISS.load_local(VECTOR_DB_PATH, embeddings, allow_dangerous_deserialization=True)
+        if ActiveConfig.RAG_CONTEXT_SELECTION and ActiveConfig.RAG_CONTEXT_DUPLICATE_COSINE:
+            # 벡터 코사인 중복 판단에 검색 결과 벡터가 필요함
+            enable_reconstruct(vectorstore.index)
+        retriever = vectorstore.as_retriever()
+
+        if retriever is None:
+            raise RuntimeError(
+                "retriever가 None입니다. 벡터 DB 로드에 실패했을 가능성이 있습니다."
+            )
+        print(
+            f"FAISS 벡터 DB 로드 성공 ({vector_store_format(vectorstore)}, {index_type_of(vectorstore.index)}, "
+            f"벡터 {vectorstore.index.ntotal}개)"
         )
-    print("FAISS 벡터 DB 로드 성공")
-except Exception as e:
-    print(f"모델 로드 중 오류 발생: {e}")
-    raise
+        return retriever
+    except Exception as e:
+        print(f"모델 로드 중 오류 발생: {e}")
+        raise
+
+
+retriever_resource = resources.register("vector_store", _load_retriever)
+
 
+def vector_store_format(vectorstore):
+    """벡터 저장소 형식 이름 (mmap / langchain)"""
+    return "mmap" if hasattr(vectorstore, "documents_for") else "langchain"
 
-def retrieve_relevant_documents(user_message):
+
+def get_retriever():
+    """FAISS retriever 반환 (로드 전이면 로드)"""
+    return retriever_resource.get()
+
+
+def __getattr__(name):
+    # 기존 `from app.services.rag_service import retriever` 호환 (접근 시점에 로드)
+    if name == "retriever":
+        return get_retriever()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_vectorstore():
+    """retriever가 사용하는 FAISS 벡터 저장소 (로드 전이면 로드)"""
+    return get_retriever().vectorstore
+
+
+def _load_lexical_index():
+    """벡터 DB와 같은 문서(page_content)로 문자 n-gram BM25 인덱스 생성 (문서 번호 = FAISS 벡터 번호)"""
+    from app.services.lexical_index import BM25Index
+    from app.services.vector_index import lookup_documents
+
+    vectorstore = get_vectorstore()
+    total = vectorstore.index.ntotal
+
+    def texts():
+        for start in range(0, total, 1000):
+            for document in lookup_documents(vectorstore, range(start, min(start + 1000, total))):
+                yield document.page_content
+
+    index = BM25Index(texts(), ngram_range=ActiveConfig.RAG_LEXICAL_NGRAM_RANGE)
+    print(f"BM25 인덱스 생성 (문서 {index.num_documents}개, 용어 {len(index.vocabulary)}개)")
+    return index
+
+
+# hybrid / lexical 검색이나 lexical 대체 검색을 쓸 때만 등록 (vector 전용이면 만들지 않음)
+lexical_resource = (
+    resources.register("lexical_index", _load_lexical_index, required=False)
+    if ActiveConfig.RAG_RETRIEVAL_MODE != "vector" or ActiveConfig.RAG_LEXICAL_FALLBACK_MS > 0
+    else None
+)
+
+
+# 질의 임베딩이 느리거나 실패할 때 BM25만 쓰도록 판단
+embedding_latency_guard = EmbeddingLatencyGuard(
+    ActiveConfig.RAG_LEXICAL_FALLBACK_MS if lexical_resource is not None else 0
+)
+
+
+def _search(user_message, request_class, k, fetch_k, mode):
+    """
+    검색 방식에 따라 FAISS 벡터 번호 검색 (retrieve_relevant_documents / retrieve_context_documents 공용)
+    :param fetch_k: hybrid에서 각 검색 결과를 가져올 수 (vector 전용이면 k만 사용)
+    :return: (벡터 저장소, 벡터 번호 리스트 - 좋은 순서)
+    """
+    mode = mode or ActiveConfig.RAG_RETRIEVAL_MODE
+    if mode != "vector" and lexical_resource is None:
+        raise RuntimeError(f"{mode} 검색에는 BM25 인덱스가 필요합니다. RAG_RETRIEVAL_MODE를 확인하세요.")
+
+    try:
+        vectorstore = get_vectorstore()
+    except RuntimeError:
+        raise RuntimeError("retriever가 초기화되지 않았습니다. 벡터 DB를 확인하세요.")
+
+    from app.services.lexical_index import reciprocal_rank_fusion
+    from app.services.vector_index import search_vectorstore_ids
+
+    # 임베딩이 느린 동안에는 BM25만 사용
+    if mode != "lexical" and embedding_latency_guard.use_lexical_only():
+        mode = "lexical"
+        metrics.incr("rag.retrieval.lexical_fallback")
+
+    params = ActiveConfig.VECTOR_SEARCH_PARAMS.get(request_class, {})
+    fetch_k = k if mode == "vector" else max(k, fetch_k)
+    try:
+        vector_ids = None
+        if mode != "lexical":
+            started = time.perf_counter()
+            try:
+                embedding = vectorstore.embedding_function.embed_query(user_message)
+            except Exception as e:
+                if lexical_resource is None:
+                    raise
+                embedding_latency_guard.record_failure()
+                metrics.incr("rag.retrieval.lexical_fallback")
+                logging.warning(f"질의 임베딩 실패, BM25 검색으로 대체: {e}")
+                mode = "lexical"
+            else:
+                embedding_latency_guard.record(time.perf_counter() - started)
+                with metrics.timer("rag.vector_search"):
+                    vector_ids = search_vectorstore_ids(
+                        vectorstore, embedding, fetch_k, nprobe=params.get("nprobe"), ef_search=params.get("ef_search")
+                    )
+
+        lexical_ids = None
+        if mode != "vector":
+            with metrics.timer("rag.lexical_search"):
+                lexical_ids, _ = lexical_resource.get().search(user_message, fetch_k)
+
+        if vector_ids is not None and lexical_ids is not None:
+            ids = reciprocal_rank_fusion([vector_ids, lexical_ids], ActiveConfig.RAG_RRF_K)
+        else:
+            ids = vector_ids if vector_ids is not None else lexical_ids
+        metrics.incr(f"rag.retrieval.{mode}")
+        return vectorstore, ids[:k]
+    except Exception as e:
+        raise RuntimeError(f"RAG 검색 중 오류 발생: {str(e)}")
+
+
+def retrieve_relevant_documents(user_message, request_class="chat", k=4, mode=None):
     """
     사용자의 입력을 기반으로 FAISS 벡터 DB에서 관련 문서를 검색하는 함수
 
     매개변수:
         user_message (str): 사용자가 입력한 메시지
+        request_class (str): 검색 파라미터를 고를 요청 종류 (VECTOR_SEARCH_PARAMS의 키, 예: chat / preview)
+        k (int): 검색할 문서 수
+        mode (str): 검색 방식 vector / hybrid / lexical (기본값: RAG_RETRIEVAL_MODE)
 
     반환값:
         list: 검색된 문서 리스트 (각 문서는 metadata에 'output' 필드 포함)
     """
-    if retriever is None:
-        raise RuntimeError("retriever가 초기화되지 않았습니다. 벡터 DB를 확인하세요.")
+    from app.services.vector_index import lookup_documents
 
-    try:
-        search_results = retriever.get_relevant_documents(user_message)
-        return search_results
-    except Exception as e:
-        raise RuntimeError(f"RAG 검색 중 오류 발생: {str(e)}")
+    vectorstore, ids = _search(user_message, request_class, k, ActiveConfig.RAG_HYBRID_FETCH_K, mode)
+    return lookup_documents(vectorstore, ids)
+
+
+def retrieve_context_documents(user_message, request_class="chat", k=4, mode=None):
+    """
+    챗봇 프롬프트에 넣을 상담 사례 검색
+    RAG_CONTEXT_SELECTION이 켜져 있으면 RAG_CONTEXT_FETCH_K개를 검색한 뒤
+    중복 사례 제거 → MMR 다양화 → 토큰 예산(RAG_CONTEXT_TOKEN_BUDGET)으로 k개 이하 선택
+
+    매개변수:
+        user_message (str): 사용자가 입력한 메시지
+        k (int): 프롬프트에 넣을 최대 상담 사례 수
+
+    반환값:
+        list: 선택된 문서 리스트 (retrieve_relevant_documents와 같은 형식)
+    """
+    if not ActiveConfig.RAG_CONTEXT_SELECTION:
+        return retrieve_relevant_documents(user_message, request_class, k, mode)
+
+    from app.services.context_selection import select_context_documents
+    from app.services.vector_index import lookup_documents, reconstruct_vectors
+
+    fetch_k = max(k, ActiveConfig.RAG_CONTEXT_FETCH_K)
+    vectorstore, ids = _search(user_message, request_class, fetch_k, fetch_k, mode)
+    documents = lookup_documents(vectorstore, ids)
+    vectors = None
+    if ActiveConfig.RAG_CONTEXT_DUPLICATE_COSINE:
+        vectors = reconstruct_vectors(vectorstore.index, ids)
+        if vectors is not None and len(vectors) != len(documents):
+            vectors = None
+
+    with metrics.timer("rag.context_selection"):
+        selected, stats = select_context_documents(
+            documents,
+            [document_output(doc) or doc.page_content.strip() for doc in documents],
+            k,
+            vectors=vectors,
+            duplicate_jaccard=ActiveConfig.RAG_CONTEXT_DUPLICATE_JACCARD,
+            duplicate_cosine=ActiveConfig.RAG_CONTEXT_DUPLICATE_COSINE,
+            mmr_lambda=ActiveConfig.RAG_MMR_LAMBDA,
+            token_budget=ActiveConfig.RAG_CONTEXT_TOKEN_BUDGET,
+        )
+    metrics.incr("rag.context.turns")
+    metrics.incr("rag.context.duplicates", stats["duplicates"])
+    metrics.incr("rag.context.tokens", stats["tokens"])
+    return selected
+
+
+def document_output(doc):
+    """
+    검색된 문서에서 상담 사례 답변(output) 추출
+
+    매개변수:
+        doc (Document): FAISS 검색 결과 문서
+
+    반환값:
+        str: metadata의 'output' 또는 "output:" 접두어를 제거한 page_content (없으면 빈 문자열)
+    """
+    if hasattr(doc, "metadata") and doc.metadata and "output" in doc.metadata:
+        return doc.metadata["output"].strip()
+    if hasattr(doc, "page_content") and doc.page_content:
+        # "output:" 접두어 제거
+        if doc.page_content.lower().startswith("output:"):
+            return doc.page_content[len("output:") :].strip()
+    return ""
+
+
+def format_retrieved_context(documents):
+    """
+    검색된 문서를 프롬프트의 참고 상담 사례(context) 문자열로 변환
+
+    매개변수:
+        documents (list): retrieve_relevant_documents / retrieve_context_documents 검색 결과
+
+    반환값:
+        str: 상담 사례를 줄바꿈으로 이은 문자열 (검색 결과가 없으면 빈 문자열)
+    """
+    contents = []
+    for doc in documents or []:
+        # output이 없는 문서는 본문 그대로 사용
+        content = document_output(doc) or getattr(doc, "page_content", "").strip()
+        if content:
+            contents.append(content)
+    return "\n".join(contents)
+
+
+def rag_stats():
+    """
+    RAG 검색 지표
+    벡터 저장소 형식, 인덱스 종류/크기, 검색 방식별 횟수, 프롬프트 상담 사례 평균 토큰 수,
+    요청 종류별 검색 파라미터, 질의 임베딩 캐시 적중률
+    """
+    index = None
+    if retriever_resource.state == READY:
+        from app.services.vector_index import index_type_of
+
+        vectorstore = get_vectorstore()
+        faiss_index = vectorstore.index
+        index = {
+            "format": vector_store_format(vectorstore),
+            "type": index_type_of(faiss_index),
+            "vectors": int(faiss_index.ntotal),
+            "dimension": int(faiss_index.d),
+        }
+    lexical = None
+    if lexical_resource is not None and lexical_resource.state == READY:
+        lexical_index = lexical_resource.get()
+        lexical = {
+            "documents": lexical_index.num_documents,
+            "terms": len(lexical_index.vocabulary),
+            "postings_mb": round(lexical_index.memory_bytes() / 2**20, 1),
+        }
+    counters = metrics.snapshot()["counters"]
+    turns = counters.get("rag.context.turns", 0)
+    return {
+        "index": index,
+        "retrieval": {
+            "mode": ActiveConfig.RAG_RETRIEVAL_MODE,
+            "counts": {
+                name.rsplit(".", 1)[1]: value for name, value in counters.items() if name.startswith("rag.retrieval.")
+            },
+            "embedding_latency_ema_ms": round(embedding_latency_guard.ema_ms, 1),
+            "lexical_index": lexical,
+        },
+        "context": {
+            "selection": ActiveConfig.RAG_CONTEXT_SELECTION,
+            "turns": turns,
+            "avg_tokens": round(counters.get("rag.context.tokens", 0) / turns, 1) if turns else None,
+            "duplicates_removed": counters.get("rag.context.duplicates", 0),
+        },
+        "search_params": ActiveConfig.VECTOR_SEARCH_PARAMS,
+        "embedding_cache": embedding_cache.stats() if embedding_cache is not None else None,
+    }
 
 
 def preview_rag_search(user_message):
@@ -64,25 +394,10 @@ def preview_rag_search(user_message):
         dict: 검색된 상담 사례 리스트 또는 오류 메시지
     """
     try:
-        # 유사도 검색 수행
-        search_results = retriever.get_relevant_documents(user_message)
-
-        results = []
-        for doc in search_results:
-            # metadata에 "output" 필드가 있으면 사용
-            if hasattr(doc, "metadata") and doc.metadata and "output" in doc.metadata:
-                content = doc.metadata["output"].strip()
-            elif hasattr(doc, "page_content") and doc.page_content:
-                # "output:" 접두어 제거
-                if doc.page_content.lower().startswith("output:"):
-                    content = doc.page_content[len("output:") :].strip()
-                else:
-                    continue
-            else:
-                continue
+        # 유사도 검색 수행 (재현율 우선 검색 파라미터)
+        search_results = retrieve_relevant_documents(user_message, request_class="preview")
 
-            if content:
-                results.append(content)
+        results = [content for content in map(document_output, search_results) if content]
 
         if not results:
             return {
@@ -0,0 +1,177 @@
+"""
+# RAG 벡터 인덱스 종류 / 검색 파라미터
+
+FAISS 인덱스 생성과 요청 종류별 검색 파라미터 적용 담당
+- flat : 전수 검색 (정확, 문서 수에 비례하는 검색 비용)
+- ivf_flat : nlist개 클러스터 중 nprobe개만 검색 (원본 벡터 보관)
+- ivf_pq : IVF + Product Quantization (벡터를 pq_m 바이트로 압축, 메모리 최소)
+- hnsw : 그래프 탐색 (efSearch 클수록 정확/느림, 학습 불필요, 메모리는 flat보다 큼)
+인덱스 종류는 벡터 DB 생성 시 설정(VECTOR_INDEX_TYPE)으로 정하고 파일에 저장되므로 로드 시 자동으로 결정
+검색 파라미터(nprobe, efSearch)는 공유 인덱스를 바꾸지 않고 검색 호출마다 SearchParameters로 전달
+(요청 종류별로 동시에 다른 값을 써도 안전)
+"""
+
+import math
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+
+def default_nlist(num_vectors):
+    """IVF 클러스터 수 기본값 (약 4*sqrt(N), 클러스터당 학습 벡터 39개 이상 되도록 제한)"""
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39 or 1))
+
+
+def build_faiss_index(vectors, index_type="flat", nlist=0, pq_m=16, pq_bits=8, hnsw_m=32, ef_construction=200):
+    """
+    벡터로 FAISS 인덱스 생성 (L2 거리, IVF 계열은 학습 포함)
+    :param vectors: (N, D) float32 벡터
+    :param index_type: flat / ivf_flat / ivf_pq / hnsw
+    :param nlist: IVF 클러스터 수 (0이면 default_nlist)
+    :param pq_m: PQ 하위 벡터 수 (차원 D의 약수, 벡터당 pq_m * pq_bits / 8 바이트)
+    :param pq_bits: PQ 하위 벡터당 비트 수
+    :param hnsw_m: HNSW 노드당 이웃 수
+    :param ef_construction: HNSW 생성 시 탐색 폭
+    :return: 벡터가 추가된 faiss 인덱스
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    num_vectors, dimension = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension)
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = nlist or default_nlist(num_vectors)
+        quantizer = faiss.IndexFlatL2(dimension)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_L2)
+        else:
+            if dimension % pq_m:
+                raise ValueError(f"PQ 하위 벡터 수(pq_m={pq_m})는 벡터 차원({dimension})의 약수여야 합니다.")
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, pq_m, pq_bits)
+        index.train(vectors)
+        # quantizer는 인덱스가 소유하도록 (Python 객체 해제 후에도 유지)
+        index.own_fields = True
+        quantizer.this.disown()
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m)
+        index.hnsw.efConstruction = ef_construction
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 종류입니다: {index_type} (지원: {', '.join(INDEX_TYPES)})")
+
+    index.add(vectors)
+    return index
+
+
+def index_type_of(index):
+    """로드한 faiss 인덱스의 종류 이름"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf_flat"
+    return "flat"
+
+
+def index_memory_bytes(index):
+    """인덱스 메모리 크기 근사값 (직렬화 크기)"""
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def search_parameters(index, nprobe=None, ef_search=None):
+    """
+    인덱스 종류에 맞는 검색 파라미터 객체 (해당 없는 값은 무시)
+    :return: faiss.SearchParameters 또는 None (flat / 지정 없음)
+    """
+    index_type = index_type_of(index)
+    if index_type in ("ivf_flat", "ivf_pq") and nprobe:
+        return faiss.SearchParametersIVF(nprobe=int(nprobe))
+    if index_type == "hnsw" and ef_search:
+        return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+    return None
+
+
+def search_index(index, query_vectors, k, params=None):
+    """
+    검색 파라미터를 적용해 검색
+    :param query_vectors: (Q, D) float32 질의 벡터
+    :return: (거리 (Q, k), 벡터 번호 (Q, k) - 결과가 부족하면 -1)
+    """
+    query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32)
+    if params is None:
+        return index.search(query_vectors, k)
+    return index.search(query_vectors, k, params=params)
+
+
+def search_vectorstore(vectorstore, query, k=4, nprobe=None, ef_search=None):
+    """
+    LangChain FAISS / mmap 벡터 저장소에서 검색 파라미터를 적용해 문서 검색
+    :param vectorstore: langchain_community FAISS 또는 MmapVectorStore 객체
+    :param query: 검색 문장
+    :return: Document 리스트 (가까운 순서)
+    """
+    return search_vectorstore_by_vector(
+        vectorstore, vectorstore.embedding_function.embed_query(query), k, nprobe=nprobe, ef_search=ef_search
+    )
+
+
+def search_vectorstore_by_vector(vectorstore, embedding, k=4, nprobe=None, ef_search=None):
+    """
+    질의 벡터로 검색 (search_vectorstore 참고)
+    :param embedding: 질의 벡터
+    """
+    return lookup_documents(vectorstore, search_vectorstore_ids(vectorstore, embedding, k, nprobe, ef_search))
+
+
+def search_vectorstore_ids(vectorstore, embedding, k=4, nprobe=None, ef_search=None):
+    """
+    질의 벡터로 검색해서 FAISS 벡터 번호만 반환
+    :return: 벡터 번호 리스트 (가까운 순서, 결과가 부족하면 k개보다 적음)
+    """
+    vector = np.asarray([embedding], dtype=np.float32)
+    if getattr(vectorstore, "_normalize_L2", False):
+        faiss.normalize_L2(vector)
+
+    params = search_parameters(vectorstore.index, nprobe, ef_search)
+    _, indices = search_index(vectorstore.index, vector, k, params)
+    return [int(i) for i in indices[0] if i != -1]
+
+
+def enable_reconstruct(index):
+    """IVF 계열 인덱스에서 벡터 번호로 벡터를 복원할 수 있도록 direct map 생성 (로드 시 한 번)"""
+    base = faiss.downcast_index(index)
+    if isinstance(base, faiss.IndexIVF):
+        base.make_direct_map()
+
+
+def reconstruct_vectors(index, ids):
+    """
+    벡터 번호의 저장된 벡터 (ivf_pq는 압축 복원값)
+    :return: (N, D) float32 배열, 복원할 수 없는 인덱스면 None
+    """
+    if not ids:
+        return None
+    try:
+        return np.vstack([index.reconstruct(int(i)) for i in ids])
+    except RuntimeError:
+        return None
+
+
+def lookup_documents(vectorstore, ids):
+    """
+    FAISS 벡터 번호 → Document 리스트 (LangChain FAISS / mmap 형식 공용)
+    :param ids: 벡터 번호 반복자
+    """
+    # mmap 형식은 해당 레코드만 직접 읽음
+    if hasattr(vectorstore, "documents_for"):
+        return vectorstore.documents_for(ids)
+
+    documents = []
+    for i in ids:
+        document = vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(i)])
+        if not isinstance(document, str):
+            documents.append(document)
+    return documents
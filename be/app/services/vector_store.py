@@ -0,0 +1,189 @@
+"""
+# RAG 벡터 저장소 (mmap 형식)
+
+LangChain FAISS.save_local 형식(index.faiss + index.pkl)은 로드 시 인덱스 전체를 프로세스 메모리로 읽고
+Document 전체를 unpickle하므로 워커마다 같은 데이터를 따로 들고 있음
+mmap 형식은 같은 디렉토리 구성에서 index.pkl 대신 아래 파일을 사용
+- index.faiss : FAISS 인덱스 (IO_FLAG_MMAP_IFC로 벡터/그래프를 파일 매핑, 읽기 전용)
+- docs.bin : 문서 레코드(JSON {"page_content", "metadata"} UTF-8)를 이어 붙인 파일
+- docs.offsets.npy : 레코드 시작 위치 (N+1개 uint64, 레코드 i = offsets[i]:offsets[i+1])
+레코드 순서는 FAISS 벡터 번호와 같음 (인덱스 벡터 수보다 많은 레코드는 추가 중단으로 남은 것이라 무시)
+로드는 파일 매핑만 하므로 즉시 끝나고, 검색은 결과로 나온 레코드 페이지만 읽음
+매핑한 페이지는 OS 페이지 캐시라서 같은 파일을 여는 워커끼리 공유
+"""
+
+import json
+import mmap
+import os
+import pickle
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+INDEX_FILE = "index.faiss"
+DOCS_FILE = "docs.bin"
+OFFSETS_FILE = "docs.offsets.npy"
+
+
+def is_mmap_store(index_dir):
+    """mmap 형식 벡터 저장소 디렉토리인지 여부"""
+    return os.path.exists(os.path.join(index_dir, OFFSETS_FILE))
+
+
+def write_mmap_store(output_dir, index, documents):
+    """
+    FAISS 인덱스와 문서를 mmap 형식으로 저장
+    :param index: faiss 인덱스
+    :param documents: (page_content, metadata) 반복자 (FAISS 벡터 번호 순서, 인덱스 벡터 수와 같아야 함)
+    :return: 저장한 문서 수
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    offsets = [0]
+    with open(os.path.join(output_dir, DOCS_FILE), "wb") as f:
+        for page_content, metadata in documents:
+            record = json.dumps({"page_content": page_content, "metadata": metadata}, ensure_ascii=False)
+            offsets.append(offsets[-1] + f.write(record.encode("utf-8")))
+
+    if len(offsets) - 1 != index.ntotal:
+        raise ValueError(f"문서 수({len(offsets) - 1})와 인덱스 벡터 수({index.ntotal})가 다릅니다.")
+    np.save(os.path.join(output_dir, OFFSETS_FILE), np.asarray(offsets, dtype=np.uint64))
+    faiss.write_index(index, os.path.join(output_dir, INDEX_FILE))
+    return len(offsets) - 1
+
+
+def append_mmap_store(index_dir, vectors, documents, index_type="flat", **index_options):
+    """
+    mmap 형식 저장소에 벡터/문서 추가 (저장소가 없으면 index_type으로 새로 생성)
+    순서 : docs.bin 끝에 레코드 추가 → docs.offsets.npy 교체 → index.faiss 교체 (임시 파일 + os.replace)
+    중간에 중단되어도 레코드가 인덱스보다 많을 뿐이라 로드 가능 (다음 추가 시 남은 레코드 정리)
+    실행 중인 서버는 교체 전 파일을 계속 매핑하므로 영향 없음 (재시작 시 새 파일 로드)
+    :param vectors: (N, D) float32 벡터
+    :param documents: (page_content, metadata) 리스트 (vectors와 같은 순서)
+    :return: 추가 후 전체 문서 수
+    """
+    from app.services.vector_index import build_faiss_index
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if len(vectors) != len(documents):
+        raise ValueError(f"벡터 수({len(vectors)})와 문서 수({len(documents)})가 다릅니다.")
+
+    if not is_mmap_store(index_dir):
+        if os.path.exists(os.path.join(index_dir, "index.pkl")):
+            raise ValueError(f"LangChain 형식 벡터 DB입니다. scripts.convert_vector_db로 mmap 형식으로 변환하세요: {index_dir}")
+        return write_mmap_store(index_dir, build_faiss_index(vectors, index_type, **index_options), documents)
+
+    index = faiss.read_index(os.path.join(index_dir, INDEX_FILE))
+    if index.d != vectors.shape[1]:
+        raise ValueError(f"벡터 차원({vectors.shape[1]})이 인덱스 차원({index.d})과 다릅니다.")
+    # 이전 추가가 중단되어 인덱스에 들어가지 못한 레코드는 버림
+    offsets = [int(offset) for offset in np.load(os.path.join(index_dir, OFFSETS_FILE))[: index.ntotal + 1]]
+
+    with open(os.path.join(index_dir, DOCS_FILE), "r+b") as f:
+        f.seek(offsets[-1])
+        f.truncate()
+        for page_content, metadata in documents:
+            record = json.dumps({"page_content": page_content, "metadata": metadata}, ensure_ascii=False)
+            offsets.append(offsets[-1] + f.write(record.encode("utf-8")))
+        f.flush()
+        os.fsync(f.fileno())
+
+    index.add(vectors)
+    offsets_tmp = os.path.join(index_dir, "docs.offsets.tmp.npy")
+    np.save(offsets_tmp, np.asarray(offsets, dtype=np.uint64))
+    os.replace(offsets_tmp, os.path.join(index_dir, OFFSETS_FILE))
+    index_tmp = os.path.join(index_dir, "index.faiss.tmp")
+    faiss.write_index(index, index_tmp)
+    os.replace(index_tmp, os.path.join(index_dir, INDEX_FILE))
+    return int(index.ntotal)
+
+
+def iter_mmap_documents(index_dir):
+    """mmap 형식 저장소의 문서를 벡터 번호 순서로 반환 (인덱스에 들어간 레코드만)"""
+    index = read_mmap_index(index_dir)
+    docstore = OffsetDocstore(index_dir)
+    for i in range(index.ntotal):
+        document = docstore.get(i)
+        yield document.page_content, document.metadata
+
+
+def langchain_documents(index_dir):
+    """
+    LangChain 형식 벡터 DB의 문서를 FAISS 벡터 번호 순서로 반환 (mmap 형식 변환용)
+    :return: (page_content, metadata) 제너레이터
+    """
+    with open(os.path.join(index_dir, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    for i in range(len(index_to_docstore_id)):
+        document = docstore.search(index_to_docstore_id[i])
+        yield document.page_content, document.metadata
+
+
+def read_mmap_index(index_dir):
+    """index.faiss를 파일 매핑으로 로드 (벡터를 프로세스 메모리로 복사하지 않음, 읽기 전용)"""
+    return faiss.read_index(os.path.join(index_dir, INDEX_FILE), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+
+
+class OffsetDocstore:
+    """docs.bin / docs.offsets.npy 기반 문서 조회 (요청한 레코드만 읽음)"""
+
+    def __init__(self, index_dir):
+        self.offsets = np.load(os.path.join(index_dir, OFFSETS_FILE), mmap_mode="r")
+        with open(os.path.join(index_dir, DOCS_FILE), "rb") as f:
+            # 빈 파일은 매핑할 수 없음 (문서 0건)
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, i):
+        """i번째 문서 (FAISS 벡터 번호 i)"""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        record = json.loads(self._data[start:end].decode("utf-8"))
+        return Document(page_content=record["page_content"], metadata=record["metadata"])
+
+
+class MmapVectorStore(VectorStore):
+    """
+    mmap 형식 벡터 저장소 (읽기 전용)
+    LangChain VectorStore 인터페이스라서 as_retriever() 등 기존 사용처와 호환
+    """
+
+    def __init__(self, index, docstore, embedding_function):
+        self.index = index
+        self.docstore = docstore
+        self.embedding_function = embedding_function
+        # LangChain FAISS와 같은 속성 (벡터 DB를 정규화 없이 만든 경우 False)
+        self._normalize_L2 = False
+
+    @classmethod
+    def load(cls, index_dir, embedding_function):
+        """디렉토리에서 mmap 형식 벡터 저장소 로드"""
+        index = read_mmap_index(index_dir)
+        docstore = OffsetDocstore(index_dir)
+        if len(docstore) < index.ntotal:
+            raise ValueError(f"문서 수({len(docstore)})가 인덱스 벡터 수({index.ntotal})보다 적습니다.")
+        return cls(index, docstore, embedding_function)
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    def documents_for(self, ids):
+        """FAISS 검색 결과 번호 → Document 리스트 (-1 제외)"""
+        return [self.docstore.get(int(i)) for i in ids if i != -1]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        from app.services.vector_index import search_vectorstore_by_vector
+
+        return search_vectorstore_by_vector(
+            self, embedding, k, nprobe=kwargs.get("nprobe"), ef_search=kwargs.get("ef_search")
+        )
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector(self.embedding_function.embed_query(query), k, **kwargs)
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError("mmap 형식 벡터 저장소는 scripts.build_vector_db / scripts.convert_vector_db로 생성합니다.")
@@ -0,0 +1,114 @@
+"""
+# 웹캠 프레임 디코딩 유틸리티
+
+요청 버퍼에서 바로 디코딩하고(추가 복사 없음), 원본이 모델 입력(224px)보다 훨씬 크면
+OpenCV의 축소 디코딩 모드(IMREAD_REDUCED_COLOR_2/4/8)로 1/2, 1/4, 1/8 크기로 디코딩
+JPEG는 DCT 단계에서 축소되므로 전체 해상도 디코딩 후 리사이즈하는 것보다 훨씬 빠름
+"""
+
+import math
+import struct
+
+import cv2
+import numpy as np
+
+# 축소 배율별 OpenCV 디코딩 플래그 (큰 배율부터 시도)
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# 길이 필드가 없는 JPEG 마커 (SOI, EOI, RSTn, TEM)
+_STANDALONE_MARKERS = {0xD8, 0xD9, 0x01} | set(range(0xD0, 0xD8))
+
+# 이미지 크기 정보를 담은 SOF 마커 (DHT, JPG, DAC 제외)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(buffer):
+    """JPEG 헤더(SOF 세그먼트)에서 (width, height) 추출"""
+    view = memoryview(buffer)
+    size = len(view)
+    i = 2
+    while i + 9 < size:
+        if view[i] != 0xFF:
+            return None
+        marker = view[i + 1]
+        if marker == 0xFF:  # 채움 바이트
+            i += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker in _SOF_MARKERS:
+            height, width = struct.unpack(">HH", view[i + 5 : i + 9])
+            return width, height
+        segment_length = struct.unpack(">H", view[i + 2 : i + 4])[0]
+        i += 2 + segment_length
+    return None
+
+
+def image_dimensions(buffer):
+    """
+    디코딩 없이 헤더만 읽어 이미지 크기 확인 (JPEG, PNG 지원)
+    :param buffer: 인코딩된 이미지 바이트 (bytes / memoryview / numpy 배열)
+    :return: (width, height) 또는 알 수 없으면 None
+    """
+    header = bytes(memoryview(buffer)[:24])
+    if header[:2] == b"\xff\xd8":
+        return _jpeg_dimensions(buffer)
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and len(header) >= 24:
+        width, height = struct.unpack(">II", header[16:24])
+        return width, height
+    return None
+
+
+def reduced_decode_flag(dimensions, min_side):
+    """
+    짧은 변이 min_side 이상 유지되는 가장 큰 축소 배율의 디코딩 플래그 선택
+    :param dimensions: (width, height) 또는 None
+    :param min_side: 디코딩 결과의 짧은 변 최소 길이
+    """
+    if dimensions is None:
+        return cv2.IMREAD_COLOR, 1
+
+    short_side = min(dimensions)
+    for factor, flag in _REDUCED_FLAGS:
+        if short_side // factor >= min_side:
+            return flag, factor
+    return cv2.IMREAD_COLOR, 1
+
+
+def frame_decode_min_side(min_side, face_detection=False, face_fraction=0.35):
+    """
+    축소 디코딩 결과의 짧은 변 최소 길이
+    얼굴 검출을 쓰면 분류기 입력은 프레임 전체가 아니라 얼굴 영역이므로
+    예상 얼굴 박스(프레임 짧은 변 × face_fraction)가 min_side 이상 남도록 기준을 키움
+    :param min_side: 분류기 입력 크기 기준 (0이면 항상 원본 해상도)
+    :param face_detection: 얼굴 영역만 분류기에 넣는지 여부
+    :param face_fraction: 프레임 짧은 변 대비 예상 얼굴 박스 크기 (0이면 얼굴 검출 시 축소 디코딩 안 함)
+    """
+    if not min_side or not face_detection:
+        return min_side
+    if face_fraction <= 0:
+        return 0
+    return math.ceil(min_side / min(face_fraction, 1.0))
+
+
+def decode_frame(buffer, min_side=224):
+    """
+    인코딩된 프레임을 복사 없이 디코딩 (가능하면 축소 디코딩)
+    :param buffer: 요청 본문 바이트 (bytes / bytearray / memoryview)
+    :param min_side: 디코딩 결과의 짧은 변 최소 길이 (0이면 항상 원본 해상도)
+    :return: OpenCV BGR 이미지 또는 디코딩 실패 시 None
+    """
+    if not buffer:
+        return None
+
+    np_array = np.frombuffer(buffer, np.uint8)
+    if min_side:
+        flag, _ = reduced_decode_flag(image_dimensions(buffer), min_side)
+    else:
+        flag = cv2.IMREAD_COLOR
+    return cv2.imdecode(np_array, flag)
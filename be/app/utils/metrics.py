@@ -0,0 +1,89 @@
+"""
+# 프로세스 내 성능 지표 수집
+
+카운터(처리 건수, 캐시 적중 등)와 구간별 소요 시간(최근 샘플 기준 p50/p95/p99)을 기록
+/emotion/metrics 등에서 snapshot()으로 조회
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class MetricsRegistry:
+    """스레드 안전한 카운터/타이머 저장소"""
+
+    def __init__(self, max_samples=2048):
+        """
+        :param max_samples: 타이머별로 보관할 최근 샘플 수 (백분위수 계산용)
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._timings = {}
+
+    def incr(self, name, value=1):
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name, seconds):
+        """소요 시간(초) 기록"""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "samples": deque(maxlen=self.max_samples),
+                }
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+            timing["samples"].append(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """with 블록의 소요 시간을 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def reset(self):
+        """모든 지표 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    def snapshot(self):
+        """현재 지표를 JSON 직렬화 가능한 딕셔너리로 반환 (시간 단위: ms)"""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                name: (t["count"], t["total"], t["max"], list(t["samples"]))
+                for name, t in self._timings.items()
+            }
+
+        summary = {}
+        for name, (count, total, max_value, samples) in timings.items():
+            values = np.asarray(samples, dtype=np.float64) * 1000.0
+            summary[name] = {
+                "count": count,
+                "avg_ms": round(total / count * 1000.0, 3) if count else 0.0,
+                "max_ms": round(max_value * 1000.0, 3),
+                "p50_ms": round(float(np.percentile(values, 50)), 3) if values.size else 0.0,
+                "p95_ms": round(float(np.percentile(values, 95)), 3) if values.size else 0.0,
+                "p99_ms": round(float(np.percentile(values, 99)), 3) if values.size else 0.0,
+            }
+
+        return {"counters": counters, "timings": summary}
+
+
+# 애플리케이션 전역 지표
+metrics = MetricsRegistry()
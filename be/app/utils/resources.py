@@ -0,0 +1,143 @@
+"""
+# 무거운 리소스 지연 로드 레지스트리
+
+감정 모델, FAISS 벡터 DB, LLM 클라이언트처럼 로드 비용이 큰 리소스를 모듈 import 시점이 아니라
+- 처음 사용할 때 (get) 또는
+- 앱 시작 시 백그라운드 스레드에서 미리 (warm_up)
+로드. 같은 리소스는 한 번만 로드되며 로드 중인 리소스를 요청한 스레드는 완료까지 대기
+/ready 엔드포인트가 status()로 리소스별 상태(pending / loading / ready / failed)를 보고
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyResource:
+    """처음 사용할 때 한 번만 로드되는 리소스"""
+
+    def __init__(self, name, loader, required=True):
+        """
+        :param name: 리소스 이름 (/ready 응답 키)
+        :param loader: 리소스를 생성해서 반환하는 함수
+        :param required: False이면 로드 실패해도 준비 상태 판단에서 제외
+        """
+        self.name = name
+        self.loader = loader
+        self.required = required
+        self.state = PENDING
+        self.error = None
+        self.load_seconds = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        리소스 반환 (로드 전이면 로드, 다른 스레드가 로드 중이면 완료까지 대기)
+        실패한 리소스는 다음 호출 시 다시 로드를 시도
+        """
+        if self.state == READY:
+            return self._value
+
+        with self._lock:
+            if self.state == READY:
+                return self._value
+
+            self.state = LOADING
+            started = time.perf_counter()
+            try:
+                value = self.loader()
+            except Exception as e:
+                self.state = FAILED
+                self.error = f"{type(e).__name__}: {e}"
+                logging.error(f"리소스 로드 실패 ({self.name}): {self.error}")
+                raise RuntimeError(f"{self.name} 로드 실패: {self.error}") from e
+
+            self._value = value
+            self.load_seconds = time.perf_counter() - started
+            self.error = None
+            self.state = READY
+            print(f"리소스 로드 완료: {self.name} ({self.load_seconds:.2f}s)")
+            return value
+
+    def status(self):
+        return {
+            "state": self.state,
+            "required": self.required,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class ResourceRegistry:
+    """이름으로 등록된 지연 로드 리소스 모음"""
+
+    def __init__(self):
+        self._resources = {}
+        self._warmer = None
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, required=True):
+        """
+        리소스 등록 (로드는 하지 않음)
+        :return: LazyResource (모듈 전역에 보관해서 get()으로 사용)
+        """
+        with self._lock:
+            if name in self._resources:
+                raise ValueError(f"이미 등록된 리소스입니다: {name}")
+            resource = self._resources[name] = LazyResource(name, loader, required)
+        return resource
+
+    def get(self, name):
+        """이름으로 리소스 값 조회 (필요하면 로드)"""
+        return self._resources[name].get()
+
+    def warm_up(self, names=None, background=True):
+        """
+        등록된 리소스를 미리 로드
+        :param names: 로드할 리소스 이름 목록 (기본값: 전체, 등록 순서대로)
+        :param background: True면 데몬 스레드에서 로드하고 바로 반환
+        :return: 백그라운드 스레드 또는 None
+        """
+        # multiprocessing 자식(추론 워커 등)이 앱 모듈을 다시 실행해도 리소스를 로드하지 않음
+        if multiprocessing.parent_process() is not None:
+            return None
+
+        targets = [self._resources[name] for name in (names or list(self._resources))]
+
+        def load_all():
+            for resource in targets:
+                try:
+                    resource.get()
+                except RuntimeError:
+                    # 실패 상태는 /ready에 보고되고 첫 사용 시 다시 시도
+                    pass
+
+        if not background:
+            load_all()
+            return None
+
+        with self._lock:
+            if self._warmer is not None and self._warmer.is_alive():
+                return self._warmer
+            self._warmer = threading.Thread(target=load_all, name="resource-warmup", daemon=True)
+            self._warmer.start()
+        return self._warmer
+
+    def ready(self):
+        """필수 리소스가 모두 로드되었는지 여부"""
+        return all(r.state == READY for r in self._resources.values() if r.required)
+
+    def status(self):
+        """리소스별 상태"""
+        return {name: resource.status() for name, resource in self._resources.items()}
+
+
+# 앱 전역 리소스 레지스트리
+resources = ResourceRegistry()
@@ -0,0 +1,5 @@
+"""
+# 백엔드 성능 벤치마크 모음
+
+be/ 디렉토리에서 `python -m benchmarks.<모듈명>` 형태로 실행
+"""
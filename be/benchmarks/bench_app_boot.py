@@ -0,0 +1,140 @@
+"""
+앱 시작 시간 벤치마크 : 리소스 로드 시점(RESOURCE_WARMUP)별 import / create_app / 준비 완료 시간
+
+모드마다 새 프로세스에서
+- `import app.routes` 소요 시간
+- `create_app()` 반환까지 걸린 시간 (요청을 받을 수 있게 되는 시점)
+- /ready가 200을 반환할 때까지 걸린 시간 (lazy 모드는 첫 사용 전까지 준비되지 않으므로 생략)
+- create_app 직후 / 준비 완료 후 RSS, TensorFlow가 import 시점에 로드되었는지 여부
+를 측정. eager 모드가 기존 동작(앱 시작 시 모든 리소스 로드)과 같음
+--importtime을 주면 python -X importtime 기준 누적 import 시간이 큰 모듈 상위 N개를 함께 출력
+
+실제 환경 변수(MODEL_PATH, VECTOR_DB_PATH, OPENAI_API_KEY 등)가 설정된 상태에서 실행해야 준비 완료 시간이 의미 있음
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_app_boot --modes eager,background,lazy --repeats 3 --importtime 15
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, write_results
+
+BE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 새 프로세스에서 실행할 측정 코드 (결과는 마지막 줄에 JSON으로 출력)
+CHILD_CODE = """
+import json, sys, time
+started = time.perf_counter()
+import app.routes
+import_s = time.perf_counter() - started
+tf_on_import = "tensorflow" in sys.modules
+
+from app import create_app
+from benchmarks.common import current_rss_mb
+application = create_app()
+create_app_s = time.perf_counter() - started
+rss_boot = current_rss_mb()
+
+client = application.test_client()
+ready_s = None
+if {wait_ready}:
+    deadline = started + {ready_timeout}
+    while time.perf_counter() < deadline:
+        if client.get("/ready").status_code == 200:
+            ready_s = time.perf_counter() - started
+            break
+        time.sleep(0.05)
+status = client.get("/ready").get_json()
+print(json.dumps({{
+    "import_s": import_s,
+    "create_app_s": create_app_s,
+    "ready_s": ready_s,
+    "rss_boot_mb": rss_boot,
+    "rss_ready_mb": current_rss_mb(),
+    "tf_on_import": tf_on_import,
+    "resources": status["resources"],
+}}))
+"""
+
+
+def run_child(mode, ready_timeout):
+    env = {**os.environ, "RESOURCE_WARMUP": mode}
+    code = CHILD_CODE.format(wait_ready=mode != "lazy", ready_timeout=ready_timeout)
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BE_DIR, env=env, capture_output=True, text=True
+    )
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f"{mode} 모드 실행 실패:\n{completed.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def import_profile(top):
+    """python -X importtime으로 `import app.routes`의 누적 import 시간 상위 모듈"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.routes"],
+        cwd=BE_DIR,
+        env={**os.environ, "RESOURCE_WARMUP": "lazy"},
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append({"module": name, "self_ms": int(self_us) / 1000.0, "cumulative_ms": int(cumulative_us) / 1000.0})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리소스 로드 시점별 앱 시작 시간 비교")
+    parser.add_argument("--modes", default="eager,background,lazy", help="쉼표로 구분한 RESOURCE_WARMUP 모드")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--ready-timeout", type=float, default=300.0, help="준비 완료 최대 대기 시간 (초)")
+    parser.add_argument("--importtime", type=int, default=0, help="누적 import 시간 상위 N개 모듈 출력")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    results = {"config": vars(args), "modes": {}}
+
+    for mode in [m for m in args.modes.split(",") if m]:
+        runs = [run_child(mode, args.ready_timeout) for _ in range(args.repeats)]
+        summary = {}
+        for key in ("import_s", "create_app_s", "ready_s", "rss_boot_mb", "rss_ready_mb"):
+            values = [run[key] for run in runs if run[key] is not None]
+            summary[key] = round(float(np.median(values)), 3) if values else None
+        summary["tf_on_import"] = any(run["tf_on_import"] for run in runs)
+        summary["resources"] = runs[-1]["resources"]
+        results["modes"][mode] = summary
+
+    print(f"{'mode':<12}{'import(s)':>11}{'create_app(s)':>15}{'ready(s)':>10}{'RSS boot(MB)':>14}{'RSS ready(MB)':>15}{'TF@import':>11}")
+    for mode, r in results["modes"].items():
+        ready = f"{r['ready_s']:.2f}" if r["ready_s"] is not None else "-"
+        print(
+            f"{mode:<12}{r['import_s']:>11.2f}{r['create_app_s']:>15.2f}{ready:>10}"
+            f"{r['rss_boot_mb']:>14.1f}{r['rss_ready_mb']:>15.1f}{str(r['tf_on_import']):>11}"
+        )
+        for name, status in r["resources"].items():
+            if status["state"] == "failed":
+                print(f"  {name}: 로드 실패 - {status['error']}")
+
+    if args.importtime:
+        results["import_profile"] = import_profile(args.importtime)
+        print(f"\n{'module':<60}{'cumulative(ms)':>16}{'self(ms)':>10}")
+        for row in results["import_profile"]:
+            print(f"{row['module']:<60}{row['cumulative_ms']:>16.1f}{row['self_ms']:>10.1f}")
+
+    write_results("app_boot", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+감정 분류 추론 백엔드 비교 벤치마크
+
+Keras 기준 모델 대비 각 백엔드의 프레임당 지연 시간(batch=1), 메모리(RSS 증가량),
+top-1 예측 일치율을 측정. 메모리를 정확히 재기 위해 백엔드마다 별도 프로세스에서 실행
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_backends --keras ../data/models/TEST_1efficientnet_b2_model.keras \
+        --tflite-fp16 ../data/models/emotion_fp16.tflite --tflite-int8 ../data/models/emotion_int8.tflite \
+        --onnx ../data/models/emotion.onnx --images ../data/raw/val --threads 4
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from benchmarks.common import (
+    current_rss_mb,
+    ensure_bench_env,
+    load_image_dir,
+    summarize_latencies,
+    write_results,
+)
+
+
+def measure_backend(backend_name, model_path, frames, num_threads, warmup, result_queue):
+    """별도 프로세스에서 백엔드 하나를 로드하고 측정"""
+    ensure_bench_env()
+    from app.models.emotion import preprocess_batch
+    from app.models.emotion_backends import create_backend
+
+    try:
+        rss_before = current_rss_mb()
+        load_started = time.perf_counter()
+        backend = create_backend(backend_name, model_path, num_threads)
+        load_time = time.perf_counter() - load_started
+        rss_loaded = current_rss_mb()
+
+        inputs = [preprocess_batch([frame]) for frame in frames]
+        for batch in inputs[:warmup]:
+            backend.predict(batch)
+
+        latencies = []
+        predictions = []
+        for batch in inputs:
+            started = time.perf_counter()
+            output = backend.predict(batch)
+            latencies.append(time.perf_counter() - started)
+            predictions.append(int(np.argmax(output[0])))
+
+        result_queue.put(
+            {
+                "load_time_s": round(load_time, 3),
+                "rss_model_mb": round(rss_loaded - rss_before, 1),
+                "rss_peak_mb": round(current_rss_mb(), 1),
+                "latency": summarize_latencies(latencies),
+                "predictions": predictions,
+            }
+        )
+    except Exception as e:
+        result_queue.put({"error": str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 분류 추론 백엔드 비교")
+    parser.add_argument("--keras", required=True, help="기준 .keras 모델 경로")
+    parser.add_argument("--tflite-fp16", help="float16 TFLite 모델 경로")
+    parser.add_argument("--tflite-int8", help="int8 TFLite 모델 경로")
+    parser.add_argument("--onnx", help="ONNX 모델 경로")
+    parser.add_argument("--images", help="평가 이미지 디렉토리 (미지정 시 합성 프레임)")
+    parser.add_argument("--num-frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="백엔드 추론 스레드 수 (0: 기본값)")
+    args = parser.parse_args()
+
+    if args.images:
+        frames = [image for _, image in load_image_dir(args.images, args.num_frames)]
+    else:
+        rng = np.random.default_rng(0)
+        frames = [
+            rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(args.num_frames)
+        ]
+
+    candidates = [
+        ("keras", "keras", args.keras),
+        ("tflite-fp16", "tflite", args.tflite_fp16),
+        ("tflite-int8", "tflite", args.tflite_int8),
+        ("onnx", "onnx", args.onnx),
+    ]
+
+    ctx = mp.get_context("spawn")
+    results = {"num_frames": len(frames), "threads": args.threads, "backends": {}}
+    baseline = None
+
+    print(f"{'backend':<14}{'p50(ms)':>10}{'p99(ms)':>10}{'rss(MB)':>10}{'agree(%)':>10}")
+    for label, backend_name, model_path in candidates:
+        if not model_path:
+            continue
+
+        result_queue = ctx.Queue()
+        process = ctx.Process(
+            target=measure_backend,
+            args=(backend_name, model_path, frames, args.threads, args.warmup, result_queue),
+        )
+        process.start()
+        result = result_queue.get()
+        process.join()
+
+        if "error" in result:
+            print(f"{label:<14} 실패: {result['error']}")
+            results["backends"][label] = result
+            continue
+
+        predictions = result.pop("predictions")
+        if baseline is None:
+            baseline = predictions
+        agreement = float(np.mean(np.asarray(predictions) == np.asarray(baseline))) * 100
+        result["top1_agreement_pct"] = round(agreement, 2)
+        result["model_path"] = model_path
+        results["backends"][label] = result
+
+        print(
+            f"{label:<14}{result['latency']['p50_ms']:>10.2f}{result['latency']['p99_ms']:>10.2f}"
+            f"{result['rss_model_mb']:>10.1f}{agreement:>10.1f}"
+        )
+
+    write_results("backends", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+마이크로 배칭 스케줄러 벤치마크
+
+동시 요청 수(concurrency)별로 배칭 없는 경로와 배칭 경로의
+처리량(frames/sec)과 p50/p99 지연 시간을 비교
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_batching --concurrency 1,8,32,128 --batch-sizes 8,16 --max-wait-ms 5,10
+    python -m benchmarks.bench_batching --model-path ../data/models/TEST_1efficientnet_b2_model.keras
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.common import (
+    SimulatedModel,
+    ensure_bench_env,
+    summarize_latencies,
+    write_results,
+)
+
+ensure_bench_env()
+
+from app.models.emotion import predict_emotion  # noqa: E402
+from app.models.emotion_backends import create_backend  # noqa: E402
+from app.services.emotion_batcher import EmotionBatchScheduler  # noqa: E402
+
+
+def parse_int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def parse_float_list(value):
+    return [float(v) for v in value.split(",") if v]
+
+
+def run_load(predict_fn, frames, concurrency, duration):
+    """
+    concurrency개의 스레드가 duration초 동안 계속 프레임을 예측
+    :return: (처리한 프레임 수, 지연 시간 리스트)
+    """
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(idx):
+        local = []
+        i = idx
+        while time.perf_counter() < stop_at:
+            frame = frames[i % len(frames)]
+            started = time.perf_counter()
+            predict_fn(frame)
+            local.append(time.perf_counter() - started)
+            i += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return len(latencies), latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 예측 마이크로 배칭 벤치마크")
+    parser.add_argument("--model-path", help="실제 모델 경로 (미지정 시 시뮬레이션 모델 사용)")
+    parser.add_argument("--backend", default="keras", help="--model-path의 추론 백엔드 (keras/tflite/onnx)")
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 8, 32, 128])
+    parser.add_argument("--batch-sizes", type=parse_int_list, default=[8, 16])
+    parser.add_argument("--max-wait-ms", type=parse_float_list, default=[5.0, 10.0])
+    parser.add_argument("--duration", type=float, default=5.0, help="설정별 측정 시간 (초)")
+    parser.add_argument("--frame-size", default="480x640", help="합성 프레임 크기 (HxW)")
+    parser.add_argument("--overhead-ms", type=float, default=15.0, help="시뮬레이션 모델 호출 오버헤드")
+    parser.add_argument("--per-item-ms", type=float, default=4.0, help="시뮬레이션 모델 프레임당 비용")
+    args = parser.parse_args()
+
+    if args.model_path:
+        model = create_backend(args.backend, args.model_path)
+        model_name = args.model_path
+    else:
+        model = SimulatedModel(args.overhead_ms, args.per_item_ms)
+        model_name = f"simulated(overhead={args.overhead_ms}ms, per_item={args.per_item_ms}ms)"
+
+    height, width = (int(v) for v in args.frame_size.split("x"))
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(16)]
+
+    results = {"model": model_name, "frame_size": args.frame_size, "runs": []}
+
+    print(f"{'mode':<28}{'conc':>6}{'fps':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'avg_batch':>11}")
+
+    for concurrency in args.concurrency:
+        # 배칭 없는 기준 경로
+        count, latencies, elapsed = run_load(
+            lambda frame: predict_emotion(frame, model), frames, concurrency, args.duration
+        )
+        summary = summarize_latencies(latencies)
+        run = {
+            "mode": "unbatched",
+            "concurrency": concurrency,
+            "throughput_fps": round(count / elapsed, 2),
+            "latency": summary,
+            "avg_batch_size": 1.0,
+        }
+        results["runs"].append(run)
+        print(
+            f"{'unbatched':<28}{concurrency:>6}{run['throughput_fps']:>10.1f}"
+            f"{summary['p50_ms']:>10.1f}{summary['p99_ms']:>10.1f}{1.0:>11.2f}"
+        )
+
+        for max_batch_size in args.batch_sizes:
+            for max_wait_ms in args.max_wait_ms:
+                scheduler = EmotionBatchScheduler(model, max_batch_size, max_wait_ms).start()
+                count, latencies, elapsed = run_load(
+                    scheduler.predict, frames, concurrency, args.duration
+                )
+                stats = scheduler.stats()
+                scheduler.stop()
+
+                summary = summarize_latencies(latencies)
+                mode = f"batched(b={max_batch_size},w={max_wait_ms:g}ms)"
+                run = {
+                    "mode": mode,
+                    "concurrency": concurrency,
+                    "max_batch_size": max_batch_size,
+                    "max_wait_ms": max_wait_ms,
+                    "throughput_fps": round(count / elapsed, 2),
+                    "latency": summary,
+                    "avg_batch_size": round(stats["avg_batch_size"], 2),
+                }
+                results["runs"].append(run)
+                print(
+                    f"{mode:<28}{concurrency:>6}{run['throughput_fps']:>10.1f}"
+                    f"{summary['p50_ms']:>10.1f}{summary['p99_ms']:>10.1f}"
+                    f"{run['avg_batch_size']:>11.2f}"
+                )
+
+    write_results("batching", results)
+
+
+if __name__ == "__main__":
+    main()
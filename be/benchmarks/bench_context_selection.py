@@ -0,0 +1,125 @@
+"""
+RAG 상담 사례 선택 벤치마크 : top-k 그대로 vs 중복 제거 + MMR + 토큰 예산
+
+보류 질의 CSV(input/output 컬럼)의 input으로
+- baseline : rag_service.retrieve_relevant_documents (top-k)
+- selected : rag_service.retrieve_context_documents (RAG_CONTEXT_FETCH_K개 검색 후 선택)
+를 호출해서 다음을 비교
+- 턴당 프롬프트 상담 사례(format_retrieved_context) 평균 토큰 수 / 사례 수
+- 턴당 중복 사례 수 (앞 사례와 답변 문자 3-gram Jaccard 유사도가 RAG_CONTEXT_DUPLICATE_JACCARD 이상)
+- Recall@k : 같은 output(상담 답변)을 가진 문서가 들어간 비율
+- 검색 1건 지연 시간 p50/p95/p99
+
+벡터 DB와 검색/선택 설정은 서버와 같은 환경 변수(.env)를 사용하고, 질의 임베딩 캐시는 끔
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_context_selection --index ../data/db/faiss_mmap --queries ../data/raw/val_counsel.csv
+    RAG_CONTEXT_TOKEN_BUDGET=600 python -m benchmarks.bench_context_selection --queries ../data/raw/val_counsel.csv
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.bench_embedding_providers import read_queries
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+from app.services.context_selection import jaccard, text_shingles
+
+
+def count_duplicates(texts, threshold):
+    """앞 사례와 거의 같은 답변 수"""
+    shingles = [text_shingles(text) for text in texts]
+    return sum(any(jaccard(shingles[i], shingles[j]) >= threshold for j in range(i)) for i in range(len(texts)))
+
+
+def run_variant(rag_service, count_tokens, queries, retrieve, k, duplicate_jaccard):
+    """한 방식으로 전체 질의의 프롬프트 상담 사례 생성"""
+    hits, tokens, documents_total, duplicates, latencies = 0, 0, 0, 0, []
+    for text, expected in queries:
+        started = time.perf_counter()
+        documents = retrieve(text, k=k)
+        latencies.append(time.perf_counter() - started)
+
+        outputs = [rag_service.document_output(doc) for doc in documents]
+        hits += expected in outputs
+        tokens += count_tokens(rag_service.format_retrieved_context(documents))
+        documents_total += len(documents)
+        duplicates += count_duplicates(outputs, duplicate_jaccard)
+    return {
+        f"recall@{k}": round(hits / len(queries), 4),
+        "avg_context_tokens": round(tokens / len(queries), 1),
+        "avg_documents": round(documents_total / len(queries), 2),
+        "avg_duplicates": round(duplicates / len(queries), 2),
+        "latency": summarize_latencies(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프롬프트 상담 사례 선택 전후 턴당 토큰 수 / Recall@k 비교")
+    parser.add_argument("--index", help="벡터 DB 디렉토리 (기본값: VECTOR_DB_PATH)")
+    parser.add_argument("--queries", required=True, help="보류 질의 CSV (input/output 컬럼)")
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.index:
+        os.environ["VECTOR_DB_PATH"] = args.index
+    os.environ["RAG_CONTEXT_SELECTION"] = "true"
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    ensure_bench_env()
+
+    from app.services import rag_service
+    from app.services.context_selection import count_tokens
+    from config.settings import ActiveConfig
+
+    queries = read_queries(args.queries, args.num_queries)
+    vectorstore = rag_service.get_vectorstore()
+
+    results = {
+        "config": {
+            **vars(args),
+            "retrieval_mode": ActiveConfig.RAG_RETRIEVAL_MODE,
+            "fetch_k": ActiveConfig.RAG_CONTEXT_FETCH_K,
+            "duplicate_jaccard": ActiveConfig.RAG_CONTEXT_DUPLICATE_JACCARD,
+            "duplicate_cosine": ActiveConfig.RAG_CONTEXT_DUPLICATE_COSINE,
+            "mmr_lambda": ActiveConfig.RAG_MMR_LAMBDA,
+            "token_budget": ActiveConfig.RAG_CONTEXT_TOKEN_BUDGET,
+        },
+        "documents": int(vectorstore.index.ntotal),
+        "variants": {},
+    }
+    variants = {
+        "baseline": rag_service.retrieve_relevant_documents,
+        "selected": rag_service.retrieve_context_documents,
+    }
+    for name, retrieve in variants.items():
+        retrieve(queries[0][0], k=args.k)
+        results["variants"][name] = run_variant(
+            rag_service, count_tokens, queries, retrieve, args.k, ActiveConfig.RAG_CONTEXT_DUPLICATE_JACCARD
+        )
+
+    baseline, selected = results["variants"]["baseline"], results["variants"]["selected"]
+    if baseline["avg_context_tokens"]:
+        results["token_change"] = round(selected["avg_context_tokens"] / baseline["avg_context_tokens"] - 1, 4)
+
+    print(
+        f"문서 {results['documents']}개, 질의 {len(queries)}건, k={args.k}, fetch_k={ActiveConfig.RAG_CONTEXT_FETCH_K}, "
+        f"토큰 예산 {ActiveConfig.RAG_CONTEXT_TOKEN_BUDGET or '없음'}"
+    )
+    print(f"{'variant':<10}{f'recall@{args.k}':>10}{'tokens/turn':>13}{'docs/turn':>11}{'dups/turn':>11}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for name, result in results["variants"].items():
+        latency = result["latency"]
+        print(
+            f"{name:<10}{result[f'recall@{args.k}']:>10.4f}{result['avg_context_tokens']:>13.1f}"
+            f"{result['avg_documents']:>11.2f}{result['avg_duplicates']:>11.2f}"
+            f"{latency['p50_ms']:>10.2f}{latency['p95_ms']:>10.2f}"
+        )
+    if "token_change" in results:
+        print(f"턴당 상담 사례 토큰 {results['token_change'] * 100:+.1f}%")
+
+    write_results("context_selection", results)
+
+
+if __name__ == "__main__":
+    main()
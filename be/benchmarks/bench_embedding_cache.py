@@ -0,0 +1,161 @@
+"""
+RAG 질의 임베딩 캐시 벤치마크 : 임베딩 API 호출 수, 캐시 적중률, 질의 임베딩 지연 시간
+
+자주 반복되는 상담 첫 문장(공백/표기 변형 포함)과 한 번만 나오는 문장을 섞은 질의 스트림으로
+- none : 캐시 없음 (매 질의 임베딩 API 호출)
+- lru : 프로세스 내 LRU만
+- lru+redis : LRU + Redis (--redis-url 지정 시)
+- restart : Redis는 유지하고 LRU를 비운 상태 (재시작/다른 워커 프로세스 흉내, --redis-url 지정 시)
+를 비교. 임베딩은 호출 수를 세는 결정적 가짜 임베딩 (--embed-ms로 API 왕복 시간 흉내),
+캐시된 벡터가 직접 계산한 벡터와 같은지, 배치(embed_documents)의 중복/캐시 항목이 빠지는지도 확인
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_embedding_cache --queries 2000 --embed-ms 80
+    python -m benchmarks.bench_embedding_cache --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_rag_pipeline import SAMPLE_MESSAGES, CountingEmbeddings
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+OPENERS = SAMPLE_MESSAGES + [
+    "요즘 너무 우울해",
+    "친구랑 싸웠어",
+    "학교 가기 싫어",
+    "잠이 안 와",
+    "엄마랑 또 싸웠어",
+]
+
+
+def query_stream(num_queries, unique_ratio, seed=0):
+    """자주 나오는 첫 문장(Zipf 분포, 공백 변형 포함) + 한 번만 나오는 문장"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(OPENERS) + 1)
+    weights /= weights.sum()
+
+    queries = []
+    for i in range(num_queries):
+        if rng.random() < unique_ratio:
+            queries.append(f"{OPENERS[i % len(OPENERS)]} 그리고 {i}번째 고민이 있어")
+            continue
+        text = OPENERS[rng.choice(len(OPENERS), p=weights)]
+        # 입력 습관에 따른 공백 차이 (정규화 후 같은 키)
+        variant = rng.integers(3)
+        if variant == 1:
+            text = f"  {text} "
+        elif variant == 2:
+            text = text.replace(" ", "  ")
+        queries.append(text)
+    return queries
+
+
+def run(name, embedder, counter, queries):
+    from app.utils.metrics import metrics
+
+    metrics.reset()
+    counter.query_calls = 0
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        embedder.embed_query(query)
+        latencies.append(time.perf_counter() - started)
+
+    run = {"name": name, "embedding_calls": counter.query_calls, "latency": summarize_latencies(latencies)}
+    if hasattr(embedder, "cache"):
+        run["cache"] = embedder.cache.stats()
+    return run
+
+
+def check_vectors(embedder, base, queries):
+    """캐시에서 읽은 벡터와 캐시 없이 직접 계산한 벡터의 최대 차이
+
+    공백 변형은 정규화 후 같은 키라서 처음 계산한 문장의 벡터를 공유하므로,
+    키마다 처음 나온 문장(실제로 임베딩된 원문)만 비교
+    """
+    from app.services.embedding_cache import normalize_text
+
+    first_seen = {}
+    for q in queries:
+        first_seen.setdefault(normalize_text(q), q)
+    diffs = [
+        float(np.max(np.abs(np.asarray(embedder.embed_query(q)) - np.asarray(base.embed_query(q)))))
+        for q in first_seen.values()
+    ]
+    return max(diffs)
+
+
+def check_batch(embedder, counter):
+    """배치 임베딩: 중복 제거 + 캐시 항목 제외 후 한 번의 호출로 계산되는지"""
+    texts = ["배치 문장 A", "배치 문장 B", "배치  문장 A", "배치 문장 C"]
+    counter.document_calls = 0
+    first = embedder.embed_documents(texts)
+    second = embedder.embed_documents(texts + ["배치 문장 D"])
+    return {
+        "document_calls": counter.document_calls,
+        "duplicate_equal": first[0] == first[2],
+        "cached_equal": first == second[:4],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG 질의 임베딩 캐시 적중률/호출 수 측정")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--unique-ratio", type=float, default=0.3, help="한 번만 나오는 질의 비율")
+    parser.add_argument("--embed-ms", type=float, default=0.0, help="임베딩 호출당 지연 (API 왕복 흉내)")
+    parser.add_argument("--lru-size", type=int, default=10000)
+    parser.add_argument("--redis-url", help="Redis 단계 측정용 URL (테스트용 DB 번호 권장)")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    from app.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+    queries = query_stream(args.queries, args.unique_ratio)
+    counter = CountingEmbeddings(delay_ms=args.embed_ms)
+    model_name = f"bench-fake-{time.time_ns()}"
+
+    runs = [run("none", counter, counter, queries)]
+    lru = CachedEmbeddings(counter, EmbeddingCache(max_entries=args.lru_size), model_name)
+    runs.append(run("lru", lru, counter, queries))
+
+    redis_cache = None
+    if args.redis_url:
+        import redis
+
+        redis_cache = EmbeddingCache(
+            max_entries=args.lru_size, redis_client=redis.Redis.from_url(args.redis_url), ttl_seconds=600
+        )
+        tiered = CachedEmbeddings(counter, redis_cache, model_name)
+        runs.append(run("lru+redis", tiered, counter, queries))
+        redis_cache.clear_local()
+        runs.append(run("restart", tiered, counter, queries))
+
+    print(f"{'cache':<12}{'embed calls':>12}{'hit rate':>10}{'lru hits':>10}{'redis hits':>12}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for result in runs:
+        cache = result.get("cache", {})
+        print(
+            f"{result['name']:<12}{result['embedding_calls']:>12}{cache.get('hit_rate', 0.0):>10.3f}"
+            f"{cache.get('lru_hits', 0):>10}{cache.get('redis_hits', 0):>12}"
+            f"{result['latency']['p50_ms']:>10.3f}{result['latency']['p95_ms']:>10.3f}"
+        )
+
+    base = CountingEmbeddings()
+    max_diff = check_vectors(lru, base, queries[:50])
+    batch = check_batch(lru, counter)
+    print(f"캐시 벡터 최대 차이: {max_diff:.2e}")
+    print(f"배치: 원래 임베딩 호출 {batch['document_calls']}회, 중복 동일 {batch['duplicate_equal']}, 캐시 동일 {batch['cached_equal']}")
+
+    if redis_cache is not None:
+        redis_cache.redis.delete(*redis_cache.redis.keys(f"{redis_cache.key_prefix}:{model_name}:*") or ["-"])
+
+    write_results(
+        "embedding_cache",
+        {"config": vars(args), "runs": runs, "max_vector_diff": max_diff, "batch": batch},
+    )
+
+
+if __name__ == "__main__":
+    main()
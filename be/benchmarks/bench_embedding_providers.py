@@ -0,0 +1,152 @@
+"""
+RAG 임베딩 제공자 벤치마크 : 질의 임베딩 지연 시간과 검색 Recall@k (OpenAI vs 로컬 ONNX)
+
+- 질의 임베딩 지연 시간 : 한 문장씩 embed_query p50/p95/p99
+- 배치 문서 임베딩 처리량 : --batch-sizes별 문장/초 (onnx)
+- 검색 Recall@k : 보류해 둔 질의 CSV(input/output 컬럼)의 input으로 검색해서
+  top-k 안에 같은 output(상담 답변)을 가진 문서가 있는 비율
+- 기존 벡터 DB(--index, OpenAI 임베딩)와 onnx로 만든 벡터 DB(--onnx-index, scripts.build_vector_db)의
+  top-k 결과 겹침 비율
+--index는 OPENAI_API_KEY가 있을 때만 측정 (없으면 onnx만)
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_embedding_providers --queries ../data/raw/val_counsel.csv \
+        --index ../data/faiss_v2 --model-dir ../data/models/multilingual-e5-small --onnx-index ../data/db/faiss_onnx \
+        --query-prefix "query: " --document-prefix "passage: " --threads 4
+"""
+
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import current_rss_mb, ensure_bench_env, summarize_latencies, write_results
+
+
+def read_queries(csv_path, limit):
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        rows = [
+            (row["input"].strip(), row["output"].strip())
+            for row in csv.DictReader(f)
+            if (row.get("input") or "").strip() and (row.get("output") or "").strip()
+        ]
+    return rows[:limit]
+
+
+def query_latency(embeddings, queries, warmup=3):
+    for text, _ in queries[:warmup]:
+        embeddings.embed_query(text)
+    latencies = []
+    for text, _ in queries:
+        started = time.perf_counter()
+        embeddings.embed_query(text)
+        latencies.append(time.perf_counter() - started)
+    return summarize_latencies(latencies)
+
+
+def batch_throughput(embeddings, texts, batch_sizes):
+    """배치 크기별 문서 임베딩 처리량 (문장/초)"""
+    results = {}
+    original = embeddings.batch_size
+    for batch_size in batch_sizes:
+        embeddings.batch_size = batch_size
+        embeddings.embed_documents(texts[:batch_size])
+        started = time.perf_counter()
+        embeddings.embed_documents(texts)
+        results[str(batch_size)] = round(len(texts) / (time.perf_counter() - started), 1)
+    embeddings.batch_size = original
+    return results
+
+
+def retrieval(vectorstore, queries, k):
+    """질의별 top-k output 목록과 Recall@k"""
+    from app.services.rag_service import document_output
+
+    retrieved, hits = [], 0
+    for text, expected in queries:
+        outputs = [document_output(doc) for doc in vectorstore.similarity_search(text, k=k)]
+        retrieved.append(outputs)
+        hits += expected in outputs
+    return retrieved, round(hits / len(queries), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI / 로컬 ONNX 임베딩 지연 시간과 검색 Recall@k 비교")
+    parser.add_argument("--queries", required=True, help="보류 질의 CSV (input/output 컬럼)")
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4, help="Recall@k의 k (retriever 기본값 4)")
+    parser.add_argument("--index", help="기존 벡터 DB (OpenAI 임베딩)")
+    parser.add_argument("--openai-model", help="기존 벡터 DB 임베딩 모델 이름")
+    parser.add_argument("--model-dir", required=True, help="onnx 모델 디렉토리")
+    parser.add_argument("--onnx-index", help="onnx 임베딩으로 만든 벡터 DB")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--query-prefix", default="")
+    parser.add_argument("--document-prefix", default="")
+    parser.add_argument("--batch-sizes", default="1,8,32", help="배치 처리량 측정 크기")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    from langchain_community.vectorstores import FAISS
+
+    from app.services.embedding_providers import create_embedding_provider
+
+    queries = read_queries(args.queries, args.num_queries)
+    results = {"config": vars(args), "providers": {}}
+
+    rss_before = current_rss_mb()
+    onnx = create_embedding_provider(
+        "onnx",
+        model_dir=args.model_dir,
+        max_length=args.max_length,
+        num_threads=args.threads,
+        query_prefix=args.query_prefix,
+        document_prefix=args.document_prefix,
+    )
+    onnx_result = {
+        "model_rss_mb": round(current_rss_mb() - rss_before, 1),
+        "query_latency": query_latency(onnx, queries),
+        "batch_sentences_per_sec": batch_throughput(
+            onnx, [text for text, _ in queries], [int(size) for size in args.batch_sizes.split(",") if size]
+        ),
+    }
+    results["providers"]["onnx"] = onnx_result
+
+    onnx_retrieved = None
+    if args.onnx_index:
+        store = FAISS.load_local(args.onnx_index, onnx, allow_dangerous_deserialization=True)
+        onnx_retrieved, onnx_result[f"recall@{args.k}"] = retrieval(store, queries, args.k)
+
+    if args.index and os.getenv("OPENAI_API_KEY"):
+        openai = create_embedding_provider("openai", model=args.openai_model)
+        openai_result = {"query_latency": query_latency(openai, queries)}
+        store = FAISS.load_local(args.index, openai, allow_dangerous_deserialization=True)
+        openai_retrieved, openai_result[f"recall@{args.k}"] = retrieval(store, queries, args.k)
+        results["providers"]["openai"] = openai_result
+        if onnx_retrieved is not None:
+            overlaps = [
+                len(set(a) & set(b)) / args.k for a, b in zip(openai_retrieved, onnx_retrieved)
+            ]
+            results[f"top{args.k}_overlap"] = round(float(np.mean(overlaps)), 4)
+    elif args.index:
+        print("OPENAI_API_KEY가 없어 기존 벡터 DB 측정은 건너뜀")
+
+    print(f"{'provider':<10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{f'recall@{args.k}':>12}")
+    for name, result in results["providers"].items():
+        latency = result["query_latency"]
+        recall = result.get(f"recall@{args.k}")
+        print(
+            f"{name:<10}{latency['p50_ms']:>10.2f}{latency['p95_ms']:>10.2f}{latency['p99_ms']:>10.2f}"
+            f"{recall if recall is not None else '-':>12}"
+        )
+    print(f"onnx 배치 처리량(문장/s): {onnx_result['batch_sentences_per_sec']}, 모델 RSS 증가 {onnx_result['model_rss_mb']}MB")
+    if f"top{args.k}_overlap" in results:
+        print(f"기존 벡터 DB와 top-{args.k} 겹침: {results[f'top{args.k}_overlap']:.3f}")
+
+    write_results("embedding_providers", results)
+
+
+if __name__ == "__main__":
+    main()
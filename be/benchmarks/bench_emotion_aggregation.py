@@ -0,0 +1,159 @@
+"""
+감정 저장 방식 벤치마크 : 프레임별 insert vs 집계 윈도우
+
+채팅방별 대화(기본 30분, 초당 1프레임)를 시뮬레이션해서
+- 저장 문서 수 / BSON 크기 / 쓰기 시간
+- get_emotion_results 조회 지연 시간 (p50/p99)
+- 대표 감정 변경 횟수 (프레임별 라벨 vs 스무딩된 대표 감정)
+을 비교. MongoDB 대신 mongomock 인메모리 DB 사용 (실제 서버 I/O 비용은 포함되지 않음)
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_emotion_aggregation --rooms 20 --minutes 30 --fps 1 --window-seconds 30
+"""
+
+import argparse
+import random
+import time
+
+import bson
+import mongomock
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+ensure_bench_env()
+
+from app.database import mongo  # noqa: E402
+from app.models.emotion import EMOTION_CLASSES  # noqa: E402
+from app.services.emotion_aggregator import EmotionAggregator  # noqa: E402
+from app.services.emotion_service import (  # noqa: E402
+    get_emotion_results,
+    save_emotion_data,
+    save_emotion_window,
+)
+
+
+def simulate_predictions(minutes, fps, noise, segment_seconds, seed):
+    """
+    실제 감정은 segment_seconds마다 바뀌고, 프레임 예측은 noise 확률로 다른 감정이 섞인 시퀀스
+    :return: (경과 시간(초), 감정, 신뢰도) 리스트
+    """
+    rng = random.Random(seed)
+    frames = []
+    true_emotion = rng.choice(EMOTION_CLASSES)
+    for i in range(int(minutes * 60 * fps)):
+        elapsed = i / fps
+        if i and elapsed % segment_seconds == 0:
+            true_emotion = rng.choice(EMOTION_CLASSES)
+        emotion = rng.choice(EMOTION_CLASSES) if rng.random() < noise else true_emotion
+        frames.append((elapsed, emotion, rng.uniform(0.7, 1.0)))
+    return frames
+
+
+def use_fresh_db(rooms, user_id):
+    """mongomock DB로 교체하고 권한 확인용 채팅방 문서 생성"""
+    mongo.db = mongomock.MongoClient().bench
+    mongo.db.chatrooms.insert_many(
+        [{"chatroom_id": f"room-{r}", "user_id": user_id} for r in range(rooms)]
+    )
+
+
+def collection_stats():
+    documents = list(mongo.db.emotions.find({}, {"_id": 0}))
+    return {
+        "documents": len(documents),
+        "bson_kb": round(sum(len(bson.encode(d)) for d in documents) / 1024.0, 1),
+    }
+
+
+def measure_reads(rooms, user_id, repeats):
+    latencies = []
+    for _ in range(repeats):
+        for r in range(rooms):
+            started = time.perf_counter()
+            get_emotion_results(f"room-{r}", user_id)
+            latencies.append(time.perf_counter() - started)
+    return summarize_latencies(latencies)
+
+
+def count_changes(labels):
+    return sum(1 for prev, cur in zip(labels, labels[1:]) if prev != cur)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프레임별 저장 vs 집계 윈도우 저장 비교")
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--fps", type=float, default=1.0)
+    parser.add_argument("--noise", type=float, default=0.25, help="다른 감정이 섞일 확률")
+    parser.add_argument("--segment-seconds", type=int, default=120, help="실제 감정 유지 시간")
+    parser.add_argument("--window-seconds", type=float, default=30)
+    parser.add_argument("--smoothing", default="ema", choices=["ema", "majority"])
+    parser.add_argument("--ema-alpha", type=float, default=0.2)
+    parser.add_argument("--switch-margin", type=float, default=0.1)
+    parser.add_argument("--read-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    user_id = "bench-user"
+    sequences = [
+        simulate_predictions(args.minutes, args.fps, args.noise, args.segment_seconds, seed=r)
+        for r in range(args.rooms)
+    ]
+    results = {"config": vars(args)}
+
+    # 1. 기존 방식 : 프레임마다 insert_one
+    use_fresh_db(args.rooms, user_id)
+    started = time.perf_counter()
+    for r, frames in enumerate(sequences):
+        for _, emotion, confidence in frames:
+            save_emotion_data(user_id, f"room-{r}", emotion, confidence)
+    write_seconds = time.perf_counter() - started
+    results["per_frame"] = {
+        **collection_stats(),
+        "write_s": round(write_seconds, 3),
+        "read": measure_reads(args.rooms, user_id, args.read_repeats),
+        "label_changes_per_room": round(
+            sum(count_changes([e for _, e, _ in frames]) for frames in sequences) / args.rooms, 1
+        ),
+    }
+
+    # 2. 집계 윈도우 : 구간마다 문서 하나
+    use_fresh_db(args.rooms, user_id)
+    aggregator = EmotionAggregator(
+        window_seconds=args.window_seconds,
+        smoothing=args.smoothing,
+        ema_alpha=args.ema_alpha,
+        switch_margin=args.switch_margin,
+        on_window=save_emotion_window,
+    )
+    changes = []
+    aggregator.add_listener(changes.append)
+    base = time.time()
+    started = time.perf_counter()
+    for r, frames in enumerate(sequences):
+        for elapsed, emotion, confidence in frames:
+            aggregator.add(user_id, f"room-{r}", emotion, confidence, now=base + elapsed)
+    aggregator.flush()
+    write_seconds = time.perf_counter() - started
+    results["windowed"] = {
+        **collection_stats(),
+        "write_s": round(write_seconds, 3),
+        "read": measure_reads(args.rooms, user_id, args.read_repeats),
+        # 첫 대표 감정 설정(previous=None)은 변경으로 세지 않음
+        "dominant_changes_per_room": round(
+            sum(1 for e in changes if e["previous"] is not None) / args.rooms, 1
+        ),
+    }
+
+    print(f"{'mode':<12}{'docs':>8}{'size(KB)':>10}{'write(s)':>10}{'read p50(ms)':>14}{'read p99(ms)':>14}{'changes/room':>14}")
+    for mode, key in (("per_frame", "label_changes_per_room"), ("windowed", "dominant_changes_per_room")):
+        r = results[mode]
+        print(
+            f"{mode:<12}{r['documents']:>8}{r['bson_kb']:>10.1f}{r['write_s']:>10.3f}"
+            f"{r['read']['p50_ms']:>14.3f}{r['read']['p99_ms']:>14.3f}{r[key]:>14.1f}"
+        )
+
+    write_results("emotion_aggregation", results)
+
+
+if __name__ == "__main__":
+    main()
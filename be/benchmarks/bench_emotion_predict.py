@@ -0,0 +1,286 @@
+"""
+감정 예측 벤치마크 / 회귀 검사 : predict_emotion 직접 호출과 Flask 라우트 전체 경로
+
+실행 조합(모드 x 해상도 x 동시 요청 수)마다 합성 JPEG 프레임으로
+- 단계별 소요 시간 p50/p95/p99 (앱 metrics 레지스트리 기준)
+    decode(base64/JPEG 디코딩), preprocess(리사이즈/정규화), inference(model.predict),
+    persist(감정 기록/저장), classify(배칭 대기 포함 분류 단계), request(요청 전체)
+- 처리량 (frames/s)
+를 측정
+- function 모드 : decode_frame → predict_emotion → save_emotion 을 스레드별로 직접 호출
+- route 모드 : 테스트 클라이언트로 POST /emotion/predict (base64 JSON, --route-format binary면 /emotion/predict-frame)
+  (얼굴 추적/중복 프레임 캐시/배칭 스케줄러/집계 윈도우 등 설정된 파이프라인 전체 포함)
+
+- MongoDB는 mongomock 인메모리 DB로 교체 (실제 서버 I/O 비용은 포함되지 않음)
+- 모델은 --model(MODEL_PATH, EMOTION_MODEL_BACKEND 형식) 또는 SimulatedModel(--overhead-ms, --per-item-ms)
+- 합성 프레임에는 얼굴이 없으므로 얼굴 검출은 끄고 (--face-detection과 --images 실제 얼굴 이미지로 켬)
+  매 프레임이 분류되도록 중복 프레임 캐시도 끔
+
+결과는 benchmarks/results/에 JSON으로 저장
+--save-baseline 경로에 기준선 저장, --baseline 지정 시 기준선 대비 회귀 검사 (benchmarks.regression, 실패 시 종료 코드 1)
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_emotion_predict --modes function,route --resolutions 640x480,1280x720 --concurrency 1,8
+    python -m benchmarks.bench_emotion_predict --baseline benchmarks/baselines/emotion_predict.json --max-regression 0.2
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import cv2
+import mongomock
+import numpy as np
+
+from benchmarks.common import SimulatedModel, ensure_bench_env, load_image_dir, write_results
+from benchmarks.regression import check_regressions, load_results, report_regressions
+
+# 결과에 포함할 단계 (결과 키 → metrics 타이머 이름)
+STAGES = {
+    "decode": "emotion.decode",
+    "preprocess": "emotion.preprocess",
+    "inference": "emotion.inference",
+    "persist": "emotion.persist",
+    "classify": "emotion.classify",
+    "face": "emotion.face",
+    "request": "bench.request",
+}
+
+
+def synthetic_jpegs(width, height, count, quality=85, seed=0):
+    """웹캠 프레임 크기의 합성 JPEG (부드러운 노이즈라 실제 프레임과 비슷한 압축률)"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        small = rng.integers(0, 256, (max(height // 16, 1), max(width // 16, 1), 3), dtype=np.uint8)
+        image = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+        image = cv2.add(image, rng.integers(0, 16, image.shape, dtype=np.uint8))
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append(encoded.tobytes())
+    return frames
+
+
+def image_dir_jpegs(image_dir, width, height, count, quality=85):
+    """실제 이미지를 지정 해상도로 리사이즈한 JPEG"""
+    frames = []
+    for _, image in load_image_dir(image_dir, count):
+        image = cv2.resize(image, (width, height))
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append(encoded.tobytes())
+    return frames
+
+
+def run_threads(concurrency, requests_per_thread, send):
+    """스레드마다 send(thread_id, i)를 반복 호출하고 요청 전체 시간을 bench.request로 기록"""
+    from app.utils.metrics import metrics
+
+    errors = []
+
+    def worker(thread_id):
+        for i in range(requests_per_thread):
+            started = time.perf_counter()
+            try:
+                send(thread_id, i)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+            metrics.observe("bench.request", time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, errors
+
+
+def function_sender(model, frames):
+    """function 모드 : 디코딩 → predict_emotion → save_emotion"""
+    from app.database import mongo
+    from app.models.emotion import predict_emotion, save_emotion
+    from app.utils.image import decode_frame
+    from app.utils.metrics import metrics
+    from config.settings import ActiveConfig
+
+    def send(thread_id, i):
+        with metrics.timer("emotion.decode"):
+            image = decode_frame(frames[(thread_id + i) % len(frames)], ActiveConfig.FRAME_DECODE_MIN_SIDE)
+        emotion, confidence = predict_emotion(image, model)
+        with metrics.timer("emotion.persist"):
+            save_emotion(mongo, f"bench-user-{thread_id}", f"bench-room-{thread_id}", emotion, confidence)
+
+    return send
+
+
+def route_sender(app, token, frames, route_format):
+    """route 모드 : 테스트 클라이언트로 감정 예측 API 호출 (스레드별 클라이언트, 채팅방)"""
+    clients = {}
+    headers = {"Authorization": token}
+    data_urls = [f"data:image/jpeg;base64,{base64.b64encode(frame).decode()}" for frame in frames]
+
+    def send(thread_id, i):
+        client = clients.get(thread_id)
+        if client is None:
+            client = clients[thread_id] = app.test_client()
+        index = (thread_id + i) % len(frames)
+        if route_format == "binary":
+            response = client.post(
+                f"/emotion/predict-frame?chatroom_id=bench-room-{thread_id}",
+                data=frames[index],
+                content_type="image/jpeg",
+                headers=headers,
+            )
+        else:
+            response = client.post(
+                "/emotion/predict",
+                json={"chatroom_id": f"bench-room-{thread_id}", "frame": data_urls[index]},
+                headers=headers,
+            )
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    return send
+
+
+def summarize_stages(snapshot):
+    stages = {}
+    for name, timer in STAGES.items():
+        timing = snapshot["timings"].get(timer)
+        if timing:
+            stages[name] = {key: timing[key] for key in ("count", "p50_ms", "p95_ms", "p99_ms")}
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 예측 단계별 지연 시간 벤치마크 / 회귀 검사")
+    parser.add_argument("--modes", default="function,route", help="function / route (쉼표로 구분)")
+    parser.add_argument("--route-format", choices=["json", "binary"], default="json", help="route 모드 업로드 형식")
+    parser.add_argument("--resolutions", default="640x480,1280x720", help="쉼표로 구분한 WxH 목록")
+    parser.add_argument("--concurrency", default="1,8", help="쉼표로 구분한 동시 요청 수 목록")
+    parser.add_argument("--requests", type=int, default=200, help="실행 조합별 총 요청 수")
+    parser.add_argument("--frames", type=int, default=32, help="해상도별 서로 다른 프레임 수")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--images", help="합성 프레임 대신 사용할 이미지 디렉토리")
+    parser.add_argument("--face-detection", action="store_true", help="얼굴 검출/추적 단계 포함 (실제 얼굴 이미지 필요)")
+    parser.add_argument("--model", help="감정 모델 경로 (미지정 시 SimulatedModel)")
+    parser.add_argument("--backend", default="keras", help="--model 추론 백엔드")
+    parser.add_argument("--overhead-ms", type=float, default=15.0, help="SimulatedModel 호출당 고정 비용")
+    parser.add_argument("--per-item-ms", type=float, default=4.0, help="SimulatedModel 프레임당 비용")
+    parser.add_argument("--baseline", help="회귀 검사 기준선 JSON")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준선으로 저장할 경로")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 악화 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="지연 시간 회귀 최소 증가량 (ms)")
+    args = parser.parse_args()
+
+    # 설정은 app import 시점에 읽히므로 먼저 지정
+    ensure_bench_env()
+    os.environ["FACE_DETECTION_ENABLED"] = "true" if args.face_detection else "false"
+    os.environ["FRAME_CACHE_ENABLED"] = "false"
+    os.environ["RESOURCE_WARMUP"] = "lazy"
+    if args.model:
+        os.environ["MODEL_PATH"] = args.model
+        os.environ["EMOTION_MODEL_BACKEND"] = args.backend
+
+    from app.database import mongo
+    from app.models.emotion import load_emotion_model
+    from app.services import emotion_pipeline
+    from app.utils.metrics import metrics
+
+    if args.model:
+        model = load_emotion_model()
+    else:
+        model = SimulatedModel(args.overhead_ms, args.per_item_ms)
+        emotion_pipeline.load_emotion_model = lambda: model
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    app = token = None
+    if "route" in modes:
+        from flask_jwt_extended import create_access_token
+
+        from app import create_app
+
+        app = create_app()
+        # 요청마다 남는 INFO 로그(토큰 디코딩 등)는 측정에서 제외
+        app.logger.setLevel(logging.WARNING)
+        logging.getLogger().setLevel(logging.WARNING)
+        with app.app_context():
+            token = create_access_token(identity="bench-user")
+    # create_app의 init_app 이후 교체해야 요청 경로도 mongomock 사용
+    mongo.db = mongomock.MongoClient().bench
+
+    results = {
+        "config": {**vars(args), "model": args.model or f"simulated({args.overhead_ms}+{args.per_item_ms}ms)"},
+        "runs": {},
+    }
+    header = f"{'run':<30}{'fps':>8}" + "".join(f"{stage + ' p95':>16}" for stage in STAGES)
+    print(header)
+
+    # 요청마다 출력되는 로그는 측정 시간에 섞이지 않도록 버림
+    devnull = open(os.devnull, "w")
+    for resolution in [r for r in args.resolutions.split(",") if r]:
+        width, height = (int(v) for v in resolution.lower().split("x"))
+        if args.images:
+            frames = image_dir_jpegs(args.images, width, height, args.frames)
+        else:
+            frames = synthetic_jpegs(width, height, args.frames)
+
+        for mode in modes:
+            send = function_sender(model, frames) if mode == "function" else route_sender(app, token, frames, args.route_format)
+            for concurrency in [int(c) for c in args.concurrency.split(",") if c]:
+                requests_per_thread = max(args.requests // concurrency, 1)
+                with contextlib.redirect_stdout(devnull):
+                    run_threads(1, args.warmup, send)
+                    metrics.reset()
+                    elapsed, errors = run_threads(concurrency, requests_per_thread, send)
+                    snapshot = metrics.snapshot()
+
+                key = f"{mode}/{resolution}/c{concurrency}"
+                total = requests_per_thread * concurrency
+                run = {
+                    "requests": total,
+                    "errors": len(errors),
+                    "frames_per_sec": round(total / elapsed, 2),
+                    "frame_kb": round(sum(len(frame) for frame in frames) / len(frames) / 1024.0, 1),
+                    "stages": summarize_stages(snapshot),
+                }
+                results["runs"][key] = run
+                print(
+                    f"{key:<30}{run['frames_per_sec']:>8.1f}"
+                    + "".join(
+                        f"{run['stages'][stage]['p95_ms']:>16.2f}" if stage in run["stages"] else f"{'-':>16}"
+                        for stage in STAGES
+                    )
+                )
+                if errors:
+                    print(f"  오류 {len(errors)}건: {errors[0]}")
+    devnull.close()
+
+    write_results("emotion_predict", results)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"benchmark": "emotion_predict", "created_at": datetime.now().strftime("%Y%m%d%H%M%S"), "results": results},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"기준선 저장: {args.save_baseline}")
+
+    if args.baseline:
+        regressions, compared = check_regressions(
+            load_results(args.baseline), results, args.max_regression, args.min_delta_ms
+        )
+        if not report_regressions(regressions, compared, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
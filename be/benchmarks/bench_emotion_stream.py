@@ -0,0 +1,173 @@
+"""
+WebSocket 스트림 vs HTTP 폴링 벤치마크 (실행 중인 서버 대상)
+
+세션(채팅방)마다 일정 간격으로 프레임을 보내며 경로별로 비교
+- http_json   : POST /emotion/predict (base64 JSON, 매 요청 JWT 디코딩)
+- http_binary : POST /emotion/predict-frame (JPEG 바이트)
+- websocket   : /emotion/stream (채팅방당 1회 인증 후 바이너리 프레임)
+
+프레임당 왕복 지연 시간(p50/p95/p99), 처리한 프레임 수, 서버 CPU 시간(프레임당)을 출력
+서버 CPU는 --server-pid로 지정한 프로세스의 user+system 시간 증가량으로 측정
+
+실행 예시 (be/ 디렉토리, 서버 실행 후):
+    python -m benchmarks.bench_emotion_stream --base-url http://localhost:5000 --token <JWT> \
+        --chatroom-ids <ID1,ID2,...> --sessions 100 --interval 1.0 --duration 30 --server-pid <PID>
+"""
+
+import argparse
+import base64
+import json
+import threading
+import time
+
+import requests
+import websocket
+
+from benchmarks.bench_frame_decode import synthetic_jpeg
+from benchmarks.common import summarize_latencies, write_results
+
+
+def server_cpu_seconds(pid):
+    """서버 프로세스(자식 포함)의 누적 CPU 시간"""
+    if not pid:
+        return None
+    import psutil
+
+    process = psutil.Process(pid)
+    total = 0.0
+    for p in [process] + process.children(recursive=True):
+        times = p.cpu_times()
+        total += times.user + times.system
+    return total
+
+
+def http_session(base_url, token, chatroom_id, frame, mode, interval, stop_at, sink):
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    data_url = "data:image/jpeg;base64," + base64.b64encode(frame).decode("ascii")
+
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        if mode == "http_json":
+            response = session.post(
+                f"{base_url}/emotion/predict",
+                json={"chatroom_id": chatroom_id, "frame": data_url},
+            )
+        else:
+            response = session.post(
+                f"{base_url}/emotion/predict-frame",
+                params={"chatroom_id": chatroom_id},
+                data=frame,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+        elapsed = time.perf_counter() - started
+        sink(elapsed, response.status_code == 200)
+        time.sleep(max(interval - elapsed, 0))
+
+
+def websocket_session(base_url, token, chatroom_id, frame, interval, stop_at, sink):
+    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
+    ws = websocket.create_connection(f"{ws_url}/emotion/stream")
+    ws.send(json.dumps({"type": "auth", "token": token, "chatroom_id": chatroom_id}))
+    if json.loads(ws.recv()).get("type") != "ready":
+        sink(0.0, False)
+        ws.close()
+        return
+
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        ws.send_binary(frame)
+        message = json.loads(ws.recv())
+        elapsed = time.perf_counter() - started
+        sink(elapsed, message.get("type") == "prediction")
+        time.sleep(max(interval - elapsed, 0))
+
+    ws.send(json.dumps({"type": "close"}))
+    ws.close()
+
+
+def run_mode(mode, args, chatroom_ids, frame):
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+
+    def sink(elapsed, ok):
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                failures[0] += 1
+
+    cpu_before = server_cpu_seconds(args.server_pid)
+    stop_at = time.perf_counter() + args.duration
+    threads = []
+    for i in range(args.sessions):
+        chatroom_id = chatroom_ids[i % len(chatroom_ids)]
+        if mode == "websocket":
+            target = websocket_session
+            target_args = (args.base_url, args.token, chatroom_id, frame, args.interval, stop_at, sink)
+        else:
+            target = http_session
+            target_args = (args.base_url, args.token, chatroom_id, frame, mode, args.interval, stop_at, sink)
+        threads.append(threading.Thread(target=target, args=target_args, daemon=True))
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cpu_after = server_cpu_seconds(args.server_pid)
+
+    result = {
+        "frames": len(latencies),
+        "failures": failures[0],
+        "throughput_fps": round(len(latencies) / args.duration, 2),
+        "latency": summarize_latencies(latencies),
+    }
+    if cpu_before is not None:
+        cpu = cpu_after - cpu_before
+        result["server_cpu_s"] = round(cpu, 3)
+        result["server_cpu_ms_per_frame"] = round(cpu / len(latencies) * 1000.0, 3) if latencies else None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket 스트림 vs HTTP 폴링 벤치마크")
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    parser.add_argument("--token", required=True, help="테스트 사용자 access token")
+    parser.add_argument("--chatroom-ids", required=True, help="테스트 사용자의 채팅방 ID 목록 (쉼표 구분)")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=1.0, help="세션당 프레임 전송 간격 (초)")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--resolution", default="640x480")
+    parser.add_argument("--modes", default="http_json,http_binary,websocket")
+    parser.add_argument("--server-pid", type=int, help="서버 프로세스 PID (CPU 측정용)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.resolution.split("x"))
+    frame = synthetic_jpeg(width, height)
+    chatroom_ids = [c for c in args.chatroom_ids.split(",") if c]
+
+    results = {
+        "sessions": args.sessions,
+        "interval_s": args.interval,
+        "duration_s": args.duration,
+        "resolution": args.resolution,
+        "modes": {},
+    }
+
+    print(f"{'mode':<14}{'frames':>8}{'fail':>6}{'p50(ms)':>10}{'p99(ms)':>10}{'cpu/frame(ms)':>15}")
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args, chatroom_ids, frame)
+        results["modes"][mode] = result
+        cpu = result.get("server_cpu_ms_per_frame")
+        print(
+            f"{mode:<14}{result['frames']:>8}{result['failures']:>6}"
+            f"{result['latency']['p50_ms']:>10.1f}{result['latency']['p99_ms']:>10.1f}"
+            f"{(cpu if cpu is not None else float('nan')):>15.2f}"
+        )
+
+    write_results("emotion_stream", results)
+
+
+if __name__ == "__main__":
+    main()
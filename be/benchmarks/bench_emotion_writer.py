@@ -0,0 +1,159 @@
+"""
+감정 문서 저장 벤치마크 : 요청 스레드 insert_one vs write-behind 버퍼(insert_many)
+
+여러 스레드가 동시에 감정 문서를 저장할 때
+- 요청 스레드에서 체감하는 저장 지연 시간 (p50/p99)
+- 전체 처리량 (docs/s)
+- 배치 수, 평균 배치 크기, flush 지연 시간
+을 비교하고, 종료 후 모든 문서가 저장됐는지 확인
+
+--mongo-uri를 주면 실제 MongoDB, 없으면 mongomock에 왕복 지연(--rtt-ms)을 더한 컬렉션 사용
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_emotion_writer --threads 16 --docs-per-thread 500 --rtt-ms 1.0
+    python -m benchmarks.bench_emotion_writer --mongo-uri mongodb://localhost:27017/bench
+"""
+
+import argparse
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import mongomock
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+ensure_bench_env()
+
+from app.services.emotion_writer import EmotionWriteBuffer  # noqa: E402
+from app.utils.metrics import metrics  # noqa: E402
+
+
+class LatencyCollection:
+    """mongomock 컬렉션에 호출당 네트워크 왕복 지연을 더한 래퍼"""
+
+    def __init__(self, collection, rtt_ms):
+        self.collection = collection
+        self.rtt = rtt_ms / 1000.0
+
+    def insert_one(self, document):
+        time.sleep(self.rtt)
+        return self.collection.insert_one(document)
+
+    def insert_many(self, documents, ordered=True):
+        time.sleep(self.rtt)
+        return self.collection.insert_many(documents, ordered=ordered)
+
+    def count_documents(self, query):
+        return self.collection.count_documents(query)
+
+    def drop(self):
+        self.collection.drop()
+
+
+def open_collection(args, name):
+    if args.mongo_uri:
+        import pymongo
+
+        collection = pymongo.MongoClient(args.mongo_uri).get_default_database()[name]
+        collection.drop()
+        return collection
+    return LatencyCollection(mongomock.MongoClient().bench[name], args.rtt_ms)
+
+
+def make_document(thread_id, i):
+    return {
+        "user_id": f"user-{thread_id}",
+        "chatroom_id": f"room-{thread_id}",
+        "emotion_id": str(uuid.uuid4()),
+        "emotion": "happy",
+        "confidence": 0.9,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def run(save, threads, docs_per_thread):
+    """스레드별로 문서를 저장하며 호출 지연 시간 측정"""
+    latencies = [[] for _ in range(threads)]
+
+    def worker(thread_id):
+        for i in range(docs_per_thread):
+            started = time.perf_counter()
+            save(make_document(thread_id, i))
+            latencies[thread_id].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - started, [v for per_thread in latencies for v in per_thread]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="insert_one vs write-behind 버퍼 비교")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--docs-per-thread", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="mongomock 사용 시 호출당 지연 (ms)")
+    parser.add_argument("--mongo-uri", help="실제 MongoDB URI (지정 시 mongomock 대신 사용)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--flush-interval-ms", type=float, default=1000)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    total = args.threads * args.docs_per_thread
+    results = {"config": vars(args)}
+
+    # 1. 요청 스레드에서 insert_one
+    collection = open_collection(args, "emotions_sync")
+    elapsed, latencies = run(collection.insert_one, args.threads, args.docs_per_thread)
+    results["insert_one"] = {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_docs_s": round(total / elapsed, 1),
+        "call_latency": summarize_latencies(latencies),
+        "stored": collection.count_documents({}),
+    }
+
+    # 2. write-behind 버퍼 (종료 시 flush까지 포함해서 측정)
+    collection = open_collection(args, "emotions_buffered")
+    metrics.reset()
+    buffer = EmotionWriteBuffer(
+        lambda: collection,
+        max_batch_size=args.batch_size,
+        flush_interval_ms=args.flush_interval_ms,
+        max_queue_size=args.queue_size,
+    ).start()
+    started = time.perf_counter()
+    _, latencies = run(buffer.put, args.threads, args.docs_per_thread)
+    buffer.stop()
+    elapsed = time.perf_counter() - started
+    flush = metrics.snapshot()["timings"].get("emotion_writer.flush", {})
+    results["write_buffer"] = {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_docs_s": round(total / elapsed, 1),
+        "call_latency": summarize_latencies(latencies),
+        "stored": collection.count_documents({}),
+        "flush_latency": flush,
+        **buffer.stats(),
+    }
+
+    print(f"{'mode':<14}{'docs/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'stored':>10}")
+    for mode in ("insert_one", "write_buffer"):
+        r = results[mode]
+        print(
+            f"{mode:<14}{r['throughput_docs_s']:>10.1f}{r['call_latency']['p50_ms']:>10.3f}"
+            f"{r['call_latency']['p99_ms']:>10.3f}{r['stored']:>10}"
+        )
+    buffered = results["write_buffer"]
+    print(
+        f"batches={buffered['batches']} avg_batch={buffered['avg_batch_size']} "
+        f"dropped={buffered['dropped']} flush_p99={flush.get('p99_ms')}ms"
+    )
+
+    write_results("emotion_writer", results)
+
+
+if __name__ == "__main__":
+    main()
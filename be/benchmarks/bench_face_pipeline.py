@@ -0,0 +1,128 @@
+"""
+얼굴 검출/추적 단계 벤치마크
+
+영상(또는 이미지 시퀀스)을 하나의 채팅방 스트림으로 보고
+- 전체 프레임 분류(기존 방식)
+- 얼굴 검출/추적 후 얼굴 영역만 분류
+두 경로의 분류기 호출 수, 생략된 추론 수, 단계별 소요 시간을 비교
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_face_pipeline --video sample.mp4 --detect-every 10
+    python -m benchmarks.bench_face_pipeline --images ../data/raw/val --model-path <.keras>
+"""
+
+import argparse
+import time
+
+import cv2
+
+from benchmarks.common import (
+    SimulatedModel,
+    ensure_bench_env,
+    load_image_dir,
+    summarize_latencies,
+    write_results,
+)
+
+ensure_bench_env()
+
+from app.models.emotion import predict_emotion  # noqa: E402
+from app.models.emotion_backends import create_backend  # noqa: E402
+from app.services.face_tracker import FaceTracker  # noqa: E402
+from app.utils.metrics import metrics  # noqa: E402
+
+
+def read_video_frames(path, limit):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 검출/추적 단계 벤치마크")
+    parser.add_argument("--video", help="입력 영상 경로")
+    parser.add_argument("--images", help="입력 이미지 디렉토리 (파일명 순서대로 한 스트림으로 처리)")
+    parser.add_argument("--max-frames", type=int, default=500)
+    parser.add_argument("--model-path", help="실제 모델 경로 (미지정 시 시뮬레이션 모델)")
+    parser.add_argument("--backend", default="keras")
+    parser.add_argument("--detect-every", type=int, default=10)
+    parser.add_argument("--detect-width", type=int, default=320)
+    args = parser.parse_args()
+
+    if args.video:
+        frames = read_video_frames(args.video, args.max_frames)
+    elif args.images:
+        frames = [image for _, image in load_image_dir(args.images, args.max_frames)]
+    else:
+        parser.error("--video 또는 --images 중 하나가 필요합니다.")
+
+    model = (
+        create_backend(args.backend, args.model_path)
+        if args.model_path
+        else SimulatedModel(overhead_ms=15.0, per_item_ms=4.0)
+    )
+
+    # 기존 방식: 모든 프레임을 전체 크기로 분류
+    baseline_latencies = []
+    for frame in frames:
+        started = time.perf_counter()
+        predict_emotion(frame, model)
+        baseline_latencies.append(time.perf_counter() - started)
+
+    # 얼굴 단계 적용
+    metrics.reset()
+    tracker = FaceTracker(detect_every=args.detect_every, detect_width=args.detect_width)
+    pipeline_latencies = []
+    classified = 0
+    for frame in frames:
+        started = time.perf_counter()
+        with metrics.timer("emotion.face"):
+            box = tracker.locate("bench", frame)
+        if box is not None:
+            face = tracker.crop(frame, box)
+            with metrics.timer("emotion.classify"):
+                predict_emotion(face, model)
+            classified += 1
+        pipeline_latencies.append(time.perf_counter() - started)
+
+    snapshot = metrics.snapshot()
+    results = {
+        "frames": len(frames),
+        "baseline": {
+            "classifier_calls": len(frames),
+            "latency": summarize_latencies(baseline_latencies),
+        },
+        "face_pipeline": {
+            "classifier_calls": classified,
+            "skipped_inferences": len(frames) - classified,
+            "detector_runs": snapshot["counters"].get("face.detector_runs", 0),
+            "tracked_frames": snapshot["counters"].get("face.tracked", 0),
+            "latency": summarize_latencies(pipeline_latencies),
+            "stages": snapshot["timings"],
+        },
+    }
+
+    print(f"프레임 수: {len(frames)}")
+    print(
+        f"기존 방식 : 분류기 호출 {len(frames)}회, "
+        f"p50 {results['baseline']['latency']['p50_ms']:.1f}ms"
+    )
+    print(
+        f"얼굴 단계 : 분류기 호출 {classified}회 (생략 {len(frames) - classified}회), "
+        f"검출기 {results['face_pipeline']['detector_runs']}회, "
+        f"p50 {results['face_pipeline']['latency']['p50_ms']:.1f}ms"
+    )
+    for stage, timing in snapshot["timings"].items():
+        print(f"  {stage:<18} avg {timing['avg_ms']:.2f}ms  p99 {timing['p99_ms']:.2f}ms")
+
+    write_results("face_pipeline", results)
+
+
+if __name__ == "__main__":
+    main()
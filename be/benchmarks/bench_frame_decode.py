@@ -0,0 +1,113 @@
+"""
+프레임 전송/디코딩 마이크로벤치마크
+
+기존 JSON/base64 경로와 바이너리 업로드 경로의 서버측 비용 비교
+- json_base64 : JSON 파싱 → data URL 분리 → base64 디코딩 → 전체 해상도 imdecode → 224 리사이즈
+- binary      : 요청 버퍼에서 바로 (축소) 디코딩 → 224 리사이즈
+해상도별 페이로드 크기와 p50/p99 지연 시간을 출력
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_frame_decode --resolutions 640x480,1280x720,1920x1080 --iterations 300
+"""
+
+import argparse
+import base64
+import json
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+ensure_bench_env()
+
+from app.utils.image import decode_frame  # noqa: E402
+
+
+def synthetic_jpeg(width, height, quality=90, seed=0):
+    """부드러운 그라디언트 + 노이즈로 웹캠 프레임과 비슷한 압축률의 JPEG 생성"""
+    rng = np.random.default_rng(seed)
+    base = cv2.resize(
+        rng.integers(0, 256, (height // 16, width // 16, 3), dtype=np.uint8),
+        (width, height),
+        interpolation=cv2.INTER_CUBIC,
+    )
+    noise = rng.integers(0, 12, (height, width, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(".jpg", cv2.add(base, noise), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes()
+
+
+def legacy_json_path(body):
+    """기존 /emotion/predict 경로"""
+    payload = json.loads(body)
+    image_data = base64.b64decode(payload["frame"].split(",")[1])
+    np_array = np.frombuffer(image_data, np.uint8)
+    image = cv2.imdecode(np_array, cv2.IMREAD_COLOR)
+    return cv2.resize(image, (224, 224))
+
+
+def binary_path(body, min_side):
+    """/emotion/predict-frame 경로"""
+    image = decode_frame(body, min_side)
+    return cv2.resize(image, (224, 224))
+
+
+def measure(fn, iterations):
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return summarize_latencies(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프레임 전송/디코딩 마이크로벤치마크")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1920x1080")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--min-side", type=int, default=224, help="축소 디코딩 최소 짧은 변")
+    args = parser.parse_args()
+
+    results = {"iterations": args.iterations, "min_side": args.min_side, "resolutions": []}
+
+    print(f"{'resolution':<12}{'path':<14}{'payload(KB)':>12}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for resolution in args.resolutions.split(","):
+        width, height = (int(v) for v in resolution.split("x"))
+        jpeg = synthetic_jpeg(width, height)
+        data_url = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("ascii")
+        json_body = json.dumps({"chatroom_id": "bench", "frame": data_url}).encode("utf-8")
+
+        # 워밍업
+        legacy_json_path(json_body)
+        binary_path(jpeg, args.min_side)
+
+        legacy = measure(lambda: legacy_json_path(json_body), args.iterations)
+        binary = measure(lambda: binary_path(jpeg, args.min_side), args.iterations)
+
+        entry = {
+            "resolution": resolution,
+            "json_base64": {"payload_bytes": len(json_body), "latency": legacy},
+            "binary": {
+                "payload_bytes": len(jpeg),
+                "decoded_shape": list(decode_frame(jpeg, args.min_side).shape),
+                "latency": binary,
+            },
+            "speedup_p50": round(legacy["p50_ms"] / binary["p50_ms"], 2) if binary["p50_ms"] else None,
+        }
+        results["resolutions"].append(entry)
+
+        for name, payload, summary in (
+            ("json_base64", len(json_body), legacy),
+            ("binary", len(jpeg), binary),
+        ):
+            print(
+                f"{resolution:<12}{name:<14}{payload / 1024:>12.1f}"
+                f"{summary['p50_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+            )
+
+    write_results("frame_decode", results)
+
+
+if __name__ == "__main__":
+    main()
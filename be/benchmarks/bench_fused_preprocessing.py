@@ -0,0 +1,126 @@
+"""
+전처리 포함 서빙 모델 벤치마크 : Python 전처리(preprocess_batch) + float 모델 vs uint8 입력 모델(fused)
+
+배치 크기별로
+- Python 전처리 시간 (preprocess_batch / fused_input_batch)
+- 전처리 중 numpy 할당 최대 바이트 (tracemalloc, 프레임당)
+- 전처리 + 추론 전체 지연 시간 p50/p95
+- top-1 예측 일치율 (기존 경로는 BGR 프레임을 그대로 넣으므로 채널 순서 수정만큼 달라질 수 있음)
+를 측정. 프레임은 실제 얼굴 이미지(--images) 또는 크기가 제각각인 합성 얼굴 크롭
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_fused_preprocessing --model ../data/models/TEST_1efficientnet_b2_model.keras \
+        --fused-model ../data/models/emotion_serving.keras --images ../data/raw/val --batch-sizes 1,8 --threads 4
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, load_image_dir, summarize_latencies, write_results
+
+
+def synthetic_crops(num_frames, seed=0):
+    """얼굴 검출 크롭과 비슷한 크기(96~320px)의 합성 BGR 프레임"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(num_frames):
+        height, width = rng.integers(96, 320, 2)
+        frames.append(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+    return frames
+
+
+def preprocess_peak_bytes(preprocess, batches):
+    """전처리 함수 호출 중 numpy 할당 최대 바이트 (배치별 최댓값의 평균)"""
+    peaks = []
+    for batch in batches:
+        tracemalloc.start()
+        result = preprocess(batch)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        peaks.append(peak)
+    return float(np.mean(peaks))
+
+
+def measure(name, backend, preprocess, batches, warmup):
+    for batch in batches[:warmup]:
+        backend.predict(preprocess(batch))
+
+    preprocess_times, latencies, predictions = [], [], []
+    for batch in batches:
+        started = time.perf_counter()
+        inputs = preprocess(batch)
+        prepared = time.perf_counter()
+        output = backend.predict(inputs)
+        finished = time.perf_counter()
+        preprocess_times.append(prepared - started)
+        latencies.append(finished - started)
+        predictions.extend(int(index) for index in np.argmax(output, axis=1))
+
+    frames = sum(len(batch) for batch in batches)
+    return {
+        "pipeline": name,
+        "preprocess": summarize_latencies(preprocess_times),
+        "latency": summarize_latencies(latencies),
+        "preprocess_peak_kb_per_frame": round(preprocess_peak_bytes(preprocess, batches) / 1024.0 / (frames / len(batches)), 1),
+        "frames_per_sec": round(frames / sum(latencies), 1),
+        "predictions": predictions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 포함 서빙 모델 복사/시간 비교")
+    parser.add_argument("--model", required=True, help="0-1 float 입력 .keras 모델 (기존)")
+    parser.add_argument("--fused-model", required=True, help="export_serving_model.py로 만든 uint8 입력 모델")
+    parser.add_argument("--images", help="평가 이미지 디렉토리 (미지정 시 합성 크롭)")
+    parser.add_argument("--num-frames", type=int, default=200)
+    parser.add_argument("--batch-sizes", default="1,8", help="쉼표로 구분한 배치 크기")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=0, help="추론 스레드 수 (0: 기본값)")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    from app.models.emotion import fused_input_batch, preprocess_batch
+    from app.models.emotion_backends import create_backend
+
+    if args.images:
+        frames = [image for _, image in load_image_dir(args.images, args.num_frames)]
+    else:
+        frames = synthetic_crops(args.num_frames)
+
+    baseline = create_backend("keras", args.model, args.threads)
+    fused = create_backend("keras", args.fused_model, args.threads)
+    if not fused.fused_preprocessing:
+        raise SystemExit(f"uint8 입력 모델이 아닙니다: {args.fused_model}")
+
+    results = {"config": vars(args), "runs": {}}
+    print(
+        f"{'batch':>5} {'pipeline':<10}{'prep p50(ms)':>14}{'prep KB/frame':>15}"
+        f"{'p50(ms)':>10}{'p95(ms)':>10}{'frames/s':>10}"
+    )
+    for batch_size in [int(size) for size in args.batch_sizes.split(",") if size]:
+        batches = [frames[i : i + batch_size] for i in range(0, len(frames) - batch_size + 1, batch_size)]
+        runs = [
+            measure("python", baseline, preprocess_batch, batches, args.warmup),
+            measure("fused", fused, fused_input_batch, batches, args.warmup),
+        ]
+        for run in runs:
+            print(
+                f"{batch_size:>5} {run['pipeline']:<10}{run['preprocess']['p50_ms']:>14.3f}"
+                f"{run['preprocess_peak_kb_per_frame']:>15.1f}{run['latency']['p50_ms']:>10.2f}"
+                f"{run['latency']['p95_ms']:>10.2f}{run['frames_per_sec']:>10.1f}"
+            )
+        agreement = float(np.mean(np.asarray(runs[0]["predictions"]) == np.asarray(runs[1]["predictions"])))
+        print(f"      top-1 일치율 {agreement:.3f} (기존 경로는 BGR 입력)")
+        for run in runs:
+            del run["predictions"]
+        results["runs"][str(batch_size)] = {"python": runs[0], "fused": runs[1], "top1_agreement": agreement}
+
+    write_results("fused_preprocessing", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+RAG 검색 방식 벤치마크 : vector / hybrid (벡터 + 문자 n-gram BM25, RRF) / lexical (BM25만)
+
+보류 질의 CSV(input/output 컬럼)의 input으로 rag_service.retrieve_relevant_documents를 호출해서
+- Recall@k : top-k 안에 같은 output(상담 답변)을 가진 문서가 있는 비율
+- 검색 1건 지연 시간 p50/p95/p99, 질의 임베딩 호출 수
+를 방식별로 측정. BM25 인덱스 생성 시간/메모리도 함께 기록
+--embed-delay-ms로 임베딩 서비스 지연을 흉내내고, --fallback-ms를 주면
+임베딩 평균 지연이 기준을 넘을 때 BM25만 쓰는 대체 경로(hybrid+fallback)도 측정
+
+벡터 DB와 임베딩 설정은 서버와 같은 환경 변수(.env)를 사용하고, 질의 임베딩 캐시는 끔
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_hybrid_retrieval --index ../data/db/faiss_mmap --queries ../data/raw/val_counsel.csv
+    python -m benchmarks.bench_hybrid_retrieval --index ../data/db/faiss_mmap --queries ../data/raw/val_counsel.csv \
+        --embed-delay-ms 300 --fallback-ms 150
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.bench_embedding_providers import read_queries
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+
+class DelayedEmbeddings:
+    """질의 임베딩 호출 수를 세고 지연을 더하는 래퍼"""
+
+    def __init__(self, embeddings, delay_ms=0.0):
+        self.embeddings = embeddings
+        self.delay_ms = delay_ms
+        self.query_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        if self.delay_ms:
+            time.sleep(self.delay_ms / 1000.0)
+        return self.embeddings.embed_query(text)
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+
+def run_mode(rag_service, queries, mode, k, embeddings):
+    """한 검색 방식으로 전체 질의 검색"""
+    embeddings.query_calls = 0
+    hits, latencies = 0, []
+    for text, expected in queries:
+        started = time.perf_counter()
+        documents = rag_service.retrieve_relevant_documents(text, k=k, mode=mode)
+        latencies.append(time.perf_counter() - started)
+        hits += expected in [rag_service.document_output(doc) for doc in documents]
+    return {
+        f"recall@{k}": round(hits / len(queries), 4),
+        "latency": summarize_latencies(latencies),
+        "embedding_calls": embeddings.query_calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="vector / hybrid / lexical 검색 Recall@k와 지연 시간 비교")
+    parser.add_argument("--index", help="벡터 DB 디렉토리 (기본값: VECTOR_DB_PATH)")
+    parser.add_argument("--queries", required=True, help="보류 질의 CSV (input/output 컬럼)")
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--modes", default="vector,hybrid,lexical")
+    parser.add_argument("--embed-delay-ms", type=float, default=0.0, help="질의 임베딩마다 더할 지연 (느린 임베딩 서비스 흉내)")
+    parser.add_argument("--fallback-ms", type=float, default=0.0, help="hybrid+fallback 측정 시 RAG_LEXICAL_FALLBACK_MS")
+    args = parser.parse_args()
+
+    if args.index:
+        os.environ["VECTOR_DB_PATH"] = args.index
+    # BM25 인덱스가 등록되도록 hybrid로 설정 (방식은 호출마다 지정), 캐시 적중이 섞이지 않도록 캐시 끔
+    os.environ["RAG_RETRIEVAL_MODE"] = "hybrid"
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    ensure_bench_env()
+
+    from app.services import rag_service
+
+    queries = read_queries(args.queries, args.num_queries)
+    vectorstore = rag_service.get_vectorstore()
+    embeddings = DelayedEmbeddings(vectorstore.embedding_function, args.embed_delay_ms)
+    vectorstore.embedding_function = embeddings
+    lexical_index = rag_service.lexical_resource.get()
+
+    results = {
+        "config": vars(args),
+        "documents": int(vectorstore.index.ntotal),
+        "lexical_index": {
+            "build_s": round(rag_service.lexical_resource.load_seconds, 2),
+            "terms": len(lexical_index.vocabulary),
+            "postings_mb": round(lexical_index.memory_bytes() / 2**20, 1),
+        },
+        "modes": {},
+    }
+
+    for mode in [name for name in args.modes.split(",") if name]:
+        rag_service.retrieve_relevant_documents(queries[0][0], k=args.k, mode=mode)
+        results["modes"][mode] = run_mode(rag_service, queries, mode, args.k, embeddings)
+
+    if args.fallback_ms:
+        guard = rag_service.embedding_latency_guard
+        guard.threshold_ms = args.fallback_ms
+        fallback_before = rag_service.metrics.snapshot()["counters"].get("rag.retrieval.lexical_fallback", 0)
+        result = run_mode(rag_service, queries, "hybrid", args.k, embeddings)
+        fallbacks = rag_service.metrics.snapshot()["counters"].get("rag.retrieval.lexical_fallback", 0) - fallback_before
+        result["lexical_fallback_ratio"] = round(fallbacks / len(queries), 4)
+        results["modes"]["hybrid+fallback"] = result
+
+    print(
+        f"문서 {results['documents']}개, 질의 {len(queries)}건, k={args.k}, 임베딩 지연 +{args.embed_delay_ms:.0f}ms, "
+        f"BM25 생성 {results['lexical_index']['build_s']}s ({results['lexical_index']['postings_mb']}MB)"
+    )
+    print(f"{'mode':<17}{f'recall@{args.k}':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'embed calls':>13}")
+    for mode, result in results["modes"].items():
+        latency = result["latency"]
+        print(
+            f"{mode:<17}{result[f'recall@{args.k}']:>10.4f}{latency['p50_ms']:>10.2f}{latency['p95_ms']:>10.2f}"
+            f"{latency['p99_ms']:>10.2f}{result['embedding_calls']:>13}"
+        )
+    if "hybrid+fallback" in results["modes"]:
+        print(f"hybrid+fallback BM25 대체 비율: {results['modes']['hybrid+fallback']['lexical_fallback_ratio']:.2f}")
+
+    write_results("hybrid_retrieval", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+감정 추론 워커 풀 부하 테스트 : 웹 프로세스 내 추론(thread) vs 워커 프로세스 풀(process)
+
+여러 클라이언트 스레드가 프레임을 계속 제출할 때 풀 크기별
+- 처리량 (frames/s)과 풀 크기 1 대비 배율
+- 요청 지연 시간 (p50/p99)
+- 워커 평균 배치 크기
+를 측정. 기준선은 웹 프로세스 안에서 모델 하나 + 배칭 스케줄러로 처리하는 기존 방식
+(모델 하나의 intra-op 스레드 수 = 워커별 intra-op x 최대 풀 크기로 같은 코어 수를 사용)
+코어가 많은 서버에서 --pool-sizes와 --intra-op-threads를 바꿔가며 (풀 크기 x intra-op ≒ 코어 수) 확인
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_inference_pool --model ../data/models/TEST_1efficientnet_b2_model.keras \
+        --pool-sizes 1,2,4,8 --intra-op-threads 2 --clients 32 --duration 20
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, load_image_dir, summarize_latencies, write_results
+
+ensure_bench_env()
+
+from app.models.emotion import predict_emotion  # noqa: E402
+from app.models.emotion_backends import create_backend  # noqa: E402
+from app.services.emotion_batcher import EmotionBatchScheduler  # noqa: E402
+from app.services.inference_pool import InferencePool  # noqa: E402
+
+
+def synthetic_frames(count, seed=0):
+    """웹캠 해상도(640x480) 합성 프레임"""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def run_load(predict, frames, clients, duration):
+    """
+    클라이언트 스레드들이 duration초 동안 프레임을 계속 예측
+    :return: (경과 시간, 지연 시간 리스트, 오류 수)
+    """
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        i = index
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                predict(frames[i % len(frames)])
+            except Exception:
+                errors[index] += 1
+                continue
+            latencies[index].append(time.perf_counter() - started)
+            i += clients
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, [v for per_client in latencies for v in per_client], sum(errors)
+
+
+def summarize(elapsed, latencies, errors):
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "frames": len(latencies),
+        "throughput_fps": round(len(latencies) / elapsed, 1),
+        "latency": summarize_latencies(latencies),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 추론 워커 풀 부하 테스트")
+    parser.add_argument("--model", required=True, help="모델 파일 경로 (--backend 형식)")
+    parser.add_argument("--backend", default="keras", choices=["keras", "tflite", "onnx"])
+    parser.add_argument("--images", help="입력 이미지 디렉토리 (미지정 시 합성 프레임)")
+    parser.add_argument("--num-frames", type=int, default=64)
+    parser.add_argument("--pool-sizes", default="1,2,4,8", help="쉼표로 구분한 풀 크기 목록")
+    parser.add_argument("--intra-op-threads", type=int, default=1, help="워커별 intra-op 스레드 수")
+    parser.add_argument("--inter-op-threads", type=int, default=1, help="워커별 inter-op 스레드 수")
+    parser.add_argument("--slots", type=int, default=16, help="워커별 공유 메모리 슬롯 수")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--clients", type=int, default=32, help="동시 요청 스레드 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="구성별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="구성별 워밍업 시간 (초)")
+    parser.add_argument(
+        "--start-method",
+        default="spawn",
+        choices=["spawn", "forkserver", "fork"],
+        help="워커 프로세스 시작 방식",
+    )
+    parser.add_argument("--skip-thread", action="store_true", help="웹 프로세스 내 추론 기준선 생략")
+    args = parser.parse_args()
+
+    if args.images:
+        frames = [image for _, image in load_image_dir(args.images, args.num_frames)]
+    else:
+        frames = synthetic_frames(args.num_frames)
+    pool_sizes = [int(size) for size in args.pool_sizes.split(",") if size]
+    results = {"config": {**vars(args), "cpu_count": os.cpu_count()}, "process": {}}
+
+    # 1. 워커 프로세스 풀 (풀 크기별)
+    for pool_size in pool_sizes:
+        pool = InferencePool(
+            args.model,
+            backend=args.backend,
+            pool_size=pool_size,
+            intra_op_threads=args.intra_op_threads,
+            inter_op_threads=args.inter_op_threads,
+            slots_per_worker=args.slots,
+            max_batch_size=args.max_batch_size,
+            start_method=args.start_method,
+        )
+        started = time.perf_counter()
+        pool.start()
+        startup = time.perf_counter() - started
+        try:
+            run_load(pool.predict, frames, args.clients, args.warmup)
+            result = summarize(*run_load(pool.predict, frames, args.clients, args.duration))
+            stats = pool.stats()
+        finally:
+            pool.stop()
+        result["startup_s"] = round(startup, 3)
+        result["avg_batch_size"] = stats["avg_batch_size"]
+        results["process"][str(pool_size)] = result
+
+    # 2. 기준선 : 웹 프로세스 안에서 모델 하나 + 배칭 스케줄러
+    # (fork 시작 방식의 워커가 TensorFlow 초기화 이후에 만들어지지 않도록 마지막에 측정)
+    if not args.skip_thread:
+        model = create_backend(args.backend, args.model, args.intra_op_threads * max(pool_sizes))
+        scheduler = EmotionBatchScheduler(model, max_batch_size=args.max_batch_size, max_wait_ms=10).start()
+        run_load(scheduler.predict, frames, args.clients, args.warmup)
+        results["thread"] = summarize(*run_load(scheduler.predict, frames, args.clients, args.duration))
+        results["thread"]["batching"] = scheduler.stats()
+        scheduler.stop()
+        # 배칭 없는 단일 요청 기준 지연 시간 (참고용)
+        latencies = []
+        for frame in frames:
+            started = time.perf_counter()
+            predict_emotion(frame, model)
+            latencies.append(time.perf_counter() - started)
+        results["thread"]["single_request_latency"] = summarize_latencies(latencies)
+        del model
+
+    base = results["process"][str(pool_sizes[0])]["throughput_fps"]
+    print(f"{'mode':<16}{'frames/s':>10}{'scale':>8}{'p50(ms)':>10}{'p99(ms)':>10}{'batch':>8}{'errors':>8}")
+    if "thread" in results:
+        r = results["thread"]
+        print(
+            f"{'thread':<16}{r['throughput_fps']:>10.1f}{'-':>8}{r['latency']['p50_ms']:>10.2f}"
+            f"{r['latency']['p99_ms']:>10.2f}{round(r['batching']['avg_batch_size'], 2):>8}{r['errors']:>8}"
+        )
+    for pool_size in pool_sizes:
+        r = results["process"][str(pool_size)]
+        scale = r["throughput_fps"] / base if base else 0.0
+        print(
+            f"{'process x' + str(pool_size):<16}{r['throughput_fps']:>10.1f}{scale:>8.2f}"
+            f"{r['latency']['p50_ms']:>10.2f}{r['latency']['p99_ms']:>10.2f}"
+            f"{r['avg_batch_size']:>8}{r['errors']:>8}"
+        )
+
+    write_results("inference_pool", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+pre-fork 메모리 벤치마크 : gunicorn 워커 수별 상주 메모리 (preload vs 워커별 로드)
+
+워커 수(기본 1, 4, 8)와 GUNICORN_PRELOAD(true/false) 조합마다 gunicorn을 실행하고
+/ready가 안정적으로 200을 반환한 뒤 마스터와 워커 프로세스의
+- RSS 합계 (공유 페이지를 프로세스마다 중복 계산)
+- PSS 합계 (공유 페이지를 나눠서 계산 = 실제 점유 메모리)
+- 워커 평균 USS (워커 고유 메모리)
+를 측정. preload 모드에서는 마스터가 로드한 모델/인덱스 페이지를 워커가 공유하므로 PSS 합계가 워커 수에 덜 비례함
+
+실제 환경 변수(MODEL_PATH, VECTOR_DB_PATH, OPENAI_API_KEY, DB 설정 등)가 있는 상태에서 실행
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_prefork_memory --workers 1,4,8 --modes preload,no-preload
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import psutil
+
+from benchmarks.common import ensure_bench_env, write_results
+
+BE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_ready(url, workers, timeout):
+    """/ready가 연속으로 200을 반환할 때까지 대기 (요청이 여러 워커로 분산되도록 워커 수의 3배)"""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, OSError):
+            streak = 0
+        if streak >= workers * 3:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def memory_of(process):
+    """프로세스 메모리 (MB) : rss, pss, uss"""
+    info = process.memory_full_info()
+    to_mb = 1024.0 * 1024.0
+    return {
+        "rss_mb": info.rss / to_mb,
+        "pss_mb": getattr(info, "pss", info.rss) / to_mb,
+        "uss_mb": info.uss / to_mb,
+    }
+
+
+def measure(workers, preload, args):
+    env = {
+        **os.environ,
+        "GUNICORN_WORKERS": str(workers),
+        "GUNICORN_PRELOAD": "true" if preload else "false",
+        "GUNICORN_BIND": args.bind,
+        "GUNICORN_THREADS": str(args.threads),
+        "GUNICORN_LOG_LEVEL": "warning",
+    }
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=BE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+    try:
+        if not wait_ready(f"http://{args.bind}/ready", workers, args.ready_timeout):
+            raise RuntimeError(f"워커 {workers}개 ({'preload' if preload else 'no-preload'}) 준비 시간 초과")
+        ready_s = time.monotonic() - started
+        # 마지막으로 준비된 워커의 리소스 로드가 끝나도록 잠시 대기
+        time.sleep(args.settle)
+
+        master = psutil.Process(server.pid)
+        children = master.children()
+        master_mem = memory_of(master)
+        worker_mems = [memory_of(child) for child in children]
+        total = {
+            key: master_mem[key] + sum(mem[key] for mem in worker_mems)
+            for key in ("rss_mb", "pss_mb", "uss_mb")
+        }
+        return {
+            "workers": len(children),
+            "ready_s": round(ready_s, 2),
+            "master": {key: round(value, 1) for key, value in master_mem.items()},
+            "total_rss_mb": round(total["rss_mb"], 1),
+            "total_pss_mb": round(total["pss_mb"], 1),
+            "worker_uss_mb": round(sum(mem["uss_mb"] for mem in worker_mems) / len(worker_mems), 1),
+            "worker_rss_mb": round(sum(mem["rss_mb"] for mem in worker_mems) / len(worker_mems), 1),
+        }
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn 워커 수별 상주 메모리 비교")
+    parser.add_argument("--workers", default="1,4,8", help="쉼표로 구분한 워커 수 목록")
+    parser.add_argument("--modes", default="preload,no-preload", help="preload / no-preload")
+    parser.add_argument("--threads", type=int, default=8, help="워커별 요청 처리 스레드 수")
+    parser.add_argument("--bind", default="127.0.0.1:5055")
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--settle", type=float, default=5.0, help="준비 완료 후 측정 전 대기 시간 (초)")
+    parser.add_argument("--verbose", action="store_true", help="gunicorn 로그 출력")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    worker_counts = [int(count) for count in args.workers.split(",") if count]
+    modes = [mode for mode in args.modes.split(",") if mode]
+    results = {"config": vars(args), "cpu_count": os.cpu_count(), "runs": {}}
+
+    for mode in modes:
+        results["runs"][mode] = {}
+        for workers in worker_counts:
+            results["runs"][mode][str(workers)] = measure(workers, mode == "preload", args)
+
+    print(f"{'mode':<12}{'workers':>8}{'RSS sum(MB)':>13}{'PSS sum(MB)':>13}{'worker USS(MB)':>16}{'master RSS(MB)':>16}{'ready(s)':>10}")
+    for mode, runs in results["runs"].items():
+        for workers, r in runs.items():
+            print(
+                f"{mode:<12}{workers:>8}{r['total_rss_mb']:>13.1f}{r['total_pss_mb']:>13.1f}"
+                f"{r['worker_uss_mb']:>16.1f}{r['master']['rss_mb']:>16.1f}{r['ready_s']:>10.2f}"
+            )
+
+    write_results("prefork_memory", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+챗봇 RAG 파이프라인 벤치마크 : 메시지당 임베딩/벡터 검색/LLM 호출 횟수와 지연 시간
+
+- legacy : 기존 경로 재현 (retrieve_relevant_documents로 검색한 뒤 ConversationalRetrievalChain이
+  프롬프트 전체를 질문으로 다시 임베딩/검색하고 기본 QA 프롬프트로 LLM 호출)
+- single : 현재 경로 (chat_with_bot - 사용자 메시지로 한 번 검색 → 프롬프트 조립 → LLM 직접 호출)
+
+외부 API 없이 측정하도록
+- 임베딩 : 호출 횟수를 세는 결정적 가짜 임베딩 (--embed-ms로 API 왕복 시간 흉내)
+- 벡터 DB : 합성 상담 사례로 만든 인메모리 FAISS
+- LLM : 호출 횟수/프롬프트 길이를 세는 가짜 채팅 모델 (--llm-ms)
+- MongoDB : mongomock
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_rag_pipeline --messages 50 --embed-ms 80 --llm-ms 300
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from typing import ClassVar
+
+import mongomock
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+SAMPLE_MESSAGES = [
+    "요즘 친구들이랑 자꾸 싸워서 학교 가기 싫어",
+    "시험 망쳐서 부모님한테 혼날까 봐 무서워",
+    "오늘 좋아하는 애한테 고백 받았어!",
+    "아무것도 하기 싫고 그냥 계속 우울해",
+    "동생이 내 물건을 맘대로 써서 너무 화나",
+]
+
+
+class CountingEmbeddings(Embeddings):
+    """호출 횟수를 세는 결정적 가짜 임베딩"""
+
+    def __init__(self, size=1536, delay_ms=0.0):
+        self.embedding = DeterministicFakeEmbedding(size=size)
+        self.delay = delay_ms / 1000.0
+        self.query_calls = 0
+        self.document_calls = 0
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return self.embedding.embed_documents(texts)
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        time.sleep(self.delay)
+        return self.embedding.embed_query(text)
+
+
+class CountingChatModel(FakeListChatModel):
+    """호출 횟수와 프롬프트 길이를 세는 가짜 채팅 모델"""
+
+    stats: ClassVar[dict] = {"calls": 0, "prompt_chars": 0}
+    delay_ms: float = 0.0
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        CountingChatModel.stats["calls"] += 1
+        CountingChatModel.stats["prompt_chars"] += sum(len(message.content) for message in messages)
+        time.sleep(self.delay_ms / 1000.0)
+        return super()._call(messages, stop, run_manager, **kwargs)
+
+
+def build_vectorstore(embeddings, num_docs):
+    """합성 상담 사례 FAISS 인덱스 (metadata의 output이 상담 답변)"""
+    from langchain_community.vectorstores import FAISS
+
+    texts = [f"input: {SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)]} ({i})" for i in range(num_docs)]
+    metadatas = [{"output": f"상담 사례 {i}: 그런 일이 있었구나. 조금 더 이야기해 줄래?"} for i in range(num_docs)]
+    return FAISS.from_texts(texts, embeddings, metadatas=metadatas)
+
+
+def legacy_reply(user_id, chatroom_id, user_message):
+    """기존 경로: 검색 결과를 프롬프트에 넣은 뒤 ConversationalRetrievalChain이 다시 검색"""
+    from langchain.chains import ConversationalRetrievalChain
+
+    from app.services.llm_service import describe_emotion, get_emotion_data, llm_resource, prompt_resource
+    from app.services.rag_service import format_retrieved_context, get_retriever, retrieve_relevant_documents
+
+    retrieved_context = format_retrieved_context(retrieve_relevant_documents(user_message))
+    emotion, confidence = get_emotion_data(user_id, chatroom_id)
+    input_text = prompt_resource.get().format(
+        question=user_message,
+        context=retrieved_context,
+        emotion_description=describe_emotion(emotion, confidence),
+    )
+    conversation_rag = ConversationalRetrievalChain.from_llm(
+        llm=llm_resource.get(),
+        retriever=get_retriever(),
+        return_source_documents=False,
+        output_key="answer",
+        verbose=False,
+    )
+    return conversation_rag.invoke({"question": input_text, "chat_history": []})["answer"].strip()
+
+
+def single_reply(user_id, chatroom_id, user_message):
+    """현재 경로: chat_with_bot (테스트 모드, DB 저장 없음)"""
+    from app.services.chat_service import chat_with_bot
+
+    return chat_with_bot(user_id, chatroom_id, user_message, test_mode=True)["bot_response"]
+
+
+def measure(name, reply, embeddings, messages):
+    CountingChatModel.stats.update(calls=0, prompt_chars=0)
+    embeddings.query_calls = 0
+
+    latencies = []
+    for i, message in enumerate(messages):
+        started = time.perf_counter()
+        reply("bench-user", f"bench-room-{i}", message)
+        latencies.append(time.perf_counter() - started)
+
+    count = len(messages)
+    return {
+        "pipeline": name,
+        "embedding_calls_per_message": embeddings.query_calls / count,
+        "llm_calls_per_message": CountingChatModel.stats["calls"] / count,
+        "prompt_chars_per_message": round(CountingChatModel.stats["prompt_chars"] / count, 1),
+        "latency": summarize_latencies(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="챗봇 RAG 파이프라인 임베딩/검색 횟수 비교")
+    parser.add_argument("--messages", type=int, default=50, help="측정할 메시지 수")
+    parser.add_argument("--docs", type=int, default=2000, help="합성 상담 사례 수")
+    parser.add_argument("--embed-ms", type=float, default=0.0, help="임베딩 호출당 지연 (API 왕복 흉내)")
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="LLM 호출당 지연")
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    from app.database import mongo
+    from app.services import llm_service, rag_service
+
+    embeddings = CountingEmbeddings(delay_ms=args.embed_ms)
+    vectorstore = build_vectorstore(embeddings, args.docs)
+    # 레지스트리 로더를 바꿔서 실제 벡터 DB/OpenAI 대신 사용
+    rag_service.retriever_resource.loader = vectorstore.as_retriever
+    llm_service.llm_resource.loader = lambda: CountingChatModel(
+        responses=["그랬구나. 조금 더 얘기해 줄래?"], delay_ms=args.llm_ms
+    )
+    mongo.db = mongomock.MongoClient().bench
+
+    messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(args.messages)]
+    results = {"config": vars(args), "runs": {}}
+    print(f"{'pipeline':<10}{'embed/msg':>11}{'llm/msg':>9}{'prompt chars':>14}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for name, reply in (("legacy", legacy_reply), ("single", single_reply)):
+        # 요청마다 출력되는 로그는 측정 시간에 섞이지 않도록 버림
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            reply("bench-user", "bench-warmup", messages[0])
+            run = measure(name, reply, embeddings, messages)
+        results["runs"][name] = run
+        print(
+            f"{name:<10}{run['embedding_calls_per_message']:>11.1f}{run['llm_calls_per_message']:>9.1f}"
+            f"{run['prompt_chars_per_message']:>14.0f}{run['latency']['p50_ms']:>10.2f}{run['latency']['p95_ms']:>10.2f}"
+        )
+
+    write_results("rag_pipeline", results)
+
+
+if __name__ == "__main__":
+    main()
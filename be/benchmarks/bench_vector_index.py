@@ -0,0 +1,173 @@
+"""
+RAG 벡터 인덱스 종류별 Recall@k / QPS / 메모리 비교와 검색 파라미터 스윕
+
+- 벡터 : 기존 벡터 DB(--index, index.faiss)에서 복원하거나 군집 형태의 합성 벡터(--synthetic N --dim D)
+- 보류 질의 : 벡터 중 --num-queries개를 빼서 질의로 사용 (나머지로 인덱스 생성)
+- 정답 : 같은 벡터로 만든 flat(전수) 인덱스의 top-k (k번째 거리 이하면 정답, 중복 벡터 동률 처리)
+- 인덱스 종류별 생성 시간, 인덱스 크기(MB),
+  nprobe(ivf_flat / ivf_pq) / efSearch(hnsw) 값별 Recall@k, QPS(질의 1건씩), p50
+- --target-recall을 만족하는 가장 작은 파라미터를 추천 (VECTOR_SEARCH_PARAMS 설정값)
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_vector_index --index ../data/faiss_v2 --num-queries 500 --k 4
+    python -m benchmarks.bench_vector_index --synthetic 200000 --dim 384 --types ivf_flat,ivf_pq,hnsw
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+
+def load_index_vectors(index_dir):
+    """벡터 DB의 index.faiss에서 원본 벡터 복원 (flat / ivf_flat / hnsw 인덱스만 가능)"""
+    import faiss
+
+    index = faiss.read_index(os.path.join(index_dir, "index.faiss"))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def synthetic_vectors(num_vectors, dimension, num_clusters=200, seed=0):
+    """군집 중심 주변에 분포한 L2 정규화 합성 벡터 (문장 임베딩과 비슷한 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((num_clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, num_clusters, num_vectors)]
+    vectors += 0.6 * rng.standard_normal((num_vectors, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(base, queries, found, kth_distances):
+    """
+    질의별 top-k 중 정답 비율의 평균
+    거리가 같은 벡터(중복 문서)끼리는 순서가 정해지지 않으므로 번호 대신
+    정확한 거리가 전수 검색 k번째 거리 이하인 결과를 정답으로 셈
+    """
+    hits = []
+    for query, ids, kth in zip(queries, found, kth_distances):
+        ids = ids[ids >= 0]
+        distances = ((base[ids] - query) ** 2).sum(axis=1)
+        hits.append(int((distances <= kth + 1e-5).sum()) / len(found[0]))
+    return round(float(np.mean(hits)), 4)
+
+
+def measure(index, base, queries, kth_distances, k, params):
+    """질의를 1건씩 검색해서 Recall@k, QPS, 지연 시간 측정"""
+    from app.services.vector_index import search_index
+
+    found, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        _, indices = search_index(index, query[np.newaxis], k, params)
+        latencies.append(time.perf_counter() - started)
+        found.append(indices[0])
+    latency = summarize_latencies(latencies)
+    return {
+        f"recall@{k}": recall_at_k(base, queries, found, kth_distances),
+        "qps": round(len(queries) / sum(latencies), 1),
+        "p50_ms": latency["p50_ms"],
+        "p95_ms": latency["p95_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS 인덱스 종류별 Recall@k / QPS / 메모리 비교")
+    parser.add_argument("--index", help="벡터를 가져올 벡터 DB 디렉토리")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 벡터 수 (--index 대신)")
+    parser.add_argument("--dim", type=int, default=384, help="합성 벡터 차원")
+    parser.add_argument("--num-queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--types", default="flat,ivf_flat,ivf_pq,hnsw")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF 클러스터 수 (0이면 자동)")
+    parser.add_argument("--pq-m", type=int, default=16)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--nprobes", default="1,2,4,8,16,32,64")
+    parser.add_argument("--ef-searches", default="16,32,64,128,256")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not args.index and not args.synthetic:
+        parser.error("--index 또는 --synthetic 중 하나가 필요합니다.")
+
+    ensure_bench_env()
+    from app.services.vector_index import build_faiss_index, index_memory_bytes, search_index, search_parameters
+
+    vectors = (
+        load_index_vectors(args.index) if args.index else synthetic_vectors(args.synthetic, args.dim, seed=args.seed)
+    )
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(vectors))
+    queries = np.ascontiguousarray(vectors[order[: args.num_queries]])
+    base = np.ascontiguousarray(vectors[order[args.num_queries :]])
+    print(f"벡터 {len(base)}개 (차원 {base.shape[1]}), 보류 질의 {len(queries)}개, k={args.k}")
+
+    exact = build_faiss_index(base, "flat")
+    truth_distances, _ = search_index(exact, queries, args.k)
+    kth_distances = truth_distances[:, -1]
+
+    sweeps = {
+        "ivf_flat": ("nprobe", [int(v) for v in args.nprobes.split(",") if v]),
+        "ivf_pq": ("nprobe", [int(v) for v in args.nprobes.split(",") if v]),
+        "hnsw": ("ef_search", [int(v) for v in args.ef_searches.split(",") if v]),
+    }
+    results = {
+        "config": vars(args),
+        "num_vectors": len(base),
+        "dimension": int(base.shape[1]),
+        "indexes": {},
+        "recommended": {},
+    }
+
+    for index_type in [name for name in args.types.split(",") if name]:
+        started = time.perf_counter()
+        index = exact if index_type == "flat" else build_faiss_index(
+            base, index_type, nlist=args.nlist, pq_m=args.pq_m, hnsw_m=args.hnsw_m
+        )
+        entry = {
+            "build_s": round(time.perf_counter() - started, 2),
+            "memory_mb": round(index_memory_bytes(index) / 2**20, 2),
+            "runs": [],
+        }
+        if index_type in ("ivf_flat", "ivf_pq"):
+            entry["nlist"] = int(index.nlist)
+
+        param_name, values = sweeps.get(index_type, (None, [None]))
+        for value in values:
+            params = search_parameters(index, **({param_name: value} if param_name else {}))
+            run = measure(index, base, queries, kth_distances, args.k, params)
+            if param_name:
+                run[param_name] = value
+            entry["runs"].append(run)
+            if (
+                param_name
+                and index_type not in results["recommended"]
+                and run[f"recall@{args.k}"] >= args.target_recall
+            ):
+                results["recommended"][index_type] = {param_name: value, **run}
+        results["indexes"][index_type] = entry
+
+    print(f"{'index':<10}{'param':>14}{f'recall@{args.k}':>11}{'QPS':>10}{'p50(ms)':>9}{'MB':>9}{'build(s)':>10}")
+    for index_type, entry in results["indexes"].items():
+        for run in entry["runs"]:
+            param = next((f"{name}={run[name]}" for name in ("nprobe", "ef_search") if name in run), "-")
+            print(
+                f"{index_type:<10}{param:>14}{run[f'recall@{args.k}']:>11.4f}{run['qps']:>10.1f}"
+                f"{run['p50_ms']:>9.3f}{entry['memory_mb']:>9.1f}{entry['build_s']:>10.2f}"
+            )
+    for index_type in sweeps:
+        if index_type not in results["indexes"]:
+            continue
+        recommended = results["recommended"].get(index_type)
+        if recommended:
+            param_name = sweeps[index_type][0]
+            print(f"{index_type}: recall@{args.k} >= {args.target_recall} 최소 {param_name}={recommended[param_name]}")
+        else:
+            print(f"{index_type}: 스윕 범위에서 recall@{args.k} {args.target_recall} 미달 (nlist/pq_m/hnsw_m 조정 필요)")
+
+    write_results("vector_index", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+RAG 벡터 저장소 형식 벤치마크 : LangChain pickle 형식 vs mmap 형식 (cold start / 메모리)
+
+형식마다 새 프로세스(워커 역할)를 --workers개 띄워서 각각
+- import 시간, 벡터 저장소 로드 시간 (cold start = import + 로드)
+- 로드 직후 / 검색 --queries건 후 RSS와 그 중 익명(private) 메모리
+- 검색 1건(질의 벡터 → top-k Document) p50/p95
+를 측정하고, 워커가 모두 떠 있는 상태에서 PSS 합계(공유 페이지를 나눠 계산 = 실제 점유)와 워커 평균 USS(고유 메모리) 측정
+mmap 형식은 인덱스/문서 파일 페이지를 워커끼리 공유하므로 워커 수가 늘어도 PSS 합계가 덜 늘어남
+
+입력 : 기존 LangChain 형식 벡터 DB(--index, mmap 형식은 임시 디렉토리로 변환)
+      또는 합성 데이터(--synthetic N --dim D, 두 형식 모두 임시 디렉토리에 생성)
+임베딩 모델 없이 측정하도록 질의는 인덱스 차원의 임의 벡터 사용
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.bench_vector_store --index ../data/faiss_v2 --workers 4
+    python -m benchmarks.bench_vector_store --synthetic 200000 --dim 1536 --workers 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import ensure_bench_env, summarize_latencies, write_results
+
+BE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory_status():
+    """/proc/self/status의 RSS와 익명 메모리 (MB)"""
+    values = {}
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            key = line.split(":")[0]
+            if key in ("VmRSS", "RssAnon"):
+                values[key] = int(line.split()[1]) / 1024.0
+    return {"rss_mb": round(values.get("VmRSS", 0.0), 1), "anon_mb": round(values.get("RssAnon", 0.0), 1)}
+
+
+def run_child(store_format, index_dir, num_queries, k, seed):
+    """워커 프로세스 : 로드/검색 측정 후 결과 JSON 한 줄 출력, stdin이 닫힐 때까지 대기 (메모리 측정용)"""
+    started = time.perf_counter()
+    import faiss  # noqa: F401
+
+    from app.services.vector_index import search_vectorstore_by_vector
+
+    if store_format == "langchain":
+        from langchain_community.vectorstores import FAISS
+    else:
+        from app.services.vector_store import MmapVectorStore
+    import_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if store_format == "langchain":
+        store = FAISS.load_local(index_dir, None, allow_dangerous_deserialization=True)
+    else:
+        store = MmapVectorStore.load(index_dir, None)
+    load_s = time.perf_counter() - started
+    after_load = memory_status()
+
+    rng = np.random.default_rng(seed)
+    queries = rng.standard_normal((num_queries, store.index.d)).astype(np.float32)
+    latencies, returned = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        returned += len(search_vectorstore_by_vector(store, query, k))
+        latencies.append(time.perf_counter() - started)
+
+    print(
+        json.dumps(
+            {
+                "import_s": round(import_s, 3),
+                "load_s": round(load_s, 3),
+                "cold_start_s": round(import_s + load_s, 3),
+                "after_load": after_load,
+                "after_queries": memory_status(),
+                "search": summarize_latencies(latencies),
+                "documents_returned": returned,
+            }
+        ),
+        flush=True,
+    )
+    sys.stdin.read()
+
+
+def measure_format(store_format, index_dir, args):
+    """워커 --workers개를 동시에 띄워 측정 (PSS/USS는 모두 떠 있는 상태에서)"""
+    import psutil
+
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "benchmarks.bench_vector_store",
+                "--child", store_format, "--child-dir", index_dir,
+                "--queries", str(args.queries), "--k", str(args.k), "--seed", str(seed),
+            ],
+            cwd=BE_DIR,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        for seed in range(args.workers)
+    ]
+    try:
+        reports = [json.loads(worker.stdout.readline()) for worker in workers]
+        to_mb = 1024.0 * 1024.0
+        memory = [psutil.Process(worker.pid).memory_full_info() for worker in workers]
+        pss_total = sum(getattr(info, "pss", info.rss) for info in memory) / to_mb
+        uss_avg = sum(info.uss for info in memory) / len(memory) / to_mb
+    finally:
+        for worker in workers:
+            worker.stdin.close()
+            worker.wait()
+
+    def mean(path):
+        values = reports
+        for key in path:
+            values = [value[key] for value in values]
+        return round(float(np.mean(values)), 3)
+
+    return {
+        "import_s": mean(["import_s"]),
+        "load_s": mean(["load_s"]),
+        "cold_start_s": mean(["cold_start_s"]),
+        "rss_after_load_mb": mean(["after_load", "rss_mb"]),
+        "anon_after_load_mb": mean(["after_load", "anon_mb"]),
+        "rss_after_queries_mb": mean(["after_queries", "rss_mb"]),
+        "anon_after_queries_mb": mean(["after_queries", "anon_mb"]),
+        "search_p50_ms": mean(["search", "p50_ms"]),
+        "search_p95_ms": mean(["search", "p95_ms"]),
+        "workers_pss_total_mb": round(pss_total, 1),
+        "worker_uss_avg_mb": round(uss_avg, 1),
+    }
+
+
+def build_synthetic(output_dir, num_vectors, dimension, doc_chars, seed=0):
+    """합성 문서/벡터로 두 형식의 벡터 DB 생성 → (langchain 디렉토리, mmap 디렉토리)"""
+    import logging
+
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+
+    from app.services.vector_index import build_faiss_index
+    from app.services.vector_store import write_mmap_store
+
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((num_vectors, dimension)).astype(np.float32)
+    syllables = np.array([chr(code) for code in range(0xAC00, 0xAC00 + 400)])
+
+    def text(length):
+        return "".join(rng.choice(syllables, length))
+
+    documents = [(text(60), {"output": text(doc_chars)}) for _ in range(num_vectors)]
+    index = build_faiss_index(vectors, "flat")
+
+    langchain_dir, mmap_dir = os.path.join(output_dir, "langchain"), os.path.join(output_dir, "mmap")
+    # 임베딩 없이 저장만 하므로 embedding_function 경고 숨김
+    logging.getLogger("langchain_community.vectorstores.faiss").setLevel(logging.ERROR)
+    ids = [str(i) for i in range(num_vectors)]
+    FAISS(
+        embedding_function=None,
+        index=index,
+        docstore=InMemoryDocstore(
+            {i: Document(page_content=content, metadata=metadata) for i, (content, metadata) in zip(ids, documents)}
+        ),
+        index_to_docstore_id=dict(enumerate(ids)),
+    ).save_local(langchain_dir)
+    write_mmap_store(mmap_dir, index, documents)
+    return langchain_dir, mmap_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LangChain pickle / mmap 벡터 저장소 cold start와 메모리 비교")
+    parser.add_argument("--index", help="LangChain 형식 벡터 DB 디렉토리")
+    parser.add_argument("--mmap-index", help="mmap 형식 벡터 DB 디렉토리 (없으면 --index를 임시 디렉토리로 변환)")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 문서 수 (--index 대신)")
+    parser.add_argument("--dim", type=int, default=1536, help="합성 벡터 차원")
+    parser.add_argument("--doc-chars", type=int, default=400, help="합성 상담 답변 글자 수")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", choices=["langchain", "mmap"], help=argparse.SUPPRESS)
+    parser.add_argument("--child-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    ensure_bench_env()
+    if args.child:
+        run_child(args.child, args.child_dir, args.queries, args.k, args.seed)
+        return
+    if not args.index and not args.synthetic:
+        parser.error("--index 또는 --synthetic 중 하나가 필요합니다.")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.synthetic:
+            started = time.perf_counter()
+            langchain_dir, mmap_dir = build_synthetic(temp_dir, args.synthetic, args.dim, args.doc_chars, args.seed)
+            print(f"합성 벡터 DB 생성 {time.perf_counter() - started:.1f}s")
+        else:
+            from scripts.convert_vector_db import convert_vector_db
+
+            langchain_dir, mmap_dir = args.index, args.mmap_index
+            if not mmap_dir:
+                mmap_dir = os.path.join(temp_dir, "mmap")
+                convert_vector_db(langchain_dir, mmap_dir)
+
+        sizes = {
+            name: round(sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file()) / 2**20, 1)
+            for name, path in (("langchain", langchain_dir), ("mmap", mmap_dir))
+        }
+        results = {"config": {key: value for key, value in vars(args).items() if not key.startswith("child")}}
+        results["disk_mb"] = sizes
+        results["formats"] = {
+            store_format: measure_format(store_format, path, args)
+            for store_format, path in (("langchain", langchain_dir), ("mmap", mmap_dir))
+        }
+
+    print(f"워커 {args.workers}개, 질의 {args.queries}건 (k={args.k})")
+    print(
+        f"{'format':<10}{'disk(MB)':>9}{'import(s)':>10}{'load(s)':>9}{'RSS(MB)':>9}{'anon(MB)':>10}"
+        f"{'p50(ms)':>9}{'PSS합(MB)':>11}{'USS(MB)':>9}"
+    )
+    for store_format, result in results["formats"].items():
+        print(
+            f"{store_format:<10}{sizes[store_format]:>9.1f}{result['import_s']:>10.3f}{result['load_s']:>9.3f}"
+            f"{result['rss_after_queries_mb']:>9.1f}{result['anon_after_queries_mb']:>10.1f}"
+            f"{result['search_p50_ms']:>9.3f}{result['workers_pss_total_mb']:>11.1f}{result['worker_uss_avg_mb']:>9.1f}"
+        )
+
+    write_results("vector_store", results)
+
+
+if __name__ == "__main__":
+    main()
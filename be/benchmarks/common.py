@@ -0,0 +1,140 @@
+"""
+벤치마크 공통 유틸리티
+
+- 설정 모듈 로드에 필요한 더미 환경 변수 지정
+- 지연 시간 백분위수 요약
+- 결과 JSON 저장
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def ensure_bench_env():
+    """
+    config.settings는 필수 환경 변수가 없으면 import 시점에 예외를 던지므로
+    벤치마크 실행에 필요한 더미 값을 채워 넣음 (이미 설정된 값은 유지)
+    """
+    defaults = {
+        "DB_HOST": "localhost",
+        "DB_USER": "bench",
+        "DB_PASSWORD": "bench",
+        "DB_NAME": "bench",
+        "MONGO_URI": "mongodb://localhost:27017/bench",
+        "MODEL_PATH": "bench.keras",
+        "VECTOR_DB_PATH": "bench_faiss",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def current_rss_mb(pid="self"):
+    """
+    프로세스의 현재 RSS(MB) 조회 (Linux는 /proc, 그 외는 psutil 사용)
+    :param pid: 프로세스 ID (기본값: 현재 프로세스)
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+
+    import psutil
+
+    process = psutil.Process() if pid == "self" else psutil.Process(int(pid))
+    return process.memory_info().rss / (1024.0 * 1024.0)
+
+
+def load_image_dir(image_dir, limit=None):
+    """
+    디렉토리(하위 폴더 포함)의 이미지를 OpenCV로 로드
+    :return: (경로, 이미지) 리스트
+    """
+    import cv2
+
+    paths = []
+    for root, _, files in os.walk(image_dir):
+        paths.extend(
+            os.path.join(root, name)
+            for name in sorted(files)
+            if name.lower().endswith((".jpg", ".jpeg", ".png", ".bmp"))
+        )
+
+    images = []
+    for path in paths[:limit]:
+        image = cv2.imread(path)
+        if image is not None:
+            images.append((path, image))
+    return images
+
+
+def summarize_latencies(latencies):
+    """
+    지연 시간 리스트(초)를 ms 단위 p50/p95/p99 요약으로 변환
+    :param latencies: 초 단위 지연 시간 리스트
+    """
+    if len(latencies) == 0:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+
+    values = np.asarray(latencies, dtype=np.float64) * 1000.0
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+    }
+
+
+class SimulatedModel:
+    """
+    실제 모델 없이 배치 처리 비용을 흉내 내는 모델
+    호출당 고정 오버헤드 + 프레임당 비용만큼 sleep (TF처럼 GIL을 놓음)
+    연산 자원(CPU 코어)을 공유하는 상황을 흉내 내기 위해 호출은 직렬화됨
+    """
+
+    def __init__(self, overhead_ms=15.0, per_item_ms=4.0, num_classes=4, seed=0):
+        self.overhead = overhead_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self.num_classes = num_classes
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def predict(self, batch):
+        with self._lock:
+            time.sleep(self.overhead + self.per_item * len(batch))
+            logits = self._rng.random((len(batch), self.num_classes), dtype=np.float32)
+        return logits / logits.sum(axis=1, keepdims=True)
+
+
+def write_results(name, results, output_dir=None):
+    """
+    벤치마크 결과를 JSON 파일로 저장
+    :param name: 벤치마크 이름 (파일명 접두어)
+    :param results: JSON 직렬화 가능한 결과 딕셔너리
+    :return: 저장된 파일 경로
+    """
+    output_dir = output_dir or RESULTS_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    path = os.path.join(output_dir, f"{name}_{timestamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"benchmark": name, "created_at": timestamp, "results": results},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    print(f"결과 저장: {path}")
+    return path
@@ -0,0 +1,122 @@
+"""
+벤치마크 결과 회귀 검사 : 저장된 기준선(baseline) JSON 대비 지연 시간/처리량 비교
+
+- 지연 시간 지표(p50_ms, p95_ms, p99_ms) : 기준선보다 max_regression 비율 이상 늘고
+  증가량이 min_delta_ms 이상이면 회귀 (아주 짧은 단계의 측정 잡음 무시)
+- 처리량 지표(frames_per_sec) : 기준선보다 max_regression 비율 이상 줄면 회귀
+- 기준선과 현재 결과에 모두 있는 항목만 비교 (실행 조합/단계가 달라진 항목은 건너뜀)
+
+write_results로 저장한 파일({"benchmark", "created_at", "results"})과 결과 딕셔너리 모두 읽을 수 있음
+
+실행 예시 (be/ 디렉토리):
+    python -m benchmarks.regression benchmarks/results/emotion_predict_20250101120000.json \
+        --baseline benchmarks/baselines/emotion_predict.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import sys
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+THROUGHPUT_METRICS = ("frames_per_sec",)
+
+
+def load_results(path):
+    """결과 JSON 로드 (write_results 형식이면 results 부분만)"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("results", data)
+
+
+def flatten(results, prefix=""):
+    """중첩 딕셔너리를 {"runs/route/640x480/c8/stages/inference/p95_ms": 값} 형태로 (config 제외)"""
+    values = {}
+    for key, value in results.items():
+        if not prefix and key == "config":
+            continue
+        path = f"{prefix}/{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            values.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = float(value)
+    return values
+
+
+def check_regressions(baseline, current, max_regression=0.2, min_delta_ms=1.0):
+    """
+    기준선 대비 회귀 항목 찾기
+    :param baseline: 기준선 결과 딕셔너리
+    :param current: 현재 결과 딕셔너리
+    :param max_regression: 허용하는 악화 비율 (0.2 = 20%)
+    :param min_delta_ms: 지연 시간 회귀로 판단할 최소 증가량 (ms)
+    :return: (회귀 항목 리스트, 비교한 항목 수)
+    """
+    baseline_values = flatten(baseline)
+    current_values = flatten(current)
+
+    regressions = []
+    compared = 0
+    for path, before in baseline_values.items():
+        metric = path.rsplit("/", 1)[-1]
+        after = current_values.get(path)
+        if after is None or metric not in LATENCY_METRICS + THROUGHPUT_METRICS:
+            continue
+        compared += 1
+
+        if metric in LATENCY_METRICS:
+            regressed = after > before * (1.0 + max_regression) and after - before >= min_delta_ms
+        else:
+            regressed = after < before * (1.0 - max_regression)
+        if regressed:
+            regressions.append(
+                {
+                    "metric": path,
+                    "baseline": before,
+                    "current": after,
+                    "delta": round(after - before, 3),
+                    # 기준선이 0이면 비율 대신 delta(절대 증가량)로 표시
+                    "change": round((after - before) / before, 3) if before else None,
+                }
+            )
+    return regressions, compared
+
+
+def report_regressions(regressions, compared, max_regression):
+    """회귀 검사 결과 출력 후 통과 여부 반환"""
+    if not compared:
+        print("회귀 검사: 기준선과 겹치는 지표가 없습니다 (실행 조합 확인 필요)")
+        return False
+    if not regressions:
+        print(f"회귀 검사 통과: 지표 {compared}개, 허용 {max_regression:.0%}")
+        return True
+
+    print(f"회귀 검사 실패: 지표 {compared}개 중 {len(regressions)}개가 {max_regression:.0%} 이상 악화")
+    for regression in regressions:
+        if regression["change"] is not None:
+            change = f"{regression['change']:+.1%}"
+        else:
+            unit = "ms" if regression["metric"].endswith("_ms") else ""
+            change = f"{regression['delta']:+.3f}{unit}"
+        print(
+            f"  {regression['metric']}: {regression['baseline']:.3f} → {regression['current']:.3f} ({change})"
+        )
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 기준선 대비 회귀 검사")
+    parser.add_argument("current", help="현재 결과 JSON")
+    parser.add_argument("--baseline", required=True, help="기준선 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 악화 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="지연 시간 회귀 최소 증가량 (ms)")
+    args = parser.parse_args()
+
+    regressions, compared = check_regressions(
+        load_results(args.baseline), load_results(args.current), args.max_regression, args.min_delta_ms
+    )
+    if not report_regressions(regressions, compared, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -50,16 +51,124 @@ class Config:
         "SWAGGER_API_DOCS", "/static/swagger.json"
     )  # Swagger JSON 문서 경로
 
+    # 무거운 리소스(감정 모델, 벡터 DB, LLM) 로드 시점
+    # background: 앱 시작 후 백그라운드 스레드에서 미리 로드 / lazy: 처음 사용할 때 로드 / eager: 앱 시작 시 모두 로드 후 요청 처리
+    RESOURCE_WARMUP = os.getenv("RESOURCE_WARMUP", "background").lower()
+
     # 모델 경로 설정
     MODEL_PATH = os.getenv("MODEL_PATH")
     if not MODEL_PATH:
         raise ValueError("환경 변수 MODEL_PATH가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
+    # 감정 모델 추론 백엔드 설정 (keras / tflite / onnx, MODEL_PATH가 해당 형식의 파일을 가리켜야 함)
+    EMOTION_MODEL_BACKEND = os.getenv("EMOTION_MODEL_BACKEND", "keras").lower()
+    EMOTION_INFERENCE_THREADS = int(os.getenv("EMOTION_INFERENCE_THREADS", 0))  # 0이면 라이브러리 기본값
+
+    # 감정 예측 마이크로 배칭 설정
+    EMOTION_BATCHING_ENABLED = os.getenv("EMOTION_BATCHING_ENABLED", "true").lower() == "true"
+    EMOTION_BATCH_MAX_SIZE = int(os.getenv("EMOTION_BATCH_MAX_SIZE", 8))  # 최대 배치 크기
+    EMOTION_BATCH_MAX_WAIT_MS = float(os.getenv("EMOTION_BATCH_MAX_WAIT_MS", 10))  # 배치 최대 대기 시간 (ms)
+
+    # 감정 추론 실행 방식 (thread: 웹 프로세스 안에서 추론, process: 전용 워커 프로세스 풀)
+    EMOTION_INFERENCE_MODE = os.getenv("EMOTION_INFERENCE_MODE", "thread").lower()
+    EMOTION_POOL_SIZE = int(os.getenv("EMOTION_POOL_SIZE", 2))  # 워커 프로세스 수 (워커마다 모델 하나)
+    EMOTION_POOL_INTRA_OP_THREADS = int(os.getenv("EMOTION_POOL_INTRA_OP_THREADS", 1))  # 워커별 intra-op 스레드 수
+    EMOTION_POOL_INTER_OP_THREADS = int(os.getenv("EMOTION_POOL_INTER_OP_THREADS", 1))  # 워커별 inter-op 스레드 수
+    EMOTION_POOL_SLOTS = int(os.getenv("EMOTION_POOL_SLOTS", 16))  # 워커별 공유 메모리 프레임 슬롯 수
+    EMOTION_POOL_START_METHOD = os.getenv("EMOTION_POOL_START_METHOD", "spawn").lower()  # spawn / forkserver / fork
+
+    # 얼굴 검출/추적 설정 (얼굴이 없는 프레임은 분류기를 건너뜀)
+    FACE_DETECTION_ENABLED = os.getenv("FACE_DETECTION_ENABLED", "true").lower() == "true"
+    FACE_DETECT_EVERY_N_FRAMES = int(os.getenv("FACE_DETECT_EVERY_N_FRAMES", 10))  # 추적 중 재검출 간격
+    FACE_DETECT_WIDTH = int(os.getenv("FACE_DETECT_WIDTH", 320))  # 검출용 축소 이미지 너비
+    FACE_TRACK_THRESHOLD = float(os.getenv("FACE_TRACK_THRESHOLD", 0.6))  # 템플릿 매칭 최소 점수
+
+    # 근접 중복 프레임 예측 캐시 설정
+    FRAME_CACHE_ENABLED = os.getenv("FRAME_CACHE_ENABLED", "true").lower() == "true"
+    FRAME_CACHE_MAX_DISTANCE = int(os.getenv("FRAME_CACHE_MAX_DISTANCE", 4))  # dHash 해밍 거리 임계값 (0~64)
+    FRAME_CACHE_TTL_SECONDS = float(os.getenv("FRAME_CACHE_TTL_SECONDS", 10))  # 캐시된 예측 유효 시간
+    FRAME_CACHE_MAX_ENTRIES = int(os.getenv("FRAME_CACHE_MAX_ENTRIES", 5000))  # 최대 채팅방 수
+
+    # 프레임 디코딩 설정 (짧은 변이 이 값 이상 유지되는 범위에서 1/2, 1/4, 1/8 축소 디코딩, 0이면 원본 해상도)
+    FRAME_DECODE_MIN_SIDE = int(os.getenv("FRAME_DECODE_MIN_SIDE", 224))
+    # 얼굴 검출 사용 시 프레임 짧은 변 대비 예상 얼굴 박스 크기 (얼굴 박스가 FRAME_DECODE_MIN_SIDE 이상 남도록 축소 배율 제한, 0이면 축소 디코딩 안 함)
+    FRAME_DECODE_FACE_FRACTION = float(os.getenv("FRAME_DECODE_FACE_FRACTION", 0.35))
+
+    # 감정 집계 윈도우 설정 (프레임마다 저장하지 않고 구간별 문서 하나로 저장)
+    EMOTION_AGGREGATION_ENABLED = os.getenv("EMOTION_AGGREGATION_ENABLED", "true").lower() == "true"
+    EMOTION_WINDOW_SECONDS = float(os.getenv("EMOTION_WINDOW_SECONDS", 30))  # 윈도우 문서 하나의 구간 길이
+    EMOTION_SMOOTHING = os.getenv("EMOTION_SMOOTHING", "ema").lower()  # ema / majority
+    EMOTION_EMA_ALPHA = float(os.getenv("EMOTION_EMA_ALPHA", 0.2))  # EMA 가중치
+    EMOTION_SWITCH_MARGIN = float(os.getenv("EMOTION_SWITCH_MARGIN", 0.1))  # EMA 대표 감정 변경에 필요한 점수 차
+    EMOTION_VOTE_WINDOW = int(os.getenv("EMOTION_VOTE_WINDOW", 9))  # 다수결에 사용할 최근 프레임 수
+    EMOTION_DEBUG_RAW_FRAMES = os.getenv("EMOTION_DEBUG_RAW_FRAMES", "false").lower() == "true"  # 프레임별 원본 저장 (emotion_frames)
+
+    # 감정 문서 write-behind 버퍼 설정 (insert_many 배치 저장)
+    EMOTION_WRITE_BUFFER_ENABLED = os.getenv("EMOTION_WRITE_BUFFER_ENABLED", "true").lower() == "true"
+    EMOTION_WRITE_BATCH_SIZE = int(os.getenv("EMOTION_WRITE_BATCH_SIZE", 100))  # 한 번에 저장할 최대 문서 수
+    EMOTION_WRITE_FLUSH_INTERVAL_MS = float(os.getenv("EMOTION_WRITE_FLUSH_INTERVAL_MS", 1000))  # 최대 저장 대기 시간 (ms)
+    EMOTION_WRITE_QUEUE_SIZE = int(os.getenv("EMOTION_WRITE_QUEUE_SIZE", 10000))  # 저장되지 않은 문서 최대 수 (재시도 대기 포함)
+    EMOTION_WRITE_PUT_TIMEOUT_MS = float(os.getenv("EMOTION_WRITE_PUT_TIMEOUT_MS", 1000))  # 한도 도달 시 최대 대기 시간 (ms, 초과 시 버림)
+    EMOTION_WRITE_MAX_RETRIES = int(os.getenv("EMOTION_WRITE_MAX_RETRIES", 10))  # 일시적 오류로 실패한 문서의 최대 재시도 횟수
+
     # 벡터 DB 경로 설정
     VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH")
     if not VECTOR_DB_PATH:
         raise ValueError("환경 변수 VECTOR_DB_PATH가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
+    # RAG 벡터 인덱스 종류 (벡터 DB 생성 시 적용, 로드는 저장된 인덱스 종류를 그대로 사용)
+    VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat").lower()  # flat / ivf_flat / ivf_pq / hnsw
+    VECTOR_INDEX_NLIST = int(os.getenv("VECTOR_INDEX_NLIST", 0))  # IVF 클러스터 수 (0이면 약 4*sqrt(N))
+    VECTOR_INDEX_PQ_M = int(os.getenv("VECTOR_INDEX_PQ_M", 16))  # IVF-PQ 하위 벡터 수 (벡터당 바이트 수)
+    VECTOR_INDEX_HNSW_M = int(os.getenv("VECTOR_INDEX_HNSW_M", 32))  # HNSW 노드당 이웃 수
+
+    # 요청 종류별 검색 파라미터 (JSON, nprobe는 IVF 계열 / ef_search는 HNSW에만 적용)
+    # chat : 채팅 응답 생성 (지연 시간 우선) / preview : 검색 결과 미리보기 (재현율 우선)
+    VECTOR_SEARCH_PARAMS = json.loads(
+        os.getenv(
+            "VECTOR_SEARCH_PARAMS",
+            '{"chat": {"nprobe": 8, "ef_search": 64}, "preview": {"nprobe": 32, "ef_search": 256}}',
+        )
+    )
+
+    # RAG 검색 방식 : vector (벡터 검색) / hybrid (벡터 + 문자 n-gram BM25, RRF로 합침) / lexical (BM25만, 임베딩 호출 없음)
+    RAG_RETRIEVAL_MODE = os.getenv("RAG_RETRIEVAL_MODE", "vector").lower()
+    RAG_HYBRID_FETCH_K = int(os.getenv("RAG_HYBRID_FETCH_K", 20))  # hybrid에서 각 검색 결과를 가져올 수 (RRF 후보)
+    RAG_RRF_K = int(os.getenv("RAG_RRF_K", 60))  # RRF 순위 상수 (클수록 하위 순위 반영이 커짐)
+    RAG_LEXICAL_NGRAM_RANGE = tuple(
+        int(n) for n in os.getenv("RAG_LEXICAL_NGRAM_RANGE", "2,3").split(",")
+    )  # BM25 문자 n-gram 길이 범위 (최소,최대)
+    RAG_LEXICAL_FALLBACK_MS = float(os.getenv("RAG_LEXICAL_FALLBACK_MS", 0))  # 질의 임베딩 평균 지연이 넘으면 BM25만 사용 (0이면 사용 안 함)
+
+    # 챗봇 프롬프트 상담 사례 선택 (over-fetch → 중복 제거 → MMR → 토큰 예산)
+    RAG_CONTEXT_SELECTION = os.getenv("RAG_CONTEXT_SELECTION", "true").lower() == "true"
+    RAG_CONTEXT_FETCH_K = int(os.getenv("RAG_CONTEXT_FETCH_K", 20))  # 후보로 검색할 상담 사례 수
+    RAG_CONTEXT_DUPLICATE_JACCARD = float(os.getenv("RAG_CONTEXT_DUPLICATE_JACCARD", 0.8))  # 답변 문자 3-gram 유사도 중복 기준
+    RAG_CONTEXT_DUPLICATE_COSINE = float(os.getenv("RAG_CONTEXT_DUPLICATE_COSINE", 0))  # 질문 벡터 코사인 유사도 중복 기준 (0이면 사용 안 함)
+    RAG_MMR_LAMBDA = float(os.getenv("RAG_MMR_LAMBDA", 0.7))  # MMR 관련도 가중치 (1이면 다양화 안 함)
+    RAG_CONTEXT_TOKEN_BUDGET = int(os.getenv("RAG_CONTEXT_TOKEN_BUDGET", 1000))  # 상담 사례 토큰 수 합 상한 (0이면 제한 없음)
+
+    # RAG 임베딩 제공자 (벡터 DB 생성 시와 같은 설정이어야 함)
+    EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai").lower()  # openai / onnx
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL")  # OpenAI 임베딩 모델 이름 (미지정 시 기본값)
+    EMBEDDING_MODEL_DIR = os.getenv("EMBEDDING_MODEL_DIR")  # onnx 모델 디렉토리 (model.onnx + tokenizer.json)
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 32))  # onnx 배치 인코딩 크기
+    EMBEDDING_MAX_LENGTH = int(os.getenv("EMBEDDING_MAX_LENGTH", 256))  # onnx 최대 토큰 수
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", 0))  # onnx intra-op 스레드 수 (0이면 라이브러리 기본값)
+    EMBEDDING_QUERY_PREFIX = os.getenv("EMBEDDING_QUERY_PREFIX", "")  # 질의 접두어 (e5 계열은 "query: ")
+    EMBEDDING_DOCUMENT_PREFIX = os.getenv("EMBEDDING_DOCUMENT_PREFIX", "")  # 문서 접두어 (e5 계열은 "passage: ")
+
+    # Redis 연결 (인증 토큰/세션과 같은 서버)
+    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+    REDIS_DB = int(os.getenv("REDIS_DB", 0))
+
+    # RAG 질의 임베딩 캐시 (프로세스 내 LRU + Redis)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 10000))  # LRU 최대 항목 수 (1536차원 기준 약 6KB/항목)
+    EMBEDDING_CACHE_REDIS_ENABLED = os.getenv("EMBEDDING_CACHE_REDIS_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", 7 * 24 * 3600))  # Redis 항목 만료 시간 (0이면 만료 없음)
+
     # SECRET_KEY = os.getenv("SECRET_KEY", "your_jwt_secret_key")
 
 class ProductionConfig(Config):
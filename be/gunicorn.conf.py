@@ -0,0 +1,110 @@
+"""
+# gunicorn 프로덕션 설정 (pre-fork)
+
+실행 (be/ 디렉토리):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+- preload_app : 마스터가 앱을 import하고 GUNICORN_PRELOAD_RESOURCES(기본: 감정 모델, FAISS 벡터 DB)를 로드한 뒤 워커를 fork
+  → 워커들이 모델 가중치/인덱스 메모리 페이지를 copy-on-write로 공유 (마스터에서 gc.freeze로 GC에 의한 페이지 복사 감소)
+- TensorFlow/OpenMP 스레드 수는 앱 import 전에 환경 변수로 고정되어 모든 워커에 적용
+- 마스터에서 초기화된 TF/ONNX 런타임은 intra-op 스레드가 1개일 때만 fork 후에도 동작하므로 (2 이상이면 워커가 멈춤)
+  GUNICORN_INFERENCE_THREADS가 2 이상이거나 process 추론 모드이면 감정 모델은 각 워커에서 로드
+- 그레이스풀 재시작
+    kill -HUP <master pid>  : 워커를 순차 교체 (preload 상태에서는 코드/모델이 다시 로드되지 않음)
+    kill -USR2 <master pid> 후 기존 마스터에 -WINCH, -QUIT : 새 코드/모델로 무중단 교체
+    kill -TERM <master pid> : 진행 중 요청을 graceful_timeout까지 마친 뒤 종료
+
+워커/스레드 산정
+    inference_threads = GUNICORN_INFERENCE_THREADS (워커별 TF intra-op 스레드, 기본 1)
+    workers = GUNICORN_WORKERS 또는 max(1, CPU 코어 수 // inference_threads)
+        → 동시에 추론하는 스레드 합(workers x inference_threads)이 코어 수를 넘지 않게
+    threads = GUNICORN_THREADS (워커별 요청 처리 스레드, 기본 8)
+        → WebSocket 스트림은 연결마다 스레드 하나를 점유하므로 워커당 동시 스트림 수 + HTTP 여유분 이상
+    메모리 ≈ 공유 리소스(1회) + workers x 워커 고유 메모리 → benchmarks.bench_prefork_memory로 확인
+"""
+
+import gc
+import os
+
+INFERENCE_THREADS = max(int(os.getenv("GUNICORN_INFERENCE_THREADS", 1)), 1)
+
+# 앱(TensorFlow) import 전에 워커별 추론 스레드 수 고정
+for _name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "TF_NUM_INTRAOP_THREADS"):
+    os.environ.setdefault(_name, str(INFERENCE_THREADS))
+os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+os.environ.setdefault("EMOTION_INFERENCE_THREADS", str(INFERENCE_THREADS))
+
+# 마스터에서는 백그라운드 워밍 스레드를 만들지 않음 (스레드는 fork되지 않음)
+# 설정된 워밍 방식은 워커 fork 이후에 적용
+WORKER_WARMUP = os.getenv("RESOURCE_WARMUP", "background").lower()
+os.environ["RESOURCE_WARMUP"] = "lazy"
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 0)) or max(1, (os.cpu_count() or 1) // INFERENCE_THREADS)
+# WebSocket(flask-sock)은 스레드 워커에서 연결마다 스레드 하나를 사용
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+# 메모리 증가를 막기 위한 워커 주기적 교체 (0이면 사용 안 함)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+# 하트비트 파일을 디스크 대신 메모리에 (컨테이너 환경에서 워커 멈춤 방지)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def _preload_resources(log):
+    """마스터에서 미리 로드할 리소스 이름 목록"""
+    names = [
+        name.strip()
+        for name in os.getenv("GUNICORN_PRELOAD_RESOURCES", "emotion_model,vector_store").split(",")
+        if name.strip()
+    ]
+    if "emotion_model" in names:
+        if os.getenv("EMOTION_INFERENCE_MODE", "thread").lower() == "process":
+            log.info("process 추론 모드 : 감정 추론 워커 풀은 각 워커에서 시작")
+            names.remove("emotion_model")
+        elif INFERENCE_THREADS > 1:
+            log.warning(
+                f"워커별 추론 스레드가 {INFERENCE_THREADS}개이므로 감정 모델은 fork 이후 각 워커에서 로드 "
+                "(마스터에서 초기화한 TF 스레드 풀은 fork된 워커에서 사용할 수 없음)"
+            )
+            names.remove("emotion_model")
+    return names
+
+
+def when_ready(server):
+    """마스터 : 워커를 fork하기 전에 공유할 리소스 로드"""
+    if not server.cfg.preload_app:
+        return
+
+    from app.utils.resources import resources
+
+    names = _preload_resources(server.log)
+    if names:
+        resources.warm_up(names, background=False)
+        server.log.info(f"마스터 리소스 로드 완료: {resources.status()}")
+    # 이후 생성되는 객체만 GC 대상으로 두어 fork된 워커에서 공유 페이지가 복사되지 않게 함
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """워커 : 마스터에서 연 DB 연결 정리 후 나머지 리소스를 백그라운드에서 로드"""
+    if server.cfg.preload_app:
+        from app.database import db
+
+        # 마스터의 MySQL 커넥션 풀을 자식에서 공유하지 않도록 버림 (소켓은 닫지 않음)
+        with server.app.wsgi().app_context():
+            db.engine.dispose(close=False)
+
+    if WORKER_WARMUP != "lazy":
+        from app.utils.resources import resources
+
+        resources.warm_up()
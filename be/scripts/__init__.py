@@ -0,0 +1,5 @@
+"""
+# 운영 스크립트 모음 (벡터 DB 생성 등)
+
+be/ 디렉토리에서 `python -m scripts.<모듈명>` 형태로 실행 (서버와 같은 .env 설정 사용)
+"""
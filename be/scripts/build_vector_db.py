@@ -0,0 +1,168 @@
+"""
+상담 사례 CSV로 RAG 벡터 DB(FAISS, LangChain 형식) 생성
+
+서버(rag_service)와 같은 임베딩 설정(EMBEDDING_PROVIDER 등, .env)으로 문서 벡터를 만들어
+질의 벡터와 문서 벡터가 항상 같은 모델에서 나오도록 함 (--provider 등으로 덮어쓸 수 있음)
+- 본문(page_content) : input (임베딩한 사용자 고민), metadata : {"output": 상담 답변}
+- CSV는 한 줄씩 읽고 --chunk-size 행마다 배치 임베딩 (onnx는 EMBEDDING_BATCH_SIZE 단위로 다시 나눔)
+- 인덱스 종류는 --index-type (기본값 VECTOR_INDEX_TYPE : flat / ivf_flat / ivf_pq / hnsw)
+- 저장 형식은 --format (기본값 mmap : 파일 매핑 로드, langchain : 기존 FAISS.save_local 형식)
+- 저장 디렉토리에 embedding.json(제공자/모델/접두어/차원) 기록 → rag_service가 로드 시 설정과 비교
+
+실행 예시 (be/ 디렉토리):
+    python -m scripts.build_vector_db --csv ../data/raw/total_kor_counsel_bot.csv --output ../data/db/faiss_onnx \
+        --provider onnx --model-dir ../data/models/multilingual-e5-small --query-prefix "query: " --document-prefix "passage: "
+"""
+
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+
+def read_counsel_rows(csv_path):
+    """CSV에서 (input, output) 행을 하나씩 반환 (빈 행은 건너뜀)"""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "input" not in reader.fieldnames or "output" not in reader.fieldnames:
+            raise ValueError("CSV 파일에 'input' 및 'output' 컬럼이 있어야 합니다.")
+        for row in reader:
+            input_text = (row["input"] or "").strip()
+            output_text = (row["output"] or "").strip()
+            if input_text and output_text:
+                yield input_text, output_text
+
+
+def embed_rows(embeddings, rows, chunk_size):
+    """
+    chunk_size 행씩 문서 임베딩
+    :return: (input 리스트, output 리스트, (N, D) float32 벡터)
+    """
+    inputs, outputs, vectors = [], [], []
+    chunk = []
+    started = time.perf_counter()
+
+    def flush():
+        vectors.append(np.asarray(embeddings.embed_documents([row[0] for row in chunk]), dtype=np.float32))
+        inputs.extend(row[0] for row in chunk)
+        outputs.extend(row[1] for row in chunk)
+        elapsed = time.perf_counter() - started
+        print(f"임베딩 {len(inputs)}건 ({len(inputs) / elapsed:.1f} 건/s)")
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    if not vectors:
+        raise ValueError("임베딩할 상담 사례가 없습니다.")
+    return inputs, outputs, np.concatenate(vectors)
+
+
+def build_vector_db(
+    embeddings, csv_path, output_dir, chunk_size=1000, index_type="flat", store_format="mmap", **index_options
+):
+    """
+    벡터 DB 생성 후 저장
+    :param embeddings: 문서 임베딩 객체 (create_embedding_provider)
+    :param index_type: flat / ivf_flat / ivf_pq / hnsw
+    :param store_format: mmap (app/services/vector_store.py) / langchain (FAISS.save_local)
+    :param index_options: build_faiss_index 옵션 (nlist, pq_m, hnsw_m)
+    :return: 저장한 벡터 수
+    """
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+
+    from app.services.embedding_providers import write_embedding_info
+    from app.services.vector_index import build_faiss_index, index_memory_bytes
+    from app.services.vector_store import write_mmap_store
+
+    inputs, outputs, vectors = embed_rows(embeddings, read_counsel_rows(csv_path), chunk_size)
+
+    started = time.perf_counter()
+    index = build_faiss_index(vectors, index_type, **index_options)
+    print(f"{index_type} 인덱스 생성 {time.perf_counter() - started:.1f}s, 크기 {index_memory_bytes(index) / 2**20:.1f}MB")
+
+    os.makedirs(output_dir, exist_ok=True)
+    if store_format == "mmap":
+        write_mmap_store(
+            output_dir, index, ((input_text, {"output": output_text}) for input_text, output_text in zip(inputs, outputs))
+        )
+    elif store_format == "langchain":
+        docstore_ids = [str(i) for i in range(len(inputs))]
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(
+                {
+                    docstore_id: Document(page_content=input_text, metadata={"output": output_text})
+                    for docstore_id, input_text, output_text in zip(docstore_ids, inputs, outputs)
+                }
+            ),
+            index_to_docstore_id=dict(enumerate(docstore_ids)),
+        )
+        vectorstore.save_local(output_dir)
+    else:
+        raise ValueError(f"지원하지 않는 저장 형식입니다: {store_format} (지원: mmap, langchain)")
+    write_embedding_info(output_dir, embeddings, vectors.shape[1])
+    print(f"FAISS 벡터 DB 저장 완료: {output_dir} ({store_format}, 벡터 {len(inputs)}개, 차원 {vectors.shape[1]})")
+    return len(inputs)
+
+
+def main():
+    from config.settings import ActiveConfig
+
+    parser = argparse.ArgumentParser(description="상담 사례 CSV로 RAG 벡터 DB 생성")
+    parser.add_argument("--csv", required=True, help="input/output 컬럼이 있는 상담 사례 CSV")
+    parser.add_argument("--output", required=True, help="벡터 DB 저장 디렉토리 (VECTOR_DB_PATH로 사용)")
+    parser.add_argument("--provider", default=ActiveConfig.EMBEDDING_PROVIDER, help="openai / onnx")
+    parser.add_argument("--model", default=ActiveConfig.EMBEDDING_MODEL, help="OpenAI 임베딩 모델 이름")
+    parser.add_argument("--model-dir", default=ActiveConfig.EMBEDDING_MODEL_DIR, help="onnx 모델 디렉토리")
+    parser.add_argument("--batch-size", type=int, default=ActiveConfig.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--max-length", type=int, default=ActiveConfig.EMBEDDING_MAX_LENGTH)
+    parser.add_argument("--threads", type=int, default=ActiveConfig.EMBEDDING_THREADS)
+    parser.add_argument("--query-prefix", default=ActiveConfig.EMBEDDING_QUERY_PREFIX)
+    parser.add_argument("--document-prefix", default=ActiveConfig.EMBEDDING_DOCUMENT_PREFIX)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="진행 상황 출력 단위 행 수")
+    parser.add_argument("--index-type", default=ActiveConfig.VECTOR_INDEX_TYPE, help="flat / ivf_flat / ivf_pq / hnsw")
+    parser.add_argument("--nlist", type=int, default=ActiveConfig.VECTOR_INDEX_NLIST, help="IVF 클러스터 수 (0이면 자동)")
+    parser.add_argument("--pq-m", type=int, default=ActiveConfig.VECTOR_INDEX_PQ_M, help="IVF-PQ 하위 벡터 수")
+    parser.add_argument("--hnsw-m", type=int, default=ActiveConfig.VECTOR_INDEX_HNSW_M, help="HNSW 노드당 이웃 수")
+    parser.add_argument("--format", default="mmap", choices=["mmap", "langchain"], help="저장 형식")
+    args = parser.parse_args()
+
+    from app.services.embedding_providers import create_embedding_provider
+
+    embeddings = create_embedding_provider(
+        args.provider,
+        model=args.model,
+        model_dir=args.model_dir,
+        batch_size=args.batch_size,
+        max_length=args.max_length,
+        num_threads=args.threads,
+        query_prefix=args.query_prefix,
+        document_prefix=args.document_prefix,
+    )
+    build_vector_db(
+        embeddings,
+        args.csv,
+        args.output,
+        args.chunk_size,
+        index_type=args.index_type,
+        store_format=args.format,
+        nlist=args.nlist,
+        pq_m=args.pq_m,
+        hnsw_m=args.hnsw_m,
+    )
+    if args.provider != ActiveConfig.EMBEDDING_PROVIDER:
+        print(f"서버에서 사용하려면 EMBEDDING_PROVIDER={args.provider} 등 같은 임베딩 설정이 필요합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+LangChain 형식 벡터 DB(index.faiss + index.pkl)를 mmap 형식(app/services/vector_store.py)으로 변환
+
+임베딩은 다시 계산하지 않음 (인덱스 파일과 embedding.json은 그대로 복사, 문서는 벡터 번호 순서로 다시 기록)
+변환한 디렉토리를 VECTOR_DB_PATH로 지정하면 rag_service가 mmap 형식으로 로드
+
+실행 예시 (be/ 디렉토리):
+    python -m scripts.convert_vector_db --input ../data/faiss_v2 --output ../data/db/faiss_v2_mmap
+"""
+
+import argparse
+import os
+import shutil
+
+
+def convert_vector_db(input_dir, output_dir):
+    """
+    벡터 DB 형식 변환
+    :return: 변환한 문서 수
+    """
+    import faiss
+
+    from app.services.embedding_providers import EMBEDDING_INFO_FILE
+    from app.services.vector_store import langchain_documents, write_mmap_store
+
+    if os.path.abspath(input_dir) == os.path.abspath(output_dir):
+        raise ValueError("입력과 출력 디렉토리가 같습니다. 다른 디렉토리로 변환하세요.")
+
+    index = faiss.read_index(os.path.join(input_dir, "index.faiss"))
+    count = write_mmap_store(output_dir, index, langchain_documents(input_dir))
+    if os.path.exists(os.path.join(input_dir, EMBEDDING_INFO_FILE)):
+        shutil.copyfile(os.path.join(input_dir, EMBEDDING_INFO_FILE), os.path.join(output_dir, EMBEDDING_INFO_FILE))
+    print(f"mmap 형식 변환 완료: {output_dir} (문서 {count}개)")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LangChain 형식 벡터 DB를 mmap 형식으로 변환")
+    parser.add_argument("--input", required=True, help="LangChain 형식 벡터 DB 디렉토리")
+    parser.add_argument("--output", required=True, help="mmap 형식 저장 디렉토리")
+    args = parser.parse_args()
+
+    convert_vector_db(args.input, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+상담 사례를 기존 벡터 DB(mmap 형식)에 증분 추가
+
+02_save_vector_db_v2.ipynb(전체 CSV 로드 → 전체 재임베딩)를 대체하는 증분 수집 파이프라인
+- 입력 : CSV(input/output 컬럼) 또는 JSONL({"input", "output"}), 여러 파일 가능, 한 줄씩 읽음
+- 중복 제거 : 정규화한 input/output의 SHA-256(내용 해시)이 이미 벡터 DB에 있거나 입력 안에서 반복되면 건너뜀
+- 임베딩 : --batch-size 행씩 --concurrency개 배치를 동시에 요청, 실패 시 지수 백오프로 --max-retries번 재시도
+- 체크포인트 : 임베딩이 끝난 배치는 바로 <벡터 DB>/.ingest/에 저장 → 중단 후 다시 실행하면 저장된 배치는 다시 임베딩하지 않음
+- 반영 : --commit-every 배치마다 저장된 배치를 기존 인덱스/문서 파일에 추가 (app.services.vector_store.append_mmap_store)
+벡터 DB가 없으면 VECTOR_INDEX_TYPE으로 새로 만들고, LangChain 형식이면 scripts.convert_vector_db로 먼저 변환해야 함
+결과는 그대로 rag_service(VECTOR_DB_PATH)로 로드 가능 (임베딩 설정은 embedding.json과 같아야 함)
+
+실행 예시 (be/ 디렉토리):
+    python -m scripts.ingest_corpus --input ../data/raw/new_counsel.csv ../data/raw/extra.jsonl \
+        --output ../data/db/faiss_mmap --batch-size 100 --concurrency 4
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from scripts.build_vector_db import read_counsel_rows
+
+STAGING_DIR = ".ingest"
+HASHES_FILE = "ingest.hashes"
+
+
+def read_jsonl_rows(jsonl_path):
+    """JSONL에서 (input, output) 행을 하나씩 반환 (빈 행/깨진 줄은 건너뜀)"""
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"JSONL 파싱 실패 건너뜀: {jsonl_path}:{line_number}")
+                continue
+            input_text = str(row.get("input") or "").strip()
+            output_text = str(row.get("output") or "").strip()
+            if input_text and output_text:
+                yield input_text, output_text
+
+
+def read_rows(paths):
+    """입력 파일들의 (input, output) 행 (확장자로 CSV / JSONL 구분)"""
+    for path in paths:
+        if path.endswith((".jsonl", ".ndjson")):
+            yield from read_jsonl_rows(path)
+        else:
+            yield from read_counsel_rows(path)
+
+
+def content_hash(input_text, output_text):
+    """중복 판단용 내용 해시 (공백/유니코드 정규화 후)"""
+    from app.services.embedding_cache import normalize_text
+
+    content = normalize_text(input_text) + "\x1f" + normalize_text(output_text)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def load_indexed_hashes(output_dir):
+    """
+    벡터 DB에 이미 들어간 문서의 내용 해시
+    ingest.hashes(한 줄에 하나, 벡터 번호 순서)의 줄 수가 인덱스 벡터 수와 다르면 문서 파일에서 다시 계산
+    """
+    from app.services.vector_store import is_mmap_store, iter_mmap_documents, read_mmap_index
+
+    if not is_mmap_store(output_dir):
+        if os.path.exists(os.path.join(output_dir, "index.pkl")):
+            raise ValueError(f"LangChain 형식 벡터 DB입니다. scripts.convert_vector_db로 먼저 변환하세요: {output_dir}")
+        return []
+
+    total = read_mmap_index(output_dir).ntotal
+    path = os.path.join(output_dir, HASHES_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            hashes = f.read().split()
+        if len(hashes) >= total:
+            return hashes[:total]
+
+    print(f"내용 해시 재계산 (문서 {total}개)")
+    hashes = [
+        content_hash(page_content, metadata.get("output", ""))
+        for page_content, metadata in iter_mmap_documents(output_dir)
+    ]
+    write_hashes(output_dir, hashes)
+    return hashes
+
+
+def write_hashes(output_dir, hashes):
+    path = os.path.join(output_dir, HASHES_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write("\n".join(hashes) + ("\n" if hashes else ""))
+    os.replace(path + ".tmp", path)
+
+
+def embed_with_retry(embeddings, texts, max_retries, base_delay=1.0):
+    """
+    배치 문서 임베딩 (실패 시 지수 백오프 + 지터로 재시도)
+    :return: (N, D) float32 벡터, 재시도 횟수
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return np.asarray(embeddings.embed_documents(texts), dtype=np.float32), attempt
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = base_delay * 2**attempt * (0.5 + random.random())
+            print(f"임베딩 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+            time.sleep(delay)
+
+
+class StagingArea:
+    """임베딩이 끝난 배치 저장소 (<벡터 DB>/.ingest/batch_*.npz, 반영 후 삭제)"""
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, STAGING_DIR)
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+        existing = [int(os.path.basename(name)[6:-4]) for name in self.files()]
+        self._next = max(existing, default=-1) + 1
+
+    def files(self):
+        return sorted(glob.glob(os.path.join(self.path, "batch_*.npz")))
+
+    def save(self, vectors, rows, hashes):
+        with self._lock:
+            number = self._next
+            self._next += 1
+        path = os.path.join(self.path, f"batch_{number:06d}.npz")
+        temp_path = os.path.join(self.path, f"tmp_{number:06d}.npz")
+        # 완성된 파일만 보이도록 임시 이름으로 쓰고 교체
+        np.savez(
+            temp_path,
+            vectors=vectors,
+            inputs=np.array([row[0] for row in rows]),
+            outputs=np.array([row[1] for row in rows]),
+            hashes=np.array(hashes),
+        )
+        os.replace(temp_path, path)
+
+    def load(self):
+        """저장된 배치 전체 → (파일 목록, 벡터, 행, 해시)"""
+        files = self.files()
+        vectors, rows, hashes = [], [], []
+        for path in files:
+            with np.load(path) as batch:
+                vectors.append(batch["vectors"])
+                rows.extend(zip(batch["inputs"].tolist(), batch["outputs"].tolist()))
+                hashes.extend(batch["hashes"].tolist())
+        return files, vectors, rows, hashes
+
+    def staged_hashes(self):
+        return self.load()[3]
+
+
+def commit(output_dir, staging, indexed_hashes, embeddings, index_type, index_options):
+    """
+    저장된 배치를 벡터 DB에 추가하고 배치 파일 삭제
+    이미 반영된 배치(반영 후 삭제 전에 중단된 경우)는 해시로 걸러냄
+    :return: 추가한 문서 수
+    """
+    from app.services.embedding_providers import write_embedding_info
+    from app.services.vector_store import append_mmap_store, is_mmap_store
+
+    files, vectors, rows, hashes = staging.load()
+    if not files:
+        return 0
+
+    indexed = set(indexed_hashes)
+    keep = [i for i, value in enumerate(hashes) if value not in indexed]
+    if keep:
+        new_vectors = np.concatenate(vectors)[keep]
+        created = not is_mmap_store(output_dir)
+        append_mmap_store(
+            output_dir,
+            new_vectors,
+            [(rows[i][0], {"output": rows[i][1]}) for i in keep],
+            index_type=index_type,
+            **index_options,
+        )
+        if created:
+            write_embedding_info(output_dir, embeddings, new_vectors.shape[1])
+        indexed_hashes.extend(hashes[i] for i in keep)
+        write_hashes(output_dir, indexed_hashes)
+
+    for path in files:
+        os.remove(path)
+    return len(keep)
+
+
+def ingest(
+    embeddings,
+    paths,
+    output_dir,
+    batch_size=100,
+    concurrency=4,
+    max_retries=5,
+    commit_every=20,
+    index_type="flat",
+    **index_options,
+):
+    """
+    입력 파일의 새 상담 사례를 임베딩해서 벡터 DB에 추가
+    :return: 통계 딕셔너리 (읽은 행, 중복, 임베딩, 재시도, 추가 문서 수)
+    """
+    from app.services.embedding_providers import check_embedding_info
+
+    os.makedirs(output_dir, exist_ok=True)
+    if os.path.exists(os.path.join(output_dir, "embedding.json")):
+        check_embedding_info(output_dir, embeddings)
+
+    indexed_hashes = load_indexed_hashes(output_dir)
+    staging = StagingArea(output_dir)
+    staged = staging.staged_hashes()
+    seen = set(indexed_hashes) | set(staged)
+    stats = {"read": 0, "duplicates": 0, "resumed": len(staged), "embedded": 0, "retries": 0, "added": 0}
+    if staged:
+        print(f"이전 실행에서 임베딩한 {len(staged)}건 재사용")
+
+    started = time.perf_counter()
+    staged_batches = 0
+
+    errors = []
+
+    def finish(future):
+        """완료된 배치를 임시 저장 (재시도 후에도 실패한 배치는 오류만 기록하고 다른 배치는 계속 저장)"""
+        nonlocal staged_batches
+        try:
+            vectors, retries, rows, hashes = future.result()
+        except Exception as e:
+            errors.append(e)
+            return
+        staging.save(vectors, rows, hashes)
+        stats["embedded"] += len(rows)
+        stats["retries"] += retries
+        staged_batches += 1
+
+    def run_batch(rows, hashes):
+        vectors, retries = embed_with_retry(embeddings, [row[0] for row in rows], max_retries)
+        return vectors, retries, rows, hashes
+
+    def flush_commit():
+        nonlocal staged_batches
+        if not staging.files():
+            return
+        stats["added"] += commit(output_dir, staging, indexed_hashes, embeddings, index_type, index_options)
+        staged_batches = 0
+        elapsed = time.perf_counter() - started
+        print(
+            f"읽음 {stats['read']} / 중복 {stats['duplicates']} / 임베딩 {stats['embedded']} "
+            f"({stats['embedded'] / elapsed:.1f} 건/s) / 추가 {stats['added']} (전체 {len(indexed_hashes)})"
+        )
+
+    pending = set()
+
+    def drain(limit):
+        """대기 중인 배치가 limit개 이하가 될 때까지 완료된 배치를 저장 (필요하면 벡터 DB에 반영)"""
+        nonlocal pending
+        while len(pending) > limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(future)
+        if errors:
+            # 실패한 배치가 있으면 새 배치는 보내지 않고, 이미 보낸 배치가 끝나길 기다려 성공한 배치를 모두 임시 저장한 뒤 중단
+            # (다음 실행에서 임시 저장분은 재사용하고 실패한 배치만 다시 임베딩)
+            done, _ = wait(pending)
+            pending = set()
+            for future in done:
+                finish(future)
+            print(f"임베딩 실패 배치 {len(errors)}개, 완료된 배치는 임시 저장 후 중단 ({stats['embedded']}건)")
+            raise errors[0]
+        if commit_every and staged_batches >= commit_every:
+            flush_commit()
+
+    batch_rows, batch_hashes = [], []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for input_text, output_text in read_rows(paths):
+            stats["read"] += 1
+            value = content_hash(input_text, output_text)
+            if value in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(value)
+            batch_rows.append((input_text, output_text))
+            batch_hashes.append(value)
+            if len(batch_rows) >= batch_size:
+                pending.add(executor.submit(run_batch, batch_rows, batch_hashes))
+                batch_rows, batch_hashes = [], []
+                # 동시 요청 수의 2배까지만 대기열에 쌓음 (입력 전체를 메모리에 올리지 않도록)
+                drain(concurrency * 2)
+        if batch_rows:
+            pending.add(executor.submit(run_batch, batch_rows, batch_hashes))
+        drain(0)
+
+    flush_commit()
+    stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def main():
+    from config.settings import ActiveConfig
+
+    parser = argparse.ArgumentParser(description="상담 사례를 벡터 DB에 증분 추가 (중복 제거, 재시도, 이어하기)")
+    parser.add_argument("--input", nargs="+", required=True, help="CSV(input/output 컬럼) 또는 JSONL 파일")
+    parser.add_argument("--output", default=ActiveConfig.VECTOR_DB_PATH, help="mmap 형식 벡터 DB 디렉토리")
+    parser.add_argument("--batch-size", type=int, default=100, help="임베딩 요청 1건의 행 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 임베딩 요청 수")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--commit-every", type=int, default=20, help="몇 배치마다 벡터 DB에 반영할지 (0이면 마지막에 한 번)")
+    parser.add_argument("--index-type", default=ActiveConfig.VECTOR_INDEX_TYPE, help="새 벡터 DB 생성 시 인덱스 종류")
+    parser.add_argument("--nlist", type=int, default=ActiveConfig.VECTOR_INDEX_NLIST)
+    parser.add_argument("--pq-m", type=int, default=ActiveConfig.VECTOR_INDEX_PQ_M)
+    parser.add_argument("--hnsw-m", type=int, default=ActiveConfig.VECTOR_INDEX_HNSW_M)
+    args = parser.parse_args()
+
+    from app.services.rag_service import create_base_embeddings
+
+    stats = ingest(
+        create_base_embeddings(),
+        args.input,
+        args.output,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        commit_every=args.commit_every,
+        index_type=args.index_type,
+        nlist=args.nlist,
+        pq_m=args.pq_m,
+        hnsw_m=args.hnsw_m,
+    )
+    print(
+        f"완료 : 읽음 {stats['read']}, 중복 건너뜀 {stats['duplicates']}, 이어하기 {stats['resumed']}, "
+        f"임베딩 {stats['embedded']}, 재시도 {stats['retries']}, 추가 {stats['added']} ({stats['elapsed_s']}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
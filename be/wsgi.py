@@ -0,0 +1,9 @@
+"""
+프로덕션 WSGI 엔트리포인트 (개발 서버는 app.py)
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import create_app
+
+app = create_app()
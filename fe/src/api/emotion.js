@@ -21,6 +21,73 @@ export const predictEmotion = async (imageData, userId, chatroomId) => {
   }
 };
 
+/**
+ * 감정 예측 요청 함수 (JPEG 바이너리 업로드, base64 변환 없이 전송)
+ * @param {Blob} frameBlob - 웹캠 캔버스에서 만든 JPEG Blob
+ * @param {string} chatroomId
+ * @returns {Promise<Object>}
+ */
+export const predictEmotionFrame = async (frameBlob, chatroomId) => {
+  try {
+    const response = await api.post("/emotion/predict-frame", frameBlob, {
+      params: { chatroom_id: chatroomId },
+      headers: { "Content-Type": "application/octet-stream" },
+    });
+    return response.data;
+  } catch (error) {
+    console.error("감정 예측 실패:", error);
+    throw new Error("감정 예측 실패");
+  }
+};
+
+/**
+ * 채팅방 감정 예측 WebSocket 스트림 연결 (연결당 1회 인증 후 JPEG 프레임 전송)
+ * @param {string} chatroomId
+ * @param {function} onPrediction - 예측 결과 수신 콜백
+ * @returns {{sendFrame: function(Blob): void, close: function(): void}}
+ */
+export const openEmotionStream = (chatroomId, onPrediction) => {
+  const wsUrl = api.defaults.baseURL.replace(/^http/, "ws") + "emotion/stream";
+  const socket = new WebSocket(wsUrl);
+  socket.binaryType = "arraybuffer";
+  let ready = false;
+
+  socket.onopen = () => {
+    socket.send(
+      JSON.stringify({
+        type: "auth",
+        token: localStorage.getItem("access_token"),
+        chatroom_id: chatroomId,
+      })
+    );
+  };
+
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    if (message.type === "ready") {
+      ready = true;
+    } else if (message.type === "prediction") {
+      onPrediction(message);
+    } else if (message.type === "error") {
+      console.error("감정 스트림 오류:", message.message);
+    }
+  };
+
+  return {
+    sendFrame: (frameBlob) => {
+      if (ready && socket.readyState === WebSocket.OPEN) {
+        socket.send(frameBlob);
+      }
+    },
+    close: () => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: "close" }));
+      }
+      socket.close();
+    },
+  };
+};
+
 /**
  * 감정 데이터를 MongoDB에 저장
  * @param {string} userId
@@ -6,7 +6,7 @@ import {
 } from "../api/chat";
 import useEmotionStore from "../store/emotionStore";
 import useDiaryStore from "../store/diaryStore";
-import { predictEmotion } from "../api/emotion";
+import { predictEmotionFrame } from "../api/emotion";
 import styled from "styled-components";
 import Webcam from "react-webcam";
 import { ClockLoader } from "react-spinners";
@@ -309,10 +309,19 @@ const ChatRoomDetail = ({ userId, chatroomId, setSelectedChatroom }) => {
   useEffect(() => {
     const interval = setInterval(async () => {
       if (!webcamRef.current || loading || conversationEnd) return;
-      const imageSrc = webcamRef.current.getScreenshot();
-      if (!imageSrc) return;
+      const canvas = webcamRef.current.getCanvas();
+      if (!canvas) return;
       try {
-        const result = await predictEmotion(imageSrc, userId, chatroomId);
+        // base64 data URL 대신 JPEG 바이너리로 전송
+        const frameBlob = await new Promise((resolve) =>
+          canvas.toBlob(resolve, "image/jpeg", 0.92)
+        );
+        if (!frameBlob) return;
+        const result = await predictEmotionFrame(frameBlob, chatroomId);
+
+        // 얼굴이 감지되지 않은 프레임은 이전 감정 상태를 그대로 유지
+        if (result.face_detected === false) return;
+
         const { emotion: newEmotion, confidence: newConfidence } = result;
 
         // 화면에는 5초마다 감정 분석 결과(감정, 신뢰도)를 그대로 표시 (neutral이라도 표시)
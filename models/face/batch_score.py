@@ -0,0 +1,367 @@
+"""
+학습된 감정분류 모델로 이미지 디렉토리/영상 파일을 일괄 채점
+
+tf.data 파이프라인으로 병렬 디코딩/리사이즈 → 큰 배치 → prefetch 후 모델에 스트리밍
+- 이미지 디렉토리 : 하위 폴더 이름이 감정 클래스(happy, sadness, angry, panic)이면 라벨로 사용
+- 영상 파일 : --every-n 프레임마다 채점 (디코딩은 순차, 리사이즈/정규화는 병렬)
+- export_serving_model.py로 만든 전처리 포함 모델(uint8 입력)이면 정규화 없이 uint8 프레임을 모델 채널 순서로 입력
+결과는 MongoDB(insert_many) 또는 Parquet/CSV 파일에 청크 단위로 저장
+처리량(images/sec)과 라벨이 있는 경우 클래스별 혼동 행렬/정밀도/재현율 출력
+
+실행 예시
+    python batch_score.py --model TEST_1efficientnet_b2_model.keras --images ../../data/raw/val \
+        --output scores.parquet --report report.json
+    python batch_score.py --model TEST_1efficientnet_b2_model.keras --video session.mp4 --every-n 5 \
+        --mongo-uri mongodb://localhost:27017/ --mongo-db emotionDB --mongo-collection emotion_scores
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+CLASS_NAMES = ["happy", "sadness", "angry", "panic"]
+IMAGE_SIZE = (224, 224)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+# 다른 감정 문서와 같은 한국 표준시(KST) 타임스탬프
+KST = datetime.timezone(datetime.timedelta(hours=9), "KST")
+
+
+def list_images(image_dir):
+    """
+    이미지 경로와 라벨 목록 생성
+    :param image_dir: 이미지 디렉토리 (클래스 폴더 구조이면 라벨 사용)
+    :return: (경로 리스트, 라벨 인덱스 리스트 - 라벨이 없으면 -1)
+    """
+    paths, labels = [], []
+    for root, _, files in os.walk(image_dir):
+        class_name = os.path.basename(root)
+        label = CLASS_NAMES.index(class_name) if class_name in CLASS_NAMES else -1
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+                labels.append(label)
+    return paths, labels
+
+
+def serving_input_format(model, channel_order):
+    """
+    모델 입력 형식 확인
+    :return: (uint8 입력 여부, 채널 순서) - 전처리 포함 서빙 모델은 모델에 들어 있는 채널 변환으로 순서 결정
+    """
+    # KerasBackend와 같은 기준 : uint8 입력 모델 = 전처리 포함 서빙 모델
+    if str(model.inputs[0].dtype) != "uint8":
+        return False, channel_order
+    layer_names = {layer.name for layer in model.layers}
+    return True, "bgr" if "bgr_to_rgb" in layer_names else "rgb"
+
+
+def _normalize(image, channel_order, fused=False):
+    """
+    리사이즈 + 채널 순서 변환 + 0~1 정규화 (서빙 경로는 OpenCV BGR, 학습 경로는 RGB)
+    fused(전처리 포함 서빙 모델)이면 정규화하지 않고 uint8로 반환
+    (배치로 묶기 위해 같은 크기로 리사이즈만 미리 하고, 모델 안의 같은 크기 리사이즈는 값을 바꾸지 않음)
+    """
+    image = tf.image.resize(image, IMAGE_SIZE)
+    if channel_order == "bgr":
+        image = tf.reverse(image, axis=[-1])
+    if fused:
+        return tf.cast(tf.round(tf.clip_by_value(image, 0.0, 255.0)), tf.uint8)
+    return image / 255.0
+
+
+def image_dataset(paths, labels, batch_size, channel_order, fused=False):
+    """이미지 파일 → (배치 이미지, 라벨, 경로) 스트림 (파일 읽기/디코딩/리사이즈 병렬)"""
+
+    def load(path, label):
+        data = tf.io.read_file(path)
+        image = tf.io.decode_image(data, channels=3, expand_animations=False)
+        image.set_shape([None, None, 3])
+        return _normalize(tf.cast(image, tf.float32), channel_order, fused), label, path
+
+    dataset = tf.data.Dataset.from_tensor_slices((paths, labels))
+    dataset = dataset.map(load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def video_dataset(video_path, every_n, max_frames, batch_size, channel_order, fused=False):
+    """영상 파일 → (배치 이미지, 라벨(-1), 프레임 번호 문자열) 스트림"""
+
+    def frames():
+        capture = cv2.VideoCapture(video_path)
+        index = 0
+        yielded = 0
+        try:
+            while True:
+                ok = capture.grab()
+                if not ok or (max_frames and yielded >= max_frames):
+                    break
+                if index % every_n == 0:
+                    ok, frame = capture.retrieve()
+                    if not ok:
+                        break
+                    # OpenCV는 BGR로 디코딩하므로 RGB로 맞춘 뒤 공통 정규화 적용
+                    yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), f"{video_path}#{index}"
+                    yielded += 1
+                index += 1
+        finally:
+            capture.release()
+
+    dataset = tf.data.Dataset.from_generator(
+        frames,
+        output_signature=(
+            tf.TensorSpec(shape=(None, None, 3), dtype=tf.uint8),
+            tf.TensorSpec(shape=(), dtype=tf.string),
+        ),
+    )
+    dataset = dataset.map(
+        lambda image, source: (
+            _normalize(tf.cast(image, tf.float32), channel_order, fused),
+            tf.constant(-1, dtype=tf.int32),
+            source,
+        ),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=True,
+    )
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+class ResultWriter:
+    """채점 결과를 MongoDB / Parquet / CSV로 chunk_size건씩 나눠 저장 (전체 결과를 메모리에 모으지 않음)"""
+
+    def __init__(self, output=None, mongo_uri=None, mongo_db=None, mongo_collection=None, chunk_size=1000):
+        self.output = output
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.file_buffer = []
+        self.collection = None
+        self.written = 0
+        self.file_written = 0
+        # 첫 청크를 쓸 때 연결 (Parquet : ParquetWriter, CSV : 파일 + DictWriter)
+        self._parquet = None
+        self._schema = None
+        self._csv_file = None
+        self._csv = None
+
+        if mongo_uri:
+            from pymongo import MongoClient
+
+            self.collection = MongoClient(mongo_uri)[mongo_db][mongo_collection]
+
+    def add(self, rows):
+        if self.collection is not None:
+            self.buffer.extend(rows)
+            if len(self.buffer) >= self.chunk_size:
+                self._flush_mongo()
+        if self.output:
+            self.file_buffer.extend(rows)
+            if len(self.file_buffer) >= self.chunk_size:
+                self._flush_file()
+
+    def _flush_mongo(self):
+        if self.buffer:
+            # insert_many가 문서에 _id를 추가하므로 파일 저장용 행과 분리
+            self.collection.insert_many([dict(row) for row in self.buffer], ordered=False)
+            self.written += len(self.buffer)
+            self.buffer = []
+
+    def _flush_file(self):
+        if not self.file_buffer:
+            return
+        if self.output.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                # 첫 청크의 label이 모두 None이어도 타입이 정해지도록 스키마 고정 (실수는 float64, 나머지는 문자열)
+                self._schema = pa.schema(
+                    [
+                        (key, pa.float64() if isinstance(value, float) else pa.string())
+                        for key, value in self.file_buffer[0].items()
+                    ]
+                )
+                self._parquet = pq.ParquetWriter(self.output, self._schema)
+            self._parquet.write_table(pa.Table.from_pylist(self.file_buffer, schema=self._schema))
+        else:
+            if self._csv is None:
+                self._csv_file = open(self.output, "w", newline="", encoding="utf-8")
+                self._csv = csv.DictWriter(self._csv_file, fieldnames=list(self.file_buffer[0].keys()))
+                self._csv.writeheader()
+            self._csv.writerows(self.file_buffer)
+        self.file_written += len(self.file_buffer)
+        self.file_buffer = []
+
+    def close(self):
+        if self.collection is not None:
+            self._flush_mongo()
+            print(f"MongoDB 저장 완료: {self.written}건")
+
+        if not self.output:
+            return
+        self._flush_file()
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._csv_file is not None:
+            self._csv_file.close()
+        if self.file_written:
+            print(f"결과 파일 저장: {self.output} ({self.file_written}건)")
+
+
+def classification_report(labels, predictions):
+    """
+    라벨이 있는 샘플의 혼동 행렬과 클래스별 정밀도/재현율
+    :return: 리포트 딕셔너리 또는 라벨이 없으면 None
+    """
+    labels = np.asarray(labels)
+    predictions = np.asarray(predictions)
+    mask = labels >= 0
+    if not mask.any():
+        return None
+
+    num_classes = len(CLASS_NAMES)
+    confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+    np.add.at(confusion, (labels[mask], predictions[mask]), 1)
+
+    per_class = {}
+    for i, name in enumerate(CLASS_NAMES):
+        true_positive = confusion[i, i]
+        predicted = confusion[:, i].sum()
+        actual = confusion[i, :].sum()
+        per_class[name] = {
+            "precision": round(float(true_positive / predicted), 4) if predicted else 0.0,
+            "recall": round(float(true_positive / actual), 4) if actual else 0.0,
+            "support": int(actual),
+        }
+
+    return {
+        "labeled": int(mask.sum()),
+        "accuracy": round(float(np.trace(confusion) / mask.sum()), 4),
+        "confusion_matrix": confusion.tolist(),
+        "per_class": per_class,
+    }
+
+
+def print_report(report):
+    width = max(len(name) for name in CLASS_NAMES) + 2
+    print(f"\n정확도: {report['accuracy'] * 100:.2f}% (라벨 {report['labeled']}장)")
+    print("혼동 행렬 (행: 실제, 열: 예측)")
+    print(" " * width + "".join(f"{name:>{width}}" for name in CLASS_NAMES))
+    for name, row in zip(CLASS_NAMES, report["confusion_matrix"]):
+        print(f"{name:<{width}}" + "".join(f"{value:>{width}}" for value in row))
+    for name, values in report["per_class"].items():
+        print(f"{name:<{width}} precision={values['precision']:.4f} recall={values['recall']:.4f} support={values['support']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정분류 모델 일괄 채점")
+    parser.add_argument("--model", required=True, help="학습된 .keras 모델 경로")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--images", help="이미지 디렉토리 (클래스 폴더 구조이면 라벨 사용)")
+    source.add_argument("--video", help="영상 파일 경로")
+    parser.add_argument("--every-n", type=int, default=1, help="영상에서 N프레임마다 채점")
+    parser.add_argument("--max-frames", type=int, default=0, help="영상 최대 채점 프레임 수 (0이면 전체)")
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument(
+        "--channel-order",
+        choices=["bgr", "rgb"],
+        default="bgr",
+        help="모델 입력 채널 순서 (서빙/test_model.py는 OpenCV BGR, train_model.py 데이터셋은 RGB, 전처리 포함 모델은 자동)",
+    )
+    parser.add_argument("--output", help="결과 파일 (.parquet 또는 .csv)")
+    parser.add_argument("--mongo-uri", help="결과를 저장할 MongoDB URI")
+    parser.add_argument("--mongo-db", default="emotionDB")
+    parser.add_argument("--mongo-collection", default="emotion_scores")
+    parser.add_argument("--report", help="처리량/혼동 행렬 리포트 JSON 저장 경로")
+    args = parser.parse_args()
+
+    model = tf.keras.models.load_model(args.model)
+    fused, channel_order = serving_input_format(model, args.channel_order)
+    print(f"모델 로드 완료: {args.model}")
+    if fused:
+        print(f"전처리 포함 서빙 모델 : uint8 {channel_order.upper()} 프레임 입력")
+
+    if args.images:
+        paths, labels = list_images(args.images)
+        if not paths:
+            raise ValueError(f"이미지가 없습니다: {args.images}")
+        dataset = image_dataset(paths, labels, args.batch_size, channel_order, fused)
+        print(f"이미지 {len(paths)}장 채점 시작")
+    else:
+        dataset = video_dataset(
+            args.video, max(args.every_n, 1), args.max_frames, args.batch_size, channel_order, fused
+        )
+        print(f"영상 채점 시작: {args.video} ({args.every_n}프레임마다)")
+
+    @tf.function(reduce_retracing=True)
+    def infer(batch):
+        return model(batch, training=False)
+
+    writer = ResultWriter(args.output, args.mongo_uri, args.mongo_db, args.mongo_collection)
+    model_name = os.path.basename(args.model)
+    all_labels, all_predictions = [], []
+    total = 0
+    inference_seconds = 0.0
+    started = time.perf_counter()
+
+    for images, batch_labels, sources in dataset:
+        batch_started = time.perf_counter()
+        probabilities = infer(images).numpy()
+        inference_seconds += time.perf_counter() - batch_started
+
+        predicted = probabilities.argmax(axis=1)
+        batch_labels = batch_labels.numpy()
+        scored_at = datetime.datetime.now(KST).isoformat()
+        rows = []
+        for source, label, index, probs in zip(sources.numpy(), batch_labels, predicted, probabilities):
+            rows.append(
+                {
+                    "source": source.decode("utf-8"),
+                    "emotion": CLASS_NAMES[index],
+                    "confidence": float(probs[index]),
+                    **{f"prob_{name}": float(p) for name, p in zip(CLASS_NAMES, probs)},
+                    "label": CLASS_NAMES[label] if label >= 0 else None,
+                    "model": model_name,
+                    "scored_at": scored_at,
+                }
+            )
+        writer.add(rows)
+
+        all_labels.extend(batch_labels.tolist())
+        all_predictions.extend(predicted.tolist())
+        total += len(rows)
+
+    elapsed = time.perf_counter() - started
+    writer.close()
+
+    summary = {
+        "model": args.model,
+        "images": total,
+        "batch_size": args.batch_size,
+        "elapsed_s": round(elapsed, 3),
+        "images_per_sec": round(total / elapsed, 2) if elapsed else 0.0,
+        "model_images_per_sec": round(total / inference_seconds, 2) if inference_seconds else 0.0,
+    }
+    print(
+        f"\n채점 완료: {total}장, {summary['elapsed_s']}s, "
+        f"{summary['images_per_sec']} images/sec (모델 단독 {summary['model_images_per_sec']} images/sec)"
+    )
+
+    report = classification_report(all_labels, all_predictions)
+    if report is not None:
+        summary["classification"] = report
+        print_report(report)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"리포트 저장: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+학습 입력 파이프라인 벤치마크 : image_dataset_from_directory(기존) vs prepare_dataset.py 변환 데이터셋
+
+- input 모드 : 모델 없이 데이터셋을 epoch 수만큼 끝까지 읽어 epoch 시간과 images/sec 측정
+    기존 파이프라인은 epoch마다 디코딩/리사이즈/증강을 다시 수행하고,
+    변환 데이터셋은 첫 epoch에 샤드를 읽어 캐시한 뒤 이후 epoch는 메모리에서 읽음 (증강은 모델 그래프로 이동)
+- train 모드 (--train) : 실제 학습 스텝(EfficientNetB2, 증강 포함)까지 포함한 epoch 시간과 images/sec
+    --weights none이면 사전 학습 가중치 다운로드 없이 측정 (처리량은 가중치와 무관)
+
+실행 예시
+    python benchmark_input_pipeline.py --train-dir ../../data/raw/train --data-dir ../../data/prepared --epochs 3
+    python benchmark_input_pipeline.py --train-dir ../../data/raw/train --data-dir ../../data/prepared --train --max-steps 20
+"""
+
+import argparse
+import json
+import os
+import time
+
+import tensorflow as tf
+
+from prepare_dataset import load_prepared_dataset, read_metadata
+from train_model import IMAGE_SIZE, build_training_model, create_model, data_process
+
+
+def iterate_epochs(dataset, epochs):
+    """데이터셋을 epoch 수만큼 끝까지 읽고 epoch별 (초, 이미지 수) 반환"""
+    results = []
+    for _ in range(epochs):
+        started = time.perf_counter()
+        count = 0
+        for _, labels in dataset:
+            count += int(labels.shape[0])
+        results.append((time.perf_counter() - started, count))
+    return results
+
+
+def train_epochs(model, dataset, epochs, steps, batch_size):
+    """steps 스텝씩 epochs번 학습하고 epoch별 (초, 이미지 수) 반환 (마지막 배치가 작을 수 있어 근사치)"""
+    results = []
+    for _ in range(epochs):
+        started = time.perf_counter()
+        model.fit(dataset, epochs=1, steps_per_epoch=steps, verbose=0)
+        results.append((time.perf_counter() - started, steps * batch_size))
+    return results
+
+
+def summarize(name, runs):
+    epochs = [{'seconds': round(s, 3), 'images_per_sec': round(n / s, 1)} for s, n in runs]
+    steady = epochs[1:] or epochs
+    summary = {
+        'epochs': epochs,
+        'first_epoch_s': epochs[0]['seconds'],
+        'steady_epoch_s': round(sum(e['seconds'] for e in steady) / len(steady), 3),
+        'steady_images_per_sec': round(sum(e['images_per_sec'] for e in steady) / len(steady), 1),
+    }
+    print(
+        f"{name:<28}{summary['first_epoch_s']:>14.2f}{summary['steady_epoch_s']:>16.2f}"
+        f"{epochs[0]['images_per_sec']:>16.1f}{summary['steady_images_per_sec']:>18.1f}"
+    )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 입력 파이프라인 처리량 비교")
+    parser.add_argument('--train-dir', required=True, help="원본 학습 이미지 디렉토리 (클래스 폴더 구조)")
+    parser.add_argument('--data-dir', required=True, help="prepare_dataset.py 출력 디렉토리 (같은 이미지)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--train', action='store_true', help="학습 스텝까지 포함해서 측정")
+    parser.add_argument('--max-steps', type=int, default=0, help="train 모드 epoch당 스텝 수 (0이면 전체)")
+    parser.add_argument('--weights', default='none', help="train 모드 EfficientNetB2 가중치 (none / imagenet)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    metadata = read_metadata(args.data_dir)
+    # 기존 파이프라인은 학습/검증 경로를 함께 받으므로 검증 경로에 학습 경로를 넣고 학습 데이터셋만 사용
+    legacy, _ = data_process(args.batch_size, args.train_dir, args.train_dir)
+    prepared = load_prepared_dataset(args.data_dir, 'train', args.batch_size)
+    results = {'config': vars(args), 'format': metadata['format'], 'encoding': metadata['encoding'], 'runs': {}}
+
+    print(f"{'pipeline':<28}{'epoch1(s)':>14}{'epoch2+(s)':>16}{'epoch1(img/s)':>16}{'epoch2+(img/s)':>18}")
+    if not args.train:
+        results['runs']['image_dataset_from_directory'] = summarize(
+            'image_dataset_from_directory', iterate_epochs(legacy, args.epochs)
+        )
+        results['runs']['prepared'] = summarize(
+            f"prepared ({metadata['format']})", iterate_epochs(prepared, args.epochs)
+        )
+    else:
+        weights = None if args.weights == 'none' else args.weights
+        count = metadata['splits']['train']['count']
+        steps = args.max_steps or -(-count // args.batch_size)
+        input_shape = IMAGE_SIZE + (3,)
+        num_classes = len(metadata['class_names'])
+
+        model = create_model(input_shape=input_shape, num_classes=num_classes, weights=weights)
+        results['runs']['image_dataset_from_directory'] = summarize(
+            'image_dataset_from_directory',
+            train_epochs(model, legacy.repeat(), args.epochs, steps, args.batch_size),
+        )
+        model = create_model(input_shape=input_shape, num_classes=num_classes, weights=weights)
+        training_model = build_training_model(model, input_shape)
+        results['runs']['prepared'] = summarize(
+            f"prepared ({metadata['format']})",
+            train_epochs(training_model, prepared.repeat(), args.epochs, steps, args.batch_size),
+        )
+
+    before = results['runs']['image_dataset_from_directory']['steady_images_per_sec']
+    after = results['runs']['prepared']['steady_images_per_sec']
+    print(f"epoch2+ 처리량 {before:.1f} → {after:.1f} images/sec ({after / before:.2f}x)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+학습 설정 벤치마크 : 정밀도(float32 / mixed_bfloat16) x XLA(jit_compile) x steps_per_execution 조합별
+학습 steps/sec, 최대 메모리, 검증 정확도를 합성 데이터로 빠르게 비교 (전체 20 epoch 학습 없이 설정 선택)
+
+- 합성 데이터 : 클래스마다 색조가 다른 uint8 노이즈 이미지 (학습 가능한 신호가 있어 정확도 비교 가능)
+- 조합마다 새 프로세스에서 실행 (전역 dtype 정책과 최대 RSS를 분리)
+    1번째 fit : 그래프 추적/XLA 컴파일 포함 (compile_s)
+    2번째 fit : --steps 스텝 측정 (steps/sec, images/sec)
+    이후 합성 검증 데이터 정확도, 프로세스 최대 RSS(ru_maxrss)
+- 학습 모델은 train_model.py --data-dir 경로와 같은 uint8 입력 + 그래프 내 증강 학습용 모델
+
+실행 예시
+    python benchmark_training.py --model efficientnet_b2 --precisions float32,mixed_bfloat16 \
+        --jit both --steps-per-execution 1,8 --steps 30 --batch-size 16
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+# 새 프로세스에서 실행할 측정 코드 (결과는 마지막 줄에 JSON으로 출력)
+CHILD_CODE = """
+import json, resource, sys, time
+import numpy as np
+import tensorflow as tf
+from train_model import (
+    IMAGE_SIZE, build_training_model, configure_precision, create_model, create_student_model,
+)
+
+config = json.loads(sys.argv[1])
+configure_precision(config["precision"])
+compile_options = {{"jit_compile": config["jit_compile"], "steps_per_execution": config["steps_per_execution"]}}
+input_shape = IMAGE_SIZE + (3,)
+num_classes = 4
+batch_size = config["batch_size"]
+
+
+def synthetic(count, seed):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, num_classes, count).astype(np.int32)
+    tints = np.array([[60, 0, 0], [0, 60, 0], [0, 0, 60], [40, 40, 0]], dtype=np.int16)
+    images = rng.integers(0, 196, (count,) + input_shape, dtype=np.int16) + tints[labels][:, None, None, :]
+    return np.clip(images, 0, 255).astype(np.uint8), labels
+
+
+train_x, train_y = synthetic(batch_size * 8, 0)
+val_x, val_y = synthetic(config["val_images"], 1)
+train = tf.data.Dataset.from_tensor_slices((train_x, train_y)).shuffle(len(train_x)).repeat().batch(batch_size).prefetch(2)
+val = tf.data.Dataset.from_tensor_slices((val_x, val_y)).batch(batch_size)
+
+if config["model"] == "efficientnet_b2":
+    model = create_model(input_shape, num_classes, weights=None, **compile_options)
+else:
+    model, _ = create_student_model(input_shape, num_classes, config["model"], config["resolution"], weights=None)
+training_model = build_training_model(model, input_shape, **compile_options)
+
+# steps_per_epoch는 steps_per_execution의 배수로 맞춤
+spe = config["steps_per_execution"]
+steps = max(spe, config["steps"] // spe * spe)
+
+started = time.perf_counter()
+training_model.fit(train, epochs=1, steps_per_epoch=spe, verbose=0)
+compile_s = time.perf_counter() - started
+
+started = time.perf_counter()
+training_model.fit(train, epochs=1, steps_per_epoch=steps, verbose=0)
+elapsed = time.perf_counter() - started
+
+_, accuracy = training_model.evaluate(val, verbose=0)
+print(json.dumps({{
+    "steps": steps,
+    "compile_s": compile_s,
+    "steps_per_sec": steps / elapsed,
+    "images_per_sec": steps * batch_size / elapsed,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    "val_accuracy": float(accuracy),
+}}))
+"""
+
+
+def run_child(config, timeout):
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE.format(), json.dumps(config)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode != 0 or not lines:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "실행 실패"}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습 정밀도/XLA/steps_per_execution 조합별 처리량 비교")
+    parser.add_argument("--model", default="efficientnet_b2", help="efficientnet_b2 / mobilenet_v3_small / efficientnet_b0")
+    parser.add_argument("--resolution", type=int, default=160, help="student 모델 내부 해상도")
+    parser.add_argument("--precisions", default="float32,mixed_bfloat16", help="쉼표로 구분한 dtype 정책")
+    parser.add_argument("--jit", choices=["off", "on", "both"], default="both", help="XLA jit_compile")
+    parser.add_argument("--steps-per-execution", default="1,8", help="쉼표로 구분한 steps_per_execution 목록")
+    parser.add_argument("--steps", type=int, default=30, help="측정 학습 스텝 수")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--val-images", type=int, default=128)
+    parser.add_argument("--timeout", type=float, default=1800.0, help="조합별 최대 실행 시간 (초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    precisions = [p for p in args.precisions.split(",") if p]
+    jit_options = {"off": [False], "on": [True], "both": [False, True]}[args.jit]
+    spe_options = [int(v) for v in args.steps_per_execution.split(",") if v]
+
+    results = {"config": vars(args), "runs": []}
+    print(f"{'precision':<16}{'jit':>5}{'spe':>5}{'compile(s)':>12}{'steps/s':>10}{'img/s':>9}{'peak RSS(MB)':>14}{'val acc':>9}")
+    for precision, jit_compile, spe in itertools.product(precisions, jit_options, spe_options):
+        config = {
+            "model": args.model,
+            "resolution": args.resolution,
+            "precision": precision,
+            "jit_compile": jit_compile,
+            "steps_per_execution": spe,
+            "steps": args.steps,
+            "batch_size": args.batch_size,
+            "val_images": args.val_images,
+        }
+        run = {**config, **run_child(config, args.timeout)}
+        results["runs"].append(run)
+        if "error" in run:
+            print(f"{precision:<16}{str(jit_compile):>5}{spe:>5}  실패: {run['error']}")
+            continue
+        print(
+            f"{precision:<16}{str(jit_compile):>5}{spe:>5}{run['compile_s']:>12.1f}{run['steps_per_sec']:>10.2f}"
+            f"{run['images_per_sec']:>9.1f}{run['peak_rss_mb']:>14.0f}{run['val_accuracy']:>9.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+train_model.py로 학습한 .keras 감정분류 모델을 CPU 추론용 형식으로 변환
+
+생성 파일 (output-dir)
+- emotion_fp16.tflite : float16 가중치 양자화 TFLite
+- emotion_int8.tflite : 대표 데이터셋으로 보정한 full int8 양자화 TFLite
+- emotion.onnx        : ONNX Runtime용 모델 (tf2onnx 필요)
+
+실행 예시
+    python convert_model.py --model TEST_1efficientnet_b2_model.keras --output-dir ../../data/models \
+        --representative-dir ../../data/raw/val --formats fp16,int8,onnx
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+IMAGE_SIZE = (224, 224)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_representative_images(data_dir, num_samples):
+    """
+    int8 보정용 대표 이미지 로드 (서빙 경로와 동일하게 OpenCV 디코딩 + 0~1 정규화)
+    :param data_dir: 클래스 폴더 구조의 이미지 디렉토리
+    :param num_samples: 사용할 최대 이미지 수
+    """
+    paths = []
+    for root, _, files in os.walk(data_dir):
+        paths.extend(
+            os.path.join(root, name)
+            for name in sorted(files)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    rng = np.random.default_rng(0)
+    rng.shuffle(paths)
+
+    images = []
+    for path in paths[:num_samples]:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        image = cv2.resize(image, IMAGE_SIZE).astype(np.float32) / 255.0
+        images.append(image[np.newaxis])
+    return images
+
+
+def convert_tflite_fp16(model, output_path):
+    """float16 가중치 양자화 (입출력은 float32 유지)"""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+
+
+def convert_tflite_int8(model, output_path, representative_images):
+    """대표 데이터셋 보정 기반 full integer(int8) 양자화"""
+    if not representative_images:
+        raise ValueError("int8 변환에는 대표 이미지가 필요합니다. --representative-dir를 확인하세요.")
+
+    def representative_dataset():
+        for image in representative_images:
+            yield [image]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+
+
+def convert_onnx(model, output_path, opset):
+    """SavedModel로 export한 뒤 tf2onnx CLI로 ONNX 변환"""
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        model.export(saved_model_dir)
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "tf2onnx.convert",
+                "--saved-model",
+                saved_model_dir,
+                "--output",
+                output_path,
+                "--opset",
+                str(opset),
+            ],
+            check=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정분류 모델 TFLite/ONNX 변환")
+    parser.add_argument("--model", required=True, help="학습된 .keras 모델 경로")
+    parser.add_argument("--output-dir", required=True, help="변환 결과 저장 디렉토리")
+    parser.add_argument("--formats", default="fp16,int8,onnx", help="생성할 형식 (fp16,int8,onnx)")
+    parser.add_argument("--representative-dir", help="int8 보정용 이미지 디렉토리 (클래스 폴더 구조)")
+    parser.add_argument("--num-calibration", type=int, default=200, help="int8 보정에 사용할 이미지 수")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset 버전")
+    args = parser.parse_args()
+
+    formats = {f.strip() for f in args.formats.split(",") if f.strip()}
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    model = tf.keras.models.load_model(args.model)
+    print(f"모델 로드 완료: {args.model}")
+
+    if "fp16" in formats:
+        path = os.path.join(args.output_dir, "emotion_fp16.tflite")
+        convert_tflite_fp16(model, path)
+        print(f"float16 TFLite 저장: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    if "int8" in formats:
+        images = load_representative_images(args.representative_dir or "", args.num_calibration)
+        path = os.path.join(args.output_dir, "emotion_int8.tflite")
+        convert_tflite_int8(model, path, images)
+        print(f"int8 TFLite 저장: {path} ({os.path.getsize(path) / 1e6:.1f} MB, 보정 이미지 {len(images)}장)")
+
+    if "onnx" in formats:
+        path = os.path.join(args.output_dir, "emotion.onnx")
+        convert_onnx(model, path, args.opset)
+        print(f"ONNX 저장: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+전처리를 모델 그래프에 포함한 서빙용 모델 내보내기 (uint8 프레임 입력 → 확률 출력)
+
+서빙 입력 : (N, H, W, 3) uint8, OpenCV로 디코딩한 BGR 프레임 그대로 (H, W는 임의 크기)
+그래프 안 전처리 (학습 파이프라인 image_dataset_from_directory + Rescaling과 동일)
+    1/255 스케일(float 변환) → bilinear 리사이즈(224x224, antialias 없음) → BGR→RGB 채널 변환
+    (Resizing 레이어는 uint8 입력이면 결과를 uint8로 반올림하므로 스케일을 먼저 적용, 리사이즈는 선형이라 순서 무관)
+    채널 변환은 고정 가중치 1x1 Conv2D(순열 행렬)로 구현해 커스텀 레이어 없이 .keras로 저장/로드
+출력 : 기존 모델과 같은 클래스 확률
+
+저장 후 학습/서빙 전처리 동일성 검사를 항상 실행하고, 허용 오차를 넘으면 종료 코드 1
+- 합성 프레임(여러 크기) : 학습 경로(RGB → tf.image.resize → /255)와 서빙 모델 내부 전처리 결과 비교
+- --check-dir 지정 시 실제 이미지 : 같은 OpenCV 디코딩 결과로 전처리/확률/top-1 비교 (디코더 차이는 참고용 출력)
+
+실행 예시
+    python export_serving_model.py --model TEST_1efficientnet_b2_model.keras --output emotion_serving.keras \
+        --check-dir ../../data/raw/val
+"""
+
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+import tensorflow as tf
+
+IMAGE_SIZE = (224, 224)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def build_serving_model(classifier, image_size=IMAGE_SIZE, channel_order='bgr'):
+    """
+    :param classifier: 0-1 스케일 RGB 224x224 입력을 받는 분류 모델
+    :param channel_order: 서빙 입력 채널 순서 ('bgr': OpenCV 프레임, 'rgb')
+    :return: (서빙 모델, 전처리 결과를 출력하는 모델) 두 모델은 레이어 공유
+    """
+    inputs = tf.keras.Input(shape=(None, None, 3), dtype='uint8', name='frames')
+    x = tf.keras.layers.Rescaling(1./255, name='rescale')(inputs)
+    x = tf.keras.layers.Resizing(image_size[0], image_size[1], interpolation='bilinear', name='resize')(x)
+    if channel_order == 'bgr':
+        permute = tf.keras.layers.Conv2D(3, 1, use_bias=False, trainable=False, name='bgr_to_rgb')
+        x = permute(x)
+        # 출력 채널 c ← 입력 채널 2 - c
+        permute.set_weights([np.eye(3, dtype=np.float32)[::-1].reshape(1, 1, 3, 3)])
+    # Resizing 레이어가 호출 컨텍스트를 학습 모드로 바꾸므로 분류 모델은 항상 추론 모드로 고정
+    # (training 인자 없이 호출하면 BatchNormalization 이동 통계가 갱신됨)
+    outputs = classifier(x, training=False)
+
+    serving_model = tf.keras.Model(inputs, outputs, name='emotion_serving')
+    preprocessor = tf.keras.Model(inputs, x, name='emotion_serving_preprocess')
+    return serving_model, preprocessor
+
+
+def train_preprocess(rgb_image, image_size=IMAGE_SIZE):
+    """학습 파이프라인과 같은 전처리 (RGB uint8 → bilinear 리사이즈 → 0-1)"""
+    return tf.image.resize(rgb_image, image_size).numpy() / 255.0
+
+
+def check_synthetic(preprocessor, image_size, channel_order, sizes, tolerance):
+    """합성 RGB 프레임으로 학습/서빙 전처리 최대 오차 확인"""
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    for height, width in sizes:
+        rgb = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        frame = rgb[..., ::-1] if channel_order == 'bgr' else rgb
+        served = np.asarray(preprocessor(np.ascontiguousarray(frame)[np.newaxis]))[0]
+        diff = float(np.max(np.abs(served - train_preprocess(rgb, image_size))))
+        worst = max(worst, diff)
+        print(f"  합성 {height}x{width}: 최대 오차 {diff:.2e}")
+    return worst <= tolerance, worst
+
+
+def check_images(serving_model, preprocessor, classifier, image_dir, image_size, channel_order, limit, tolerance):
+    """
+    실제 이미지로 학습/서빙 전처리와 예측 비교
+    같은 디코딩 결과(cv2.imread)를 학습 경로와 서빙 모델에 넣어 전처리 차이만 검사하고,
+    학습 데이터셋의 tf.io 디코딩과 OpenCV 디코딩의 차이(JPEG IDCT 구현 차이)는 참고용으로 출력
+    """
+    paths = []
+    for root, _, files in os.walk(image_dir):
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(IMAGE_EXTENSIONS))
+
+    worst_input, worst_output, worst_decode, agree = 0.0, 0.0, 0, 0
+    for path in paths[:limit]:
+        frame = cv2.imread(path)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if channel_order == 'rgb':
+            frame = rgb
+        train_input = train_preprocess(rgb, image_size)
+
+        served_input = np.asarray(preprocessor(frame[np.newaxis]))[0]
+        served = np.asarray(serving_model(frame[np.newaxis]))[0]
+        expected = np.asarray(classifier(train_input[np.newaxis].astype(np.float32)))[0]
+
+        worst_input = max(worst_input, float(np.max(np.abs(served_input - train_input))))
+        worst_output = max(worst_output, float(np.max(np.abs(served - expected))))
+        agree += int(np.argmax(served) == np.argmax(expected))
+
+        tf_rgb = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False).numpy()
+        worst_decode = max(worst_decode, int(np.max(np.abs(tf_rgb.astype(np.int16) - rgb))))
+
+    count = min(len(paths), limit)
+    print(
+        f"  이미지 {count}장: 입력 최대 오차 {worst_input:.2e}, 확률 최대 오차 {worst_output:.2e}, "
+        f"top-1 일치 {agree}/{count}"
+    )
+    print(f"  참고: TensorFlow / OpenCV 디코딩 최대 픽셀 차이 {worst_decode} (0-255)")
+    return worst_input <= tolerance and agree == count, worst_input
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전처리 포함 서빙 모델 내보내기 (uint8 입력)")
+    parser.add_argument("--model", required=True, help="0-1 RGB 입력 분류 모델 (.keras)")
+    parser.add_argument("--output", required=True, help="서빙 모델 저장 경로 (.keras)")
+    parser.add_argument("--channel-order", choices=["bgr", "rgb"], default="bgr", help="서빙 입력 채널 순서")
+    parser.add_argument("--check-dir", help="동일성 검사용 실제 이미지 디렉토리")
+    parser.add_argument("--check-limit", type=int, default=100)
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="전처리 결과(0-1 스케일) 허용 오차")
+    args = parser.parse_args()
+
+    classifier = tf.keras.models.load_model(args.model)
+    serving_model, _ = build_serving_model(classifier, IMAGE_SIZE, args.channel_order)
+    serving_model.save(args.output)
+    print(f"서빙 모델 저장: {args.output}")
+
+    # 저장한 파일을 다시 로드해서 검사 (서빙에서 로드하는 것과 같은 모델)
+    loaded = tf.keras.models.load_model(args.output)
+    loaded_preprocessor = tf.keras.Model(loaded.inputs[0], loaded.layers[-2].output)
+
+    print("학습/서빙 전처리 동일성 검사")
+    sizes = [(224, 224), (120, 96), (480, 640), (37, 53), (720, 1280)]
+    passed, _ = check_synthetic(loaded_preprocessor, IMAGE_SIZE, args.channel_order, sizes, args.tolerance)
+    if args.check_dir:
+        image_passed, _ = check_images(
+            loaded, loaded_preprocessor, classifier, args.check_dir, IMAGE_SIZE,
+            args.channel_order, args.check_limit, args.tolerance,
+        )
+        passed = passed and image_passed
+
+    if not passed:
+        print("전처리 동일성 검사 실패")
+        sys.exit(1)
+    print("전처리 동일성 검사 통과")
+
+
+if __name__ == "__main__":
+    main()
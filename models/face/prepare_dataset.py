@@ -0,0 +1,259 @@
+"""
+클래스 폴더 구조의 얼굴 이미지를 한 번만 디코딩/리사이즈해서 학습용 데이터셋으로 저장
+
+image_dataset_from_directory는 epoch마다 원본 JPEG를 다시 읽고 디코딩/리사이즈하므로
+학습 전에 한 번 변환해 두고 train_model.py가 변환된 데이터를 읽음
+
+저장 형식 (output-dir)
+- tfrecord : {split}-00000-of-000NN.tfrecord 샤드 (uint8 원시 배열 또는 224 해상도 JPEG 재인코딩)
+- memmap   : {split}_images.npy (N, 224, 224, 3) uint8 + {split}_labels.npy (np.load mmap_mode='r'로 읽음)
+- metadata.json : 클래스 이름(폴더 이름 정렬 순서, image_dataset_from_directory와 동일), 이미지 크기, split별 개수/파일
+
+리사이즈는 image_dataset_from_directory와 같은 tf.image.resize(bilinear) 후 uint8로 반올림
+
+실행 예시
+    python prepare_dataset.py --train-dir ../../data/raw/train --val-dir ../../data/raw/val \
+        --output-dir ../../data/prepared --format tfrecord --shard-size 2000
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+IMAGE_SIZE = (224, 224)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+METADATA_FILE = "metadata.json"
+
+
+def list_class_images(data_dir, class_names=None):
+    """
+    클래스 폴더 구조의 이미지 경로와 라벨
+    :param data_dir: 하위 폴더 이름이 클래스인 디렉토리
+    :param class_names: 클래스 순서 (None이면 폴더 이름 정렬 순서)
+    :return: (경로 리스트, 라벨 리스트, 클래스 이름 리스트)
+    """
+    if class_names is None:
+        class_names = sorted(
+            name for name in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, name))
+        )
+
+    paths, labels = [], []
+    for label, class_name in enumerate(class_names):
+        class_dir = os.path.join(data_dir, class_name)
+        for root, _, files in sorted(os.walk(class_dir)):
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    paths.append(os.path.join(root, name))
+                    labels.append(label)
+    return paths, labels, class_names
+
+
+def _decode_dataset(paths, labels, image_size, seed):
+    """경로 → (uint8 이미지, 라벨) 스트림 (파일 읽기/디코딩/리사이즈 병렬, 순서 섞기 1회)"""
+    order = np.random.default_rng(seed).permutation(len(paths))
+    paths = [paths[i] for i in order]
+    labels = [labels[i] for i in order]
+
+    def load(path, label):
+        image = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+        image.set_shape([None, None, 3])
+        image = tf.image.resize(image, image_size)
+        image = tf.cast(tf.clip_by_value(tf.round(image), 0.0, 255.0), tf.uint8)
+        return image, label
+
+    dataset = tf.data.Dataset.from_tensor_slices((paths, np.asarray(labels, dtype=np.int32)))
+    dataset = dataset.map(load, num_parallel_calls=tf.data.AUTOTUNE, deterministic=True)
+    return dataset.prefetch(tf.data.AUTOTUNE), len(paths)
+
+
+def _serialize(image, label, encoding):
+    if encoding == "jpeg":
+        data = tf.io.encode_jpeg(image, quality=95).numpy()
+    else:
+        data = image.numpy().tobytes()
+    feature = {
+        "image": tf.train.Feature(bytes_list=tf.train.BytesList(value=[data])),
+        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[int(label)])),
+    }
+    return tf.train.Example(features=tf.train.Features(feature=feature)).SerializeToString()
+
+
+def write_tfrecord_shards(dataset, count, output_dir, split, shard_size, encoding):
+    """
+    (uint8 이미지, 라벨) 스트림을 TFRecord 샤드로 저장
+    :return: 샤드 파일 이름 리스트
+    """
+    num_shards = max(1, -(-count // shard_size))
+    files = [f"{split}-{i:05d}-of-{num_shards:05d}.tfrecord" for i in range(num_shards)]
+
+    writer = None
+    for index, (image, label) in enumerate(dataset):
+        if index % shard_size == 0:
+            if writer is not None:
+                writer.close()
+            writer = tf.io.TFRecordWriter(os.path.join(output_dir, files[index // shard_size]))
+        writer.write(_serialize(image, label, encoding))
+    if writer is not None:
+        writer.close()
+    return files
+
+
+def write_memmap(dataset, count, output_dir, split, image_size):
+    """
+    (uint8 이미지, 라벨) 스트림을 memory-mapped .npy 배열로 저장
+    :return: [이미지 파일 이름, 라벨 파일 이름]
+    """
+    images_file, labels_file = f"{split}_images.npy", f"{split}_labels.npy"
+    images = np.lib.format.open_memmap(
+        os.path.join(output_dir, images_file),
+        mode="w+",
+        dtype=np.uint8,
+        shape=(count, image_size[0], image_size[1], 3),
+    )
+    labels = np.empty(count, dtype=np.int32)
+    for index, (image, label) in enumerate(dataset):
+        images[index] = image.numpy()
+        labels[index] = int(label)
+    images.flush()
+    del images
+    np.save(os.path.join(output_dir, labels_file), labels)
+    return [images_file, labels_file]
+
+
+def read_metadata(data_dir):
+    with open(os.path.join(data_dir, METADATA_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_prepared_dataset(data_dir, split, batch_size, shuffle=True, cache=True, shuffle_buffer=10000, seed=None):
+    """
+    변환된 데이터셋을 학습용 tf.data 파이프라인으로 로드
+    tfrecord : 샤드 병렬 interleave → 병렬 파싱 → cache → shuffle → batch → prefetch
+    memmap   : 인덱스 shuffle → batch → 배치 단위 gather (페이지 캐시 사용) → prefetch
+    :param data_dir: prepare_dataset.py 출력 디렉토리
+    :param split: 'train' 또는 'val'
+    :param cache: 파싱된 uint8 이미지를 메모리에 캐시 (True) / 캐시 파일 경로 (str) / 사용 안 함 (False)
+    :return: (uint8 이미지 배치, int32 라벨 배치) 데이터셋 (정규화/증강은 모델 그래프에서)
+    """
+    metadata = read_metadata(data_dir)
+    height, width = metadata["image_size"]
+    info = metadata["splits"][split]
+
+    if metadata["format"] == "memmap":
+        images = np.load(os.path.join(data_dir, info["files"][0]), mmap_mode="r")
+        labels = np.load(os.path.join(data_dir, info["files"][1]))
+
+        def gather(indices):
+            # 인접한 행을 읽도록 정렬 (배치 구성은 이미 무작위)
+            indices = np.sort(indices)
+            return images[indices], labels[indices]
+
+        dataset = tf.data.Dataset.range(info["count"])
+        if shuffle:
+            dataset = dataset.shuffle(info["count"], seed=seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(batch_size)
+        dataset = dataset.map(
+            lambda indices: tf.numpy_function(gather, [indices], (tf.uint8, tf.int32)),
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=not shuffle,
+        )
+        dataset = dataset.map(
+            lambda x, y: (tf.ensure_shape(x, [None, height, width, 3]), tf.ensure_shape(y, [None]))
+        )
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def parse(record):
+        example = tf.io.parse_single_example(
+            record,
+            {
+                "image": tf.io.FixedLenFeature([], tf.string),
+                "label": tf.io.FixedLenFeature([], tf.int64),
+            },
+        )
+        if metadata["encoding"] == "jpeg":
+            image = tf.io.decode_jpeg(example["image"], channels=3)
+        else:
+            image = tf.io.decode_raw(example["image"], tf.uint8)
+        image = tf.reshape(image, [height, width, 3])
+        return image, tf.cast(example["label"], tf.int32)
+
+    files = [os.path.join(data_dir, name) for name in info["files"]]
+    dataset = tf.data.Dataset.from_tensor_slices(files)
+    if shuffle:
+        dataset = dataset.shuffle(len(files), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.interleave(
+        tf.data.TFRecordDataset,
+        cycle_length=min(len(files), 8),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not shuffle,
+    )
+    dataset = dataset.map(parse, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle)
+    if cache:
+        dataset = dataset.cache(cache if isinstance(cache, str) else "")
+    if shuffle:
+        dataset = dataset.shuffle(min(shuffle_buffer, info["count"]), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 이미지 학습 데이터셋 변환 (TFRecord / memmap)")
+    parser.add_argument("--train-dir", required=True, help="학습 이미지 디렉토리 (클래스 폴더 구조)")
+    parser.add_argument("--val-dir", help="검증 이미지 디렉토리 (클래스 폴더 구조)")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--format", choices=["tfrecord", "memmap"], default="tfrecord")
+    parser.add_argument(
+        "--encoding",
+        choices=["raw", "jpeg"],
+        default="raw",
+        help="tfrecord 이미지 저장 방식 (raw: 디코딩 없음, jpeg: 용량 약 1/10, 캐시 전 1회 디코딩)",
+    )
+    parser.add_argument("--shard-size", type=int, default=2000, help="TFRecord 샤드당 이미지 수")
+    parser.add_argument("--image-size", type=int, default=IMAGE_SIZE[0])
+    parser.add_argument("--seed", type=int, default=0, help="샤드에 저장할 순서를 섞는 시드")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    image_size = (args.image_size, args.image_size)
+    metadata = {
+        "format": args.format,
+        "encoding": args.encoding if args.format == "tfrecord" else "raw",
+        "image_size": list(image_size),
+        "class_names": None,
+        "splits": {},
+    }
+
+    for split, data_dir in (("train", args.train_dir), ("val", args.val_dir)):
+        if not data_dir:
+            continue
+        paths, labels, class_names = list_class_images(data_dir, metadata["class_names"])
+        if not paths:
+            raise ValueError(f"이미지가 없습니다: {data_dir}")
+        metadata["class_names"] = class_names
+
+        started = time.perf_counter()
+        dataset, count = _decode_dataset(paths, labels, image_size, args.seed)
+        if args.format == "memmap":
+            files = write_memmap(dataset, count, args.output_dir, split, image_size)
+        else:
+            files = write_tfrecord_shards(dataset, count, args.output_dir, split, args.shard_size, args.encoding)
+        elapsed = time.perf_counter() - started
+
+        metadata["splits"][split] = {
+            "count": count,
+            "class_counts": np.bincount(labels, minlength=len(class_names)).tolist(),
+            "files": files,
+        }
+        size_mb = sum(os.path.getsize(os.path.join(args.output_dir, name)) for name in files) / (1024 * 1024)
+        print(f"{split}: {count}장 → {len(files)}개 파일, {size_mb:.1f}MB, {elapsed:.1f}s ({count / elapsed:.1f} images/sec)")
+
+    with open(os.path.join(args.output_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    print(f"클래스 순서: {metadata['class_names']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,62 @@
+"""
+EfficientNetB2 감정 분류 모델 학습
+
+입력 데이터
+- --data-dir : prepare_dataset.py로 변환한 데이터셋 (TFRecord / memmap, 디코딩/리사이즈 1회)
+    입력 파이프라인은 uint8 이미지만 전달하고 0-1 스케일/증강은 학습용 모델 그래프 안에서 실행
+- --train-dir, --val-dir : 클래스 폴더 구조 원본 이미지 (기존 image_dataset_from_directory 방식, epoch마다 디코딩)
+저장되는 모델은 두 방식 모두 0-1 스케일 입력을 받는 분류 모델 (서빙 전처리 변경 없음)
+epoch마다 소요 시간과 images/sec 출력
+
+지식 증류 (--teacher)
+- 학습된 EfficientNetB2 모델(teacher)의 soft label로 작은 student 모델 학습
+    student : MobileNetV3-Small(기본) 또는 EfficientNetB0, 224보다 낮은 해상도(--student-resolution)
+- student도 224x224 0-1 스케일 입력을 받고(리사이즈는 모델 그래프 안에서) 확률을 출력하므로
+  MODEL_PATH만 바꾸면 load_emotion_model / 변환 스크립트(convert_model.py)에서 그대로 사용
+- 학습 후 teacher/student의 검증 정확도, 모델 크기, 단일 프레임 CPU 지연 시간 비교 리포트 출력 (--report로 JSON 저장)
+
+실행 예시
+    python prepare_dataset.py --train-dir ../../data/raw/train --val-dir ../../data/raw/val --output-dir ../../data/prepared
+    python train_model.py --data-dir ../../data/prepared --output ../../be/app/models/face_model.keras
+    python train_model.py --data-dir ../../data/prepared --teacher ../../be/app/models/face_model.keras \
+        --student mobilenet_v3_small --student-resolution 160 --output face_student.keras --report distill_report.json
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
 import tensorflow as tf
-from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+from tensorflow.keras.callbacks import Callback, EarlyStopping, ReduceLROnPlateau
+
+from prepare_dataset import load_prepared_dataset, read_metadata
+
+IMAGE_SIZE = (224, 224)
+
+
+def build_augmentation():
+    # 데이터 증강
+    return tf.keras.Sequential([
+        tf.keras.layers.RandomFlip("horizontal"),
+        tf.keras.layers.RandomRotation(0.2),
+        tf.keras.layers.RandomZoom(0.1),
+        tf.keras.layers.RandomContrast(0.2)
+    ], name='augmentation')
 
-def data_process(batch_size):
-    # 경로 수정
-    train_data_path = ''
-    val_data_path = ''
 
+def data_process(batch_size, train_data_path, val_data_path):
     # 데이터셋 생성
     train_dataset = tf.keras.preprocessing.image_dataset_from_directory(
         train_data_path,
-        image_size=(224, 224),
+        image_size=IMAGE_SIZE,
         batch_size=batch_size,
         shuffle=True
     )
     val_dataset = tf.keras.preprocessing.image_dataset_from_directory(
         val_data_path,
-        image_size=(224, 224),
+        image_size=IMAGE_SIZE,
         batch_size=batch_size,
         shuffle=False
     )
@@ -25,47 +66,412 @@ def data_process(batch_size):
     train_dataset = train_dataset.map(lambda x, y: (standardization_layer(x), y))
     val_dataset = val_dataset.map(lambda x, y: (standardization_layer(x), y))
 
-    # 데이터 증강
-    data_augmentation = tf.keras.Sequential([
-        tf.keras.layers.RandomFlip("horizontal"),
-        tf.keras.layers.RandomRotation(0.2),
-        tf.keras.layers.RandomZoom(0.1),
-        tf.keras.layers.RandomContrast(0.2)
-    ])
-
+    data_augmentation = build_augmentation()
     train_dataset = train_dataset.map(lambda x, y: (data_augmentation(x, training=True), y))
 
     return train_dataset, val_dataset
 
-def create_model(input_shape=(224, 224, 3), num_classes=4):
+
+def prepared_data_process(batch_size, data_dir, cache=True):
+    """
+    prepare_dataset.py로 변환한 데이터셋 로드
+    :return: (학습 데이터셋, 검증 데이터셋 또는 None, 메타데이터) - 이미지는 uint8
+    """
+    metadata = read_metadata(data_dir)
+    train_dataset = load_prepared_dataset(data_dir, 'train', batch_size, shuffle=True, cache=cache)
+    val_dataset = None
+    if 'val' in metadata['splits']:
+        val_dataset = load_prepared_dataset(data_dir, 'val', batch_size, shuffle=False, cache=cache)
+    return train_dataset, val_dataset, metadata
+
+
+def prepared_input_shape(metadata):
+    """변환된 데이터셋 메타데이터의 이미지 크기로 모델 입력 형태 결정 (H, W, 3)"""
+    height, width = metadata['image_size']
+    return (height, width, 3)
+
+
+PRECISION_POLICIES = ('float32', 'mixed_bfloat16', 'mixed_float16')
+
+
+def configure_precision(precision='float32'):
+    """
+    Keras 전역 dtype 정책 지정 (모델 생성 전에 호출)
+    mixed_bfloat16 : 연산은 bfloat16, 가중치는 float32 (AVX512-BF16/AMX CPU에서 빠름, loss scaling 불필요)
+    mixed_float16  : GPU용 (Adam은 compile 시 자동으로 LossScaleOptimizer로 감싸짐)
+    """
+    if precision not in PRECISION_POLICIES:
+        raise ValueError(f"지원하지 않는 정밀도입니다: {precision} (지원: {', '.join(PRECISION_POLICIES)})")
+    tf.keras.mixed_precision.set_global_policy(precision)
+
+
+def compile_model(model, learning_rate=0.0001, jit_compile=False, steps_per_execution=1):
+    """
+    :param jit_compile: XLA로 학습 스텝 컴파일
+    :param steps_per_execution: tf.function 한 번 호출에 실행할 배치 수 (Python 오버헤드 감소)
+    """
+    # 학습률 감소 적용
+    optimizer = tf.keras.optimizers.Adam(learning_rate=learning_rate)
+    model.compile(
+        optimizer=optimizer,
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy'],
+        jit_compile=jit_compile,
+        steps_per_execution=steps_per_execution,
+    )
+    return model
+
+
+def save_serving_model(model, path, rebuild):
+    """
+    서빙용 모델 저장
+    mixed precision으로 학습했으면 float32 정책으로 같은 구조를 다시 만들어 가중치를 복사한 뒤 저장
+    (저장된 dtype 정책이 서빙 CPU에서 bfloat16 연산을 강제하지 않도록)
+    :param rebuild: 같은 구조의 모델을 만드는 함수 (가중치 초기화 불필요)
+    """
+    if tf.keras.mixed_precision.global_policy().name != 'float32':
+        tf.keras.mixed_precision.set_global_policy('float32')
+        serving_model = rebuild()
+        serving_model.set_weights(model.get_weights())
+        model = serving_model
+    model.save(path)
+
+
+def create_model(input_shape=(224, 224, 3), num_classes=4, weights='imagenet', **compile_options):
     base_model = tf.keras.applications.EfficientNetB2(
-        weights='imagenet', include_top=False, input_shape=input_shape
+        weights=weights, include_top=False, input_shape=input_shape
     )
     base_model.trainable = True  # 사전 훈련된 모델의 가중치 동결 해제
 
     model = tf.keras.Sequential([
+        tf.keras.Input(shape=input_shape),
         base_model,
         tf.keras.layers.GlobalAveragePooling2D(),
         tf.keras.layers.Dense(128, activation='relu'),
-        tf.keras.layers.Dense(num_classes, activation='softmax')
+        # mixed precision에서도 softmax 출력은 float32
+        tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
     ])
+    return compile_model(model, **compile_options)
 
-    # 학습률 감소 적용
-    optimizer = tf.keras.optimizers.Adam(learning_rate=0.0001)  
 
-    model.compile(optimizer=optimizer, loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-    return model
+def build_training_model(model, input_shape=(224, 224, 3), **compile_options):
+    """
+    uint8 이미지를 받아 0-1 스케일 → 증강 → 분류 모델을 실행하는 학습용 모델
+    증강 레이어는 추론(training=False) 시 그대로 통과하므로 검증에도 같은 모델 사용
+    가중치는 분류 모델과 공유하므로 학습 후 분류 모델만 저장
+    """
+    inputs = tf.keras.Input(shape=input_shape, dtype=tf.uint8, name='image')
+    x = tf.keras.layers.Rescaling(1./255)(inputs)
+    x = build_augmentation()(x)
+    outputs = model(x)
+    return compile_model(tf.keras.Model(inputs, outputs, name='training_model'), **compile_options)
+
+
+STUDENT_ARCHITECTURES = ('mobilenet_v3_small', 'efficientnet_b0')
+
+
+def create_student_model(input_shape=(224, 224, 3), num_classes=4, architecture='mobilenet_v3_small',
+                         resolution=160, weights='imagenet'):
+    """
+    지식 증류용 경량 student 모델
+    입력은 teacher와 같은 224x224 0-1 스케일이고 모델 안에서 resolution으로 리사이즈
+    :return: (확률 출력 모델 - 저장/서빙용, logits 출력 모델 - 증류 학습용) 두 모델은 가중치 공유
+    """
+    inputs = tf.keras.Input(shape=input_shape, name='image')
+    x = inputs
+    if resolution != input_shape[0]:
+        x = tf.keras.layers.Resizing(resolution, resolution, name='student_resize')(x)
+
+    backbone_shape = (resolution, resolution, 3)
+    if architecture == 'mobilenet_v3_small':
+        # 내장 전처리 없이 [-1, 1] 입력
+        x = tf.keras.layers.Rescaling(2.0, offset=-1.0)(x)
+        base_model = tf.keras.applications.MobileNetV3Small(
+            weights=weights, include_top=False, input_shape=backbone_shape, include_preprocessing=False
+        )
+    elif architecture == 'efficientnet_b0':
+        # EfficientNet은 내장 전처리가 0-255 입력을 기대
+        x = tf.keras.layers.Rescaling(255.0)(x)
+        base_model = tf.keras.applications.EfficientNetB0(
+            weights=weights, include_top=False, input_shape=backbone_shape
+        )
+    else:
+        raise ValueError(f"지원하지 않는 student 모델입니다: {architecture} (지원: {', '.join(STUDENT_ARCHITECTURES)})")
+    base_model.trainable = True
+
+    x = base_model(x)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    x = tf.keras.layers.Dropout(0.2)(x)
+    logits = tf.keras.layers.Dense(num_classes, name='logits', dtype='float32')(x)
+    outputs = tf.keras.layers.Softmax(name='probabilities', dtype='float32')(logits)
+
+    student = tf.keras.Model(inputs, outputs, name=f'student_{architecture}_{resolution}')
+    student_logits = tf.keras.Model(inputs, logits, name=f'student_{architecture}_{resolution}_logits')
+    return student, student_logits
+
+
+class Distiller(tf.keras.Model):
+    """
+    teacher soft label + 정답 라벨로 student를 학습하는 래퍼 모델
+    loss = alpha * CE(정답, student) + (1 - alpha) * T^2 * KL(softmax(teacher/T) || softmax(student/T))
+    teacher 출력은 확률이므로 log를 logits로 사용
+    """
+
+    def __init__(self, student_logits, teacher, alpha=0.1, temperature=4.0):
+        super().__init__()
+        self.student_logits = student_logits
+        self.teacher = teacher
+        self.teacher.trainable = False
+        self.alpha = alpha
+        self.temperature = temperature
+        self.student_loss_fn = tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True)
+        self.distillation_loss_fn = tf.keras.losses.KLDivergence()
+
+    def call(self, x, training=False):
+        return self.student_logits(x, training=training)
+
+    def compute_loss(self, x=None, y=None, y_pred=None, sample_weight=None, training=True):
+        teacher_logits = tf.math.log(tf.clip_by_value(self.teacher(x, training=False), 1e-7, 1.0))
+        student_loss = self.student_loss_fn(y, y_pred)
+        distillation_loss = self.distillation_loss_fn(
+            tf.nn.softmax(teacher_logits / self.temperature),
+            tf.nn.softmax(y_pred / self.temperature),
+        ) * (self.temperature ** 2)
+        return self.alpha * student_loss + (1.0 - self.alpha) * distillation_loss
+
+
+def rescale_dataset(dataset, augmentation=None):
+    """uint8 배치 → 0-1 스케일 (augmentation이 있으면 입력 파이프라인에서 증강)"""
+    def transform(x, y):
+        x = tf.cast(x, tf.float32) / 255.0
+        if augmentation is not None:
+            x = augmentation(x, training=True)
+        return x, y
+    return dataset.map(transform, num_parallel_calls=tf.data.AUTOTUNE)
+
+
+def measure_latency(model, input_shape=(224, 224, 3), runs=50, warmup=5):
+    """
+    단일 프레임 CPU 추론 지연 시간 (ms, 서빙 KerasBackend와 같은 직접 호출)
+    :return: {'p50_ms', 'p90_ms'}
+    """
+    frame = np.random.default_rng(0).random((1,) + tuple(input_shape), dtype=np.float32)
+    for _ in range(warmup):
+        model(frame, training=False)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        np.asarray(model(frame, training=False))
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return {'p50_ms': round(float(np.percentile(timings, 50)), 2), 'p90_ms': round(float(np.percentile(timings, 90)), 2)}
+
+
+def evaluate_accuracy(model, dataset):
+    correct = total = 0
+    for x, y in dataset:
+        predictions = np.asarray(model(x, training=False))
+        correct += int(np.sum(np.argmax(predictions, axis=1) == y.numpy()))
+        total += len(predictions)
+    return correct / total if total else None
+
+
+def distillation_report(teacher, teacher_path, student, student_path, val_dataset, input_shape):
+    """
+    teacher/student 비교 리포트 (검증 정확도, 파라미터 수, 저장 파일 크기, 단일 프레임 CPU 지연 시간)
+    :param val_dataset: 0-1 스케일 검증 데이터셋 (None이면 정확도 생략)
+    """
+    report = {}
+    for name, model, path in (('teacher', teacher, teacher_path), ('student', student, student_path)):
+        report[name] = {
+            'name': model.name,
+            'val_accuracy': evaluate_accuracy(model, val_dataset) if val_dataset is not None else None,
+            'params': int(model.count_params()),
+            'file_mb': round(os.path.getsize(path) / (1024 * 1024), 2) if path and os.path.exists(path) else None,
+            'latency': measure_latency(model, input_shape),
+        }
+
+    print(f"{'model':<10}{'val acc':>10}{'params(M)':>12}{'file(MB)':>10}{'p50(ms)':>10}{'p90(ms)':>10}")
+    for name, r in report.items():
+        accuracy = f"{r['val_accuracy']:.4f}" if r['val_accuracy'] is not None else '-'
+        file_mb = f"{r['file_mb']:.1f}" if r['file_mb'] is not None else '-'
+        print(
+            f"{name:<10}{accuracy:>10}{r['params'] / 1e6:>12.2f}{file_mb:>10}"
+            f"{r['latency']['p50_ms']:>10.1f}{r['latency']['p90_ms']:>10.1f}"
+        )
+    report['speedup'] = round(report['teacher']['latency']['p50_ms'] / report['student']['latency']['p50_ms'], 2)
+    print(f"student 단일 프레임 추론 {report['speedup']:.2f}x 빠름")
+    return report
+
+
+class ThroughputCallback(Callback):
+    """epoch별 소요 시간과 처리량(images/sec) 출력"""
+
+    def __init__(self, num_images):
+        super().__init__()
+        self.num_images = num_images
+        self.epochs = []
+        self._started = 0.0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self._started
+        self.epochs.append({'epoch': epoch + 1, 'seconds': elapsed, 'images_per_sec': self.num_images / elapsed})
+        print(f"epoch {epoch + 1}: {elapsed:.1f}s, {self.num_images / elapsed:.1f} images/sec")
+
+
+def count_images(dataset):
+    return sum(int(tf.shape(labels)[0]) for _, labels in dataset)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감정 분류 모델 학습")
+    parser.add_argument('--data-dir', help="prepare_dataset.py 출력 디렉토리")
+    parser.add_argument('--train-dir', help="학습 이미지 디렉토리 (클래스 폴더 구조, --data-dir 대신 사용)")
+    parser.add_argument('--val-dir', help="검증 이미지 디렉토리 (클래스 폴더 구조)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--num-classes', type=int, default=4)
+    parser.add_argument('--weights', default='imagenet', help="EfficientNetB2 초기 가중치 (imagenet / none)")
+    parser.add_argument('--no-cache', action='store_true', help="변환된 데이터셋을 메모리에 캐시하지 않음")
+    parser.add_argument('--output', help="학습된 모델 저장 경로 (.keras)")
+    parser.add_argument('--teacher', help="지식 증류 teacher 모델 경로 (.keras, 지정하면 student 학습)")
+    parser.add_argument('--student', choices=STUDENT_ARCHITECTURES, default='mobilenet_v3_small')
+    parser.add_argument('--student-resolution', type=int, default=160, help="student 내부 입력 해상도")
+    parser.add_argument('--temperature', type=float, default=4.0, help="soft label 온도")
+    parser.add_argument('--alpha', type=float, default=0.1, help="정답 라벨 loss 비중 (나머지는 증류 loss)")
+    parser.add_argument('--learning-rate', type=float, default=0.0001)
+    parser.add_argument('--report', help="증류 비교 리포트 JSON 저장 경로")
+    parser.add_argument('--precision', choices=PRECISION_POLICIES, default='float32', help="학습 dtype 정책")
+    parser.add_argument('--jit-compile', action='store_true', help="XLA로 학습 스텝 컴파일")
+    parser.add_argument('--steps-per-execution', type=int, default=1, help="tf.function 호출당 실행할 배치 수")
+    args = parser.parse_args()
+
+    if not args.data_dir and not (args.train_dir and args.val_dir):
+        parser.error("--data-dir 또는 --train-dir/--val-dir를 지정하세요")
+    configure_precision(args.precision)
+    compile_options = {
+        'learning_rate': args.learning_rate,
+        'jit_compile': args.jit_compile,
+        'steps_per_execution': args.steps_per_execution,
+    }
+    if args.teacher:
+        distill(args, compile_options)
+        return
+
+    input_shape = IMAGE_SIZE + (3,)
+    weights = None if args.weights == 'none' else args.weights
+    if args.data_dir:
+        train_dataset, val_dataset, metadata = prepared_data_process(
+            args.batch_size, args.data_dir, cache=not args.no_cache
+        )
+        # prepare_dataset.py --image-size로 변환한 해상도에 맞춤
+        input_shape = prepared_input_shape(metadata)
+        num_images = metadata['splits']['train']['count']
+        num_classes = len(metadata['class_names'])
+        model = create_model(input_shape, num_classes, weights, **compile_options)
+        training_model = build_training_model(model, input_shape, **compile_options)
+        print(f"클래스 순서: {metadata['class_names']}")
+    else:
+        train_dataset, val_dataset = data_process(args.batch_size, args.train_dir, args.val_dir)
+        num_images = count_images(train_dataset)
+        num_classes = args.num_classes
+        model = create_model(input_shape, num_classes, weights, **compile_options)
+        training_model = model
+
+    # 콜백 설정 (EarlyStopping & ReduceLROnPlateau)
+    monitor = 'val_loss' if val_dataset is not None else 'loss'
+    early_stopping = EarlyStopping(monitor=monitor, patience=5, restore_best_weights=True, verbose=1)
+    reduce_lr = ReduceLROnPlateau(monitor=monitor, factor=0.5, patience=3, verbose=1, min_lr=1e-6)
+    throughput = ThroughputCallback(num_images)
+
+    # 모델 학습
+    training_model.fit(
+        train_dataset,
+        validation_data=val_dataset,
+        epochs=args.epochs,
+        callbacks=[early_stopping, reduce_lr, throughput]
+    )
+
+    # 첫 epoch는 cache 채우기/그래프 추적이 포함되므로 나머지 epoch 평균을 함께 출력
+    steady = throughput.epochs[1:] or throughput.epochs
+    print(
+        f"학습 처리량: 첫 epoch {throughput.epochs[0]['images_per_sec']:.1f} images/sec, "
+        f"이후 평균 {sum(e['images_per_sec'] for e in steady) / len(steady):.1f} images/sec"
+    )
+
+    if args.output:
+        save_serving_model(model, args.output, lambda: create_model(input_shape, num_classes, weights=None))
+        print(f"모델 저장: {args.output}")
+
+
+def distill(args, compile_options):
+    """--teacher 지정 시 : teacher soft label로 student 학습 후 저장/비교 리포트"""
+    input_shape = IMAGE_SIZE + (3,)
+    weights = None if args.weights == 'none' else args.weights
+
+    # teacher와 student가 같은 증강 이미지를 보도록 증강은 입력 파이프라인에서 실행
+    if args.data_dir:
+        train_dataset, val_dataset, metadata = prepared_data_process(
+            args.batch_size, args.data_dir, cache=not args.no_cache
+        )
+        input_shape = prepared_input_shape(metadata)
+        train_dataset = rescale_dataset(train_dataset, build_augmentation()).prefetch(tf.data.AUTOTUNE)
+        val_dataset = rescale_dataset(val_dataset) if val_dataset is not None else None
+        num_images = metadata['splits']['train']['count']
+        num_classes = len(metadata['class_names'])
+    else:
+        train_dataset, val_dataset = data_process(args.batch_size, args.train_dir, args.val_dir)
+        num_images = count_images(train_dataset)
+        num_classes = args.num_classes
+
+    teacher = tf.keras.models.load_model(args.teacher)
+    teacher_shape = tuple(teacher.input_shape[1:])
+    if teacher_shape != tuple(input_shape):
+        raise ValueError(f"teacher 입력 크기 {teacher_shape}와 데이터셋 이미지 크기 {tuple(input_shape)}가 다릅니다.")
+    student, student_logits = create_student_model(
+        input_shape, num_classes, args.student, args.student_resolution, weights
+    )
+    distiller = Distiller(student_logits, teacher, alpha=args.alpha, temperature=args.temperature)
+    distiller.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=compile_options['learning_rate']),
+        metrics=[tf.keras.metrics.SparseCategoricalAccuracy(name='accuracy')],
+        jit_compile=compile_options['jit_compile'],
+        steps_per_execution=compile_options['steps_per_execution'],
+    )
+
+    monitor = 'val_loss' if val_dataset is not None else 'loss'
+    throughput = ThroughputCallback(num_images)
+    distiller.fit(
+        train_dataset,
+        validation_data=val_dataset,
+        epochs=args.epochs,
+        callbacks=[
+            EarlyStopping(monitor=monitor, patience=5, restore_best_weights=True, verbose=1),
+            ReduceLROnPlateau(monitor=monitor, factor=0.5, patience=3, verbose=1, min_lr=1e-6),
+            throughput,
+        ]
+    )
 
-# 데이터셋 준비
-batch_size = 32
-train_dataset, val_dataset = data_process(batch_size)
+    if args.output:
+        save_serving_model(student, args.output, lambda: create_student_model(
+            input_shape, num_classes, args.student, args.student_resolution, weights=None
+        )[0])
+        print(f"student 모델 저장: {args.output}")
 
-# 모델 생성
-model = create_model(input_shape=(224, 224, 3), num_classes=4)
+    report = distillation_report(teacher, args.teacher, student, args.output, val_dataset, input_shape)
+    report['config'] = {
+        'student': args.student,
+        'student_resolution': args.student_resolution,
+        'temperature': args.temperature,
+        'alpha': args.alpha,
+        'epochs': len(throughput.epochs),
+    }
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
 
-# 콜백 설정 (EarlyStopping & ReduceLROnPlateau)
-early_stopping = EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True, verbose=1)
-reduce_lr = ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3, verbose=1, min_lr=1e-6)
 
-# 모델 학습
-model.fit(train_dataset, validation_data=val_dataset, epochs=20, callbacks=[early_stopping, reduce_lr])
+if __name__ == '__main__':
+    main()